@@ -0,0 +1,40 @@
+"""create validation results table
+
+Revision ID: 0e02300cd167
+Revises: 7233badda95e
+Create Date: 2026-10-18 14:02:17.525913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import (types, func)
+
+
+# revision identifiers, used by Alembic.
+revision = '0e02300cd167'
+down_revision = '7233badda95e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'validation_results',
+        # The Deckhand revision validated. Revisions are immutable, so the
+        # result of a validator for a revision does not change.
+        sa.Column('revision_id', types.Integer, primary_key=True),
+        # The name of the validator (e.g. Drydock)
+        sa.Column('validator', types.String(64), primary_key=True),
+        # The endpoint of the validator invoked
+        sa.Column('endpoint', types.String(512), primary_key=True),
+        # The json response of the validator
+        sa.Column('result', sa.Text, nullable=False),
+        # The time the result was stored
+        sa.Column('datetime',
+                  types.TIMESTAMP(timezone=True),
+                  server_default=func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table('validation_results')
@@ -0,0 +1,49 @@
+"""add lookup indexes
+
+Revision ID: 7233badda95e
+Revises: 7486ddec1979
+Create Date: 2026-10-18 09:12:41.302115
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7233badda95e'
+down_revision = '7486ddec1979'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Validations and command audits are retrieved by action id
+    op.create_index('ix_preflight_validation_failures_action_id',
+                    'preflight_validation_failures',
+                    ['action_id'])
+    op.create_index('ix_action_command_audit_action_id',
+                    'action_command_audit',
+                    ['action_id'])
+    # Locks are retrieved by type, newest first
+    op.create_index('ix_api_locks_lock_type_datetime',
+                    'api_locks',
+                    ['lock_type', 'datetime'])
+    # Notes are retrieved by an exact or prefix (LIKE 'prefix%') match on
+    # assoc_id. The pattern operator class allows the prefix match to use the
+    # index regardless of the collation of the database.
+    op.create_index('ix_notes_assoc_id_verbosity',
+                    'notes',
+                    ['assoc_id', 'verbosity'],
+                    postgresql_ops={'assoc_id': 'text_pattern_ops'})
+    op.create_index('ix_notes_note_timestamp',
+                    'notes',
+                    ['note_timestamp'])
+
+
+def downgrade():
+    op.drop_index('ix_notes_note_timestamp', table_name='notes')
+    op.drop_index('ix_notes_assoc_id_verbosity', table_name='notes')
+    op.drop_index('ix_api_locks_lock_type_datetime', table_name='api_locks')
+    op.drop_index('ix_action_command_audit_action_id',
+                  table_name='action_command_audit')
+    op.drop_index('ix_preflight_validation_failures_action_id',
+                  table_name='preflight_validation_failures')
@@ -0,0 +1,257 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process wide registry of SQLAlchemy engines
+
+Engines are shared per connection string, so that all users of a database
+within a process (e.g. the db access classes and the notes storage) draw
+from a single connection pool. The pools record metrics for the wait to
+check out a connection and for pool saturation, which are logged when the
+pool is saturated and otherwise periodically.
+"""
+import logging
+import threading
+import time
+
+import sqlalchemy
+from sqlalchemy.pool import QueuePool
+
+LOG = logging.getLogger(__name__)
+
+# The minimum number of seconds between periodic logs of a pool's metrics
+METRICS_LOG_INTERVAL = 300
+
+
+class PoolMetrics:
+    """Metrics for the connection checkouts of a pool
+
+    :param capacity: The maximum number of connections the pool allows
+        (pool size + max overflow), or None if unbounded.
+
+    Wait times are in seconds, and include the time to establish a connection
+    when the pool creates a new one. A checkout is counted as saturated if
+    all of the connections allowed by the pool were in use when the checkout
+    was requested, meaning the requester was blocked waiting for another
+    user of the pool to return a connection.
+    """
+    def __init__(self, capacity):
+        self._lock = threading.Lock()
+        self.capacity = capacity
+        self.checkouts = 0
+        self.saturated_checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._logged = time.monotonic()
+
+    def record_checkout(self, wait, in_use, saturated):
+        """Record a successful checkout of a connection
+
+        :param wait: The seconds spent waiting for the connection
+        :param in_use: The number of connections in use, including the
+            connection checked out
+        :param saturated: True if the pool was at capacity when the checkout
+            was requested
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.in_use = in_use
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            if saturated:
+                self.saturated_checkouts += 1
+
+    def record_checkin(self, in_use):
+        """Record the return of a connection to the pool
+
+        :param in_use: The number of connections remaining in use
+        """
+        with self._lock:
+            self.in_use = in_use
+
+    def record_timeout(self, wait):
+        """Record a checkout that timed out waiting for a connection"""
+        with self._lock:
+            self.timeouts += 1
+            self.saturated_checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def log_due(self, interval):
+        """Returns True if the metrics were last logged at least interval
+        seconds ago, marking them as logged now
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._logged < interval:
+                return False
+            self._logged = now
+            return True
+
+    def as_dict(self):
+        """Returns a dictionary representation of the metrics"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'capacity': self.capacity,
+                'checkouts': self.checkouts,
+                'saturated_checkouts': self.saturated_checkouts,
+                'timeouts': self.timeouts,
+                'mean_wait': self.total_wait / attempts if attempts else 0.0,
+                'max_wait': self.max_wait,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'saturation': (self.in_use / self.capacity
+                               if self.capacity else 0.0),
+            }
+
+
+def _metered_pool_class(metrics, url, metrics_log_interval):
+    """Returns a QueuePool class that records checkouts to the metrics
+
+    The metrics are logged when a checkout finds the pool saturated, and
+    otherwise at most once per metrics_log_interval seconds.
+
+    A class is produced for each engine because SQLAlchemy recreates a pool
+    from its class (e.g. when the engine is disposed), which does not retain
+    attributes set on the pool instance.
+    """
+    class MeteredQueuePool(QueuePool):
+        def _do_get(self):
+            bounded = self._max_overflow > -1
+            saturated = bounded and (
+                self.checkedout() >= self.size() + self._max_overflow)
+            start = time.monotonic()
+            try:
+                connection = super()._do_get()
+            except sqlalchemy.exc.TimeoutError:
+                metrics.record_timeout(time.monotonic() - start)
+                LOG.error('Timed out waiting for a connection from the '
+                          'database pool for <%r>. Pool metrics: %s',
+                          url, metrics.as_dict())
+                raise
+            wait = time.monotonic() - start
+            metrics.record_checkout(wait, self.checkedout(), saturated)
+            if saturated:
+                LOG.warning('Database pool for <%r> is saturated; waited '
+                            '%.3f seconds for a connection. Pool metrics: %s',
+                            url, wait, metrics.as_dict())
+            elif metrics.log_due(metrics_log_interval):
+                LOG.info('Database pool metrics for <%r>: %s',
+                         url, metrics.as_dict())
+            return connection
+
+        def _do_return_conn(self, conn):
+            super()._do_return_conn(conn)
+            metrics.record_checkin(self.checkedout())
+
+    return MeteredQueuePool
+
+
+class EnginePoolRegistry:
+    """Registry of SQLAlchemy engines, one per connection string
+
+    The pool settings supplied by the first request for a connection string
+    are used to create the engine; later requests for the same connection
+    string share that engine.
+
+    :param metrics_log_interval: The minimum number of seconds between
+        periodic logs of the metrics of each pool
+    """
+    def __init__(self, metrics_log_interval=METRICS_LOG_INTERVAL):
+        self._lock = threading.Lock()
+        self._engines = {}
+        self._metrics = {}
+        self.metrics_log_interval = metrics_log_interval
+
+    def get_engine(self, connection_string, pool_size=15, max_overflow=10,
+                   pool_pre_ping=True, pool_recycle=-1, pool_timeout=30,
+                   statement_timeout=0):
+        """Returns the engine for the connection string, creating it if needed
+
+        :param connection_string: The SQLAlchemy URL of the database
+        :param pool_size: The number of connections kept in the pool
+        :param max_overflow: The number of connections allowed above the pool
+            size during high usage
+        :param pool_pre_ping: Should connections be validated prior to use
+        :param pool_recycle: Seconds after which a connection is closed and
+            re-established. -1 for no recycling
+        :param pool_timeout: Seconds to wait for a connection to become
+            available
+        :param statement_timeout: Seconds that a single statement may run
+            before it is cancelled by the database. 0 for no limit
+        """
+        with self._lock:
+            engine = self._engines.get(connection_string)
+            if engine is not None:
+                return engine
+
+            url = sqlalchemy.engine.url.make_url(connection_string)
+            metrics = PoolMetrics(
+                pool_size + max_overflow if max_overflow > -1 else None)
+            connect_args = {}
+            if statement_timeout > 0:
+                connect_args['options'] = '-c statement_timeout={}'.format(
+                    statement_timeout * 1000)
+            LOG.info('Initializing connection pool for <%r> with pool size: '
+                     '%d, max overflow: %d, pool pre ping: %s, pool '
+                     'recycle: %d, pool timeout: %d, and statement '
+                     'timeout: %d', url, pool_size, max_overflow,
+                     pool_pre_ping, pool_recycle, pool_timeout,
+                     statement_timeout)
+            engine = sqlalchemy.create_engine(
+                url,
+                poolclass=_metered_pool_class(metrics, url,
+                                              self.metrics_log_interval),
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+                pool_timeout=pool_timeout,
+                connect_args=connect_args
+            )
+            self._engines[connection_string] = engine
+            self._metrics[connection_string] = metrics
+            return engine
+
+    def get_metrics(self, connection_string=None):
+        """Returns the pool metrics as a dictionary
+
+        :param connection_string: optional, if specified the metrics of only
+            this connection string's pool are returned, otherwise a
+            dictionary of metrics keyed by the (password masked) URL of each
+            pool is returned
+        """
+        with self._lock:
+            if connection_string is not None:
+                metrics = self._metrics.get(connection_string)
+                return metrics.as_dict() if metrics is not None else None
+            return {
+                repr(self._engines[conn_str].url): metrics.as_dict()
+                for conn_str, metrics in self._metrics.items()
+            }
+
+    def dispose_all(self):
+        """Disposes of and removes all registered engines"""
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._metrics.clear()
+
+
+# The registry for use within a process
+ENGINE_POOLS = EnginePoolRegistry()
@@ -18,6 +18,7 @@ Encapsulates classes and functions related to the management and use of
 deployment groups used during baremetal provisioning.
 """
 import logging
+import time
 
 import networkx as nx
 
@@ -70,6 +71,20 @@ class DeploymentGroupManager:
         self._all_nodes = {}
         self._calculate_nodes()
 
+        # The groups earlier in the group order with which each group shares
+        # nodes, by group name. The success of a group depends on the outcome
+        # of its shared nodes, which are processed by the earlier group.
+        self._overlapping_groups = _find_overlapping_groups(
+            [self._all_groups[name] for name in self._group_order]
+        )
+
+        # The monotonic start and end times of the stages of each group, by
+        # group name and stage. E.g.:
+        # {
+        #   'group-1': {Stage.PREPARED: [120.5, 410.2]},
+        # }
+        self._stage_times = {}
+
     def get_next_group(self, stage):
         """Get the next eligible group name to use for the provided stage
 
@@ -83,6 +98,53 @@ class DeploymentGroupManager:
                 return self._all_groups[group]
         return None
 
+    def get_eligible_groups(self):
+        """Get the groups that may be processed now, in group order
+
+        A group is eligible if it has not been started, all of the groups it
+        depends on are deployed, and all of the earlier groups with which it
+        shares nodes are complete (deployed or failed). Eligible groups are
+        independent of each other, and may be processed concurrently.
+        """
+        complete = [Stage.DEPLOYED, Stage.FAILED]
+        eligible = []
+        for name in self._group_order:
+            group = self._all_groups[name]
+            if group.stage != Stage.NOT_STARTED:
+                continue
+            if not self.dependencies_deployed(name):
+                continue
+            if not all(self._all_groups[other].stage in complete
+                       for other in self._overlapping_groups[name]):
+                continue
+            eligible.append(group)
+        return eligible
+
+    def get_look_ahead_groups(self):
+        """Get the groups that may be prepared ahead of their dependencies
+
+        A group may be prepared ahead if it has not been started, some of the
+        groups it depends on are not yet deployed (and none have failed), and
+        all of the earlier groups with which it shares nodes are complete.
+        Such a group must not be deployed until its dependencies are
+        deployed.
+        """
+        look_ahead = []
+        for name in self._group_order:
+            group = self._all_groups[name]
+            if (group.stage == Stage.NOT_STARTED and
+                    not self.dependencies_deployed(name) and
+                    all(self._all_groups[other].stage in
+                        [Stage.DEPLOYED, Stage.FAILED]
+                        for other in self._overlapping_groups[name])):
+                look_ahead.append(group)
+        return look_ahead
+
+    def dependencies_deployed(self, group_name):
+        """Return True if all the groups a group depends on are deployed"""
+        return all(self._all_groups[parent].stage == Stage.DEPLOYED
+                   for parent in self._group_graph.predecessors(group_name))
+
     def group_list(self):
         """Return a list of DeploymentGroup objects in group order"""
         summary = []
@@ -154,6 +216,80 @@ class DeploymentGroupManager:
             LOG.info("  Nodes %s: %s", stage, ", ".join(nodes))
         LOG.info("===== End Node Summary =====")
 
+    def record_stage_start(self, group_name, stage):
+        """Records the start of processing a group for a stage
+
+        :param group_name: the name of the group
+        :param stage: Stage.PREPARED or Stage.DEPLOYED
+        """
+        self._find_group(group_name)
+        self._stage_times.setdefault(group_name, {})[stage] = [
+            time.monotonic(), None]
+
+    def record_stage_end(self, group_name, stage):
+        """Records the end of processing a group for a stage
+
+        :param group_name: the name of the group
+        :param stage: Stage.PREPARED or Stage.DEPLOYED
+        """
+        times = self._stage_times.get(group_name, {}).get(stage)
+        if times is not None:
+            times[1] = time.monotonic()
+
+    def get_stage_timing(self):
+        """Returns the timing of the stages of the groups
+
+        Returns a dictionary by group name of dictionaries by stage, of the
+        seconds from the first recorded start to the start of the stage,
+        and the seconds the stage took, e.g.:
+        {
+            'group-1': {Stage.PREPARED: {'start': 0.0, 'duration': 290.0}}
+        }
+        Stages not yet ended have a duration of None.
+        """
+        starts = [times[0] for stages in self._stage_times.values()
+                  for times in stages.values()]
+        if not starts:
+            return {}
+        first = min(starts)
+        timing = {}
+        for group_name, stages in self._stage_times.items():
+            timing[group_name] = {
+                stage: {
+                    'start': start - first,
+                    'duration': None if end is None else end - start
+                } for stage, (start, end) in stages.items()
+            }
+        return timing
+
+    def report_stage_timing(self):
+        """Reports the timing of the stages of the groups
+
+        The total of the durations of the stages exceeds the elapsed time
+        by the time that stages of groups overlapped, less any time that no
+        stage was in progress.
+        """
+        timing = self.get_stage_timing()
+        if not timing:
+            return
+        LOG.info("=====   Stage Timing   =====")
+        total = 0.0
+        elapsed = 0.0
+        for group in self.group_list():
+            for stage, times in sorted(timing.get(group.name, {}).items(),
+                                       key=lambda item: item[1]['start']):
+                if times['duration'] is None:
+                    continue
+                total += times['duration']
+                elapsed = max(elapsed, times['start'] + times['duration'])
+                LOG.info("  Group %s %s started at %.1fs and took %.1fs",
+                         group.name, stage, times['start'],
+                         times['duration'])
+        LOG.info("  Stages took %.1fs in total, in %.1fs elapsed, "
+                 "overlapping by %.1fs", total, elapsed,
+                 max(total - elapsed, 0.0))
+        LOG.info("===== End Stage Timing =====")
+
     #
     # Methods that support setup of the nodes in groups
     #
@@ -299,6 +435,26 @@ def _update_group_actionable_nodes(group, known_nodes):
               ", ".join(group.full_nodes))
 
 
+def _find_overlapping_groups(ordered_groups):
+    """Find the earlier groups with which each group shares nodes
+
+    :param ordered_groups: the list of DeploymentGroup objects in group order
+    returns a dictionary of group name to the list of names of the groups
+    before it that have nodes in common with it
+    """
+    overlapping = {}
+    for index, group in enumerate(ordered_groups):
+        nodes = set(group.full_nodes)
+        overlapping[group.name] = [
+            other.name for other in ordered_groups[:index]
+            if nodes.intersection(other.full_nodes)
+        ]
+        if overlapping[group.name]:
+            LOG.debug("Group %s shares nodes with groups %s",
+                      group.name, ", ".join(overlapping[group.name]))
+    return overlapping
+
+
 def _generate_group_graph(groups):
     """Create the directed graph of groups
 
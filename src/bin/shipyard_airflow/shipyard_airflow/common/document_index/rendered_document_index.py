@@ -0,0 +1,284 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local indexes of the rendered documents of Deckhand revisions
+
+Rather than requesting each document needed from a revision from Deckhand
+(which renders the revision for each request), the rendered documents of a
+revision are fetched once and written to an index file in a local directory.
+Revisions do not change once created, so an index file is never invalidated.
+
+An index file is a header, a JSON object mapping the schema and name of each
+document to the offset and length of its data, and then the JSON data of each
+document. The file is memory mapped by each process that uses it, so that a
+lookup by schema and name decodes only the data of the document found. Files
+are built and removed under an exclusive lock of the directory, so that the
+processes (e.g. Airflow workers) sharing a directory fetch each revision only
+once, and are written to a temporary file that is then renamed into place.
+The least recently used files beyond a limit are removed once a file is
+built. An existing file is opened without taking the lock.
+"""
+import collections
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+# The number of index files kept in a directory, and of open indexes kept by
+# a registry
+DEFAULT_INDEX_LIMIT = 32
+
+# magic, format version, length of the JSON index
+_HEADER = struct.Struct('>4sBQ')
+_MAGIC = b'SYDI'
+_FORMAT_VERSION = 1
+# The format version is part of the file name, so files of another format
+# are never opened
+_SUFFIX = '.v{}.idx'.format(_FORMAT_VERSION)
+# The file locked while an index file is built or removed. It is never
+# removed, so that every process locks the same file.
+_LOCK_NAME = '.lock'
+
+
+def _key(schema, name):
+    return '{}\0{}'.format(schema, name)
+
+
+def write_index(stream, documents):
+    """Writes an index of documents to a file
+
+    A document that is not unique by schema and name is not found in the
+    index.
+
+    :param stream: the binary file to write the index to
+    :param documents: an iterable of the (schema, name, data) of each
+        document
+    :returns: the number of documents written
+    """
+    index = {}
+    blobs = []
+    offset = 0
+    for schema, name, data in documents:
+        key = _key(schema, name)
+        if key in index:
+            index[key] = None
+            continue
+        blob = json.dumps(data, separators=(',', ':'),
+                          default=str).encode('utf-8')
+        index[key] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    serialized_index = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    stream.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(serialized_index)))
+    stream.write(serialized_index)
+    for blob in blobs:
+        stream.write(blob)
+    return len(blobs)
+
+
+class RenderedDocumentIndex:
+    """A memory mapped index file of documents
+
+    :param path: the path of the index file
+    :raises ValueError: if the file is not an index file
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, index_length = _HEADER.unpack_from(self._map)
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError('{} is not a document index'.format(path))
+            start = _HEADER.size
+            self._index = json.loads(
+                self._map[start:start + index_length].decode('utf-8'))
+        except Exception:
+            self._map.close()
+            raise
+        self._data_start = _HEADER.size + index_length
+
+    def get(self, schema, name, default=None):
+        """Returns the data of the document, or the default if the document
+        is not in the index"""
+        entry = self._index.get(_key(schema, name))
+        if entry is None:
+            return default
+        start = self._data_start + entry[0]
+        return json.loads(self._map[start:start + entry[1]].decode('utf-8'))
+
+    def __contains__(self, schema_name):
+        return self._index.get(_key(*schema_name)) is not None
+
+    def __len__(self):
+        return sum(1 for entry in self._index.values() if entry is not None)
+
+    def close(self):
+        self._map.close()
+
+
+def index_path(directory, revision_id):
+    """Returns the path of the index file of a revision"""
+    return os.path.join(directory,
+                        'revision-{}{}'.format(int(revision_id), _SUFFIX))
+
+
+class DocumentIndexRegistry:
+    """Registry of the open indexes of revisions
+
+    The indexes used most recently, up to a limit, are kept open for reuse
+    within the process. Indexes removed from the registry are not closed,
+    because they may still be in use; the mapping is released when the index
+    is no longer referenced.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = collections.OrderedDict()
+
+    def get_index(self, directory, revision_id, fetch_documents,
+                  limit=DEFAULT_INDEX_LIMIT):
+        """Returns the index of a revision, building it if needed
+
+        :param directory: the directory of the index files
+        :param revision_id: the Deckhand revision
+        :param fetch_documents: a callable returning an iterable of the
+            (schema, name, data) of the rendered documents of the revision,
+            called if the index file does not already exist
+        :param limit: the number of index files kept in the directory, and of
+            open indexes kept by the registry
+        """
+        key = (directory, int(revision_id))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+
+        index = _open_index(directory, revision_id, fetch_documents, limit)
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > limit:
+                self._indexes.popitem(last=False)
+        return index
+
+    def clear(self):
+        """Removes all indexes from the registry"""
+        with self._lock:
+            self._indexes.clear()
+
+
+def _open_index(directory, revision_id, fetch_documents, limit):
+    """Opens the index file of a revision, building it if it does not exist
+
+    Once an index file is built, the least recently used files beyond the
+    limit are removed.
+    """
+    path = index_path(directory, revision_id)
+    index = _open_existing(path)
+    if index is not None:
+        return index
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, _LOCK_NAME), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            # built by another process while waiting for the lock
+            index = _open_existing(path)
+            if index is not None:
+                return index
+
+            start = time.monotonic()
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as stream:
+                    count = write_index(stream, fetch_documents())
+                os.replace(temp_path, path)
+            except Exception:
+                _remove(temp_path)
+                raise
+            LOG.info('Built the index of %d rendered documents of revision '
+                     '%s in %.3f seconds', count, revision_id,
+                     time.monotonic() - start)
+            index = RenderedDocumentIndex(path)
+            _remove_old_indexes(directory, limit, keep=path)
+            return index
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _open_existing(path):
+    """Opens an existing index file, or returns None if there is none
+
+    An index file may be removed at any time by another process, but once
+    opened, the mapping of the file remains usable.
+    """
+    try:
+        index = RenderedDocumentIndex(path)
+    except FileNotFoundError:
+        return None
+    _touch(path)
+    return index
+
+
+def _remove_old_indexes(directory, limit, keep):
+    """Removes the least recently used index files beyond the limit
+
+    Called holding the lock of the directory.
+    """
+    try:
+        paths = [os.path.join(directory, name)
+                 for name in os.listdir(directory) if name.endswith('.idx')]
+    except OSError as ex:
+        LOG.warning('Unable to list the document indexes in %s: %s',
+                    directory, ex)
+        return
+    if len(paths) <= limit:
+        return
+    paths.sort(key=_mtime, reverse=True)
+    for path in paths[limit:]:
+        if path != keep:
+            LOG.debug('Removing document index %s', path)
+            _remove(path)
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# The registry for use within a process
+DOCUMENT_INDEXES = DocumentIndexRegistry()
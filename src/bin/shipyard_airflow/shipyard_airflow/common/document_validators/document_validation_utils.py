@@ -14,16 +14,30 @@
 """Utilities for use by document validators."""
 import logging
 
+from ..document_index.rendered_document_index import DEFAULT_INDEX_LIMIT
+from ..document_index.rendered_document_index import DOCUMENT_INDEXES
 from .errors import DocumentLookupError, DocumentNotFoundError
 
 LOG = logging.getLogger(__name__)
 
 
 class DocumentValidationUtils:
-    def __init__(self, deckhand_client):
+    """Lookup of the rendered documents of a Deckhand revision
+
+    :param deckhand_client: An instance of a Deckhand client
+    :param index_dir: optional, a directory for the local indexes of the
+        rendered documents of revisions. If specified, the rendered documents
+        of a revision are fetched from Deckhand once, and each document is
+        looked up in the index, rather than requested from Deckhand.
+    :param index_limit: the number of revisions for which indexes are kept
+    """
+    def __init__(self, deckhand_client, index_dir=None,
+                 index_limit=DEFAULT_INDEX_LIMIT):
         if deckhand_client is None:
             raise TypeError('Deckhand client is required.')
         self.deckhand_client = deckhand_client
+        self.index_dir = index_dir
+        self.index_limit = index_limit
 
     def get_unique_doc(self, revision_id, name, schema):
         """Retrieve a single, unique document as a dictionary
@@ -35,6 +49,9 @@ class DocumentValidationUtils:
             found
         returns the specified document, or raises a DocumentLookupError
         """
+        if self.index_dir:
+            return self._get_indexed_doc(revision_id, name, schema)
+
         filters = {
             "schema": schema,
             "metadata.name": name
@@ -68,3 +85,33 @@ class DocumentValidationUtils:
                                       "for validation: {}".format(str(ex)))
 
         return docs or []
+
+    def _get_indexed_doc(self, revision_id, name, schema):
+        """Retrieve a single, unique document from the index of the revision
+        """
+        try:
+            index = DOCUMENT_INDEXES.get_index(
+                self.index_dir, revision_id,
+                lambda: self._rendered_documents(revision_id),
+                limit=self.index_limit)
+        except Exception as ex:
+            LOG.exception(ex)
+            raise DocumentLookupError("Exception during lookup of a document "
+                                      "for validation: {}".format(str(ex)))
+        data = index.get(schema, name)
+        LOG.info("Looked up %s, %s in the index of revision %s: %s", schema,
+                 name, revision_id,
+                 "not found" if data is None else "found")
+        if data is not None:
+            return data
+        raise DocumentNotFoundError
+
+    def _rendered_documents(self, revision_id):
+        """Yields the (schema, name, data) of the rendered documents of a
+        revision"""
+        LOG.info("Retrieving the rendered documents of revision %s",
+                 revision_id)
+        docs = self.deckhand_client.revisions.documents(revision_id,
+                                                        rendered=True)
+        for doc in docs or []:
+            yield doc.schema, (doc.metadata or {}).get('name'), doc.data
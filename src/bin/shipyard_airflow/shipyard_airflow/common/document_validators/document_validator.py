@@ -30,12 +30,15 @@ class DocumentValidator(metaclass=abc.ABCMeta):
         to interact with Deckhand during the validation
     :param revision: The numeric Deckhand revision of document under test
     :param doc_name: The name of the document under test
+    :param index_dir: optional, the directory of the local indexes of
+        rendered documents used to look up the documents
     """
-    def __init__(self, deckhand_client, revision, doc_name):
+    def __init__(self, deckhand_client, revision, doc_name, index_dir=None):
         if deckhand_client is None:
             raise DeckhandClientRequiredError()
         self.deckhand_client = deckhand_client
-        self.docutils = DocumentValidationUtils(self.deckhand_client)
+        self.docutils = DocumentValidationUtils(self.deckhand_client,
+                                                index_dir=index_dir)
         self.doc_name = doc_name
 
         # self.error_status is False if no validations fail. It becomes
@@ -40,10 +40,15 @@ class DocumentValidationManager:
     :param revision: The numeric Deckhand revision of document under test
     :param validations: The list of tuples containing a Validator (extending
         DocumentValidator) and a document name.
+    :param index_dir: optional, the directory of the local indexes of
+        rendered documents. If specified, the rendered documents of the
+        revision are fetched once for all of the validations.
     """
-    def __init__(self, deckhand_client, revision, validations):
+    def __init__(self, deckhand_client, revision, validations,
+                 index_dir=None):
         self.deckhand_client = deckhand_client
         self.revision = revision
+        self.index_dir = index_dir
         self.validations = self._parse_validations(validations)
         self.errored = False
         self.validations_run = 0
@@ -66,7 +71,8 @@ class DocumentValidationManager:
             for val_def in unfinished:
                 vldtr = val_def.validator(deckhand_client=self.deckhand_client,
                                           revision=self.revision,
-                                          doc_name=val_def.name)
+                                          doc_name=val_def.name,
+                                          index_dir=self.index_dir)
                 LOG.info("Validating document %s: %s ",
                          vldtr.schema, vldtr.doc_name)
                 vldtr.validate()
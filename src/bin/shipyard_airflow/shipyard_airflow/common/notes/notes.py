@@ -143,6 +143,30 @@ class NotesManager:
                     "Details at notedetails/{}".format(note.note_id))
         return notes
 
+    def retrieve_many(self, queries):
+        """Retrieve the notes for several queries at once
+
+        :param queries: a list of query objects to retrieve notes
+        :returns: a dictionary keyed by the assoc_id_pattern of each query,
+            having a list of the notes matching the query, or [] if there are
+            no notes matching the query.
+        """
+        try:
+            notes_dict = dict(self.storage.retrieve_many(queries))
+        except NotesRetrievalError:
+            raise
+        except Exception as ex:
+            LOG.exception(ex)
+            raise NotesRetrievalError(
+                "Unhandled error during retrieval of notes"
+            )
+        for notes in notes_dict.values():
+            for note in notes:
+                if note.link_url:
+                    note.resolved_url_value = (
+                        "Details at notedetails/{}".format(note.note_id))
+        return notes_dict
+
     def retrieve_by_id(self, note_id):
         """Return a single note looked up by the specified note_id
 
@@ -267,6 +291,14 @@ class Query:
         self.max_verbosity = max_verbosity or MAX_VERBOSITY
         self.exact_match = exact_match or False
 
+    def matches(self, note):
+        """Returns True if the note is selected by this query"""
+        if note.verbosity > self.max_verbosity:
+            return False
+        if self.exact_match:
+            return note.assoc_id == self.assoc_id_pattern
+        return note.assoc_id.startswith(self.assoc_id_pattern)
+
 
 class NotesStorage(metaclass=abc.ABCMeta):
     """NotesStorage abstract base class
@@ -297,6 +329,23 @@ class NotesStorage(metaclass=abc.ABCMeta):
         """
         pass
 
+    def retrieve_many(self, queries):
+        """Query for the Note objects matching any of several queries
+
+        :param queries: a list of Notes Query objects
+        :returns: a dictionary keyed by the assoc_id_pattern of each query,
+            having a list of Note objects matching the query. Each list is
+            ordered by note_timestamp. A note matching more than one query is
+            included in the list for each.
+        :raises NotesRetrievalError: when there is a failure to retrieve notes
+
+        Implementations should override this method to retrieve the notes
+        using a single request of the data store. This default
+        implementation retrieves the notes for each query separately.
+        """
+        return {query.assoc_id_pattern: self.retrieve(query)
+                for query in queries}
+
     @abc.abstractmethod
     def retrieve_by_id(self, note_id):
         """Lookup a note by note_id
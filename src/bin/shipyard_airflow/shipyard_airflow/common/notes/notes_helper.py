@@ -171,6 +171,23 @@ class NotesHelper:
             LOG.exception(ex)
         return []
 
+    def _failsafe_get_many_notes(self, queries):
+        """LOG and continue on any note retrieval failure
+
+        :returns: a dictionary of lists of notes keyed by the assoc_id_pattern
+            of each query. On failure, each list is empty.
+        """
+        try:
+            return self.nm.retrieve_many(queries)
+        except Exception as ex:
+            LOG.warn(
+                "Note retrieval for {} encountered a problem, exception "
+                "info follows, but processing is not halted for notes.",
+                [q.assoc_id_pattern for q in queries]
+            )
+            LOG.exception(ex)
+        return {q.assoc_id_pattern: [] for q in queries}
+
     #
     # Retrieve notes by note ID
     #
@@ -267,6 +284,31 @@ class NotesHelper:
             note_dict[action_id].append(n)
         return note_dict
 
+    def get_notes_for_actions(self, action_ids, verbosity=MIN_VERBOSITY):
+        """Retrieve notes for the listed actions, in a dictionary keyed by
+        action id, using a single retrieval.
+
+        :param action_ids: the list of actions for which to retrieve notes.
+        :param verbosity: optional integer, 0-5, the maximum verbosity level
+            to retrieve, defaults to 1 (most summary level)
+            if set to less than 1, returns {}, skipping any retrieval
+        """
+        if verbosity < MIN_VERBOSITY or not action_ids:
+            return {}
+        queries = {
+            action_id: Query(
+                assoc_id_pattern=NoteType.ACTION.key_pattern.format(
+                    action_id),
+                max_verbosity=verbosity,
+                exact_match=True)
+            for action_id in action_ids
+        }
+        notes = self._failsafe_get_many_notes(list(queries.values()))
+        return {
+            action_id: notes.get(query.assoc_id_pattern, [])
+            for action_id, query in queries.items()
+        }
+
     def get_action_notes(self, action_id, verbosity=MAX_VERBOSITY):
         """Retrive notes related to a particular action
 
@@ -339,6 +381,44 @@ class NotesHelper:
             verbosity=verbosity,
             exact_match=False
         )
+        return self._step_notes_dict(notes)
+
+    def get_action_and_step_notes(self, action_id, verbosity=MAX_VERBOSITY,
+                                  step_verbosity=MIN_VERBOSITY):
+        """Retrieve the notes related to an action and those of its steps,
+        using a single retrieval.
+
+        :param action_id: the action for which to retrieve notes.
+        :param verbosity: optional integer, 0-5, the maximum verbosity level
+            of the action notes to retrieve, defaults to 5 (most detailed
+            level). If set to less than 1, no action notes are retrieved.
+        :param step_verbosity: optional integer, 0-5, the maximum verbosity
+            level of the step notes to retrieve, defaults to 1 (most summary
+            level). If set to less than 1, no step notes are retrieved.
+        :returns: a tuple of (the list of the notes of the action, a dict of
+            the lists of the notes of the steps, keyed by step name)
+        """
+        action_query = Query(
+            assoc_id_pattern=NoteType.ACTION.key_pattern.format(action_id),
+            max_verbosity=verbosity,
+            exact_match=True)
+        step_query = Query(
+            assoc_id_pattern=NoteType.STEP.lookup_pattern.format(action_id),
+            max_verbosity=step_verbosity,
+            exact_match=False)
+        queries = [query for query in (action_query, step_query)
+                   if query.max_verbosity >= MIN_VERBOSITY]
+        if not queries:
+            return [], {}
+        notes = self._failsafe_get_many_notes(queries)
+        return (
+            notes.get(action_query.assoc_id_pattern, []),
+            self._step_notes_dict(notes.get(step_query.assoc_id_pattern, []))
+        )
+
+    @staticmethod
+    def _step_notes_dict(notes):
+        """Returns the step notes in a dict of lists keyed by step name"""
         note_dict = {}
         id_s = NoteType.STEP.id_start
         for n in notes:
@@ -24,6 +24,7 @@ from contextlib import contextmanager
 import logging
 
 from sqlalchemy import and_
+from sqlalchemy import or_
 from sqlalchemy import Column
 from sqlalchemy import func
 from sqlalchemy import Text
@@ -142,6 +143,29 @@ class ShipyardSQLNotesStorage(NotesStorage):
                 r_notes.append(self._map(tn, Note))
         return r_notes
 
+    def retrieve_many(self, queries):
+        notes_dict = {query.assoc_id_pattern: [] for query in queries}
+        if not queries:
+            return notes_dict
+        conditions = []
+        for query in queries:
+            if query.exact_match:
+                a_id_cond = TNote.assoc_id == query.assoc_id_pattern
+            else:
+                a_id_cond = TNote.assoc_id.like(query.assoc_id_pattern + '%')
+            conditions.append(
+                and_(a_id_cond, TNote.verbosity <= query.max_verbosity))
+        with self.session_scope() as session:
+            n_qry = session.query(TNote).filter(
+                or_(*conditions)
+            ).order_by(TNote.note_timestamp)
+            for tn in n_qry.all():
+                note = self._map(tn, Note)
+                for query in queries:
+                    if query.matches(note):
+                        notes_dict[query.assoc_id_pattern].append(note)
+        return notes_dict
+
     def retrieve_by_id(self, note_id):
         with self.session_scope() as session:
             note = session.query(TNote).filter(
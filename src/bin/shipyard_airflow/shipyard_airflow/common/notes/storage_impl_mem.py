@@ -45,6 +45,15 @@ class MemoryNotesStorage(NotesStorage):
         notes.sort(key=lambda x: x.note_timestamp)
         return notes
 
+    def retrieve_many(self, queries):
+        notes_dict = {query.assoc_id_pattern: [] for query in queries}
+        for note in sorted(self.storage.values(),
+                           key=lambda x: x.note_timestamp):
+            for query in queries:
+                if query.matches(note):
+                    notes_dict[query.assoc_id_pattern].append(note)
+        return notes_dict
+
     def retrieve_by_id(self, note_id):
         note = self.storage.get(note_id)
         if not note:
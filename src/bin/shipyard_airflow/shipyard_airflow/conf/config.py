@@ -86,17 +86,46 @@ SECTIONS = [
                 help=('Time, in seconds, when a connection should be closed '
                       'and re-established. -1 for no recycling.')
             ),
+            cfg.IntOpt(
+                'statement_timeout',
+                default=0,
+                help=('Time, in seconds, that a single database statement may '
+                      'run before it is cancelled. 0 for no limit.')
+            ),
             cfg.StrOpt(
                 'alembic_ini_path',
                 default='/home/shipyard/shipyard',
                 help='The directory containing the alembic.ini file'
             ),
+            cfg.IntOpt(
+                'configdocs_spool_size',
+                default=16,
+                help=(
+                    'The size, in megabytes, of a collection of documents '
+                    'received by Shipyard that is held in memory. Larger '
+                    'collections are held in a temporary file until they '
+                    'have been sent to Deckhand.'
+                )
+            ),
             cfg.BoolOpt(
                 'profiler',
                 default=False,
                 help=('Enable profiling of API requests. Do NOT '
                       'use in production.')
             ),
+            cfg.StrOpt(
+                'json_codec',
+                default='json',
+                choices=[
+                    ('json', 'The standard library json module'),
+                    ('orjson', 'orjson, which is faster at encoding large '
+                               'responses, but must be installed separately. '
+                               'The items of the JSON produced are not '
+                               'separated by whitespace.'),
+                ],
+                help=('The codec used to encode and decode the JSON bodies '
+                      'of API requests and responses.')
+            ),
         ]
     ),
     ConfigSection(
@@ -149,6 +178,39 @@ SECTIONS = [
                     'the service lookup in the Keystone service catalog.'
                 )
             ),
+            cfg.IntOpt(
+                'revision_cache_ttl',
+                default=10,
+                help=(
+                    'The number of seconds for which the index of Deckhand '
+                    'revisions is cached and shared by the requests handled '
+                    'by a process. Changes to revisions made by the process '
+                    'invalidate the cache. Before it is used, the cached '
+                    'index is checked against the latest and committed '
+                    'revisions in Deckhand, so that changes made elsewhere '
+                    'are seen. A value of 0 disables the cache.'
+                )
+            ),
+            cfg.IntOpt(
+                'document_hash_cache_size',
+                default=64,
+                help=(
+                    'The number of revisions of collections for which the '
+                    'content hashes of the documents are cached by a '
+                    'process, for comparing the documents of revisions. '
+                    'A value of 0 disables the cache.'
+                )
+            ),
+            cfg.IntOpt(
+                'rendered_docs_cache_size',
+                default=64,
+                help=(
+                    'The total size, in megabytes, of the rendered documents '
+                    'of revisions cached by a process. Only documents with '
+                    'redacted secrets are cached. A value of 0 disables the '
+                    'cache.'
+                )
+            ),
         ]
     ),
     ConfigSection(
@@ -223,6 +285,25 @@ SECTIONS = [
                     'PUT, POST and DELETE request'
                 )
             ),
+            cfg.IntOpt(
+                'deckhand_client_pool_maxsize',
+                default=10,
+                help=(
+                    'The maximum number of connections to Deckhand kept '
+                    'alive for reuse by the Deckhand client'
+                )
+            ),
+            cfg.IntOpt(
+                'deckhand_client_max_retries',
+                default=3,
+                help=(
+                    'The number of times the Deckhand client retries a '
+                    'request that fails to connect. A GET request, other '
+                    'than one rendering documents, is also retried if it '
+                    'receives a 502, 503 or 504 response. Requests are not '
+                    'retried if reading the response fails'
+                )
+            ),
             cfg.IntOpt(
                 'validation_connect_timeout',
                 default=5,
@@ -340,6 +421,17 @@ SECTIONS = [
                       'controlled by a field in the deployment configuration '
                       'document.')
             ),
+            cfg.StrOpt(
+                'rendered_document_index_dir',
+                default='',
+                help=('A local directory for indexes of the rendered '
+                      'documents of Deckhand revisions. If set, the rendered '
+                      'documents of a revision are retrieved from Deckhand '
+                      'once, and the documents that Shipyard validates and '
+                      'the workflow uses are looked up in the index rather '
+                      'than requested individually. If not set, each '
+                      'document is requested from Deckhand.')
+            ),
         ]
     ),
     ConfigSection(
@@ -375,6 +467,21 @@ SECTIONS = [
                          ('Error', 'Return an error when the validation fails '
                                    'and prevent the commit from proceeding')]
             ),
+            cfg.IntOpt(
+                'validation_deadline',
+                default=300,
+                help=('The number of seconds within which each of the '
+                      'validations of a revision (by Deckhand, by Shipyard '
+                      'and by each Airship component) must complete. A '
+                      'validation that does not complete in time is '
+                      'reported as an error.')
+            ),
+            cfg.IntOpt(
+                'max_concurrent_validations',
+                default=8,
+                help=('The maximum number of the validations of a revision '
+                      'that are run concurrently.')
+            ),
         ]
     ),
 ]
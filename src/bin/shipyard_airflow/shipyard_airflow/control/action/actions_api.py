@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from datetime import datetime
+from datetime import timedelta
 import logging
 import os
 
+import arrow
+from arrow.parser import ParserError
 import falcon
 import requests
 from requests.exceptions import RequestException
@@ -24,6 +27,8 @@ import ulid
 
 from shipyard_airflow import policy
 from shipyard_airflow.control.helpers.action_helper import (
+    DAG_STATE_MAPPING,
+    determine_dag_states,
     determine_lifecycle,
     format_action_steps
 )
@@ -40,6 +45,10 @@ from shipyard_airflow.errors import ApiError
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+# The number of actions retrieved and correlated at a time when producing a
+# streamed list of actions
+ACTIONS_BATCH_SIZE = 200
+
 
 def _action_mappings():
     # Return dictionary mapping actions to their dags and validators
@@ -111,8 +120,9 @@ class ActionsResource(BaseResource):
         Return actions that have been invoked through shipyard.
         :returns: a json array of action entities
         """
-        resp.body = self.to_json(self.get_all_actions(
-            verbosity=req.context.verbosity)
+        resp.stream = self.to_json_stream(self.iter_all_actions(
+            verbosity=req.context.verbosity,
+            **self.get_action_filters(req))
         )
         resp.status = falcon.HTTP_200
 
@@ -208,22 +218,152 @@ class ActionsResource(BaseResource):
 
         return action
 
-    def get_all_actions(self, verbosity):
-        """Retrieve all actions known to Shipyard
+    def get_action_filters(self, req):
+        """Parse the query parameters used to filter and page the actions
+
+        :param req: the falcon request object
+        :returns: a dictionary of filter values, suitable for use as keyword
+            arguments to iter_all_actions
+        """
+        cursor = req.get_param('cursor')
+        if cursor is not None and len(cursor) != 26:
+            raise ApiError(
+                title='Invalid cursor parameter',
+                description=('If specified, cursor must be the id of an '
+                             'action'),
+                status=falcon.HTTP_400)
+
+        try:
+            limit = req.get_param_as_int('limit', required=False, min=1)
+        except falcon.HTTPBadRequest as hbr:
+            LOG.exception(hbr)
+            raise ApiError(
+                title='Invalid limit parameter',
+                description=('If specified, limit must be an integer value '
+                             'greater than 0'),
+                status=falcon.HTTP_400)
+
+        since = req.get_param('since')
+        if since is not None:
+            try:
+                since = arrow.get(since).to('utc').naive
+            except ParserError as parser_err:
+                LOG.exception(parser_err)
+                raise ApiError(
+                    title='Invalid since parameter',
+                    description=('If specified, since must be an iso8601 '
+                                 'formatted date'),
+                    status=falcon.HTTP_400)
+
+        lifecycle = req.get_param('lifecycle')
+        if lifecycle is not None and not determine_dag_states(lifecycle):
+            raise ApiError(
+                title='Invalid lifecycle parameter',
+                description=(
+                    'If specified, lifecycle must be one of: {}'.format(
+                        ', '.join(sorted(set(DAG_STATE_MAPPING.values()))))),
+                status=falcon.HTTP_400)
+
+        return {
+            'cursor': cursor,
+            'limit': limit,
+            'since': since,
+            'name': req.get_param('name'),
+            'lifecycle': lifecycle
+        }
+
+    def iter_all_actions(self, verbosity, cursor=None, limit=None, since=None,
+                         name=None, lifecycle=None):
+        """Iterate over the actions known to Shipyard, ordered by action id
 
         :param verbosity: Integer 0-5, the level of verbosity applied to the
             response's notes.
-
-        Interacts with airflow and the shipyard database to return the list of
-        actions invoked through shipyard.
+        :param cursor: optional, the id of the last action of a prior page of
+            results. Only actions following this action are returned.
+        :param limit: optional, the maximum number of actions to return
+        :param since: optional, a datetime. Only actions invoked at or after
+            this time are returned.
+        :param name: optional, only actions of this name are returned
+        :param lifecycle: optional, only actions in this lifecycle (e.g.
+            Processing, Complete) are returned
+
+        Interacts with airflow and the shipyard database to produce the
+        actions invoked through shipyard. The actions are retrieved and
+        correlated with their dag runs, steps and notes ACTIONS_BATCH_SIZE
+        actions at a time, so that the memory used does not grow with the
+        size of the history. When filtering by lifecycle, the state of the
+        dag runs is queried for only the actions of each batch.
         """
-        # fetch actions from the shipyard db
-        all_actions = self.get_action_map()
-        # fetch the associated dags, steps from the airflow db
-        all_dag_runs = self.get_dag_run_map()
-        all_tasks = self.get_all_tasks_db()
-
-        notes = notes_helper.get_all_action_notes(verbosity=verbosity)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch_limit = ACTIONS_BATCH_SIZE
+            if remaining is not None:
+                batch_limit = min(batch_limit, remaining)
+            candidates = self.get_actions_db(cursor=cursor,
+                                             limit=batch_limit,
+                                             since=since,
+                                             name=name)
+            if not candidates:
+                return
+            cursor = candidates[-1]['id']
+            batch = candidates
+            if lifecycle is not None:
+                batch = self._filter_by_lifecycle(candidates, lifecycle)
+            actions = self._get_actions(verbosity=verbosity, actions=batch)
+            if remaining is not None:
+                remaining -= len(actions)
+            yield from actions
+            if len(candidates) < batch_limit:
+                return
+
+    def _filter_by_lifecycle(self, actions, lifecycle):
+        """Returns the actions having a dag run state matching the lifecycle
+
+        The lifecycle is derived from the state of the dag run, which is
+        looked up in airflow's data for only the actions supplied. An action
+        having no dag run, or a dag run without a state, is Pending. Such
+        actions cannot be found in airflow's data, so for the lifecycles
+        covering them the actions having a dag run in any other state are
+        excluded instead.
+        """
+        filters = {
+            'lifecycle': lifecycle,
+            'action_ids': [action['id'] for action in actions],
+            'dag_ids': sorted({action['dag_id'] for action in actions
+                               if action.get('dag_id')})
+        }
+        if 'none' in determine_dag_states(lifecycle):
+            excluded = set(self.get_action_ids_not_in_lifecycle_db(**filters))
+            return [action for action in actions
+                    if action['id'] not in excluded]
+        matched = set(self.get_action_ids_by_lifecycle_db(**filters))
+        return [action for action in actions if action['id'] in matched]
+
+    def _get_actions(self, verbosity, actions):
+        """Correlate a batch of actions with their dag runs, steps and notes
+        """
+        all_actions = {action['id']: action for action in actions}
+        if not all_actions:
+            return []
+
+        # fetch the associated dags from the airflow db, limited to the
+        # execution dates of the actions being returned
+        start_date, end_date = self._get_execution_range(
+            all_actions.values())
+        if start_date is None:
+            all_dag_runs = {}
+        else:
+            all_dag_runs = self.get_dag_run_map(start_date=start_date,
+                                                end_date=end_date)
+        # fetch the steps for only the dag runs of the actions being returned
+        all_tasks = self.get_task_map(dag_runs=[
+            (action['dag_id'], action['dag_execution_date'])
+            for action in all_actions.values()
+            if action.get('dag_id') and action.get('dag_execution_date')
+        ])
+
+        notes = notes_helper.get_notes_for_actions(
+            action_ids=list(all_actions), verbosity=verbosity)
         # correlate the actions and dags into a list of action entites
         actions = []
 
@@ -237,15 +377,9 @@ class ActionsResource(BaseResource):
             action['dag_status'] = dag_state
             action['action_lifecycle'] = determine_lifecycle(dag_state)
             # get the steps summary
-            action_tasks = [
-                step for step in all_tasks
-                if step['dag_id'].startswith(dag_key_id) and
-                step['execution_date'].strftime(
-                    '%Y-%m-%dT%H:%M:%S') == dag_key_date
-            ]
             action['steps'] = format_action_steps(
                 action_id=action_id,
-                steps=action_tasks,
+                steps=all_tasks.get((dag_key_id, dag_key_date), []),
                 verbosity=0
             )
             action['notes'] = []
@@ -255,21 +389,61 @@ class ActionsResource(BaseResource):
 
         return actions
 
-    def get_action_map(self):
+    @staticmethod
+    def _get_execution_range(actions):
+        """Determine the range of dag execution dates for the actions
+
+        Execution dates are recorded to the second for actions, so the end of
+        the range is one second past the latest execution date, and should be
+        treated as exclusive.
+        :returns: a tuple of (start date, end date), or (None, None) if none
+            of the actions have a dag execution date
+        """
+        exec_dates = [
+            parse(action['dag_execution_date']) for action in actions
+            if action.get('dag_execution_date')
+        ]
+        if not exec_dates:
+            return None, None
+        return min(exec_dates), max(exec_dates) + timedelta(seconds=1)
+
+    def get_actions_db(self, cursor=None, limit=None, since=None,
+                       name=None):
+        """
+        Wrapper for call to the shipyard database to get actions
+        :returns: a list of dictionaries keyed by action id
+        """
+        return SHIPYARD_DB.get_submitted_actions(cursor=cursor,
+                                                 limit=limit,
+                                                 since=since,
+                                                 name=name)
+
+    def get_action_ids_by_lifecycle_db(self, lifecycle, action_ids, dag_ids):
         """
-        maps an array of dictionaries to a dictonary of the same results by id
-        :returns: a dictionary of dictionaries keyed by action id
+        Wrapper for call to the airflow db to get the ids of the actions,
+        among those specified, having a dag run in a state matching the
+        lifecycle
+        :returns: a list of action ids
         """
-        return {action['id']: action for action in self.get_all_actions_db()}
+        return AIRFLOW_DB.get_run_ids_by_state(
+            states=determine_dag_states(lifecycle),
+            run_ids=action_ids,
+            dag_ids=dag_ids)
 
-    def get_all_actions_db(self):
+    def get_action_ids_not_in_lifecycle_db(self, lifecycle, action_ids,
+                                           dag_ids):
         """
-        Wrapper for call to the shipyard database to get all actions
-        :returns: a list of dictionaries keyed by action id
+        Wrapper for call to the airflow db to get the ids of the actions,
+        among those specified, having a dag run in a state not matching the
+        lifecycle
+        :returns: a list of action ids
         """
-        return SHIPYARD_DB.get_all_submitted_actions()
+        return AIRFLOW_DB.get_run_ids_not_in_state(
+            states=determine_dag_states(lifecycle),
+            run_ids=action_ids,
+            dag_ids=dag_ids)
 
-    def get_dag_run_map(self):
+    def get_dag_run_map(self, start_date, end_date):
         """
         Maps an array of dag runs to a keyed dictionary
         :returns: a dictionary of dictionaries keyed by dag_id and
@@ -278,22 +452,48 @@ class ActionsResource(BaseResource):
         return {
             run['dag_id'] +
             run['execution_date'].strftime('%Y-%m-%dT%H:%M:%S'): run
-            for run in self.get_all_dag_runs_db()
+            for run in self.get_dag_runs_db(start_date=start_date,
+                                            end_date=end_date)
         }
 
-    def get_all_dag_runs_db(self):
+    def get_task_map(self, dag_runs):
+        """
+        Maps an array of tasks to lists of tasks keyed by dag run
+        Tasks of subdags (named parent.child) are included with the tasks of
+        the parent dag run, retaining the order of the tasks retrieved.
+        :param dag_runs: a list of (dag_id, execution_date) tuples
+        :returns: a dictionary of lists of task dictionaries keyed by a tuple
+                  of (dag_id, execution_date)
+        """
+        task_map = {}
+        if not dag_runs:
+            return task_map
+        for task in self.get_tasks_db(dag_runs=dag_runs):
+            task_key = (
+                task['dag_id'].split('.', 1)[0],
+                task['execution_date'].strftime('%Y-%m-%dT%H:%M:%S')
+            )
+            if task_key not in task_map:
+                task_map[task_key] = []
+            task_map[task_key].append(task)
+        return task_map
+
+    def get_dag_runs_db(self, start_date, end_date):
         """
-        Wrapper for call to the airflow db to get all dag runs
+        Wrapper for call to the airflow db to get the dag runs in a range of
+        execution dates
         :returns: a list of dictionaries representing dag runs in airflow
         """
-        return AIRFLOW_DB.get_all_dag_runs()
+        return AIRFLOW_DB.get_dag_runs_by_execution_range(
+            start_date=start_date, end_date=end_date)
 
-    def get_all_tasks_db(self):
+    def get_tasks_db(self, dag_runs):
         """
-        Wrapper for call to the airflow db to get all tasks
+        Wrapper for call to the airflow db to get the tasks for a list of
+        dag runs
         :returns: a list of task dictionaries
         """
-        return AIRFLOW_DB.get_all_tasks()
+        return AIRFLOW_DB.get_tasks_by_dag_runs(dag_runs=dag_runs)
 
     def insert_action(self, action):
         """
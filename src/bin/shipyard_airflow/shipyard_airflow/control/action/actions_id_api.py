@@ -52,7 +52,8 @@ class ActionsIdResource(BaseResource):
             of 1 when retrieving an action (but support more verbosity when
             retreiving the step itself)
         """
-        # get the action from shipyard db
+        # get the action, including its validations and command audit, from
+        # shipyard db
         action = self.get_action_db(action_id=action_id)
         if action is None:
             raise ApiError(
@@ -65,78 +66,47 @@ class ActionsIdResource(BaseResource):
         dag_id = action['dag_id']
         dag_execution_date = action['dag_execution_date']
 
-        dag = self.get_dag_run_by_id(dag_id, dag_execution_date)
-        steps = self.get_tasks_db(dag_id, dag_execution_date)
+        dag, steps = self.get_dag_run_with_tasks_db(dag_id,
+                                                    dag_execution_date)
+        # the notes of the action and of its steps are retrieved together
+        step_verbosity = 0
+        if dag is not None:
+            step_verbosity = MIN_VERBOSITY if (
+                verbosity > MIN_VERBOSITY) else verbosity
+        notes, step_notes = notes_helper.get_action_and_step_notes(
+            action_id=action_id,
+            verbosity=verbosity,
+            step_verbosity=step_verbosity
+        )
         if dag is not None:
             # put the values together into an "action" object
             action['dag_status'] = dag['state']
             action['action_lifecycle'] = determine_lifecycle(dag['state'])
-            step_verbosity = MIN_VERBOSITY if (
-                verbosity > MIN_VERBOSITY) else verbosity
             action['steps'] = format_action_steps(
                 action_id=action_id,
                 steps=steps,
-                verbosity=step_verbosity
+                verbosity=step_verbosity,
+                step_notes=step_notes
             )
-        action['validations'] = self.get_validations_db(action_id)
-        action['command_audit'] = self.get_action_command_audit_db(action_id)
-        notes = notes_helper.get_action_notes(
-            action_id=action_id,
-            verbosity=verbosity
-        )
         action['notes'] = []
         for note in notes:
             action['notes'].append(note.view())
         return action
 
-    def get_dag_run_by_id(self, dag_id, execution_date):
-        """
-        Wrapper for call to the airflow db to get a dag_run
-        :returns: a dag run dictionary
-        """
-        dag_run_list = self.get_dag_run_db(dag_id, execution_date)
-        # should be only one result, return the first one
-        if dag_run_list:
-            return dag_run_list[0]
-        else:
-            return None
-
     def get_action_db(self, action_id):
         """
-        Wrapper for call to the shipyard database to get an action
+        Wrapper for call to the shipyard database to get an action along
+        with its validations and command audit records
         :returns: a dictionary of action details.
         """
-        return SHIPYARD_DB.get_action_by_id(
+        return SHIPYARD_DB.get_action_detail_by_id(
             action_id=action_id)
 
-    def get_validations_db(self, action_id):
+    def get_dag_run_with_tasks_db(self, dag_id, execution_date):
         """
-        Wrapper for call to the shipyard db to get validations associated with
-        an action
-        :returns: an array of dictionaries of validation details.
+        Wrapper for call to the airflow db to get a dag_run and its tasks
+        :returns: a tuple of (dag run dictionary, list of task dictionaries).
+            The dag run is None if it is not found.
         """
-        return SHIPYARD_DB.get_validation_by_action_id(
-            action_id=action_id)
-
-    def get_tasks_db(self, dag_id, execution_date):
-        """
-        Wrapper for call to the airflow db to get all tasks
-        :returns: a list of task dictionaries
-        """
-        return AIRFLOW_DB.get_tasks_by_id(
+        return AIRFLOW_DB.get_dag_run_with_tasks(
             dag_id=dag_id, execution_date=execution_date)
-
-    def get_dag_run_db(self, dag_id, execution_date):
-        """
-        Wrapper for call to the airflow db to get a dag_run
-        :returns: a dag run dictionaries
-        """
-        return AIRFLOW_DB.get_dag_runs_by_id(
-            dag_id=dag_id, execution_date=execution_date)
-
-    def get_action_command_audit_db(self, action_id):
-        """
-        Wrapper for call to the shipyard db to get the history of
-        action command audit records
-        """
-        return SHIPYARD_DB.get_command_audit_by_action_id(action_id)
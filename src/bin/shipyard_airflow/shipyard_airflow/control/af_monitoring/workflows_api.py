@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import logging
+
 import falcon
 from oslo_config import cfg
 
@@ -22,6 +24,7 @@ from shipyard_airflow.control.helpers.workflow_helper import (
 from shipyard_airflow.errors import ApiError
 
 CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
 
 
 class WorkflowResource(BaseResource):
@@ -36,22 +39,75 @@ class WorkflowResource(BaseResource):
         Return actions that have been invoked through shipyard.
         :returns: a json array of workflow entities
         """
-        since_date = req.params.get('since')
         helper = WorkflowHelper(req.context.external_marker)
-        resp.body = self.to_json(
-            self.get_all_workflows(helper=helper, since_date=since_date)
+        resp.stream = self.to_json_stream(
+            self.iter_all_workflows(helper=helper,
+                                    **self.get_workflow_filters(req))
         )
         resp.status = falcon.HTTP_200
 
-    def get_all_workflows(self, helper, since_date=None):
+    def get_workflow_filters(self, req):
+        """Parse the query parameters used to filter and page the workflows
+
+        :param req: the falcon request object
+        :returns: a dictionary of filter values, suitable for use as keyword
+            arguments to get_all_workflows
+        """
+        cursor = req.get_param('cursor')
+        if (cursor is not None and
+                not WorkflowHelper.validate_workflow_cursor(cursor)):
+            raise ApiError(
+                title='Invalid cursor parameter',
+                description=('If specified, cursor must be the id of a '
+                             'workflow, in {dag id}__{execution date} '
+                             'format'),
+                status=falcon.HTTP_400,
+                retry=False)
+
+        try:
+            limit = req.get_param_as_int('limit', required=False, min=1)
+        except falcon.HTTPBadRequest as hbr:
+            LOG.exception(hbr)
+            raise ApiError(
+                title='Invalid limit parameter',
+                description=('If specified, limit must be an integer value '
+                             'greater than 0'),
+                status=falcon.HTTP_400,
+                retry=False)
+
+        return {
+            'since_date': req.get_param('since'),
+            'cursor': cursor,
+            'limit': limit
+        }
+
+    def get_all_workflows(self, helper, since_date=None, cursor=None,
+                          limit=None):
         """
         Retrieve all workflows from airflow that have occurred,
         using the since_date (iso8601) as a boundary.
         :param helper: The WorkflowHelper constructed for this invocation
         :param since_date: a Date string in iso8601 or None
+        :param cursor: optional, the workflow id of the last workflow of a
+            prior page of results
+        :param limit: optional, the maximum number of workflows to return
         :returns: a list of workflow dictionaries
         """
-        return helper.get_workflow_list(since_iso8601=since_date)
+        return helper.get_workflow_list(since_iso8601=since_date,
+                                        cursor=cursor,
+                                        limit=limit)
+
+    def iter_all_workflows(self, helper, since_date=None, cursor=None,
+                           limit=None):
+        """
+        Iterate over all workflows from airflow that have occurred,
+        using the since_date (iso8601) as a boundary.
+        Accepts the same parameters as get_all_workflows.
+        :returns: an iterator of workflow dictionaries
+        """
+        return helper.iter_workflows(since_iso8601=since_date,
+                                     cursor=cursor,
+                                     limit=limit)
 
 
 class WorkflowIdResource(BaseResource):
@@ -31,6 +31,9 @@ from shipyard_airflow.control.af_monitoring.workflows_api import (
 from shipyard_airflow.control.base import BaseResource, ShipyardRequest
 from shipyard_airflow.control.configdocs.configdocs_api import (
     CommitConfigDocsResource,
+    ConfigDocsBatchResource,
+    ConfigDocsDiffResource,
+    ConfigDocsHashResource,
     ConfigDocsResource,
     ConfigDocsStatusResource
 )
@@ -78,6 +81,9 @@ def start_api():
          ActionsValidationsResource()),
         ('/configdocs', ConfigDocsStatusResource()),
         ('/configdocs/{collection_id}', ConfigDocsResource()),
+        ('/configdocs/{collection_id}/diff', ConfigDocsDiffResource()),
+        ('/configdocs/{collection_id}/hash', ConfigDocsHashResource()),
+        ('/batchconfigdocs', ConfigDocsBatchResource()),
         ('/commitconfigdocs', CommitConfigDocsResource()),
         ('/notedetails/{note_id}', NoteDetailsResource()),
         ('/renderedconfigdocs', RenderedConfigDocsResource()),
@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
 import logging
 import uuid
 
@@ -20,11 +19,15 @@ import falcon.request as request
 import falcon.routing as routing
 
 from shipyard_airflow.common.notes.notes import MIN_VERBOSITY
+from shipyard_airflow.control import json_codec
 from shipyard_airflow.control.json_schemas import validate_json
 from shipyard_airflow.errors import InvalidFormatError
 
 LOG = logging.getLogger(__name__)
 
+# The approximate size in bytes of each chunk of a streamed response
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class BaseResource(object):
     """
@@ -60,12 +63,12 @@ class BaseResource(object):
             # read the json and validate if necessary
             try:
                 raw_body = raw_body.decode('utf-8')
-                json_body = json.loads(raw_body)
+                json_body = json_codec.get_codec().loads(raw_body)
                 if validate_json_schema:
                     # rasises an exception if it doesn't validate
                     validate_json(json_body, validate_json_schema)
                 return json_body
-            except json.JSONDecodeError as jex:
+            except json_codec.JSONDecodeError as jex:
                 LOG.error("Invalid JSON in request: %s", raw_body)
                 raise InvalidFormatError(
                     title='JSON could not be decoded',
@@ -84,8 +87,47 @@ class BaseResource(object):
                 return None
 
     def to_json(self, body_dict):
-        """Thin wrapper around json.dumps, providing the default=str config"""
-        return json.dumps(body_dict, default=str)
+        """Encodes the body using the API's json codec. Values that are not
+        natively json serializable are encoded using str()
+        """
+        return json_codec.get_codec().dumps(body_dict)
+
+    def to_json_stream(self, records):
+        """Encodes an iterable of records as a json array, for use as a
+        response stream (resp.stream)
+
+        The records are encoded as they are produced by the iterable, so that
+        neither the full set of records nor the full encoded body need to be
+        held in memory. The first record is retrieved before returning, so
+        that an error producing the records (e.g. accessing a database) is
+        raised while an error response can still be sent.
+        The resulting body is equivalent to to_json(list(records)).
+        """
+        records = iter(records)
+        try:
+            first_record = next(records)
+        except StopIteration:
+            return iter([b'[]'])
+        return self._json_array_chunks(first_record, records)
+
+    @staticmethod
+    def _json_array_chunks(first_record, records):
+        # generates the encoded json array, in chunks of approximately
+        # STREAM_CHUNK_SIZE bytes
+        codec = json_codec.get_codec()
+        chunk = [b'[', codec.dumpb(first_record)]
+        chunk_len = len(chunk[1])
+        for record in records:
+            encoded = codec.dumpb(record)
+            chunk.append(codec.item_separator)
+            chunk.append(encoded)
+            chunk_len += len(encoded)
+            if chunk_len >= STREAM_CHUNK_SIZE:
+                yield b''.join(chunk)
+                chunk = []
+                chunk_len = 0
+        chunk.append(b']')
+        yield b''.join(chunk)
 
 
 class ShipyardRequestContext(object):
@@ -14,6 +14,7 @@
 """
 Resources representing the configdocs API for shipyard
 """
+import collections
 import logging
 
 import falcon
@@ -24,7 +25,10 @@ from shipyard_airflow.control.api_lock import (api_lock, ApiLockType)
 from shipyard_airflow.control.base import BaseResource
 from shipyard_airflow.control.helpers import configdocs_helper
 from shipyard_airflow.control.helpers.configdocs_helper import (
-    ConfigdocsHelper, add_messages_to_validation_status)
+    BufferMode, ConfigdocsHelper, add_messages_to_validation_status)
+from shipyard_airflow.control.helpers.deckhand_client import (
+    DeckhandResponseError)
+from shipyard_airflow.control.helpers.document_stream import ingest_documents
 from shipyard_airflow.errors import ApiError
 
 CONF = cfg.CONF
@@ -52,6 +56,47 @@ class ConfigDocsStatusResource(BaseResource):
         resp.status = falcon.HTTP_200
 
 
+class ConfigDocsDiffResource(BaseResource):
+    """
+    Configdocs Diff handles the retrieval of the documents of a collection
+    that differ between two versions
+    """
+
+    @policy.ApiEnforcer(policy.GET_CONFIGDOCS)
+    def on_get(self, req, resp, collection_id):
+        """Returns the created, modified and deleted documents of a
+        collection
+        """
+        versions = req.params.get('versions') or None
+        helper = ConfigdocsHelper(req.context)
+        resp.body = self.to_json(
+            helper.get_collection_diff(collection_id, versions))
+        resp.status = falcon.HTTP_200
+
+
+class ConfigDocsHashResource(BaseResource):
+    """
+    Configdocs Hash handles the retrieval of the content hash of a
+    collection
+    """
+
+    @policy.ApiEnforcer(policy.GET_CONFIGDOCS)
+    def on_get(self, req, resp, collection_id):
+        """Returns the content hash of a collection in a version"""
+        version = req.params.get('version') or 'buffer'
+        if version not in VERSION_VALUES:
+            raise ApiError(
+                title='Invalid version query parameter specified',
+                description=(
+                    'version must be {}'.format(', '.join(VERSION_VALUES))),
+                status=falcon.HTTP_400,
+                retry=False, )
+        helper = ConfigdocsHelper(req.context)
+        resp.body = self.to_json(
+            helper.get_collection_hash(collection_id, version))
+        resp.status = falcon.HTTP_200
+
+
 class ConfigDocsResource(BaseResource):
     """
     Configdocs handles the creation and retrieval of configuration
@@ -73,18 +118,28 @@ class ConfigDocsResource(BaseResource):
             # Note, a newline in a prior header can trigger subsequent
             # headers to be "missing" (and hence cause this code to think
             # that the content length is missing)
-            content_length = self.validate_content_length(req.content_length)
-            document_data = req.stream.read(content_length)
+            self.validate_content_length(req.content_length)
+            # The documents are parsed as they are read, and spooled to be
+            # sent to Deckhand, rather than read and parsed whole.
+            document_data = ingest_documents(
+                req.bounded_stream,
+                CONF.base.configdocs_spool_size * 1024 * 1024)
 
         buffer_mode = req.get_param('buffermode')
 
         helper = ConfigdocsHelper(req.context)
-        validations = self.post_collection(
-            helper=helper,
-            collection_id=collection_id,
-            document_data=document_data,
-            buffer_mode_param=buffer_mode,
-            empty_collection=empty_coll)
+        try:
+            if not empty_coll:
+                _validate_no_duplicates(document_data)
+            validations = self.post_collection(
+                helper=helper,
+                collection_id=collection_id,
+                document_data=document_data,
+                buffer_mode_param=buffer_mode,
+                empty_collection=empty_coll)
+        finally:
+            if not empty_coll:
+                document_data.close()
 
         resp.status = falcon.HTTP_201
         if validations and validations['status'] == 'Success':
@@ -189,24 +244,8 @@ class ConfigDocsResource(BaseResource):
             LOG.debug('Skipping deployment version document validation')
         else:
             if not self._validate_deployment_version(helper, document_data):
-                title = 'Deployment version document missing from collection'
-                error_msg = ('Expected document to be present with schema: {} '
-                             'and name: {}').format(
-                    DEPLOYMENT_DATA_DOC['schema'],
-                    DEPLOYMENT_DATA_DOC['name'])
-
-                if ver_validation_cfg in ['info', 'warning']:
-                    extra_messages[ver_validation_cfg].append('{}. {}'.format(
-                        title, error_msg))
-                else:  # Error
-                    raise ApiError(
-                        title=title,
-                        description=('Collection rejected due to missing '
-                                     'deployment data document'),
-                        status=falcon.HTTP_400,
-                        error_list=[{'message': error_msg}],
-                        retry=False,
-                    )
+                _deployment_version_missing(ver_validation_cfg,
+                                            extra_messages)
 
         if helper.is_buffer_valid_for_bucket(collection_id, buffer_mode):
             buffer_revision = helper.add_collection(collection_id,
@@ -256,6 +295,213 @@ class ConfigDocsResource(BaseResource):
         return validation_status
 
 
+class ConfigDocsBatchResource(BaseResource):
+    """
+    Configdocs Batch handles the creation of several collections of
+    configuration documents in Shipyard with a single request
+    """
+
+    @policy.ApiEnforcer(policy.CREATE_CONFIGDOCS)
+    @api_lock(ApiLockType.CONFIGDOCS_UPDATE)
+    def on_post(self, req, resp):
+        """
+        Ingests several collections of documents
+
+        The body is the documents of each collection, one collection after
+        the other, as named (in order) with their lengths in bytes by the
+        collections query parameter, e.g. collections=design:1024,secrets:512
+        """
+        lengths = self._parse_collections(req.get_param_as_list('collections'))
+        if (req.content_length or 0) != sum(lengths.values()):
+            raise ApiError(
+                title='Content-Length does not match collections',
+                description=('The Content-Length must be the total of the '
+                             'lengths of the collections'),
+                status=falcon.HTTP_400,
+                retry=False, )
+        buffer_mode = req.get_param('buffermode')
+
+        ingested = []
+        try:
+            for collection_id, length in lengths.items():
+                document_data = ingest_documents(
+                    req.bounded_stream,
+                    CONF.base.configdocs_spool_size * 1024 * 1024,
+                    length)
+                ingested.append((collection_id, document_data))
+                if len(document_data) != length:
+                    raise ApiError(
+                        title='Incomplete collection',
+                        description=('Collection {} is shorter than its '
+                                     'length'.format(collection_id)),
+                        status=falcon.HTTP_400,
+                        retry=False, )
+                _validate_no_duplicates(document_data, collection_id)
+
+            helper = ConfigdocsHelper(req.context)
+            validations = self.post_collections(
+                helper=helper,
+                collections=ingested,
+                buffer_mode_param=buffer_mode)
+        finally:
+            for _, document_data in ingested:
+                document_data.close()
+
+        resp.status = falcon.HTTP_201
+        if validations and validations['status'] == 'Success':
+            validations['code'] = resp.status
+        resp.body = self.to_json(validations)
+
+    def _parse_collections(self, collections_param):
+        """Returns the lengths of the collections, keyed by name (in order),
+        from the values of the collections query parameter
+        """
+        lengths = collections.OrderedDict()
+        for value in collections_param or []:
+            collection_id, _, length = value.rpartition(':')
+            try:
+                length = int(length)
+            except ValueError:
+                length = 0
+            if not collection_id or length < 1:
+                raise ApiError(
+                    title='Invalid collections query parameter specified',
+                    description=('Each collection must be specified as '
+                                 '<collection>:<length in bytes>, with a '
+                                 'length greater than 0: {}'.format(value)),
+                    status=falcon.HTTP_400,
+                    retry=False, )
+            if collection_id in lengths:
+                raise ApiError(
+                    title='Invalid collections query parameter specified',
+                    description=('Collection {} is specified more than '
+                                 'once'.format(collection_id)),
+                    status=falcon.HTTP_400,
+                    retry=False, )
+            lengths[collection_id] = length
+        if not lengths:
+            raise ApiError(
+                title='Invalid collections query parameter specified',
+                description='At least one collection must be specified',
+                status=falcon.HTTP_400,
+                retry=False, )
+        return lengths
+
+    def post_collections(self, helper, collections, buffer_mode_param=None):
+        """Ingest the collections after checking preconditions
+
+        The buffer mode applies to the batch as a whole, and the deployment
+        version document is expected in one of the collections. If any
+        collection cannot be added, the buffer is rolled back to the revision
+        preceding the batch, unless none of the collections added so far
+        created a revision. The buffer is validated once, after all the
+        collections are added.
+        The revision preceding the batch is read from Deckhand, under the
+        API lock, so that a rollback never discards the writes of another
+        process.
+        """
+        extra_messages = {'warning': [], 'info': []}
+        collection_ids = [collection_id for collection_id, _ in collections]
+        buffer_mode = ConfigdocsHelper.get_buffer_mode(buffer_mode_param)
+        if buffer_mode is None:
+            raise ApiError(
+                title='Invalid buffermode query parameter specified',
+                description='Buffermode : {}'.format(buffer_mode_param),
+                status=falcon.HTTP_400,
+                retry=False, )
+
+        ver_validation_cfg = CONF.validations.deployment_version_create.lower()
+        if ver_validation_cfg == 'skip':
+            LOG.debug('Skipping deployment version document validation')
+        elif not any(helper.check_for_document(document_data,
+                                               DEPLOYMENT_DATA_DOC['name'],
+                                               DEPLOYMENT_DATA_DOC['schema'])
+                     for _, document_data in collections):
+            _deployment_version_missing(ver_validation_cfg, extra_messages)
+
+        previous_revision_id = _get_latest_revision_id(helper.deckhand)
+        # Replacing the buffer rolls it back once, for all the collections
+        if buffer_mode == BufferMode.REPLACE:
+            valid = helper.is_buffer_valid_for_bucket(collection_ids[0],
+                                                      buffer_mode)
+        else:
+            valid = all(
+                helper.is_buffer_valid_for_bucket(collection_id, buffer_mode)
+                for collection_id in collection_ids)
+        if not valid:
+            raise ApiError(
+                title='Invalid collections specified for buffer',
+                description='Buffermode : {}'.format(buffer_mode.value),
+                status=falcon.HTTP_409,
+                error_list=[{
+                    'message': ('Buffer is either not empty or a '
+                                'collection already exists in buffer. '
+                                'Setting a different buffermode may '
+                                'provide the desired functionality')
+                }],
+                retry=False,
+            )
+
+        # The latest revision before the collections are added. Replacing
+        # the buffer creates a revision, which is kept even if the
+        # collections are not added.
+        if buffer_mode == BufferMode.REPLACE:
+            last_revision_id = _get_latest_revision_id(helper.deckhand)
+        else:
+            last_revision_id = previous_revision_id
+        buffer_revision = None
+        unchanged = []
+        try:
+            for collection_id, document_data in collections:
+                revision_id = helper.add_collection(collection_id,
+                                                    document_data)
+                # Deckhand creates no revision for a collection that is
+                # unchanged
+                if revision_id is None or revision_id <= last_revision_id:
+                    unchanged.append(collection_id)
+                else:
+                    buffer_revision = last_revision_id = revision_id
+        except Exception:
+            if buffer_revision is not None:
+                LOG.info('Rolling back the buffer to revision %s, as the '
+                         'batch of collections was not added',
+                         previous_revision_id)
+                try:
+                    helper.deckhand.rollback(previous_revision_id)
+                except Exception:
+                    LOG.exception('Unable to roll back the buffer to '
+                                  'revision %s', previous_revision_id)
+            raise
+
+        if buffer_revision is None:
+            raise ApiError(
+                title='Collections not added to Shipyard buffer',
+                description='Collections created no new revision',
+                status=falcon.HTTP_400,
+                error_list=[{
+                    'message':
+                    ('The collections {} added no new revision, and have '
+                     'been rejected as invalid input. This likely means '
+                     'that the collections already exist and were '
+                     'reloaded with the same contents'.format(
+                         ', '.join(collection_ids)))
+                }],
+                retry=False,
+            )
+
+        for collection_id in unchanged:
+            extra_messages['info'].append(
+                'Collection {} is unchanged'.format(collection_id))
+        validation_status = helper.get_deckhand_validation_status(
+            buffer_revision)
+        for level, messages in extra_messages.items():
+            if len(messages):
+                add_messages_to_validation_status(validation_status,
+                                                  messages,
+                                                  level)
+        return validation_status
+
+
 class CommitConfigDocsResource(BaseResource):
     """
     Commits the buffered configdocs, if the validations pass (or are
@@ -275,14 +521,18 @@ class CommitConfigDocsResource(BaseResource):
         # force and dryrun query parameter is False unless explicitly true
         force = req.get_param_as_bool(name='force') or False
         dryrun = req.get_param_as_bool(name='dryrun') or False
+        refresh = (req.get_param_as_bool(name='refresh-validations') or
+                   False)
         helper = ConfigdocsHelper(req.context)
-        validations = self.commit_configdocs(helper, force, dryrun)
+        validations = self.commit_configdocs(helper, force, dryrun, refresh)
         resp.body = self.to_json(validations)
         resp.status = validations.get('code', falcon.HTTP_200)
 
-    def commit_configdocs(self, helper, force, dryrun):
+    def commit_configdocs(self, helper, force, dryrun, refresh=False):
         """
         Attempts to commit the configdocs
+        If refresh is True, the stored results of earlier validations of the
+        buffer revision are not used.
         """
         if helper.is_buffer_empty():
             raise ApiError(
@@ -291,7 +541,8 @@ class CommitConfigDocsResource(BaseResource):
                 status=falcon.HTTP_409,
                 retry=True)
         validations = helper.get_validations_for_revision(
-            helper.get_revision_id(configdocs_helper.BUFFER)
+            helper.get_revision_id(configdocs_helper.BUFFER),
+            refresh=refresh
         )
         if dryrun:
             validations['code'] = falcon.HTTP_200
@@ -312,3 +563,65 @@ class CommitConfigDocsResource(BaseResource):
                 else:
                     validations['message'] = 'FORCED SUCCESS'
         return validations
+
+
+def _validate_no_duplicates(document_data, collection_id=None):
+    """Validates that no document occurs more than once in the received
+    documents (of a collection)
+    """
+    if document_data.duplicates:
+        in_collection = (' in collection {}'.format(collection_id)
+                         if collection_id else '')
+        raise ApiError(
+            title='Duplicate documents in collection',
+            description=('Collection rejected due to documents with the '
+                         'same schema and name'),
+            status=falcon.HTTP_400,
+            error_list=[{
+                'message': ('Document with schema: {} and name: {} '
+                            'occurs more than once{}').format(
+                                schema, name, in_collection)
+            } for name, schema in document_data.duplicates],
+            retry=False,
+        )
+
+
+def _deployment_version_missing(ver_validation_cfg, extra_messages):
+    """Handles a missing deployment version document, by adding a message
+    at the configured level to the extra messages, or raising an error
+    """
+    title = 'Deployment version document missing from collection'
+    error_msg = ('Expected document to be present with schema: {} '
+                 'and name: {}').format(DEPLOYMENT_DATA_DOC['schema'],
+                                        DEPLOYMENT_DATA_DOC['name'])
+
+    if ver_validation_cfg in ['info', 'warning']:
+        extra_messages[ver_validation_cfg].append('{}. {}'.format(
+            title, error_msg))
+    else:  # Error
+        raise ApiError(
+            title=title,
+            description=('Collection rejected due to missing '
+                         'deployment data document'),
+            status=falcon.HTTP_400,
+            error_list=[{'message': error_msg}],
+            retry=False,
+        )
+
+
+def _get_latest_revision_id(deckhand):
+    """Returns the id of the latest Deckhand revision, or 0 if there are none
+
+    The revisions are read from Deckhand, not from the revision index cache,
+    which may not reflect the changes made by other processes.
+    """
+    try:
+        return deckhand.get_latest_rev_id()
+    except DeckhandResponseError as drex:
+        raise ApiError(
+            title='Unable to retrieve revisions',
+            description=(
+                'Deckhand has responded unexpectedly: {}:{}'.format(
+                    drex.status_code, drex.response_message)),
+            status=falcon.HTTP_500,
+            retry=False, )
@@ -52,10 +52,19 @@ class RenderedConfigDocsResource(BaseResource):
             policy.check_auth(req.context,
                               policy.GET_RENDEREDCONFIGDOCS_CLRTXT)
 
-        resp.body = self.get_rendered_configdocs(
+        # The rendered documents of a revision do not change, so a client
+        # holding the documents with this entity tag need not receive them.
+        resp.etag = helper.get_rendered_configdocs_etag(
+            version=version, cleartext_secrets=cleartext_secrets)
+        if _etag_matches(req.if_none_match, resp.etag):
+            resp.status = falcon.HTTP_304
+            return
+
+        resp.stream = self.get_rendered_configdocs(
             helper=helper,
             version=version,
-            cleartext_secrets=cleartext_secrets
+            cleartext_secrets=cleartext_secrets,
+            stream=True
         )
         resp.append_header('Content-Type', 'application/x-yaml')
         resp.status = falcon.HTTP_200
@@ -73,8 +82,27 @@ class RenderedConfigDocsResource(BaseResource):
             )
 
     def get_rendered_configdocs(self, helper, version='buffer',
-                                cleartext_secrets=False):
+                                cleartext_secrets=False, stream=False):
         """
         Get and return the rendered configdocs from the helper/Deckhand
         """
-        return helper.get_rendered_configdocs(version, cleartext_secrets)
+        return helper.get_rendered_configdocs(version, cleartext_secrets,
+                                              stream=stream)
+
+
+def _etag_matches(if_none_match, etag):
+    """Indicates if the entity tag matches the If-None-Match header value
+
+    Uses the weak comparison required for If-None-Match (RFC 7232)
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
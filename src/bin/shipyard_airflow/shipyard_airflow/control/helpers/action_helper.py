@@ -54,21 +54,41 @@ def determine_lifecycle(dag_status=None):
     return lifecycle
 
 
-def format_action_steps(action_id, steps, verbosity=MIN_VERBOSITY):
+def determine_dag_states(lifecycle):
+    """ Convert an action_lifecycle value to the dag_status values it covers
+
+    The dag_status values are returned in lowercase, matching the values
+    recorded by Airflow. An empty list is returned if the lifecycle is not
+    known.
+    """
+    return [
+        dag_status.lower()
+        for dag_status, dag_lifecycle in DAG_STATE_MAPPING.items()
+        if dag_lifecycle.lower() == lifecycle.lower()
+    ]
+
+
+def format_action_steps(action_id, steps, verbosity=MIN_VERBOSITY,
+                        step_notes=None):
     """ Converts a list of action step db records to desired format
 
     :param action_id: the action containing steps
     :param steps: the list of dictionaries of step info, in database format
     :param verbosity: the verbosity level of notes to retrieve, defaults to 1.
         if set to a value less than 1, notes will not be retrieved.
+    :param step_notes: optional, the notes of the steps already retrieved, in
+        a dict of lists keyed by step name. If specified, notes are not
+        retrieved.
     """
     if not steps:
         return []
     steps_response = []
-    step_notes_dict = notes_helper.get_all_step_notes_for_action(
-        action_id=action_id,
-        verbosity=verbosity
-    )
+    step_notes_dict = step_notes
+    if step_notes_dict is None:
+        step_notes_dict = notes_helper.get_all_step_notes_for_action(
+            action_id=action_id,
+            verbosity=verbosity
+        )
     for idx, step in enumerate(steps):
         step_task_id = step.get('task_id')
         steps_response.append(
@@ -393,5 +413,5 @@ class ActionsHelper(object):
         Wrapper for call to the airflow db to get all tasks for a dag run
         :returns: a list of task dictionaries
         """
-        return AIRFLOW_DB.get_tasks_by_id(
-            dag_id=dag_id, execution_date=execution_date)
+        return AIRFLOW_DB.get_tasks_by_dag_runs(
+            dag_runs=[(dag_id, execution_date)])
@@ -17,13 +17,12 @@ Deckhand, providing a representation of a buffer and a committed
 bucket for Shipyard
 """
 import enum
+import functools
 import logging
-import threading
 import yaml
 
 import falcon
 from oslo_config import cfg
-import requests
 
 from shipyard_airflow.common.document_validators.document_validator_manager \
     import DocumentValidationManager
@@ -33,10 +32,22 @@ from shipyard_airflow.control.helpers.design_reference_helper import \
 from shipyard_airflow.control.helpers.deckhand_client import (
     DeckhandClient, DeckhandError, DeckhandRejectedInputError,
     DeckhandResponseError, DocumentExistsElsewhereError, NoRevisionsExistError)
+from shipyard_airflow.control.helpers.document_hash_cache import (
+    DOCUMENT_HASHES, collection_hash, document_hashes, document_key)
+from shipyard_airflow.control.helpers.document_stream import (
+    IngestedDocuments)
+from shipyard_airflow.control.helpers.http_session import HTTP_SESSIONS
+from shipyard_airflow.control.helpers.rendered_docs_cache import (
+    RENDERED_DOCS)
+from shipyard_airflow.control.helpers.revision_index_cache import (
+    REVISION_INDEX)
+from shipyard_airflow.control.helpers.validation_fanout import (
+    ValidationFanout, ValidationResult)
 from shipyard_airflow.control.service_endpoints import (
     Endpoints, get_endpoint, get_token)
 from shipyard_airflow.control.validators.validate_deployment_configuration \
     import ValidateDeploymentConfigurationFull
+from shipyard_airflow.db.db import SHIPYARD_DB
 from shipyard_airflow.errors import ApiError, AppError
 
 CONF = cfg.CONF
@@ -46,6 +57,7 @@ LOG = logging.getLogger(__name__)
 # buffer, site-action-success and site-action-failure.
 BUFFER = 'buffer'
 COMMITTED = 'committed'
+INTERMEDIATE_COMMIT = 'intermediate_commit'
 LAST_SITE_ACTION = 'last_site_action'
 LATEST = 'latest'
 REVISION_COUNT = 'count'
@@ -56,6 +68,15 @@ SUCCESSFUL_SITE_ACTION = 'successful_site_action'
 # string for rollback_commit consistency
 ROLLBACK_COMMIT = 'rollback_commit'
 
+# names of the validations run for a revision, other than those by the
+# Airship components
+DECKHAND_RENDERING = 'Deckhand rendering'
+DECKHAND_VALIDATIONS = 'Deckhand'
+SHIPYARD_VALIDATIONS = 'Shipyard'
+
+# The name of the shared HTTP session used to invoke component validations
+VALIDATION_SESSION_NAME = 'validation'
+
 
 class BufferMode(enum.Enum):
     """Enumeration of the valid values for BufferMode"""
@@ -194,7 +215,11 @@ class ConfigdocsHelper(object):
     def get_doc_names_and_schemas(self, document_data):
         """Given the document_data shipyard receives, return a list of tuples
         denoting each documents' name and schema (name, schema)
+        document_data may be IngestedDocuments, for which the names and
+        schemas have been found as the documents were read.
         """
+        if isinstance(document_data, IngestedDocuments):
+            return document_data.names_and_schemas
         parsed_docs = self.parse_received_doc_data(document_data)
         names_and_schemas = []
 
@@ -283,11 +308,132 @@ class ConfigdocsHelper(object):
 
         return configdocs_status
 
+    def get_collection_diff(self, collection_id, versions=None):
+        """
+        :param collection_id: The collection to compare
+        :param versions: A list of 2 versions. Defaults to buffer and
+                         commmitted if None.
+
+        Returns the documents of the collection that differ between the
+        versions, identified by schema and name. Documents created or
+        modified in the newer version are included in full, deleted
+        documents by schema and name only. Unmodified documents are omitted.
+        """
+        ordered_versions = self._get_ordered_versions(versions)
+        old_version_name, new_version_name, old_version_id, new_version_id = (
+            self._get_versions_name_id(ordered_versions))
+
+        old_hashes = self._get_document_hashes(old_version_id, collection_id)
+        new_hashes = DOCUMENT_HASHES.get(new_version_id, collection_id)
+        new_docs = {}
+        if new_hashes is None or _changed_document_keys(old_hashes,
+                                                        new_hashes):
+            # The content of created and modified documents is returned, so
+            # the documents of the newer version are needed.
+            for doc in self._get_revision_collection(new_version_id,
+                                                     collection_id):
+                new_docs[document_key(doc)] = doc
+            new_hashes = document_hashes(new_docs.values())
+            self._cache_document_hashes(new_version_id, collection_id,
+                                        new_hashes)
+
+        documents = []
+        for key in sorted(set(old_hashes) | set(new_hashes)):
+            schema, name = key
+            if key not in new_hashes:
+                documents.append({
+                    'schema': schema, 'name': name, 'status': 'deleted'})
+            elif key not in old_hashes:
+                documents.append({
+                    'schema': schema, 'name': name, 'status': 'created',
+                    'document': new_docs[key]})
+            elif old_hashes[key] != new_hashes[key]:
+                documents.append({
+                    'schema': schema, 'name': name, 'status': 'modified',
+                    'document': new_docs[key]})
+
+        return {
+            'collection_name': collection_id,
+            'base_version': old_version_name,
+            'base_revision': old_version_id,
+            'new_version': new_version_name,
+            'new_revision': new_version_id,
+            'documents': documents
+        }
+
+    def get_collection_hash(self, collection_id, version=BUFFER):
+        """
+        :param collection_id: The collection to hash
+        :param version: buffer, committed, last_site_action or
+                        successful_site_action. Defaults to buffer.
+
+        Returns the content hash of a collection, for clients to find if
+        their copy of the collection differs from Shipyard's without
+        uploading it. If there is no buffer, the buffer version is the
+        committed version, being the documents a new buffer starts from. A
+        collection not in the version has the hash of no documents.
+        """
+        revision_id = self.get_revision_id(version)
+        if revision_id is None:
+            if version in [LAST_SITE_ACTION, SUCCESSFUL_SITE_ACTION]:
+                raise ApiError(
+                    title='Version does not exist',
+                    description='{} version does not exist'.format(version),
+                    status=falcon.HTTP_404,
+                    retry=False)
+            if version == BUFFER:
+                revision_id = self.get_revision_id(COMMITTED)
+        revision_id = revision_id or 0
+        hashes = self._get_document_hashes(revision_id, collection_id)
+        return {
+            'collection_name': collection_id,
+            'version': version,
+            'revision_id': revision_id,
+            'document_count': len(hashes),
+            'hash': collection_hash(hashes)
+        }
+
+    def _get_document_hashes(self, revision_id, collection_id):
+        """Returns the content hashes of the documents of a collection in a
+        revision, keyed by (schema, name)
+        """
+        hashes = DOCUMENT_HASHES.get(revision_id, collection_id)
+        if hashes is None:
+            hashes = document_hashes(
+                self._get_revision_collection(revision_id, collection_id))
+            self._cache_document_hashes(revision_id, collection_id, hashes)
+        return hashes
+
+    def _cache_document_hashes(self, revision_id, collection_id, hashes):
+        # Revision 0 stands in for a revision that does not exist
+        if revision_id:
+            DOCUMENT_HASHES.put(revision_id, collection_id, hashes,
+                                CONF.deckhand.document_hash_cache_size)
+
+    def _get_revision_collection(self, revision_id, collection_id):
+        """Returns the parsed documents of a collection in a revision"""
+        if not revision_id:
+            return []
+        LOG.debug('Retrieving collection %s of revision %s for comparison',
+                  collection_id, revision_id)
+        try:
+            docs = self.deckhand.get_docs_from_revision(
+                revision_id=revision_id, bucket_id=collection_id)
+        except DeckhandResponseError as drex:
+            raise AppError(
+                title='Unable to retrieve documents',
+                description=(
+                    'Deckhand has responded unexpectedly: {}:{}'.format(
+                        drex.status_code, drex.response_message)),
+                status=falcon.HTTP_500,
+                retry=False, )
+        return [doc for doc in yaml.safe_load_all(docs) if doc]
+
     def _get_revision_dict(self):
         """Returns a dictionary with values representing the revisions in
         Deckhand that Shipyard cares about - committed, buffer, latest,
         last_site_action and successful_site_action, as well as a count
-        of revisions.
+        of revisions and the result of the intermediate commit check.
         Committed and buffer are revisions associated with the
         shipyard tags. If either of those are not present in deckhand,
         returns None for the value.
@@ -296,17 +442,59 @@ class ConfigdocsHelper(object):
         recent site action
         Successful site action holds the revision information for the
         most recent successfully executed site action.
+        The dictionary is shared through the process wide revision index
+        cache, and must not be modified.
         """
         # return the cached instance version of the revision dict.
         if self.revision_dict is not None:
             return self.revision_dict
-        # or generate one for the cache
+        # use the process wide revision index, checking that it is current
+        # or loading it if needed
+        self.revision_dict = REVISION_INDEX.get_or_load(
+            self._load_revision_dict,
+            ttl=CONF.deckhand.revision_cache_ttl,
+            is_current=self._is_revision_index_current)
+        return self.revision_dict
+
+    def _is_revision_index_current(self, revision_dict):
+        """Checks a cached revision dict against Deckhand
+
+        The revisions that may have changed since the revision dict was
+        loaded (by this or another process) are retrieved individually: the
+        latest and committed revisions must still exist with the same tags,
+        and there must be no revision following the latest.
+        """
+        latest = revision_dict[LATEST]
+        if latest is None:
+            # there were no revisions; reloading is as cheap as checking
+            return False
+        try:
+            for revision in (latest, revision_dict[COMMITTED]):
+                if revision is None:
+                    continue
+                current = self.deckhand.get_revision(revision['id'])
+                if (current is None or set(current.get('tags', [])) !=
+                        set(revision.get('tags', []))):
+                    return False
+            return self.deckhand.get_revision(latest['id'] + 1) is None
+        except DeckhandResponseError as drex:
+            LOG.warning('Unable to check the cached revision index against '
+                        'Deckhand, reloading: %s:%s', drex.status_code,
+                        drex.response_message)
+            return False
+
+    def _load_revision_dict(self):
+        """Generates the revision dict from the list of Deckhand revisions
+
+        A single pass is made over the revisions, newest first.
+        """
         committed_revision = None
         buffer_revision = None
         last_site_action = None
         latest_revision = None
         revision_count = 0
         successful_site_action = None
+        intermediate_commit = False
         try:
             revisions = self.deckhand.get_revision_list()
             revision_count = len(revisions)
@@ -314,6 +502,9 @@ class ConfigdocsHelper(object):
                 # Retrieve latest revision
                 latest_revision = revisions[-1]
 
+                # the number of revisions tagged committed seen so far
+                committed_seen = 0
+
                 # Get required revision
                 for revision in reversed(revisions):
                     tags = revision.get('tags', [])
@@ -342,6 +533,16 @@ class ConfigdocsHelper(object):
                             SITE_ACTION_FAILURE in tags)):
                         last_site_action = revision
 
+                    # An intermediate commit is indicated by the second
+                    # most recent committed revision having no site action
+                    # executed against it.
+                    if COMMITTED in tags:
+                        committed_seen += 1
+                        if committed_seen == 2:
+                            intermediate_commit = (
+                                SITE_ACTION_SUCCESS not in tags and
+                                SITE_ACTION_FAILURE not in tags)
+
         except NoRevisionsExistError:
             # the values of None/None/None/0 are fine
             pass
@@ -354,15 +555,15 @@ class ConfigdocsHelper(object):
                         drex.status_code, drex.response_message)),
                 status=falcon.HTTP_500,
                 retry=False)
-        self.revision_dict = {
+        return {
             BUFFER: buffer_revision,
             COMMITTED: committed_revision,
+            INTERMEDIATE_COMMIT: intermediate_commit,
             LAST_SITE_ACTION: last_site_action,
             LATEST: latest_revision,
             REVISION_COUNT: revision_count,
             SUCCESSFUL_SITE_ACTION: successful_site_action
         }
-        return self.revision_dict
 
     def _get_revision(self, target_revision):
         """Helper to drill down to the target revision"""
@@ -427,11 +628,62 @@ class ConfigdocsHelper(object):
             status=falcon.HTTP_404,
             retry=False)
 
-    def get_rendered_configdocs(self, version=BUFFER, cleartext_secrets=False):
+    def get_rendered_configdocs(self, version=BUFFER, cleartext_secrets=False,
+                                stream=False):
         """Returns the rendered configuration documents for the specified
         revision (by name BUFFER, COMMITTED, LAST_SITE_ACTION,
         SUCCESSFUL_SITE_ACTION)
+        If stream is True, an iterator of the chunks (bytes) of the documents
+        is returned, see DeckhandClient.get_rendered_docs_from_revision
+        Rendered documents with redacted secrets are cached by revision, see
+        RenderedDocsCache.
         """
+        revision_id = self._get_rendered_revision_id(version)
+        if not cleartext_secrets:
+            cached = RENDERED_DOCS.get(revision_id)
+            if cached is not None:
+                LOG.debug('Using cached rendered documents of revision %s',
+                          revision_id)
+                return iter([cached]) if stream else cached.decode('utf-8')
+
+        try:
+            rendered = self.deckhand.get_rendered_docs_from_revision(
+                cleartext_secrets=cleartext_secrets,
+                revision_id=revision_id,
+                stream=stream)
+        except DeckhandError as de:
+            raise ApiError(
+                title='Deckhand indicated an error while rendering',
+                description=de.response_message,
+                status=falcon.HTTP_500,
+                retry=False)
+
+        if cleartext_secrets:
+            # Never cached
+            return rendered
+        max_bytes = CONF.deckhand.rendered_docs_cache_size * 1024 * 1024
+        if stream:
+            return RENDERED_DOCS.caching_iter(revision_id, rendered,
+                                              max_bytes)
+        RENDERED_DOCS.put(revision_id, rendered.encode('utf-8'), max_bytes)
+        return rendered
+
+    def get_rendered_configdocs_etag(self, version=BUFFER,
+                                     cleartext_secrets=False):
+        """Returns the entity tag of the rendered configuration documents for
+        the specified revision (by name)
+
+        Revisions are immutable, so the rendered documents of a revision are
+        identified by the revision id and whether secrets are redacted. The
+        revision id is checked against Deckhand, so that a client is never
+        told that an out of date copy is current.
+        """
+        revision_id = self._get_rendered_revision_id(version)
+        return '"{}-{}"'.format(
+            revision_id, 'cleartext' if cleartext_secrets else 'redacted')
+
+    def _get_rendered_revision_id(self, version):
+        """Returns the id of the revision (by name) to render"""
         revision_dict = self._get_revision_dict()
 
         # Raise Exceptions if we received unexpected version
@@ -444,109 +696,172 @@ class ConfigdocsHelper(object):
                 retry=False)
 
         if revision_dict.get(version):
-            revision_id = revision_dict.get(version).get('id')
+            return revision_dict.get(version).get('id')
 
-            try:
-                return self.deckhand.get_rendered_docs_from_revision(
-                    cleartext_secrets=cleartext_secrets,
-                    revision_id=revision_id)
-            except DeckhandError as de:
-                raise ApiError(
-                    title='Deckhand indicated an error while rendering',
-                    description=de.response_message,
-                    status=falcon.HTTP_500,
-                    retry=False)
+        raise ApiError(
+            title='This revision does not exist',
+            description='{} version does not exist'.format(version),
+            status=falcon.HTTP_404,
+            retry=False)
 
-        else:
-            raise ApiError(
-                title='This revision does not exist',
-                description='{} version does not exist'.format(version),
-                status=falcon.HTTP_404,
-                retry=False)
+    def _add_component_validations(self, fanout, revision_id, refresh):
+        """Adds the validations by the other Airship components to the fanout
 
-    def _get_validations_from_ucp_components(self, revision_id):
-        """Invoke other Airship components to retrieve their validations"""
-        resp_msgs = []
-        error_count = 0
+        Unless refresh is True, the stored result of a component's earlier
+        validation of the revision is used instead of invoking the component
+        again. Revisions are immutable, so the result remains valid.
+        Returns the names of the component validations, and the stored
+        results used (as ValidationResults) by name.
+        """
         design_ref = DesignRefHelper().get_design_reference(revision_id)
+        stored = ({} if refresh else
+                  self._get_stored_validation_results(revision_id))
+        names = []
+        stored_results = {}
+        for endpoint in _get_validation_endpoints():
+            name = endpoint['name']
+            url = endpoint['url']
+            names.append(name)
+            if (name, url) in stored:
+                LOG.info('Using the stored result of the validation of '
+                         'revision %s by %s', revision_id, name)
+                stored_results[name] = ValidationResult(
+                    name, value=stored[(name, url)])
+                continue
+            fanout.add(
+                name,
+                _get_validations_for_component,
+                url=url,
+                design_reference=design_ref,
+                context_marker=self.ctx.external_marker,
+                thread_name=name,
+                on_response=functools.partial(
+                    self._store_validation_result, revision_id, name, url),
+                log_extra={
+                    'req_id': self.ctx.request_id,
+                    'external_ctx': self.ctx.external_marker,
+                    'user': self.ctx.user
+                })
+        return names, stored_results
+
+    def _get_stored_validation_results(self, revision_id):
+        """Returns the stored results of the component validations of the
+        revision, keyed by (validator name, endpoint)
+
+        A failure to retrieve the results is logged, and no results are
+        returned, so that the components are invoked.
+        """
+        try:
+            return {
+                (result['validator'], result['endpoint']): result['result']
+                for result in self._get_validation_results_db(revision_id)
+            }
+        except Exception:
+            LOG.exception('Unable to retrieve the stored validation results '
+                          'for revision %s', revision_id)
+            return {}
 
-        validation_threads = _get_validation_threads(
-            _get_validation_endpoints(), self.ctx, design_ref)
-        # trigger each validation in parallel
-        for validation_thread in validation_threads:
-            if validation_thread.get('thread'):
-                validation_thread.get('thread').start()
-        # wait for all validations to return
-        for validation_thread in validation_threads:
-            validation_thread.get('thread').join()
-
-        # check on the response, extract the validations
-        for validation_thread in validation_threads:
-            th_name = validation_thread.get('name')
-            val_response = validation_thread.get('response',
-                                                 {}).get('response')
-            LOG.debug("Validation from:  %s response: %s", th_name,
-                      str(val_response))
-            if validation_thread.get('exception', {}).get('exception'):
-                LOG.error('Invocation of validation by %s has failed', th_name)
-            # invalid status needs collection of messages
-            # valid status means that it passed. No messages to collect
-            if val_response.get('details') is None:
-                msg_list = [{'message': str(val_response), 'error': True}]
-            else:
-                msg_list = val_response.get('details').get('messageList', [])
-            for msg in msg_list:
-                # Count errors, convert message to ValidationMessage
-                default_level = 'Info'
-                if msg.get('error'):
-                    error_count = error_count + 1
-                    default_level = 'Error'
-                val_msg = _generate_validation_message(
-                    msg, level=default_level, source=th_name
-                )
-                resp_msgs.append(val_msg)
-        return (error_count, resp_msgs)
-
-    def get_validations_for_revision(self, revision_id):
+    def _store_validation_result(self, revision_id, validator, endpoint,
+                                 result):
+        """Stores the result of a component's validation of a revision
+
+        A failure to store the result is logged, and otherwise ignored.
+        """
+        try:
+            self._insert_validation_result_db(revision_id, validator,
+                                              endpoint, result)
+        except Exception:
+            LOG.exception('Unable to store the result of the validation of '
+                          'revision %s by %s', revision_id, validator)
+
+    def _get_validation_results_db(self, revision_id):
+        """Wrapper for retrieving the stored validation results"""
+        return SHIPYARD_DB.get_validation_results(revision_id)
+
+    def _insert_validation_result_db(self, revision_id, validator, endpoint,
+                                     result):
+        """Wrapper for storing a validation result"""
+        SHIPYARD_DB.insert_validation_result(revision_id, validator,
+                                             endpoint, result)
+
+    def get_validations_for_revision(self, revision_id, refresh=False):
         """Retrieves validations for a revision
 
         Invokes Deckhand to render the revision, which will either succeed, or
         fail and return validaiton failures. If there are any failures, the
-        process will not proceed to validate against the other Airship
-        components.
+        validations by Shipyard and the other Airship components are not
+        reported.
         Upon success from Deckhand rendering, uses the endpoints for each of
         the Airship components to validate the version indicated.
+        The validations by Deckhand, Shipyard and the Airship components are
+        run concurrently, each with a deadline, so that the time taken is
+        that of the slowest of them. The validations by Shipyard and the
+        Airship components are abandoned if Deckhand reports failures.
+        The results of the validations by the Airship components are stored,
+        and reused for the same revision unless refresh is True.
         Responds in the format defined here:
         https://github.com/openstack/airship-in-a-bottle/blob/master/doc/source/api-conventions.rst#post-v10validatedesign
         """
+        fanout = ValidationFanout(
+            deadline=CONF.validations.validation_deadline,
+            max_workers=CONF.validations.max_concurrent_validations)
+        fanout.add(DECKHAND_RENDERING, self.deckhand.get_render_errors,
+                   revision_id)
+        fanout.add(DECKHAND_VALIDATIONS, self._get_deckhand_validation_errors,
+                   revision_id)
+        fanout.add(SHIPYARD_VALIDATIONS, self._get_shipyard_validations,
+                   revision_id)
+        component_names = []
+        stored_results = {}
+        component_ex = None
+        try:
+            component_names, stored_results = (
+                self._add_component_validations(fanout, revision_id,
+                                                refresh))
+        except Exception as ex:
+            # Only relevant if Deckhand reports no failures.
+            component_ex = ex
+
+        results = _collect_validation_results(
+            fanout, (DECKHAND_RENDERING, DECKHAND_VALIDATIONS))
+        results.update(stored_results)
+
         resp_msgs = []
         error_count = 0
 
         # Capture the messages from trying to render the revision.
-        render_errors = self.deckhand.get_render_errors(revision_id)
+        render_errors = _get_validation_result_value(
+            results[DECKHAND_RENDERING])
         resp_msgs.extend(render_errors)
         error_count += len(render_errors)
         LOG.debug("Deckhand errors from rendering: %s", error_count)
         # Incorporate stored validation errors from Deckhand (prevalidations)
         # Note: This may have to change to be later in the code if we store
         # validations from other sources in Deckhand.
-        dh_validations = self._get_deckhand_validation_errors(revision_id)
+        dh_validations = _get_validation_result_value(
+            results[DECKHAND_VALIDATIONS])
         error_count += len(dh_validations)
         resp_msgs.extend(dh_validations)
         LOG.debug("Deckhand validations: %s", len(dh_validations))
 
-        # Only invoke the other validations if Deckhand has not returned any.
+        # Only report the other validations if Deckhand has not returned any.
         if (error_count == 0):
+            if component_ex is not None:
+                raise component_ex
             # Start with Shipyard's own validations
-            results = self._get_shipyard_validations(revision_id)
-            err_results = [r for r in results if r['error']]
+            results_sy = _get_validation_result_value(
+                results[SHIPYARD_VALIDATIONS])
+            err_results = [r for r in results_sy if r['error']]
             error_count += len(err_results)
-            resp_msgs.extend(results)
+            resp_msgs.extend(results_sy)
 
             # And then the other ucp components
-            (cpnt_ec, cpnt_msgs) = self._get_validations_from_ucp_components(
-                revision_id)
-            resp_msgs.extend(cpnt_msgs)
+            cpnt_ec = 0
+            for name in component_names:
+                (ec, msgs) = _get_component_validation_messages(
+                    results[name])
+                resp_msgs.extend(msgs)
+                cpnt_ec += ec
             error_count += cpnt_ec
             LOG.debug("Airship component validations: %s", cpnt_ec)
 
@@ -560,7 +875,8 @@ class ConfigdocsHelper(object):
                 service_clients.deckhand_client(),
                 revision_id,
                 [(ValidateDeploymentConfigurationFull,
-                  CONF.document_info.deployment_configuration_name)]
+                  CONF.document_info.deployment_configuration_name)],
+                index_dir=CONF.document_info.rendered_document_index_dir
             )
             return sy_val_mgr.validate()
         except Exception as ex:
@@ -616,8 +932,8 @@ class ConfigdocsHelper(object):
 
     def add_collection(self, collection_id, document_string):
         """Triggers a call to Deckhand to add a collection(bucket)
-        Documents are assumed to be a string input, not a
-        collection.
+        Documents are assumed to be a string input, or IngestedDocuments,
+        not a collection.
         Returns the id of the buffer version.
         """
         try:
@@ -640,47 +956,14 @@ class ConfigdocsHelper(object):
         return self.get_revision_id(BUFFER)
 
     def check_intermediate_commit(self):
+        """Returns True if the second most recent committed revision has not
+        had a site action executed against it, otherwise False.
 
-        # Initialize variable
-        list_of_committed_rev = []
-
-        try:
-            # Get the list of all revisions present in Deckhand
-            all_revisions = self.deckhand.get_revision_list()
-
-        except NoRevisionsExistError:
-            # the values of None/None/None/0 are fine
-            pass
-
-        except DeckhandResponseError as drex:
-            raise AppError(
-                title='Unable to retrieve revisions',
-                description=(
-                    'Deckhand has responded unexpectedly: {}:{}'.format(
-                        drex.status_code, drex.response_message)),
-                status=falcon.HTTP_500,
-                retry=False)
-
-        if all_revisions:
-            # Get the list of 'committed' revisions
-            for revision in all_revisions:
-                if 'committed' in revision['tags']:
-                    list_of_committed_rev.append(revision)
-
-            # This is really applicable for scenarios where multiple
-            # configdocs commits and site actions were performed. Hence
-            # we should expect at least 2 'committed' revisions to be
-            # present in deckhand.
-            #
-            # We will check the second last most recent committed revision
-            # to see if a site-action has been executed on it
-            if len(list_of_committed_rev) > 1:
-                revision_tags = list_of_committed_rev[-2]['tags']
-                if ('site-action-success' not in revision_tags and
-                        'site-action-failure' not in revision_tags):
-                    return True
-
-        return False
+        This is really applicable for scenarios where multiple configdocs
+        commits and site actions were performed, and requires at least 2
+        'committed' revisions to be present in Deckhand.
+        """
+        return self._get_revision_dict()[INTERMEDIATE_COMMIT]
 
     def _get_ordered_versions(self, versions=None):
         """Returns a list of ordered versions"""
@@ -796,6 +1079,14 @@ def add_messages_to_validation_status(status, msgs, level):
     status['details']['messageList'] += formatted_messages
 
 
+def _changed_document_keys(old_hashes, new_hashes):
+    """Returns the keys of the documents created or modified between two
+    sets of document hashes
+    """
+    return [key for key, doc_hash in new_hashes.items()
+            if old_hashes.get(key) != doc_hash]
+
+
 def _get_validation_endpoints():
     """Returns the list of validation endpoint supported"""
     val_ep = '{}/validatedesign'
@@ -815,42 +1106,91 @@ def _get_validation_endpoints():
     ]
 
 
-def _get_validation_threads(validation_endpoints, ctx, design_ref):
-    """Create a list of validation threads from the endpoints"""
-    validation_threads = []
-    for endpoint in validation_endpoints:
-        # create a holder for things we need back from the threads
-        response = {'response': None}
-        exception = {'exception': None}
-        validation_threads.append({
-            'thread':
-            threading.Thread(
-                target=_get_validations_for_component,
-                kwargs={
-                    'url': endpoint['url'],
-                    'design_reference': design_ref,
-                    'response': response,
-                    'exception': exception,
-                    'context_marker': ctx.external_marker,
-                    'thread_name': endpoint['name'],
-                    'log_extra': {
-                        'req_id': ctx.request_id,
-                        'external_ctx': ctx.external_marker,
-                        'user': ctx.user
-                    }
-                }),
-            'name': endpoint['name'],
-            'url': endpoint['url'],
-            'response': response,
-            'exception': exception
-        })
-    return validation_threads
-
-
-def _get_validations_for_component(url, design_reference, response,
-                                   exception, context_marker, thread_name,
-                                   **kwargs):
-    """Invoke the POST for validation"""
+def _collect_validation_results(fanout, deckhand_names):
+    """Runs the validations of the fanout, returning the results by name
+
+    Stops early, abandoning the remaining validations, if the validations by
+    Deckhand (named by deckhand_names) report any failures.
+    """
+    results = {}
+    result_iter = fanout.iter_results()
+    try:
+        for result in result_iter:
+            results[result.name] = result
+            if all(name in results for name in deckhand_names):
+                if any(results[name].exception or results[name].timed_out or
+                       results[name].value for name in deckhand_names):
+                    break
+    finally:
+        result_iter.close()
+    return results
+
+
+def _get_validation_result_value(result):
+    """Returns the list of messages from a validation result
+
+    Raises the exception raised by the validation, if any. A validation that
+    did not complete in time is represented by an error message.
+    """
+    if result.exception is not None:
+        raise result.exception
+    if result.timed_out:
+        return [_generate_timeout_message(result)]
+    return result.value
+
+
+def _generate_timeout_message(result):
+    """Generates the ValidationMessage for a validation that timed out"""
+    return _generate_validation_message({
+        'message': ('{} did not complete validation within the time '
+                    'allowed').format(result.name),
+        'error': True,
+        'name': 'ValidationTimeout',
+        'diagnostic': 'Abandoned after {:.1f} seconds'.format(
+            result.latency),
+    }, level='Error', source=result.name)
+
+
+def _get_component_validation_messages(result):
+    """Returns the error count and ValidationMessages from the response of
+    an Airship component validation
+    """
+    th_name = result.name
+    if result.timed_out:
+        return (1, [_generate_timeout_message(result)])
+    error_count = 0
+    resp_msgs = []
+    val_response = result.value
+    LOG.debug("Validation from:  %s response: %s", th_name,
+              str(val_response))
+    # invalid status needs collection of messages
+    # valid status means that it passed. No messages to collect
+    if val_response.get('details') is None:
+        msg_list = [{'message': str(val_response), 'error': True}]
+    else:
+        msg_list = val_response.get('details').get('messageList', [])
+    for msg in msg_list:
+        # Count errors, convert message to ValidationMessage
+        default_level = 'Info'
+        if msg.get('error'):
+            error_count = error_count + 1
+            default_level = 'Error'
+        val_msg = _generate_validation_message(
+            msg, level=default_level, source=th_name
+        )
+        resp_msgs.append(val_msg)
+    return (error_count, resp_msgs)
+
+
+def _get_validations_for_component(url, design_reference, context_marker,
+                                   thread_name, on_response=None, **kwargs):
+    """Invoke the POST for validation
+
+    Returns the response from the component, or a response representing the
+    failure to invoke the component.
+    :param on_response: optional, invoked with the response from the
+        component if the component has validated the design
+    """
     try:
         headers = {
             'X-Context-Marker': context_marker,
@@ -858,7 +1198,7 @@ def _get_validations_for_component(url, design_reference, response,
             'content-type': 'application/json'
         }
 
-        http_resp = requests.post(
+        http_resp = HTTP_SESSIONS.get_session(VALIDATION_SESSION_NAME).post(
             url,
             headers=headers,
             data=design_reference,
@@ -870,13 +1210,17 @@ def _get_validations_for_component(url, design_reference, response,
                   http_resp.status_code)
         if http_resp.status_code > 400:
             http_resp.raise_for_status()
-        response['response'] = http_resp.json()
+        response = http_resp.json()
+        if on_response is not None:
+            on_response(response)
+        return response
     except Exception as ex:
         # catch anything exceptional as a failure to run validations
         unable_str = ('{} unable to validate configdocs or an invalid response'
                       ' has been returned').format(thread_name)
         LOG.exception(unable_str)
-        response['response'] = {
+        LOG.error('Invocation of validation by %s has failed', thread_name)
+        return {
             'details': {
                 'messageList': [{
                     'message': unable_str,
@@ -888,7 +1232,6 @@ def _get_validations_for_component(url, design_reference, response,
                 }]
             }
         }
-        exception['exception'] = ex
 
 
 def _generate_dh_val_msg(msg, dh_result_name):
@@ -17,10 +17,12 @@ import enum
 import logging
 
 from oslo_config import cfg
-import requests
 from requests.exceptions import RequestException
 import yaml
 
+from shipyard_airflow.control.helpers.http_session import HTTP_SESSIONS
+from shipyard_airflow.control.helpers.revision_index_cache import (
+    REVISION_INDEX)
 from shipyard_airflow.control.service_endpoints import (Endpoints,
                                                         get_endpoint,
                                                         get_token)
@@ -29,6 +31,17 @@ from shipyard_airflow.shipyard_const import CustomHeaders
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+# The size in bytes of the chunks read from a streamed deckhand response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# The name of the shared HTTP session used to access deckhand
+SESSION_NAME = 'deckhand'
+
+# The name of the shared HTTP session used to render documents. Rendering is
+# expensive and may still be in progress when deckhand appears unavailable
+# (e.g. a gateway timeout), so these requests are not retried in that case.
+RENDER_SESSION_NAME = 'deckhand-render'
+
 
 class DeckhandPaths(enum.Enum):
     """
@@ -71,6 +84,25 @@ class DeckhandClient(object):
             )
         return DeckhandClient._deckhand_svc_url + path.value
 
+    @staticmethod
+    def _get_session(render=False):
+        """
+        Returns the HTTP session, shared within the process, used to make
+        requests to deckhand. The connections of the session are kept alive
+        and reused.
+        If render is True, the session used to render documents is returned.
+        """
+        if render:
+            return HTTP_SESSIONS.get_session(
+                RENDER_SESSION_NAME,
+                pool_maxsize=CONF.requests_config.deckhand_client_pool_maxsize,
+                max_retries=CONF.requests_config.deckhand_client_max_retries,
+                retry_unavailable=False)
+        return HTTP_SESSIONS.get_session(
+            SESSION_NAME,
+            pool_maxsize=CONF.requests_config.deckhand_client_pool_maxsize,
+            max_retries=CONF.requests_config.deckhand_client_max_retries)
+
     def get_latest_revision(self):
         """
         Retrieve the latest revision object, or raise a
@@ -93,6 +125,20 @@ class DeckhandClient(object):
         revisions = yaml.safe_load(response.text)
         return revisions.get('results', [])
 
+    def get_revision(self, revision_id):
+        """
+        Returns the revision dictionary object of the specified revision, or
+        None if the revision does not exist
+        """
+        response = self._get_request(
+            DeckhandClient.get_path(DeckhandPaths.REVISION).format(
+                revision_id)
+        )
+        if response.status_code == 404:
+            return None
+        self._handle_bad_response(response)
+        return yaml.safe_load(response.text)
+
     def get_revision_count(self):
         """
         Returns the count of revisions in deckhand
@@ -122,6 +168,7 @@ class DeckhandClient(object):
         ).format(bucket_name)
 
         response = self._put_request(url, document_data=documents)
+        REVISION_INDEX.invalidate()
         if response.status_code == 400:
             # bad input
             raise DeckhandRejectedInputError(
@@ -150,6 +197,7 @@ class DeckhandClient(object):
         ).format(revision_id, tag)
 
         response = self._post_request(url)
+        REVISION_INDEX.invalidate()
         self._handle_bad_response(response)
         return yaml.safe_load(response.text)
 
@@ -163,6 +211,7 @@ class DeckhandClient(object):
         ).format(target_revision_id)
 
         response = self._post_request(url)
+        REVISION_INDEX.invalidate()
         self._handle_bad_response(response)
 
     def reset_to_empty(self):
@@ -171,6 +220,7 @@ class DeckhandClient(object):
         """
         url = DeckhandClient.get_path(DeckhandPaths.REVISION_LIST)
         response = self._delete_request(url)
+        REVISION_INDEX.invalidate()
         self._handle_bad_response(response)
 
     def get_diff(self, old_revision_id, new_revision_id):
@@ -235,9 +285,14 @@ class DeckhandClient(object):
         return errors
 
     def get_rendered_docs_from_revision(self, revision_id, bucket_id=None,
-                                        cleartext_secrets=False):
+                                        cleartext_secrets=False,
+                                        stream=False):
         """
         Returns the full set of rendered documents for a revision
+        If stream is True, an iterator of the chunks (bytes) of the documents
+        is returned instead of the text, and the documents are read from
+        deckhand as the iterator is consumed. The response from deckhand is
+        closed when the iterator is exhausted or closed.
         """
         url = DeckhandClient.get_path(
             DeckhandPaths.RENDERED_REVISION_DOCS
@@ -248,10 +303,22 @@ class DeckhandClient(object):
             query = {'status.bucket': bucket_id}
         if cleartext_secrets is True:
             query['cleartext-secrets'] = 'true'
-        response = self._get_request(url, params=query)
+        response = self._get_request(url, params=query, stream=stream,
+                                     render=True)
         self._handle_bad_response(response)
+        if stream:
+            return DeckhandClient._iter_response_content(response)
         return response.text
 
+    @staticmethod
+    def _iter_response_content(response):
+        # Yields the content of a streamed response, releasing the response
+        # (and its connection) even if the iteration is not completed
+        try:
+            yield from response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        finally:
+            response.close()
+
     def get_all_revision_validations(self, revision_id):
         """
         Collects a YAML document containing a list of validation results
@@ -329,7 +396,7 @@ class DeckhandClient(object):
                 headers['content-type'] = 'application/x-yaml'
 
             DeckhandClient._log_request('PUT', url, params)
-            response = requests.put(
+            response = DeckhandClient._get_session().put(
                 url,
                 params=params,
                 headers=headers,
@@ -346,8 +413,11 @@ class DeckhandClient(object):
                 )
             )
 
-    def _get_request(self, url, params=None):
-        # invokes a GET against the specified URL
+    def _get_request(self, url, params=None, stream=False, render=False):
+        # invokes a GET against the specified URL. If stream is True, the
+        # body of the response is not read until it is accessed. If render is
+        # True, the request is made using the session used to render
+        # documents.
         try:
             headers = self._get_headers()
             headers['content-type'] = 'application/x-yaml'
@@ -356,10 +426,11 @@ class DeckhandClient(object):
                 params = None
 
             DeckhandClient._log_request('GET', url, params)
-            response = requests.get(
+            response = DeckhandClient._get_session(render=render).get(
                 url,
                 params=params,
                 headers=headers,
+                stream=stream,
                 timeout=(
                     CONF.requests_config.deckhand_client_connect_timeout,
                     CONF.requests_config.deckhand_client_read_timeout))
@@ -382,7 +453,7 @@ class DeckhandClient(object):
                 headers['content-type'] = 'application/x-yaml'
 
             DeckhandClient._log_request('POST', url, params)
-            response = requests.post(
+            response = DeckhandClient._get_session().post(
                 url,
                 params=params,
                 headers=headers,
@@ -405,7 +476,7 @@ class DeckhandClient(object):
             headers = self._get_headers()
 
             DeckhandClient._log_request('DELETE', url, params)
-            response = requests.delete(
+            response = DeckhandClient._get_session().delete(
                 url,
                 params=params,
                 headers=headers,
@@ -0,0 +1,118 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process wide cache of the content hashes of the documents of a revision
+
+The document level difference between two revisions of a collection is found
+by comparing the content hashes of their documents. Deckhand revisions are
+immutable, so the hashes of the documents of a collection in a revision never
+change, and are cached (least recently used first out) by revision and
+collection. Comparing a new revision to one already seen then only requires
+the documents of the new revision to be retrieved from Deckhand.
+"""
+import collections
+import hashlib
+import json
+import logging
+import threading
+
+LOG = logging.getLogger(__name__)
+
+# The parts of a document that make up its content. Other fields returned by
+# Deckhand (e.g. id, status) differ between revisions for the same content.
+HASHED_FIELDS = ('schema', 'metadata', 'data')
+
+
+def document_key(document):
+    """Returns the (schema, name) identifying a document within a revision"""
+    return (document.get('schema', ''),
+            (document.get('metadata') or {}).get('name', ''))
+
+
+def document_hash(document):
+    """Returns the sha256 hex digest of the content of a document
+
+    The content is serialized with sorted keys, so the hash does not depend
+    on the order of the keys of the document.
+    """
+    content = {field: document.get(field) for field in HASHED_FIELDS}
+    serialized = json.dumps(content, sort_keys=True, separators=(',', ':'),
+                            default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def document_hashes(documents):
+    """Returns the content hash of each document, keyed by document_key"""
+    return {document_key(doc): document_hash(doc)
+            for doc in documents if doc}
+
+
+def collection_hash(hashes):
+    """Returns the sha256 hex digest of a collection of documents
+
+    The digest is of the sorted (schema, name, hash) of each document, so the
+    order of the documents does not matter. Clients compute the same digest
+    from their copy of a collection to find if it differs from Shipyard's.
+
+    :param hashes: the content hash of each document, keyed by document_key
+    """
+    entries = sorted([schema, name, doc_hash]
+                     for (schema, name), doc_hash in hashes.items())
+    serialized = json.dumps(entries, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class DocumentHashCache(object):
+    """The document hashes of recently used revisions of collections"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    def get(self, revision_id, collection_id):
+        """Returns the cached document hashes, or None if not cached
+
+        The returned dictionary is shared, and must not be modified.
+        """
+        key = (revision_id, collection_id)
+        with self._lock:
+            hashes = self._entries.get(key)
+            if hashes is not None:
+                self._entries.move_to_end(key)
+            return hashes
+
+    def put(self, revision_id, collection_id, hashes, max_entries):
+        """Caches the document hashes of a collection in a revision
+
+        :param max_entries: the number of (revision, collection) entries
+            kept, evicting the least recently used. If less than 1, nothing
+            is cached.
+        """
+        if max_entries < 1:
+            return
+        key = (revision_id, collection_id)
+        with self._lock:
+            self._entries[key] = hashes
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                LOG.debug('Document hashes of revision %s collection %s '
+                          'evicted from cache', *evicted)
+
+    def clear(self):
+        """Discards all cached document hashes"""
+        with self._lock:
+            self._entries.clear()
+
+
+# The document hash cache for use within a process
+DOCUMENT_HASHES = DocumentHashCache()
@@ -0,0 +1,213 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Streaming ingestion of a collection of YAML documents
+
+The body of a request to create a collection is read incrementally, and:
+
+- written to a spooled temporary file, which is held in memory up to a size
+  and otherwise on disk, and is later sent to Deckhand as the request body;
+- parsed, as it is read, into YAML events (not objects), from which the name
+  and schema of each document are found, and duplicates detected.
+
+The memory used is then bounded by the spool size, and the size of the
+largest single value in the documents, regardless of the size of the
+collection.
+"""
+import logging
+import tempfile
+
+import yaml
+
+LOG = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Only events are produced, so no objects are constructed from the documents
+_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class IngestedDocuments(object):
+    """A collection of documents read from a stream
+
+    Usable as a file-like request body (read, seek, tell, iteration and len),
+    and as a context manager that discards the spooled documents on exit.
+
+    :param spool: the file the documents have been written to
+    :param length: the length in bytes of the documents
+    :param names_and_schemas: the (name, schema) of each document, in order
+    :param duplicates: the (name, schema) of each document that occurs more
+        than once
+    :param yaml_error: the error if the documents are not valid YAML
+    """
+    def __init__(self, spool, length, names_and_schemas, duplicates,
+                 yaml_error=None):
+        self._spool = spool
+        self._length = length
+        self.names_and_schemas = names_and_schemas
+        self.duplicates = duplicates
+        self.yaml_error = yaml_error
+        self._spool.seek(0)
+
+    def has_document(self, name, schema):
+        """Returns True if the collection includes the named document"""
+        return (name, schema) in self.names_and_schemas
+
+    def read(self, size=-1):
+        return self._spool.read(size)
+
+    def seek(self, offset, whence=0):
+        return self._spool.seek(offset, whence)
+
+    def tell(self):
+        return self._spool.tell()
+
+    def __iter__(self):
+        return iter(lambda: self._spool.read(READ_CHUNK_SIZE), b'')
+
+    def __len__(self):
+        return self._length
+
+    def close(self):
+        self._spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def ingest_documents(stream, spool_size, length=None):
+    """Reads and parses a stream of YAML documents
+
+    :param stream: a file-like object of the bytes of the documents, e.g.
+        falcon's req.bounded_stream
+    :param spool_size: the number of bytes of the documents held in memory,
+        beyond which they are written to a temporary file
+    :param length: the number of bytes to read from the stream, if the
+        documents are followed by other content. By default, the stream is
+        read to its end. Fewer bytes are read if the stream ends first.
+    :returns: IngestedDocuments
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    reader = _TeeReader(stream, spool, length)
+    names_and_schemas = []
+    yaml_error = None
+    try:
+        names_and_schemas = list(_iter_names_and_schemas(reader))
+    except yaml.YAMLError as exc:
+        yaml_error = exc
+        names_and_schemas = []
+        LOG.warning('Invalid YAML provided to Shipyard. Syntax error(s): %s',
+                    exc)
+    except Exception:
+        spool.close()
+        raise
+    # The remainder is forwarded as is, e.g. after invalid YAML
+    reader.drain()
+
+    seen = set()
+    duplicates = []
+    for name_schema in names_and_schemas:
+        if not all(name_schema):
+            continue
+        if name_schema in seen and name_schema not in duplicates:
+            duplicates.append(name_schema)
+        seen.add(name_schema)
+    LOG.debug('Ingested %s YAML documents, %s bytes', len(names_and_schemas),
+              reader.length)
+    return IngestedDocuments(spool, reader.length, names_and_schemas,
+                             duplicates, yaml_error)
+
+
+class _TeeReader(object):
+    """Reads from a stream, up to an optional limit, writing what is read to
+    another file"""
+    def __init__(self, stream, copy, limit=None):
+        self.stream = stream
+        self.copy = copy
+        self.limit = limit
+        self.length = 0
+
+    def read(self, size=READ_CHUNK_SIZE):
+        if size is None or size < 0:
+            size = READ_CHUNK_SIZE
+        if self.limit is not None:
+            size = min(size, self.limit - self.length)
+            if size <= 0:
+                return b''
+        data = self.stream.read(size)
+        self.copy.write(data)
+        self.length += len(data)
+        return data
+
+    def drain(self):
+        while self.read():
+            pass
+
+
+def _iter_names_and_schemas(stream):
+    """Yields the (name, schema) of each document in a YAML stream
+
+    Only the top level schema and metadata.name scalars are retained; all
+    other values are discarded as they are parsed. A value not found is ''.
+    """
+    # A stack of [is_mapping, key_pending, key, is_key] for the open
+    # collections. For mappings, key_pending indicates the next node is a
+    # key. is_key indicates the collection is itself a (complex) key.
+    stack = []
+    name = schema = ''
+    for event in yaml.parse(stream, Loader=_LOADER):
+        if isinstance(event, yaml.DocumentStartEvent):
+            stack = []
+            name = schema = ''
+        elif isinstance(event, yaml.DocumentEndEvent):
+            if not (name and schema):
+                LOG.warning('Document received with no name or schema')
+            yield (name, schema)
+        elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+            if _is_key(stack):
+                stack[-1][1] = False
+                stack[-1][2] = getattr(event, 'value', None)
+                continue
+            if all(entry[0] for entry in stack):
+                path = [entry[2] for entry in stack]
+                if path == ['schema']:
+                    schema = getattr(event, 'value', '')
+                elif path == ['metadata', 'name']:
+                    name = getattr(event, 'value', '')
+            _value_complete(stack)
+        elif isinstance(event, (yaml.MappingStartEvent,
+                                yaml.SequenceStartEvent)):
+            is_key = _is_key(stack)
+            if is_key:
+                # A complex key, which is never schema or metadata
+                stack[-1][1] = False
+                stack[-1][2] = None
+            is_mapping = isinstance(event, yaml.MappingStartEvent)
+            stack.append([is_mapping, is_mapping, None, is_key])
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            if not stack.pop()[3]:
+                _value_complete(stack)
+
+
+def _is_key(stack):
+    # Indicates if the next node is a key of the innermost mapping
+    return bool(stack) and stack[-1][0] and stack[-1][1]
+
+
+def _value_complete(stack):
+    # Following a value in a mapping, the next node is a key
+    if stack and stack[-1][0]:
+        stack[-1][1] = True
@@ -0,0 +1,186 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process wide registry of HTTP sessions
+
+Sessions are shared per name (e.g. 'deckhand'), so that the connections to a
+service are kept alive and reused by all of the requests made to it within a
+process, rather than a connection (and TLS handshake) being made for each
+request. Requests are retried when a connection cannot be established, and
+short idempotent requests are also retried on responses indicating the
+service is temporarily unavailable. A request is never retried once it may
+have been received (e.g. on a read timeout), as it may still be processed.
+The connection reuse counts of the sessions are logged periodically.
+"""
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LOG = logging.getLogger(__name__)
+
+# Statuses indicating a service is temporarily unable to handle a request,
+# for which a request of one of the RETRY_STATUS_METHODS is retried.
+RETRY_STATUSES = (502, 503, 504)
+
+# The methods of the requests retried on a RETRY_STATUSES response. Though
+# idempotent, PUT and DELETE requests are not retried, as the original request
+# may still be in progress (e.g. behind a gateway timeout) and race the retry.
+RETRY_STATUS_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# The minimum number of seconds between logs of the session metrics
+METRICS_LOG_INTERVAL = 300
+
+
+def _pool_counts(session):
+    """Returns the connections made and requests sent by a session's pools
+
+    The pools of a session are those of its HTTPAdapters, one per scheme and
+    host. Counts for pools that have been discarded are not included.
+    """
+    connections = 0
+    requests_sent = 0
+    # the same adapter is mounted for http and https
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+    return connections, requests_sent
+
+
+class HttpSessionRegistry:
+    """Creates and holds the HTTP sessions of a process, keyed by name
+
+    A registry is aware of the process it was used in, and discards the
+    sessions created by a parent process (connections cannot be shared by
+    processes).
+
+    :param metrics_log_interval: the minimum number of seconds between logs
+        of the metrics of the sessions. The metrics are logged when a session
+        is requested after the interval has passed.
+    """
+    def __init__(self, metrics_log_interval=METRICS_LOG_INTERVAL):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._pid = os.getpid()
+        self.metrics_log_interval = metrics_log_interval
+        self._metrics_logged = time.monotonic()
+
+    def get_session(self, name, pool_maxsize=10, max_retries=3,
+                    backoff_factor=0.5, retry_unavailable=True):
+        """Returns the session registered for the name, creating it if needed
+
+        The parameters other than the name are only used when the session is
+        created.
+
+        :param name: the name of the session, usually the name of the service
+            it is used to access
+        :param pool_maxsize: the maximum number of connections kept alive for
+            reuse per host. Requests in excess of this may be made, but their
+            connections are not retained.
+        :param max_retries: the number of times a request is retried if a
+            connection could not be established, or, for a GET, HEAD or
+            OPTIONS request, if the service is temporarily unavailable.
+            Requests are not retried on read errors.
+        :param backoff_factor: the factor for the exponential backoff between
+            retries, in seconds
+        :param retry_unavailable: if False, requests are not retried when the
+            service is temporarily unavailable, e.g. for a session used for
+            requests that are expensive to repeat.
+        """
+        self._log_metrics_if_due()
+        with self._lock:
+            if self._pid != os.getpid():
+                # forked; the parent's sessions are unusable here.
+                self._sessions.clear()
+                self._pid = os.getpid()
+            session = self._sessions.get(name)
+            if session is not None:
+                return session
+            LOG.info('Initializing the %s HTTP session with pool size: %d, '
+                     'max retries: %d', name, pool_maxsize, max_retries)
+            retry = Retry(
+                total=max_retries,
+                connect=max_retries,
+                read=0,
+                status=max_retries if retry_unavailable else 0,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                method_whitelist=RETRY_STATUS_METHODS,
+                raise_on_status=False)
+            adapter = HTTPAdapter(pool_maxsize=pool_maxsize,
+                                  max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._sessions[name] = session
+            return session
+
+    def get_metrics(self, name=None):
+        """Returns the connection reuse counts of the sessions
+
+        :param name: optional, if specified the counts of only the named
+            session are returned, otherwise a dictionary of the counts keyed
+            by session name is returned
+
+        The counts are of the connections established and the requests sent
+        (including retries), and the number of requests that reused an
+        established connection.
+        """
+        with self._lock:
+            if name is not None:
+                session = self._sessions.get(name)
+                return (self._session_metrics(session)
+                        if session is not None else None)
+            return {
+                session_name: self._session_metrics(session)
+                for session_name, session in self._sessions.items()
+            }
+
+    def _log_metrics_if_due(self):
+        """Logs the metrics of the sessions, at most once per interval"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._metrics_logged < self.metrics_log_interval:
+                return
+            self._metrics_logged = now
+        metrics = self.get_metrics()
+        if metrics:
+            LOG.info('HTTP session metrics: %s', metrics)
+
+    @staticmethod
+    def _session_metrics(session):
+        connections, requests_sent = _pool_counts(session)
+        return {
+            'connections': connections,
+            'requests': requests_sent,
+            'reused': max(requests_sent - connections, 0),
+        }
+
+    def close_all(self):
+        """Closes and removes all registered sessions"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# The registry for use within a process
+HTTP_SESSIONS = HttpSessionRegistry()
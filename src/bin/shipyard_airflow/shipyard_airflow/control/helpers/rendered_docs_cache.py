@@ -0,0 +1,112 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process wide cache of the rendered documents of Deckhand revisions
+
+Deckhand renders the whole site for each request of the rendered documents
+of a revision. Revisions are immutable, so the rendered documents of a
+revision never change, and are cached (least recently used first out) up to
+a total size in bytes. Only documents with redacted secrets are cached;
+documents with cleartext secrets are never held by the cache.
+"""
+import collections
+import logging
+import threading
+
+LOG = logging.getLogger(__name__)
+
+
+class RenderedDocsCache(object):
+    """The rendered documents (bytes) of recently used revisions"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._size = 0
+
+    def get(self, revision_id):
+        """Returns the cached rendered documents, or None if not cached"""
+        with self._lock:
+            rendered = self._entries.get(revision_id)
+            if rendered is not None:
+                self._entries.move_to_end(revision_id)
+            return rendered
+
+    def put(self, revision_id, rendered, max_bytes):
+        """Caches the rendered documents of a revision
+
+        :param rendered: the rendered documents (with redacted secrets) as
+            bytes
+        :param max_bytes: the total size of the cached documents, evicting
+            the least recently used. Documents larger than this are not
+            cached. If less than 1, nothing is cached.
+        """
+        if max_bytes < 1:
+            return
+        if len(rendered) > max_bytes:
+            LOG.debug('Rendered documents of revision %s (%s bytes) are too '
+                      'large to cache', revision_id, len(rendered))
+            return
+        with self._lock:
+            previous = self._entries.pop(revision_id, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[revision_id] = rendered
+            self._size += len(rendered)
+            while self._size > max_bytes:
+                evicted, evicted_docs = self._entries.popitem(last=False)
+                self._size -= len(evicted_docs)
+                LOG.debug('Rendered documents of revision %s evicted from '
+                          'cache', evicted)
+
+    def caching_iter(self, revision_id, chunks, max_bytes):
+        """Yields the chunks (bytes) of rendered documents, caching the
+        documents once all the chunks have been yielded
+
+        If the iteration is not completed (e.g. the client disconnects) or
+        the documents exceed max_bytes, nothing is cached. The chunks are
+        closed (if they can be) when the iteration is completed or closed.
+        """
+        collected = []
+        size = 0
+        try:
+            for chunk in chunks:
+                if collected is not None:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        collected = None
+                    else:
+                        collected.append(chunk)
+                yield chunk
+        finally:
+            # Closing the chunks releases the source of the documents
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+        if collected is not None:
+            self.put(revision_id, b''.join(collected), max_bytes)
+
+    @property
+    def size(self):
+        """The total size in bytes of the cached documents"""
+        with self._lock:
+            return self._size
+
+    def clear(self):
+        """Discards all cached documents"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# The rendered documents cache for use within a process
+RENDERED_DOCS = RenderedDocsCache()
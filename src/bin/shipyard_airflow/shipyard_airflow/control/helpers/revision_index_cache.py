@@ -0,0 +1,84 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process wide cache of the index of Deckhand revisions used by Shipyard
+
+The revision index (see ConfigdocsHelper._get_revision_dict) is derived from
+the full list of Deckhand revisions, which grows with the history of the
+site. The index is cached for a short time so that it can be shared by the
+requests handled by a process, and is invalidated by the DeckhandClient when
+this process makes changes to the revisions in Deckhand. Changes made by
+other processes are detected by checking the cached index against Deckhand
+(see ConfigdocsHelper._is_revision_index_current) before it is used, which
+takes a couple of small requests rather than a download of the full list of
+revisions.
+"""
+import logging
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+
+class RevisionIndexCache(object):
+    """A single cached revision index, which expires after a time to live
+
+    The cached index is shared, and must not be modified by its users.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._expires = 0
+        # Incremented for each invalidation, so that an index loaded before
+        # an invalidation is not cached after it.
+        self._generation = 0
+
+    def get_or_load(self, loader, ttl, is_current=None):
+        """Returns the cached index, or loads and caches a new index
+
+        :param loader: a function, invoked with no parameters, that returns
+            a new revision index
+        :param ttl: the seconds for which a newly loaded index is cached. If
+            less than 1, the index is loaded and not cached.
+        :param is_current: optional, a function invoked with the cached index
+            that returns False if the index no longer reflects the revisions
+            in Deckhand, in which case a new index is loaded
+        """
+        if ttl < 1:
+            return loader()
+        with self._lock:
+            index = None
+            if self._index is not None and time.monotonic() < self._expires:
+                index = self._index
+            generation = self._generation
+        if index is not None:
+            if is_current is None or is_current(index):
+                return index
+            LOG.info('Cached revision index is out of date, reloading')
+        index = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._index = index
+                self._expires = time.monotonic() + ttl
+        return index
+
+    def invalidate(self):
+        """Discards the cached index"""
+        with self._lock:
+            self._index = None
+            self._generation += 1
+        LOG.debug('Revision index cache invalidated')
+
+
+# The revision index cache for use within a process
+REVISION_INDEX = RevisionIndexCache()
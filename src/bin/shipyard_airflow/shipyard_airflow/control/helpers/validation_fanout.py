@@ -0,0 +1,197 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Concurrent execution of the validations of a revision
+
+A ValidationFanout runs a set of named validations (e.g. the validations by
+Deckhand, by Shipyard, and by each Airship component) concurrently using a
+bounded pool of threads, each with a deadline. Results are yielded as each
+validation completes, so the time taken is that of the slowest validation
+rather than the sum of them. The latency of each validation is recorded.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import logging
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+
+class ValidationLatencies:
+    """Latency metrics of the validations run, by validation name
+
+    Latencies are in seconds. A validation that does not complete within its
+    deadline is counted as timed out, and its latency as the deadline.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+
+    def record(self, name, latency, timed_out=False):
+        """Record the latency of a validation"""
+        with self._lock:
+            stats = self._latencies.setdefault(name, {
+                'count': 0,
+                'timeouts': 0,
+                'total': 0.0,
+                'max': 0.0,
+                'last': 0.0,
+            })
+            stats['count'] += 1
+            stats['total'] += latency
+            stats['max'] = max(stats['max'], latency)
+            stats['last'] = latency
+            if timed_out:
+                stats['timeouts'] += 1
+
+    def as_dict(self):
+        """Returns the latency metrics, keyed by validation name"""
+        with self._lock:
+            return {
+                name: {
+                    'count': stats['count'],
+                    'timeouts': stats['timeouts'],
+                    'mean': stats['total'] / stats['count'],
+                    'max': stats['max'],
+                    'last': stats['last'],
+                }
+                for name, stats in self._latencies.items()
+            }
+
+
+# The validation latencies recorded within a process
+VALIDATION_LATENCIES = ValidationLatencies()
+
+
+class ValidationResult:
+    """The outcome of a single validation
+
+    :param name: the name of the validation
+    :param value: the value returned by the validation, None if it raised an
+        exception or timed out
+    :param exception: the exception raised by the validation, if any
+    :param latency: the seconds taken by the validation
+    :param timed_out: True if the validation did not complete within its
+        deadline
+    """
+    def __init__(self, name, value=None, exception=None, latency=0.0,
+                 timed_out=False):
+        self.name = name
+        self.value = value
+        self.exception = exception
+        self.latency = latency
+        self.timed_out = timed_out
+
+
+class ValidationFanout:
+    """Runs named validations concurrently, each with a deadline
+
+    :param deadline: the default number of seconds within which each
+        validation must complete
+    :param max_workers: the maximum number of validations run at once
+    :param latencies: the ValidationLatencies to record to
+    """
+    def __init__(self, deadline, max_workers,
+                 latencies=VALIDATION_LATENCIES):
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.latencies = latencies
+        self._validations = []
+
+    def add(self, name, func, *args, deadline=None, **kwargs):
+        """Adds a validation to be run
+
+        :param name: the unique name of the validation
+        :param func: the function invoked, with the remaining positional and
+            keyword arguments, to run the validation
+        :param deadline: the number of seconds within which this validation
+            must complete, if different from the fanout's deadline
+        """
+        self._validations.append(
+            (name, func, args, kwargs,
+             self.deadline if deadline is None else deadline))
+
+    def iter_results(self):
+        """Runs the validations, yielding a ValidationResult for each as it
+        completes or reaches its deadline
+
+        The deadline of a validation is counted from when it starts running,
+        so a validation waiting for a worker does not time out. Validations
+        that are still running when the iteration is ended early (e.g. the
+        generator is closed) or that reach their deadline are abandoned; they
+        are left to finish in the background, and their results are
+        discarded.
+        """
+        if not self._validations:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self._validations)))
+        # the time each validation started running, keyed by name
+        run_starts = {}
+        pending = {}
+        try:
+            for name, func, args, kwargs, deadline in self._validations:
+                future = executor.submit(_timed, run_starts, name, func,
+                                         *args, **kwargs)
+                pending[future] = (name, deadline)
+            while pending:
+                now = time.monotonic()
+                # a validation not yet started cannot reach its deadline
+                # before it would if started now
+                next_deadline = min(
+                    run_starts.get(name, now) + deadline
+                    for name, deadline in pending.values())
+                done, _ = wait(
+                    pending,
+                    timeout=max(next_deadline - now, 0),
+                    return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, _ = pending.pop(future)
+                    yield self._completed(name, future)
+                now = time.monotonic()
+                for future, (name, deadline) in list(pending.items()):
+                    run_start = run_starts.get(name)
+                    if (run_start is not None and
+                            run_start + deadline <= now and
+                            not future.done()):
+                        del pending[future]
+                        future.cancel()
+                        yield self._timed_out(name, now - run_start)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _completed(self, name, future):
+        value, exception, latency = future.result()
+        self.latencies.record(name, latency)
+        LOG.info('Validation by %s completed in %.3f seconds', name, latency)
+        return ValidationResult(name, value=value, exception=exception,
+                                latency=latency)
+
+    def _timed_out(self, name, latency):
+        self.latencies.record(name, latency, timed_out=True)
+        LOG.error('Validation by %s did not complete within %.3f seconds',
+                  name, latency)
+        return ValidationResult(name, latency=latency, timed_out=True)
+
+
+def _timed(run_starts, name, func, *args, **kwargs):
+    # Runs the function, recording when it started in run_starts, and
+    # returning its value or exception and the time taken
+    start = run_starts[name] = time.monotonic()
+    try:
+        return func(*args, **kwargs), None, time.monotonic() - start
+    except Exception as ex:
+        LOG.exception('Validation has raised an exception')
+        return None, ex, time.monotonic() - start
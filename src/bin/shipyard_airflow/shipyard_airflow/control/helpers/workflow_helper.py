@@ -77,6 +77,21 @@ class WorkflowHelper(object):
         """
         return workflow_id is not None and '__' in workflow_id
 
+    @staticmethod
+    def validate_workflow_cursor(cursor):
+        """
+        checks that the cursor is a workflow_id having a valid execution
+        date, as is required to identify the position of the cursor
+        """
+        if not WorkflowHelper.validate_workflow_id(cursor):
+            return False
+        dag_info = WorkflowHelper._split_workflow_id_to_dag_run(cursor)
+        try:
+            arrow.get(dag_info['execution_date'])
+        except ParserError:
+            return False
+        return True
+
     @staticmethod
     def _get_threshold_date(since_iso8601=None):
         # generates the threshold date from the input. Defaults to
@@ -97,25 +112,57 @@ class WorkflowHelper(object):
                 threshold_date = arrow.utcnow().shift(days=-30)
         return threshold_date.naive
 
-    def get_workflow_list(self, since_iso8601=None):
+    @staticmethod
+    def _get_cursor_dag_run(cursor=None):
+        # translates a workflow id used as a cursor to the dag_id and
+        # execution date (as a naive utc datetime) of the dag run
+        if cursor is None:
+            return None, None
+        dag_info = WorkflowHelper._split_workflow_id_to_dag_run(cursor)
+        return (dag_info['dag_id'],
+                arrow.get(dag_info['execution_date']).to('utc').naive)
+
+    def get_workflow_list(self, since_iso8601=None, cursor=None, limit=None):
         """
         Returns all top level workflows, filtering by the supplied
         since_iso8601 value.
         :param since_iso8601: An iso8601 format specifying a date
         boundary. Optional, defaults to 30 days prior
-        :returns: a list of workflow dictionaries
+        :param cursor: optional, the workflow id of the last workflow of a
+            prior page of results. Only workflows following this workflow
+            are returned.
+        :param limit: optional, the maximum number of workflows to return
+        :returns: a list of workflow dictionaries, ordered by execution date
+        """
+        return list(self.iter_workflows(since_iso8601=since_iso8601,
+                                        cursor=cursor,
+                                        limit=limit))
+
+    def iter_workflows(self, since_iso8601=None, cursor=None, limit=None):
+        """
+        Iterates over all top level workflows, filtering by the supplied
+        since_iso8601 value. The dag runs are read from the database as the
+        iteration proceeds, rather than being retrieved all at once.
+        Accepts the same parameters as get_workflow_list.
+        :returns: an iterator of workflow dictionaries, ordered by execution
+            date
         """
         threshold_date = WorkflowHelper._get_threshold_date(
             since_iso8601=since_iso8601
         )
-        dag_runs = self._get_all_dag_runs_db()
-        # only dags meeting the date criteria and are not subdags
-        # by convention subdags are parent.child named.
-        return [
-            WorkflowHelper._add_id_to_run(run) for run in dag_runs
-            if ('.' not in run.get('dag_id') and
-                arrow.get(run.get('execution_date')).naive >= threshold_date)
-        ]
+        cursor_dag_id, cursor_execution_date = (
+            WorkflowHelper._get_cursor_dag_run(cursor)
+        )
+        # the date criteria and the exclusion of subdags are applied by the
+        # database query
+        return (
+            WorkflowHelper._add_id_to_run(run)
+            for run in self._iter_workflow_dag_runs_db(
+                since=threshold_date,
+                cursor_dag_id=cursor_dag_id,
+                cursor_execution_date=cursor_execution_date,
+                limit=limit)
+        )
 
     def get_workflow(self, workflow_id):
         """
@@ -161,12 +208,19 @@ class WorkflowHelper(object):
 
         return self._get_tasks_by_id_db(**dag_info)
 
-    def _get_all_dag_runs_db(self):
+    def _iter_workflow_dag_runs_db(self, since, cursor_dag_id,
+                                   cursor_execution_date, limit):
         """
-        Wrapper for call to the airflow database to get all actions
-        :returns: a list of dag_runs dictionaries
+        Wrapper for call to the airflow database to iterate over the top
+        level dag runs
+        :returns: an iterator of dag_runs dictionaries
         """
-        return AIRFLOW_DB.get_all_dag_runs()
+        return AIRFLOW_DB.iter_workflow_dag_runs(
+            since=since,
+            cursor_dag_id=cursor_dag_id,
+            cursor_execution_date=cursor_execution_date,
+            limit=limit
+        )
 
     def _get_dag_run_like_id_db(self, dag_id, execution_date):
         """
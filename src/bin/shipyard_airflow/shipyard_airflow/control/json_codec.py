@@ -0,0 +1,109 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""JSON encoding and decoding for the API
+
+The codec used is selected by the [base] json_codec option, and is backed by
+the standard library json module by default. orjson is not a requirement of
+Shipyard; it is significantly faster at encoding large responses, and may be
+installed and selected to take advantage of that. Installing orjson does not
+change the codec used.
+
+Both codecs encode values that are not natively JSON serializable (e.g.
+datetimes) using str(), so the values produced do not depend on the codec in
+use. The whitespace used to separate items differs.
+"""
+import json
+import logging
+
+from oslo_config import cfg
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+# Raised by the loads method of every codec
+JSONDecodeError = json.JSONDecodeError
+
+
+class StdlibJsonCodec(object):
+    """JSON codec using the standard library json module"""
+    name = 'json'
+    # The separator between the items of an encoded list
+    item_separator = b', '
+
+    def dumps(self, obj):
+        """Encodes the object as a JSON string"""
+        return json.dumps(obj, default=str)
+
+    def dumpb(self, obj):
+        """Encodes the object as UTF-8 encoded JSON bytes"""
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, value):
+        """Decodes a JSON string or bytes"""
+        return json.loads(value)
+
+
+class OrjsonCodec(object):
+    """JSON codec using orjson"""
+    name = 'orjson'
+    item_separator = b','
+    # Datetimes are passed to the default function, so that they are
+    # formatted in the same way as by the standard library codec.
+    _options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+                if orjson is not None else None)
+
+    def dumps(self, obj):
+        """Encodes the object as a JSON string"""
+        return self.dumpb(obj).decode('utf-8')
+
+    def dumpb(self, obj):
+        """Encodes the object as UTF-8 encoded JSON bytes"""
+        return orjson.dumps(obj, default=str, option=self._options)
+
+    def loads(self, value):
+        """Decodes a JSON string or bytes"""
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(value)
+
+
+# The codecs that can be used in this environment, by name
+CODECS = {StdlibJsonCodec.name: StdlibJsonCodec()}
+if orjson is not None:
+    CODECS[OrjsonCodec.name] = OrjsonCodec()
+
+# The names of the configured codecs that are not available, for which a
+# warning has been logged
+_unavailable = set()
+
+
+def get_codec():
+    """Returns the codec used by the API, as configured by [base] json_codec
+
+    If the configured codec is not available (i.e. orjson is not installed),
+    the standard library codec is used.
+    """
+    name = CONF.base.json_codec
+    codec = CODECS.get(name)
+    if codec is None:
+        if name not in _unavailable:
+            _unavailable.add(name)
+            LOG.warning('The %s JSON codec is not available, using the %s '
+                        'JSON codec', name, StdlibJsonCodec.name)
+        codec = CODECS[StdlibJsonCodec.name]
+    return codec
@@ -17,25 +17,37 @@ to validate against the schemas.
 see: http://json-schema.org
 see: https://pypi.org/project/jsonschema/
 """
+import functools
 import json
 import logging
 
-from jsonschema import validate
 from jsonschema.exceptions import FormatError, SchemaError, ValidationError
+from jsonschema.validators import validator_for
 
 from shipyard_airflow.errors import AppError, InvalidFormatError
 
 LOG = logging.getLogger(__name__)
 
 
-def validate_json(json_string, schema):
+@functools.lru_cache(maxsize=None)
+def _get_validator(schema):
     """
-    invokes the validate function of jsonschema
+    Returns the validator for the schema (a json string), checking the
+    schema itself is valid. Validators are cached, so the schema is only
+    parsed and checked the first time it is used.
     """
     schema_dict = json.loads(schema)
-    schema_title = schema_dict['title']
+    validator_cls = validator_for(schema_dict)
+    validator_cls.check_schema(schema_dict)
+    return validator_cls(schema_dict)
+
+
+def validate_json(json_string, schema):
+    """
+    validates the json_string (already loaded json) against the schema
+    """
     try:
-        validate(json_string, schema_dict)
+        _get_validator(schema).validate(json_string)
     except ValidationError as err:
         title = 'JSON validation failed: {}'.format(err.message)
         description = 'Failed validator: {} : {}'.format(
@@ -50,7 +62,7 @@ def validate_json(json_string, schema):
         )
     except SchemaError as err:
         title = 'SchemaError: Unable to validate JSON: {}'.format(err)
-        description = 'Invalid Schema: {}'.format(schema_title)
+        description = 'Invalid Schema: {}'.format(_get_schema_title(schema))
         LOG.error(title)
         LOG.error(description)
         raise AppError(
@@ -59,7 +71,7 @@ def validate_json(json_string, schema):
         )
     except FormatError as err:
         title = 'FormatError: Unable to validate JSON: {}'.format(err)
-        description = 'Invalid Format: {}'.format(schema_title)
+        description = 'Invalid Format: {}'.format(_get_schema_title(schema))
         LOG.error(title)
         LOG.error(description)
         raise AppError(
@@ -68,6 +80,11 @@ def validate_json(json_string, schema):
         )
 
 
+def _get_schema_title(schema):
+    # the title of the schema, for use in error messages
+    return json.loads(schema).get('title')
+
+
 # The action resource structure
 ACTION = '''
     {
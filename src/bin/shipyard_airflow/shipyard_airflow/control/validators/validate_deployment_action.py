@@ -42,7 +42,8 @@ class ValidateDeploymentAction:
                 dh_client,
                 self.doc_revision,
                 [(ValidateDeploymentConfigurationFull,
-                  CONF.document_info.deployment_configuration_name)]
+                  CONF.document_info.deployment_configuration_name)],
+                index_dir=CONF.document_info.rendered_document_index_dir
             )
         else:
             # Perform a basic validation only
@@ -50,7 +51,8 @@ class ValidateDeploymentAction:
                 dh_client,
                 self.doc_revision,
                 [(ValidateDeploymentConfigurationBasic,
-                  CONF.document_info.deployment_configuration_name)]
+                  CONF.document_info.deployment_configuration_name)],
+                index_dir=CONF.document_info.rendered_document_index_dir
             )
 
     def validate(self):
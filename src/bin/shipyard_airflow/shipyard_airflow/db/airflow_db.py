@@ -23,6 +23,10 @@ from shipyard_airflow.db.errors import AirflowStateError
 
 CONF = cfg.CONF
 
+# The number of dag runs read from the database at a time while iterating over
+# workflows
+WORKFLOW_BATCH_SIZE = 500
+
 
 class AirflowDbAccess(DbAccess):
     """
@@ -33,7 +37,11 @@ class AirflowDbAccess(DbAccess):
     for airflow to work around lack of API and feature functionality.
     """
 
-    SELECT_ALL_DAG_RUNS = sqlalchemy.sql.text('''
+    # Workflows are the top level dag runs; by convention subdags are named
+    # parent.child. Ordered so that the dag_id and execution_date of the last
+    # row (i.e. the workflow id) can be used as the cursor for the next page.
+    # A null limit returns all rows.
+    SELECT_WORKFLOW_DAG_RUNS = sqlalchemy.sql.text('''
     SELECT
         "id",
         "dag_id",
@@ -46,6 +54,69 @@ class AirflowDbAccess(DbAccess):
         "start_date"
     FROM
         dag_run
+    WHERE
+        dag_id NOT LIKE '%.%'
+    AND
+        execution_date >= :since
+    AND
+        (CAST(:cursor_dag_id AS VARCHAR) IS NULL OR
+         (execution_date, dag_id) >
+             (:cursor_execution_date, CAST(:cursor_dag_id AS VARCHAR)))
+    ORDER BY
+        execution_date, dag_id
+    LIMIT :limit
+    ''')
+
+    # The end date is exclusive, allowing for execution dates that have been
+    # truncated to the second to be used as the bounds of the range.
+    SELECT_DAG_RUNS_BY_EXECUTION_RANGE = sqlalchemy.sql.text('''
+    SELECT
+        "id",
+        "dag_id",
+        "execution_date",
+        "state",
+        "run_id",
+        "external_trigger",
+        "conf",
+        "end_date",
+        "start_date"
+    FROM
+        dag_run
+    WHERE
+        execution_date >= :start_date
+    AND
+        execution_date < :end_date
+    ''')
+
+    # Shipyard invokes dags using the action id as the run_id. The lookup is
+    # limited to the run ids and dag ids of the actions being listed, which
+    # allows the (dag_id, run_id) unique index of dag_run to be used. A null
+    # state is only included when include_null is true.
+    SELECT_RUN_IDS_BY_STATE = sqlalchemy.sql.text('''
+    SELECT
+        "run_id"
+    FROM
+        dag_run
+    WHERE
+        dag_id = ANY(:dag_ids)
+    AND
+        run_id = ANY(:run_ids)
+    AND
+        (state = ANY(:states) OR (:include_null AND state IS NULL))
+    ''')
+
+    # A dag run without a state is treated as being in the 'none' state
+    SELECT_RUN_IDS_NOT_IN_STATE = sqlalchemy.sql.text('''
+    SELECT
+        "run_id"
+    FROM
+        dag_run
+    WHERE
+        dag_id = ANY(:dag_ids)
+    AND
+        run_id = ANY(:run_ids)
+    AND
+        COALESCE(state, 'none') <> ALL(:states)
     ''')
 
     SELECT_DAG_RUNS_BY_ID = sqlalchemy.sql.text('''
@@ -115,6 +186,44 @@ class AirflowDbAccess(DbAccess):
         start_date
     ''')
 
+    # The dag ids and execution dates are parallel arrays, each pair of which
+    # identifies a dag run. As with SELECT_TASKS_BY_ID, the dag id is used as
+    # a prefix so that the tasks of subdags are also selected.
+    SELECT_TASKS_BY_DAG_RUNS = sqlalchemy.sql.text('''
+    SELECT
+        ti."task_id",
+        ti."dag_id",
+        ti."execution_date",
+        ti."start_date",
+        ti."end_date",
+        ti."duration",
+        ti."state",
+        ti."try_number",
+        ti."hostname",
+        ti."unixname",
+        ti."job_id",
+        ti."pool",
+        ti."queue",
+        ti."priority_weight",
+        ti."operator",
+        ti."queued_dttm",
+        ti."pid",
+        ti."max_tries"
+    FROM
+        task_instance ti
+    JOIN
+        unnest(CAST(:dag_ids AS VARCHAR[]),
+               CAST(:execution_dates AS TIMESTAMP WITH TIME ZONE[]))
+            AS dr (dag_id, execution_date)
+    ON
+        ti.execution_date = dr.execution_date
+    AND
+        ti.dag_id LIKE dr.dag_id || '%'
+    ORDER BY
+        ti.priority_weight desc,
+        ti.start_date
+    ''')
+
     # The like parameter must have '%' appropriately applied to the args
     # used to merge into this query.
     SELECT_TASKS_BY_ID = sqlalchemy.sql.text('''
@@ -148,6 +257,56 @@ class AirflowDbAccess(DbAccess):
         start_date
     ''')
 
+    # Selects a dag run along with the tasks of the dag run and its subdags,
+    # one row per task. The columns of the dag run are prefixed with
+    # 'dag_run_' to distinguish them from those of the task. A dag run without
+    # tasks results in a single row having null task columns.
+    SELECT_DAG_RUN_WITH_TASKS = sqlalchemy.sql.text('''
+    SELECT
+        dr."id" AS "dag_run_id",
+        dr."dag_id" AS "dag_run_dag_id",
+        dr."execution_date" AS "dag_run_execution_date",
+        dr."state" AS "dag_run_state",
+        dr."run_id" AS "dag_run_run_id",
+        dr."external_trigger" AS "dag_run_external_trigger",
+        dr."conf" AS "dag_run_conf",
+        dr."end_date" AS "dag_run_end_date",
+        dr."start_date" AS "dag_run_start_date",
+        ti."task_id",
+        ti."dag_id",
+        ti."execution_date",
+        ti."start_date",
+        ti."end_date",
+        ti."duration",
+        ti."state",
+        ti."try_number",
+        ti."hostname",
+        ti."unixname",
+        ti."job_id",
+        ti."pool",
+        ti."queue",
+        ti."priority_weight",
+        ti."operator",
+        ti."queued_dttm",
+        ti."pid",
+        ti."max_tries"
+    FROM
+        dag_run dr
+    LEFT JOIN
+        task_instance ti
+    ON
+        ti.execution_date = dr.execution_date
+    AND
+        ti.dag_id LIKE dr.dag_id || '%'
+    WHERE
+        dr.dag_id = :dag_id
+    AND
+        dr.execution_date = :execution_date
+    ORDER BY
+        ti.priority_weight desc,
+        ti.start_date
+    ''')
+
     UPDATE_DAG_RUN_STATUS = sqlalchemy.sql.text('''
     UPDATE
         dag_run
@@ -168,11 +327,83 @@ class AirflowDbAccess(DbAccess):
         """
         return CONF.base.postgresql_airflow_db
 
-    def get_all_dag_runs(self):
+    def iter_workflow_dag_runs(self, since, cursor_dag_id=None,
+                               cursor_execution_date=None, limit=None):
         """
-        Retrieves all dag runs.
+        Iterates over the top level (non-subdag) dag runs having an execution
+        date at or after the since datetime, ordered by execution date and
+        dag id, without retrieving them all at once.
+        The dag runs are read WORKFLOW_BATCH_SIZE at a time, each batch by a
+        separate query, so that a database connection is not held while the
+        dag runs are consumed.
+        :param since: the datetime bounding the execution dates
+        :param cursor_dag_id: optional, with cursor_execution_date identifies
+            the last dag run of a prior page of results. Only the dag runs
+            following this dag run are returned.
+        :param cursor_execution_date: optional, see cursor_dag_id
+        :param limit: optional, the maximum number of dag runs to return
         """
-        return self.get_as_dict_array(AirflowDbAccess.SELECT_ALL_DAG_RUNS)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch_limit = WORKFLOW_BATCH_SIZE
+            if remaining is not None:
+                batch_limit = min(remaining, WORKFLOW_BATCH_SIZE)
+            dag_runs = self.get_as_dict_array(
+                AirflowDbAccess.SELECT_WORKFLOW_DAG_RUNS,
+                since=since,
+                cursor_dag_id=cursor_dag_id,
+                cursor_execution_date=cursor_execution_date,
+                limit=batch_limit)
+            yield from dag_runs
+            if len(dag_runs) < batch_limit:
+                return
+            cursor_dag_id = dag_runs[-1]['dag_id']
+            cursor_execution_date = dag_runs[-1]['execution_date']
+            if remaining is not None:
+                remaining -= len(dag_runs)
+
+    def get_dag_runs_by_execution_range(self, start_date, end_date):
+        """
+        Retrieves dag runs having an execution date from the start date
+        (inclusive) to the end date (exclusive)
+        """
+        return self.get_as_dict_array(
+            AirflowDbAccess.SELECT_DAG_RUNS_BY_EXECUTION_RANGE,
+            start_date=start_date,
+            end_date=end_date)
+
+    def get_run_ids_by_state(self, states, run_ids, dag_ids):
+        """
+        Retrieves the run ids, among those specified, of dag runs that are in
+        one of the states
+        :param states: a list of dag run states. A value of 'none' in the
+            list indicates that dag runs without a state should be included
+        :param run_ids: the run ids of the dag runs considered
+        :param dag_ids: the dag ids of the dag runs considered
+        """
+        dag_runs = self.get_as_dict_array(
+            AirflowDbAccess.SELECT_RUN_IDS_BY_STATE,
+            states=list(states),
+            include_null='none' in states,
+            run_ids=list(run_ids),
+            dag_ids=list(dag_ids))
+        return [dag_run['run_id'] for dag_run in dag_runs]
+
+    def get_run_ids_not_in_state(self, states, run_ids, dag_ids):
+        """
+        Retrieves the run ids, among those specified, of dag runs that are
+        not in any of the states
+        :param states: a list of dag run states. A value of 'none' in the
+            list indicates that dag runs without a state should be excluded
+        :param run_ids: the run ids of the dag runs considered
+        :param dag_ids: the dag ids of the dag runs considered
+        """
+        dag_runs = self.get_as_dict_array(
+            AirflowDbAccess.SELECT_RUN_IDS_NOT_IN_STATE,
+            states=list(states),
+            run_ids=list(run_ids),
+            dag_ids=list(dag_ids))
+        return [dag_run['run_id'] for dag_run in dag_runs]
 
     def get_dag_runs_by_id(self, dag_id, execution_date):
         """
@@ -199,6 +430,20 @@ class AirflowDbAccess(DbAccess):
         """
         return self.get_as_dict_array(AirflowDbAccess.SELECT_ALL_TASKS)
 
+    def get_tasks_by_dag_runs(self, dag_runs):
+        """
+        Retrieves tasks for a set of dag runs, including the tasks of their
+        subdags, using a single query.
+        :param dag_runs: an iterable of (dag_id, execution_date) tuples
+        """
+        dag_runs = list(dag_runs)
+        if not dag_runs:
+            return []
+        return self.get_as_dict_array(
+            AirflowDbAccess.SELECT_TASKS_BY_DAG_RUNS,
+            dag_ids=[dag_id for dag_id, _ in dag_runs],
+            execution_dates=[exec_date for _, exec_date in dag_runs])
+
     def get_tasks_by_id(self, dag_id, execution_date):
         """
         Retrieves tasks by dag id and execution date
@@ -208,6 +453,33 @@ class AirflowDbAccess(DbAccess):
             dag_id=dag_id + '%',
             execution_date=execution_date)
 
+    def get_dag_run_with_tasks(self, dag_id, execution_date):
+        """
+        Retrieves a dag run by dag id and execution date, along with the tasks
+        of the dag run and its subdags, using a single query.
+        :returns: a tuple of (dag run, list of tasks). The dag run is None if
+            there is no matching dag run.
+        """
+        prefix = 'dag_run_'
+        rows = self.get_as_dict_array(
+            AirflowDbAccess.SELECT_DAG_RUN_WITH_TASKS,
+            dag_id=dag_id,
+            execution_date=execution_date)
+        if not rows:
+            return None, []
+        dag_run = {
+            key[len(prefix):]: value
+            for key, value in rows[0].items() if key.startswith(prefix)
+        }
+        tasks = [
+            {
+                key: value
+                for key, value in row.items() if not key.startswith(prefix)
+            }
+            for row in rows if row['task_id'] is not None
+        ]
+        return dag_run, tasks
+
     def stop_dag_run(self, dag_id, execution_date):
         """
         Triggers an update to set a dag_run to failed state
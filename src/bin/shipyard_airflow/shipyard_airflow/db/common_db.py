@@ -20,6 +20,7 @@ import logging
 from oslo_config import cfg
 import sqlalchemy
 
+from shipyard_airflow.common.db_pool.pool_registry import ENGINE_POOLS
 from shipyard_airflow.errors import DatabaseError
 
 CONF = cfg.CONF
@@ -41,6 +42,7 @@ class DbAccess:
         self.pool_pre_ping = CONF.base.pool_pre_ping
         self.pool_recycle = CONF.base.connection_recycle
         self.pool_timeout = CONF.base.pool_timeout
+        self.statement_timeout = CONF.base.statement_timeout
 
     def get_connection_string(self):
         """
@@ -58,23 +60,19 @@ class DbAccess:
 
     def get_engine(self):
         """
-        Returns the engine for airflow
+        Returns the engine for the database. Engines are shared by all
+        users of the same connection string within the process.
         """
         try:
             connection_string = self.get_connection_string()
             if connection_string is not None and self.engine is None:
-                LOG.info('Initializing connection <%s> with pool size: %d, '
-                         'max overflow: %d, pool pre ping: %s, pool '
-                         'recycle: %d, and pool timeout: %d',
-                         connection_string, self.pool_size, self.max_overflow,
-                         self.pool_pre_ping, self.pool_recycle,
-                         self.pool_timeout)
-                self.engine = sqlalchemy.create_engine(
+                self.engine = ENGINE_POOLS.get_engine(
                     connection_string, pool_size=self.pool_size,
                     max_overflow=self.max_overflow,
                     pool_pre_ping=self.pool_pre_ping,
                     pool_recycle=self.pool_recycle,
-                    pool_timeout=self.pool_timeout
+                    pool_timeout=self.pool_timeout,
+                    statement_timeout=self.statement_timeout
                 )
             if self.engine is None:
                 self._raise_invalid_db_config(
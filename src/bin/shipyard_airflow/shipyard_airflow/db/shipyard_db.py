@@ -21,6 +21,7 @@ import os
 import sqlalchemy
 from alembic import command as alembic_command
 from alembic.config import Config
+from dateutil.parser import parse
 from oslo_config import cfg
 
 from shipyard_airflow.db.common_db import DbAccess
@@ -48,6 +49,33 @@ class ShipyardDbAccess(DbAccess):
         actions
     ''')
 
+    # Each of the optional filters is disabled by passing a null value,
+    # allowing a single statement to serve any combination of filters.
+    # Results are ordered by the (ULID) id, which allows the id to be used as
+    # a cursor for the next page of results.
+    SELECT_ACTIONS_FILTERED = sqlalchemy.sql.text('''
+    SELECT
+        "id",
+        "name",
+        "parameters",
+        "dag_id",
+        "dag_execution_date",
+        "user",
+        "datetime",
+        "context_marker"
+    FROM
+        actions
+    WHERE
+        (:cursor IS NULL OR "id" > :cursor)
+    AND
+        (:since IS NULL OR "datetime" >= :since)
+    AND
+        (:name IS NULL OR "name" = :name)
+    ORDER BY
+        "id"
+    LIMIT :limit
+    ''')
+
     SELECT_ACTION_BY_ID = sqlalchemy.sql.text('''
     SELECT
         "id",
@@ -64,6 +92,50 @@ class ShipyardDbAccess(DbAccess):
         id = :action_id
     ''')
 
+    # The validations and command audit records of the action are aggregated
+    # as json arrays, allowing an action's details to be retrieved in a single
+    # query.
+    SELECT_ACTION_DETAIL_BY_ID = sqlalchemy.sql.text('''
+    SELECT
+        a."id",
+        a."name",
+        a."parameters",
+        a."dag_id",
+        a."dag_execution_date",
+        a."user",
+        a."datetime",
+        a."context_marker",
+        (SELECT
+            COALESCE(json_agg(json_build_object(
+                'id', v."id",
+                'action_id', v."action_id",
+                'validation_name', v."validation_name",
+                'details', v."details"
+            ) ORDER BY v."id"), CAST('[]' AS JSON))
+        FROM
+            preflight_validation_failures v
+        WHERE
+            v.action_id = a.id
+        ) AS "validations",
+        (SELECT
+            COALESCE(json_agg(json_build_object(
+                'id', c."id",
+                'action_id', c."action_id",
+                'command', c."command",
+                'user', c."user",
+                'datetime', c."datetime"
+            ) ORDER BY c."datetime", c."id"), CAST('[]' AS JSON))
+        FROM
+            action_command_audit c
+        WHERE
+            c.action_id = a.id
+        ) AS "command_audit"
+    FROM
+        actions a
+    WHERE
+        a.id = :action_id
+    ''')
+
     INSERT_ACTION = sqlalchemy.sql.text('''
     INSERT INTO
         actions (
@@ -205,6 +277,39 @@ class ShipyardDbAccess(DbAccess):
         "id" = :id
     ''')
 
+    # Results of the validations of Deckhand revisions by other components
+    SELECT_VALIDATION_RESULTS_BY_REVISION = sqlalchemy.sql.text('''
+    SELECT
+        "validator",
+        "endpoint",
+        "result"
+    FROM
+        validation_results
+    WHERE
+        "revision_id" = :revision_id
+    ''')
+
+    # Insert or replace the result of a validation of a revision
+    UPSERT_VALIDATION_RESULT = sqlalchemy.sql.text('''
+    INSERT INTO
+        validation_results (
+            "revision_id",
+            "validator",
+            "endpoint",
+            "result",
+            "datetime"
+        )
+    VALUES (
+        :revision_id,
+        :validator,
+        :endpoint,
+        :result,
+        CURRENT_TIMESTAMP )
+    ON CONFLICT ("revision_id", "validator", "endpoint") DO UPDATE SET
+        "result" = EXCLUDED."result",
+        "datetime" = EXCLUDED."datetime"
+    ''')
+
     def __init__(self):
         DbAccess.__init__(self)
 
@@ -241,6 +346,24 @@ class ShipyardDbAccess(DbAccess):
         """
         return self.get_as_dict_array(ShipyardDbAccess.SELECT_ALL_ACTIONS)
 
+    def get_submitted_actions(self, cursor=None, limit=None, since=None,
+                              name=None):
+        """
+        Retrieves actions, ordered by id, using the supplied filters.
+        :param cursor: optional, only actions having an id greater than this
+            action id are returned
+        :param limit: optional, the maximum number of actions to return
+        :param since: optional, a datetime; only actions invoked at or after
+            this time are returned
+        :param name: optional, only actions with this name are returned
+        """
+        return self.get_as_dict_array(
+            ShipyardDbAccess.SELECT_ACTIONS_FILTERED,
+            cursor=cursor,
+            limit=limit,
+            since=since,
+            name=name)
+
     def get_action_by_id(self, action_id):
         """
         Get a single action
@@ -253,6 +376,24 @@ class ShipyardDbAccess(DbAccess):
         # Not found
         return None
 
+    def get_action_detail_by_id(self, action_id):
+        """
+        Get a single action, including the validations and command audit
+        records of the action, using a single query
+        :param action_id: the id of the action to retrieve
+        """
+        actions_array = self.get_as_dict_array(
+            ShipyardDbAccess.SELECT_ACTION_DETAIL_BY_ID, action_id=action_id)
+        if not actions_array:
+            # Not found
+            return None
+        action = actions_array[0]
+        # json represents the timestamps as strings; restore them to the
+        # datetimes that are returned when the records are queried directly
+        for audit in action['command_audit']:
+            audit['datetime'] = parse(audit['datetime'])
+        return action
+
     def get_preflight_validation_fails(self):
         """
         Retrieves the summary set of preflight validation failures
@@ -293,6 +434,31 @@ class ShipyardDbAccess(DbAccess):
                             timestamp=action['timestamp'],
                             context_marker=action['context_marker'])
 
+    def get_validation_results(self, revision_id):
+        """
+        Retrieves the stored results of the validations of a revision
+        Each result is a dictionary of the validator, endpoint and result
+        (the decoded json response of the validator).
+        """
+        results = self.get_as_dict_array(
+            ShipyardDbAccess.SELECT_VALIDATION_RESULTS_BY_REVISION,
+            revision_id=revision_id)
+        for result in results:
+            result['result'] = json.loads(result['result'])
+        return results
+
+    def insert_validation_result(self, revision_id, validator, endpoint,
+                                 result):
+        """
+        Stores the result of a validation of a revision, replacing any
+        result already stored for the revision, validator and endpoint
+        """
+        self.perform_insert(ShipyardDbAccess.UPSERT_VALIDATION_RESULT,
+                            revision_id=revision_id,
+                            validator=validator,
+                            endpoint=endpoint,
+                            result=json.dumps(result))
+
     def get_command_audit_by_action_id(self, action_id):
         """
         Retreives the action audit records for a given action id
@@ -17,6 +17,18 @@ import time
 from kubernetes import client
 from kubernetes import config
 
+try:
+    from k8s_watch import list_and_watch
+except ImportError:
+    from shipyard_airflow.plugins.k8s_watch import list_and_watch
+
+# The label Kubernetes sets on a node to the hostname of the node, which is
+# the name of the node for nodes deployed by Drydock
+HOSTNAME_LABEL = 'kubernetes.io/hostname'
+# The most node names included in a label selector for a watch. Beyond this,
+# all nodes are watched.
+MAX_SELECTED_NODES = 100
+
 
 def check_node_status(time_out, interval, expected_nodes):
     """This function retrieves the current state of the nodes in the
@@ -136,3 +148,122 @@ def _get_all_k8s_node_status():
         # Log some diagnostics and return None.
         logging.warning("There was an error retrieving the cluster status",
                         exc_info=True)
+
+
+def wait_for_node_status(time_out, interval, expected_nodes):
+    """Waits for the expected nodes to reach the Ready state in the
+       Kubernetes cluster, watching the nodes for changes.
+
+       Rather than retrieving all the nodes at an interval, the current
+       state of the expected nodes is listed once, and changes are then
+       watched from the resource version of the list, so that a node is
+       seen to be ready as soon as its status changes. The wait ends as
+       soon as the last expected node is ready, or the time out elapses.
+
+       :param time_out: The seconds in which the nodes should reach the
+           Ready state
+       :param interval: The seconds to wait before retrying if the nodes
+           cannot be listed or watched
+       :param expected_nodes: The names of the nodes to wait for
+       :returns: The list of expected nodes that are not ready
+    """
+    if not expected_nodes:
+        return []
+
+    tracker = NodeReadinessTracker(expected_nodes)
+    list_and_watch(_get_list_node,
+                   tracker.handle_event,
+                   lambda: tracker.all_ready,
+                   time.monotonic() + max(int(time_out), 1),
+                   interval,
+                   **_node_selector(tracker.expected_nodes))
+
+    not_ready_node_list = tracker.not_ready_nodes()
+    if not_ready_node_list:
+        logging.info("Timed Out! Nodes [%s] did not reach ready state",
+                     ", ".join(not_ready_node_list))
+    else:
+        logging.info("All expected nodes are in ready state")
+    return not_ready_node_list
+
+
+class NodeReadinessTracker:
+    """Tracks which of the expected nodes have reached the Ready state
+
+    A node that has been seen as ready remains ready.
+
+    :param expected_nodes: The names of the nodes to track
+    """
+    def __init__(self, expected_nodes):
+        # the expected nodes, in order and without duplicates
+        self.expected_nodes = list(dict.fromkeys(expected_nodes))
+        self._not_ready = set(self.expected_nodes)
+
+    @property
+    def all_ready(self):
+        return not self._not_ready
+
+    def not_ready_nodes(self):
+        """Returns the list of expected nodes that are not ready"""
+        return [node for node in self.expected_nodes
+                if node in self._not_ready]
+
+    def handle_event(self, event_type, node):
+        """Updates the tracking from a watch event of a node"""
+        if event_type in ('ADDED', 'MODIFIED'):
+            self.update(node)
+
+    def update(self, node):
+        """Updates the tracking from a node object
+
+        :param node: A V1Node object
+        """
+        try:
+            node_name = node.metadata.name
+        except AttributeError:
+            logging.warning("Malformed node status response object. "
+                            "Processing continues with the next item",
+                            exc_info=True)
+            return
+        if node_name not in self._not_ready:
+            return
+
+        ready, message = _ready_condition(node)
+        if ready:
+            self._not_ready.discard(node_name)
+            logging.info("Node %s is in ready state. Remaining expected "
+                         "nodes to join cluster: %d", node_name,
+                         len(self._not_ready))
+        else:
+            logging.info("Node %s is not ready. Status is: %s", node_name,
+                         message)
+
+
+def _ready_condition(node):
+    """Returns the (ready, message) of the Ready condition of a node"""
+    try:
+        for condition in node.status.conditions or []:
+            if condition.type == 'Ready':
+                return condition.status == 'True', condition.message
+    except (AttributeError, TypeError):
+        logging.warning("Malformed node status response object",
+                        exc_info=True)
+    return False, 'No Ready condition'
+
+
+def _node_selector(node_names):
+    """Returns the selector arguments limiting a list or watch of nodes to
+    the named nodes, where possible"""
+    if len(node_names) == 1:
+        return {'field_selector': 'metadata.name={}'.format(node_names[0])}
+    if len(node_names) <= MAX_SELECTED_NODES:
+        return {'label_selector': '{} in ({})'.format(
+            HOSTNAME_LABEL, ','.join(node_names))}
+    return {}
+
+
+def _get_list_node():
+    """Returns the function that lists the nodes of the cluster"""
+    # Note that we are using 'in_cluster_config'
+    config.load_incluster_config()
+    return client.CoreV1Api().list_node
@@ -18,14 +18,23 @@ import time
 from airflow.exceptions import AirflowException
 from kubernetes import client, config
 
+try:
+    from k8s_watch import list_and_watch
+except ImportError:
+    from shipyard_airflow.plugins.k8s_watch import list_and_watch
 
-def check_pods_status(required_pods):
-    """This function retrieves the current state of pods in the
-       Kubernetes cluster. We can use it to check that all the pods
-       that are of interest to us are up in the cluster. Function
-       returns boolean True/False and queries every 30 seconds.
+# The phases of a pod that is considered ready
+READY_PHASES = ('Succeeded', 'Running')
 
-       :param required_pods: List of pods that are of interest to us
+
+def check_pods_status(required_pods, time_out=30):
+    """This function checks that all the pods that are of interest to us
+       are up in the cluster, waiting up to the time out for them to be
+       ready. Function returns boolean True/False.
+
+       :param required_pods: List of pod name prefixes that are of interest
+           to us
+       :param time_out: The seconds to wait for the pods to be ready
 
         Example::
 
@@ -38,35 +47,158 @@ def check_pods_status(required_pods):
         while not pods_ready:
             pods_ready = check_pods_status(required_pods)
     """
-    # Note that we are using 'in_cluster_config'
-    config.load_incluster_config()
-    v1 = client.CoreV1Api()
-    ret = v1.list_pod_for_all_namespaces(watch=False)
+    readiness = wait_for_pods_ready(required_pods, time_out)
+    missing = [prefix for prefix, status in readiness.items()
+               if not status['pods']]
+    if missing:
+        # Raise Execptions if the pod does not exits in the
+        # Kubernetes cluster
+        raise AirflowException(
+            "Unable to locate pod(s) {}".format(", ".join(missing)))
+    # Return True when all required pods are in 'Succeeded' or
+    # 'Running' state
+    return all(status['ready'] for status in readiness.values())
+
 
-    # Loop through items to get the status of the pod
-    for i in ret.items:
-        for pod_name in required_pods:
-            if pod_name in i.metadata.name:
+def wait_for_pods_ready(required_pods, time_out, interval=5,
+                        namespace=None, label_selector=None):
+    """Waits for the pods whose names start with each of the required
+       prefixes to be in the 'Succeeded' or 'Running' state.
 
-                # Return Boolean 'False' if required pods are not in
-                # 'Succeeded' or 'Running' state
-                if i.status.phase not in ['Succeeded', 'Running']:
-                    logging.info("Pods are not in ready state...")
-                    logging.info("%s is in %s state", i.metadata.name,
-                                 i.status.phase)
-                    logging.info("Wait for 30 seconds...")
+       The pods are listed once, then watched for changes, so that the wait
+       ends as soon as the pods of every prefix are ready, or the time out
+       elapses.
 
-                    # Back off for 30 seconds
-                    time.sleep(30)
+       :param required_pods: The pod name prefixes to wait for
+       :param time_out: The seconds to wait for the pods to be ready
+       :param interval: The seconds to wait before retrying if the pods
+           cannot be listed or watched
+       :param namespace: Optional, the namespace of the pods. By default,
+           the pods of all namespaces are watched.
+       :param label_selector: Optional, a label selector of the pods
+       :returns: A dictionary of the readiness of the pods of each prefix,
+           e.g. {'ceph-': {'ready': False, 'pods': 3, 'ready_pods': 2}}. A
+           prefix is ready if it has pods, and all of them are ready.
+    """
+    tracker = PodReadinessTracker(required_pods)
+    if not tracker.prefixes:
+        return {}
 
-                    return False
+    list_args = ()
+    if namespace:
+        list_args = (namespace,)
+    list_kwargs = {}
+    if label_selector:
+        list_kwargs['label_selector'] = label_selector
+    list_and_watch(lambda: _get_list_pod(namespace),
+                   tracker.handle_event,
+                   lambda: tracker.all_ready,
+                   time.monotonic() + max(int(time_out), 1),
+                   interval,
+                   list_args=list_args,
+                   on_list=tracker.clear,
+                   **list_kwargs)
 
-            # Raise Execptions if the pod does not exits in the
-            # Kubernetes cluster
-            else:
-                raise AirflowException("Unable to locate pod(s) ",
-                                       pod_name)
+    readiness = tracker.readiness()
+    for prefix, status in readiness.items():
+        logging.info("Pods %s*: %d of %d ready", prefix,
+                     status['ready_pods'], status['pods'])
+    return readiness
 
-    # Return True when all required pods are in 'Succeeded' or
-    # 'Running' state
-    return True
+
+class PodReadinessTracker:
+    """Tracks the readiness of the pods whose names start with each of a
+    set of prefixes
+
+    Pods are indexed by prefix, found for a pod name by looking up the
+    leading characters of the name for each of the prefix lengths.
+
+    :param prefixes: The pod name prefixes to track
+    """
+    def __init__(self, prefixes):
+        self.prefixes = list(dict.fromkeys(prefixes or []))
+        self._prefix_lengths = sorted({len(prefix)
+                                       for prefix in self.prefixes})
+        # The readiness of the pods of each prefix, by (namespace, name)
+        self._pods = {prefix: {} for prefix in self.prefixes}
+
+    @property
+    def all_ready(self):
+        return all(pods and all(pods.values())
+                   for pods in self._pods.values())
+
+    def clear(self):
+        """Discards the pods tracked"""
+        for pods in self._pods.values():
+            pods.clear()
+
+    def readiness(self):
+        """Returns the readiness of the pods of each prefix"""
+        return {
+            prefix: {
+                'ready': bool(pods) and all(pods.values()),
+                'pods': len(pods),
+                'ready_pods': sum(1 for ready in pods.values() if ready)
+            }
+            for prefix, pods in self._pods.items()
+        }
+
+    def handle_event(self, event_type, pod):
+        """Updates the tracking from a watch event of a pod
+
+        :param event_type: ADDED, MODIFIED or DELETED
+        :param pod: A V1Pod object
+        """
+        try:
+            name = pod.metadata.name
+            key = (pod.metadata.namespace, name)
+            phase = pod.status.phase
+        except AttributeError:
+            logging.warning("Malformed pod status response object",
+                            exc_info=True)
+            return
+
+        if event_type != 'DELETED' and _is_ignored(pod):
+            # Left in place of a pod that has been replaced, see below
+            logging.warning("%s is in %s state with status %s", name, phase,
+                            pod.status)
+            event_type = 'DELETED'
+        for length in self._prefix_lengths:
+            pods = self._pods.get(name[:length])
+            if pods is None:
+                continue
+            if event_type == 'DELETED':
+                pods.pop(key, None)
+                continue
+            ready = phase in READY_PHASES
+            if pods.get(key) != ready:
+                logging.info("%s is in %s state", name, phase)
+            pods[key] = ready
+
+
+def _is_ignored(pod):
+    """Indicates if a pod that is not ready is not a failure
+
+    Kubelet receives information about the pods and node from etcd after a
+    restart. It seems that it is possible for kubelet to set the pod status
+    to 'MatchNodeSelector' after a hard reboot of the node. This might happen
+    if the labels in the initial node info is different from the node info
+    in etcd, which will in turn cause the pod admission to fail. As the
+    system does recover after a hard reboot with new pods created for
+    various services, such failed pods are not tracked, to avoid false
+    alarms.
+    """
+    return (pod.status.phase == 'Failed' and
+            pod.status.container_statuses is None and
+            pod.status.reason == 'MatchNodeSelector')
+
+
+def _get_list_pod(namespace=None):
+    """Returns the function that lists the pods of a namespace, or all the
+    pods of the cluster"""
+    # Note that we are using 'in_cluster_config'
+    config.load_incluster_config()
+    core_v1 = client.CoreV1Api()
+    if namespace:
+        return core_v1.list_namespaced_pod
+    return core_v1.list_pod_for_all_namespaces
@@ -32,6 +32,10 @@ except ImportError:
         DeckhandClientFactory
     )
     from shipyard_airflow.plugins.xcom_puller import XcomPuller
+from shipyard_airflow.common.document_validators.document_validation_utils \
+    import DocumentValidationUtils
+from shipyard_airflow.common.document_validators.errors import \
+    DocumentNotFoundError
 from shipyard_airflow.shipyard_const import CustomHeaders
 
 LOG = logging.getLogger(__name__)
@@ -56,8 +60,10 @@ class DeploymentConfigurationOperator(BaseOperator):
         "physical_provisioner.destroy_interval": 30,
         "physical_provisioner.destroy_timeout": 900,
         "physical_provisioner.join_wait": 120,
+        "physical_provisioner.max_concurrent_tasks": 1,
         "physical_provisioner.prepare_node_interval": 30,
         "physical_provisioner.prepare_node_timeout": 1800,
+        "physical_provisioner.prepare_look_ahead": 0,
         "physical_provisioner.prepare_site_interval": 10,
         "physical_provisioner.prepare_site_timeout": 300,
         "physical_provisioner.verify_interval": 10,
@@ -156,13 +162,29 @@ class DeploymentConfigurationOperator(BaseOperator):
                 CustomHeaders.END_USER.value: end_user
             }
 
+        index_dir = self.config.get(DOCUMENT_INFO,
+                                    'rendered_document_index_dir',
+                                    fallback='')
         try:
             dhclient = DeckhandClientFactory(
                 self.shipyard_conf).get_client(addl_headers=addl_headers)
             LOG.info("Deckhand Client acquired")
+            if index_dir:
+                # Looked up in the local index of the rendered documents of
+                # the revision, which the other operators also use
+                doc_utils = DocumentValidationUtils(dhclient,
+                                                    index_dir=index_dir)
+                doc_dict = doc_utils.get_unique_doc(revision_id=revision_id,
+                                                    name=name,
+                                                    schema=schema)
+                LOG.info("DeploymentConfiguration retrieved")
+                return doc_dict
             doc = dhclient.revisions.documents(revision_id,
                                                rendered=True,
                                                **filters)
+        except DocumentNotFoundError:
+            raise AirflowException("A valid deployment-configuration is "
+                                   "required")
         except Exception as ex:
             try:
                 failed_url = ex.url
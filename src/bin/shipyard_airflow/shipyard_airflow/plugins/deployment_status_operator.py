@@ -125,8 +125,11 @@ class DeploymentStatusOperator(BaseOperator):
         doc_name = config.get('document_info', 'deployment_version_name')
         doc_schema = config.get('document_info', 'deployment_version_schema')
 
+        index_dir = config.get('document_info',
+                               'rendered_document_index_dir', fallback='')
+
         dh_client = DeckhandClientFactory(self.shipyard_conf).get_client()
-        dh_tool = DocumentValidationUtils(dh_client)
+        dh_tool = DocumentValidationUtils(dh_client, index_dir=index_dir)
 
         try:
             deployment_version_doc = dh_tool.get_unique_doc(
@@ -15,6 +15,8 @@ import configparser
 import copy
 import pprint
 import logging
+import random
+import threading
 import time
 from urllib.parse import urlparse
 
@@ -49,6 +51,79 @@ except ImportError:
 
 LOG = logging.getLogger(__name__)
 
+# The first delay, in seconds, between queries of the status of a task. Each
+# delay is POLL_BACKOFF_FACTOR times the previous one, up to the interval of
+# the task, with up to POLL_JITTER of the delay added or removed at random.
+INITIAL_POLL_DELAY = 1
+POLL_BACKOFF_FACTOR = 2
+POLL_JITTER = 0.1
+
+
+def poll_delays(interval):
+    """Yields the delays between queries of the status of a task
+
+    :param interval: The longest delay, in seconds
+    """
+    delay = min(INITIAL_POLL_DELAY, interval)
+    while True:
+        jitter = delay * POLL_JITTER
+        yield min(max(delay + random.uniform(-jitter, jitter), 0), interval)
+        delay = min(delay * POLL_BACKOFF_FACTOR, interval)
+
+
+class TaskPollMetrics:
+    """Metrics of the queries of the status of Drydock tasks, by task action
+
+    The detection time is the seconds from the start of the queries until
+    the completion of the task was seen, and the detection lag is the delay
+    before the query that saw it, the most by which the completion can have
+    preceded its detection.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def record(self, task_action, detection_time, queries, detection_lag,
+               timed_out=False):
+        """Record the queries of a task"""
+        with self._lock:
+            stats = self._metrics.setdefault(task_action, {
+                'count': 0,
+                'timeouts': 0,
+                'queries': 0,
+                'total_detection_time': 0.0,
+                'max_detection_lag': 0.0,
+            })
+            stats['count'] += 1
+            stats['queries'] += queries
+            if timed_out:
+                stats['timeouts'] += 1
+            else:
+                stats['total_detection_time'] += detection_time
+                stats['max_detection_lag'] = max(stats['max_detection_lag'],
+                                                 detection_lag)
+
+    def as_dict(self):
+        """Returns the metrics, keyed by task action"""
+        with self._lock:
+            result = {}
+            for task_action, stats in self._metrics.items():
+                completed = stats['count'] - stats['timeouts']
+                result[task_action] = {
+                    'count': stats['count'],
+                    'timeouts': stats['timeouts'],
+                    'mean_queries': stats['queries'] / stats['count'],
+                    'mean_detection_time': (
+                        stats['total_detection_time'] / completed
+                        if completed else 0.0),
+                    'max_detection_lag': stats['max_detection_lag'],
+                }
+            return result
+
+
+# The task poll metrics recorded within a process
+TASK_POLL_METRICS = TaskPollMetrics()
+
 
 class DrydockBaseOperator(UcpBaseOperator):
     """Drydock Base Operator
@@ -91,6 +166,7 @@ class DrydockBaseOperator(UcpBaseOperator):
         self.drydock_client = drydock_client
         self.drydock_client_connect_timeout = None
         self.drydock_client_read_timeout = None
+        self.drydock_task_action = None
         self.drydock_task_id = drydock_task_id
         self.node_filter = node_filter
         self.redeploy_server = redeploy_server
@@ -199,6 +275,7 @@ class DrydockBaseOperator(UcpBaseOperator):
             raise DrydockClientUseFailureException(client_error)
 
         # Retrieve Task ID
+        self.drydock_task_action = task_action
         self.drydock_task_id = create_task_response['task_id']
         LOG.info('Drydock %s task ID is %s',
                  task_action, self.drydock_task_id)
@@ -211,19 +288,31 @@ class DrydockBaseOperator(UcpBaseOperator):
             raise DrydockTaskNotCreatedException("Unable to create task!")
 
     def query_task(self, interval, time_out):
-
-        # Calculate number of times to execute the 'for' loop
-        # Convert 'time_out' and 'interval' from string into integer
-        # The result from the division will be a floating number which
-        # We will round off to nearest whole number
-        end_range = round(int(time_out) / int(interval))
-
+        """Waits for the Drydock task to complete
+
+        The task is queried after short delays at first, so that the
+        completion of a fast task is seen promptly. The delays grow
+        exponentially, with jitter, up to the interval. The time out is
+        measured by wall clock time, including the time taken by the queries.
+
+        :param interval: The longest delay, in seconds, between queries
+        :param time_out: The seconds allowed for the task to complete
+        Raises DrydockTaskTimeoutException if the task is still running at the
+        time out, and DrydockTaskFailedException if the task does not
+        complete successfully.
+        """
         LOG.info('Task ID is %s', self.drydock_task_id)
+        start = time.monotonic()
+        deadline = start + int(time_out)
+        delays = poll_delays(max(int(interval), 1))
         task_result = None
+        queries = 0
+        delay = 0
 
         # Query task status
-        for i in range(0, end_range + 1):
+        while True:
             task_status = None
+            queries += 1
 
             try:
                 # Retrieve current task state
@@ -236,26 +325,43 @@ class DrydockBaseOperator(UcpBaseOperator):
                          self.drydock_task_id, task_status)
             except DrydockClientUseFailureException:
                 raise
-            except:
+            except Exception:
                 # There can be situations where there are intermittent network
                 # issues that prevents us from retrieving the task state. We
                 # will want to retry in such situations.
-                LOG.warning("Unable to retrieve task state. Retrying...")
-
-            # Raise Time Out Exception
-            if task_status == 'running' and i == end_range:
-                # TODO(bryan-strassner) If Shipyard has timed out waiting for
-                #     this task to complete, and Drydock has provided a means
-                #     to cancel a task, that cancellation should be done here.
-                raise DrydockTaskTimeoutException("Task Execution Timed Out!")
+                LOG.warning("Unable to retrieve task state. Retrying...",
+                            exc_info=True)
 
-            # Exit 'for' loop if the task is in 'complete' or 'terminated'
+            # Exit the loop if the task is in 'complete' or 'terminated'
             # state
             if task_status in ['complete', 'terminated']:
+                elapsed = time.monotonic() - start
+                TASK_POLL_METRICS.record(self.drydock_task_action, elapsed,
+                                         queries, delay)
                 LOG.info('Task result is %s', task_result)
+                LOG.info("Completion of task id %s detected after %.1f "
+                         "seconds and %d queries, within %.1f seconds of "
+                         "completing", self.drydock_task_id, elapsed,
+                         queries, delay)
                 break
-            else:
-                time.sleep(int(interval))
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                TASK_POLL_METRICS.record(self.drydock_task_action,
+                                         time.monotonic() - start, queries,
+                                         delay, timed_out=True)
+                # Raise Time Out Exception
+                if task_status == 'running':
+                    # TODO(bryan-strassner) If Shipyard has timed out waiting
+                    #     for this task to complete, and Drydock has provided
+                    #     a means to cancel a task, that cancellation should
+                    #     be done here.
+                    raise DrydockTaskTimeoutException(
+                        "Task Execution Timed Out!")
+                break
+
+            delay = min(next(delays), remaining)
+            time.sleep(delay)
 
         # Get final task result
         if task_result == 'success':
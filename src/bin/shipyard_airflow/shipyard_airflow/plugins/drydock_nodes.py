@@ -19,11 +19,22 @@ progress through preparation and deployment of nodes in a group-based fashion.
 In the case of no specified deployment strategy, an "all-at-once" approach is
 taken, by which all nodes are deployed together.
 
+Groups that do not depend on each other may be processed concurrently, up to
+the physical_provisioner.max_concurrent_tasks Drydock tasks at a time. By
+default, groups are processed one at a time.
+
+Optionally, up to physical_provisioner.prepare_look_ahead groups may also be
+prepared ahead of the groups they depend on, e.g. while those are deploying.
+A group is only deployed once its dependencies are deployed.
+
 Historical Note: This operator replaces the function of drydock_prepare_nodes
 and drydock_deploy_nodes operators that existed previously.
 """
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import copy
 import logging
-import time
 
 from airflow.exceptions import AirflowException
 from airflow.plugins_manager import AirflowPlugin
@@ -74,11 +85,14 @@ class DrydockNodesOperator(DrydockBaseOperator):
 
         _process_deployment_groups(dgm,
                                    self._execute_prepare,
-                                   self._execute_deployment)
+                                   self._execute_deployment,
+                                   self.max_concurrent_tasks,
+                                   self.prepare_look_ahead)
 
         # All groups "complete" (as they're going to be). Report summary
         dgm.report_group_summary()
         dgm.report_node_summary()
+        dgm.report_stage_timing()
         self._gen_summary_notes(dgm)
 
         if dgm.critical_groups_failed():
@@ -151,6 +165,13 @@ class DrydockNodesOperator(DrydockBaseOperator):
         ]
         # The time to wait before querying k8s nodes after Drydock deploy nodes
         self.join_wait = self.dc['physical_provisioner.join_wait']
+        # The number of groups' Drydock tasks that may run at the same time
+        self.max_concurrent_tasks = max(
+            self.dc['physical_provisioner.max_concurrent_tasks'], 1)
+        # The number of groups that may be prepared ahead of the groups they
+        # depend on being deployed
+        self.prepare_look_ahead = max(
+            self.dc['physical_provisioner.prepare_look_ahead'], 0)
 
     def _execute_prepare(self, group):
         """Executes the prepare nodes step for the group.
@@ -160,10 +181,10 @@ class DrydockNodesOperator(DrydockBaseOperator):
         """
         LOG.info("Group %s is preparing nodes", group.name)
 
-        self.node_filter = gen_node_name_filter(group.actionable_nodes)
         return self._execute_task('prepare_nodes',
                                   self.prep_interval,
-                                  self.prep_timeout)
+                                  self.prep_timeout,
+                                  gen_node_name_filter(group.actionable_nodes))
 
     def _execute_deployment(self, group, successful_prepared_nodes):
         """Execute the deployment of nodes for the group.
@@ -175,10 +196,10 @@ class DrydockNodesOperator(DrydockBaseOperator):
         """
         LOG.info("Group %s is deploying nodes", group.name)
         s_nodes = list(successful_prepared_nodes)
-        self.node_filter = gen_node_name_filter(s_nodes)
         task_result = self._execute_task('deploy_nodes',
                                          self.dep_interval,
-                                         self.dep_timeout)
+                                         self.dep_timeout,
+                                         gen_node_name_filter(s_nodes))
 
         if not task_result.successes:
             # if there are no successes from Drydock, there is no need to
@@ -189,21 +210,23 @@ class DrydockNodesOperator(DrydockBaseOperator):
             return task_result
 
         # It takes time for the cluster join process to be triggered across
-        # all the nodes in the cluster. Hence there is a need to back off
-        # and wait before checking the state of the cluster join process.
+        # all the nodes in the cluster. Rather than waiting for the join
+        # wait before checking the state of the cluster join process, the
+        # nodes are watched from now, with the join wait added to the node
+        # status timeout.
         LOG.info("Nodes <%s> reported as deployed in MAAS",
                  ", ".join(task_result.successes))
-        LOG.info("Waiting for %d seconds before checking node state...",
-                 self.join_wait)
-        time.sleep(self.join_wait)
+        join_timeout = self.join_wait + self.node_st_timeout
+        LOG.info("Waiting up to %d seconds for the nodes to join the "
+                 "cluster...", join_timeout)
 
         # Check that cluster join process is completed before declaring
         # deploy_node as 'completed'.
         # This should only include nodes that drydock has indicated as
         # successful and has passed the join script to.
         # Anything not ready in the timeout needs to be considered a failure
-        not_ready_list = check_k8s_node_status.check_node_status(
-            self.node_st_timeout,
+        not_ready_list = check_k8s_node_status.wait_for_node_status(
+            join_timeout,
             self.node_st_interval,
             expected_nodes=task_result.successes
         )
@@ -223,12 +246,13 @@ class DrydockNodesOperator(DrydockBaseOperator):
                          ", ".join(task_result.successes))
         return task_result
 
-    def _execute_task(self, task_name, interval, timeout):
+    def _execute_task(self, task_name, interval, timeout, node_filter):
         """Execute the Drydock task requested
 
         :param task_name: 'prepare_nodes', 'deploy_nodes'
         :param interval: The time between checking status on the task
         :param timeout: The total time allowed for the task
+        :param node_filter: The node filter for the task
 
         Wraps the query_task method in the base class, capturing
         AirflowExceptions and summarizing results into a response
@@ -242,12 +266,18 @@ class DrydockNodesOperator(DrydockBaseOperator):
         the successes list in the response object. In the case of a failure to
         get the task results, this workflow must assume that the result is a
         total loss, and pass back no successes
+
+        The task is created and queried by a copy of this operator, holding
+        the node filter and task id of this task only, since the tasks of
+        independent groups may be executed concurrently.
         """
-        self.create_task(task_name)
-        result = QueryTaskResult(self.drydock_task_id, task_name)
+        task_op = copy.copy(self)
+        task_op.node_filter = node_filter
+        task_op.create_task(task_name)
+        result = QueryTaskResult(task_op.drydock_task_id, task_name)
 
         try:
-            self.query_task(interval, timeout)
+            task_op.query_task(interval, timeout)
         except DrydockTaskFailedException:
             # Task failure may be successful enough based on success criteria.
             # This should not halt the overall flow of this workflow step.
@@ -266,7 +296,8 @@ class DrydockNodesOperator(DrydockBaseOperator):
         # Other AirflowExceptions will fail the whole task - let them do this.
 
         # find successes
-        result.successes = self.get_successes_for_task(self.drydock_task_id)
+        result.successes = task_op.get_successes_for_task(
+            task_op.drydock_task_id)
         return result
 
     def get_deployment_strategy(self):
@@ -358,7 +389,8 @@ def _get_deployment_group_manager(groups_dict_list, node_lookup):
     return DeploymentGroupManager(groups_dict_list, node_lookup)
 
 
-def _process_deployment_groups(dgm, prepare_func, deploy_func):
+def _process_deployment_groups(dgm, prepare_func, deploy_func,
+                               max_concurrent_tasks=1, prepare_look_ahead=0):
     """Executes the deployment group deployments
 
     :param dgm: the DeploymentGroupManager object that manages the
@@ -367,7 +399,19 @@ def _process_deployment_groups(dgm, prepare_func, deploy_func):
         a QueryTaskResult with the purpose of preparing nodes
     :param deploy_func: a function that accepts a DeploymentGroup and returns
         a QueryTaskResult with the purpose of deploying nodes
+    :param max_concurrent_tasks: the maximum number of groups' prepare or
+        deploy functions executed at the same time. If more than 1, groups
+        whose dependencies are met are processed concurrently.
+    :param prepare_look_ahead: the maximum number of groups prepared ahead
+        of the groups they depend on being deployed. These are in addition
+        to max_concurrent_tasks.
     """
+    if max_concurrent_tasks > 1 or prepare_look_ahead > 0:
+        _DeploymentGroupScheduler(dgm, prepare_func, deploy_func,
+                                  max_concurrent_tasks,
+                                  prepare_look_ahead).run()
+        return
+
     complete = False
     while not complete:
         # Find the next group to be prepared.  Prepare and deploy it.
@@ -378,65 +422,249 @@ def _process_deployment_groups(dgm, prepare_func, deploy_func):
             complete = True
             continue
 
-        LOG.info("*** Deployment Group: %s is being processed ***", group.name)
-        if not group.actionable_nodes:
-            LOG.info("There were no actionable nodes for group %s. It is "
-                     "possible that all nodes: [%s] have previously been "
-                     "deployed. Group will be immediately checked "
-                     "against its success criteria", group.name,
-                     ", ".join(group.full_nodes))
-
-            # In the case of a group having no actionable nodes, since groups
-            # prepare -> deploy in direct sequence, we can check against
-            # deployment, since all nodes would need to be deployed or have
-            # been attempted. Need to follow the state-transition, so
-            # PREPARED -> DEPLOYED
-            dgm.evaluate_group_succ_criteria(group.name, Stage.PREPARED)
-            dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
+        if not _start_group(dgm, group):
             # success or failure, move on to next group
             continue
 
-        LOG.info("%s has actionable nodes: [%s]", group.name,
-                 ", ".join(group.actionable_nodes))
-        if len(group.actionable_nodes) < len(group.full_nodes):
-            LOG.info("Some nodes are not actionable because they were "
-                     "included in a prior group, but will be considered in "
-                     "the success critera calculation for this group")
-
         # Group has actionable nodes.
         # Prepare Nodes for group, store QueryTaskResults
+        dgm.record_stage_start(group.name, Stage.PREPARED)
         prep_qtr = prepare_func(group)
-        # Mark successes as prepared
-        for node_name in prep_qtr.successes:
-            dgm.mark_node_prepared(node_name)
-
-        dgm.fail_unsuccessful_nodes(group, prep_qtr.successes)
-        should_deploy = dgm.evaluate_group_succ_criteria(group.name,
-                                                         Stage.PREPARED)
-        if not should_deploy:
+        dgm.record_stage_end(group.name, Stage.PREPARED)
+        deploy_nodes = _complete_prepare(dgm, group, prep_qtr)
+        if deploy_nodes is None:
             # group has failed, move on to next group. Current group has
             # been marked as failed.
             continue
 
-        if prep_qtr.successes:
+        dep_qtr = None
+        if deploy_nodes:
             # Continue with deployment, only for successfully prepared nodes
-            dep_qtr = deploy_func(group, prep_qtr.successes)
-            # Mark successes as deployed
-            for node_name in dep_qtr.successes:
-                dgm.mark_node_deployed(node_name)
-            dgm.fail_unsuccessful_nodes(group, dep_qtr.successes)
+            dgm.record_stage_start(group.name, Stage.DEPLOYED)
+            dep_qtr = deploy_func(group, deploy_nodes)
+            dgm.record_stage_end(group.name, Stage.DEPLOYED)
+        _complete_deployment(dgm, group, dep_qtr)
+
+
+class _DeploymentGroupScheduler:
+    """Executes the deployment group deployments, concurrently where the
+    group dependencies allow
+
+    Groups are prepared when all the groups they depend on are deployed, up
+    to max_concurrent_tasks prepare or deploy functions at a time. In
+    addition, up to prepare_look_ahead groups may be prepared ahead of their
+    dependencies being deployed. Each prepared group is deployed once its
+    dependencies are deployed, ahead of preparing further groups.
+
+    The prepare and deploy functions are executed in worker threads, and
+    their results are applied to the DeploymentGroupManager in the thread
+    calling run only.
+    """
+    def __init__(self, dgm, prepare_func, deploy_func, max_concurrent_tasks,
+                 prepare_look_ahead):
+        self.dgm = dgm
+        self.prepare_func = prepare_func
+        self.deploy_func = deploy_func
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self.prepare_look_ahead = prepare_look_ahead
+        # The (group, stage, is_ahead) of each prepare or deploy function
+        # in progress, by its future
+        self._in_progress = {}
+        # The (group, nodes to deploy) of each prepared group, awaiting
+        # deployment
+        self._prepared = []
+        self._executor = None
+
+    def run(self):
+        """Processes the groups until no more are eligible"""
+        workers = self.max_concurrent_tasks + self.prepare_look_ahead
+        with ThreadPoolExecutor(max_workers=workers) as self._executor:
+            while True:
+                while self._start_next():
+                    pass
+
+                if not self._in_progress:
+                    LOG.info("There are no more groups eligible to process")
+                    break
+
+                LOG.info("Groups in progress: %s", ", ".join(
+                    "{} ({}{})".format(group.name, stage,
+                                       ", ahead" if is_ahead else "")
+                    for group, stage, is_ahead in self._in_progress.values()))
+                done, _ = wait(self._in_progress, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._complete(future)
+
+    def _start_next(self):
+        """Starts the next prepare or deploy function, if any may start
+
+        Returns True if a function was started or a group was completed,
+        which may allow further functions to start.
+        """
+        dgm = self.dgm
+        for entry in self._prepared:
+            group, deploy_nodes = entry
+            if group.stage == Stage.FAILED:
+                # A group it depends on has failed
+                LOG.info("Group %s was prepared, but will not be deployed "
+                         "because it has failed", group.name)
+                self._prepared.remove(entry)
+                return True
+            if not dgm.dependencies_deployed(group.name):
+                continue
+            if not deploy_nodes:
+                self._prepared.remove(entry)
+                _complete_deployment(dgm, group, None)
+                return True
+            if self._task_count() < self.max_concurrent_tasks:
+                self._prepared.remove(entry)
+                self._submit(group, Stage.DEPLOYED, False, deploy_nodes)
+                return True
+
+        if self._task_count() < self.max_concurrent_tasks:
+            group = self._next_group(dgm.get_eligible_groups())
+            if group is not None:
+                if _start_group(dgm, group):
+                    self._submit(group, Stage.PREPARED, False)
+                return True
+
+        if self._ahead_count() < self.prepare_look_ahead:
+            # Groups without actionable nodes are checked against their
+            # success criteria when started, so are never started ahead.
+            group = self._next_group(
+                g for g in dgm.get_look_ahead_groups() if g.actionable_nodes)
+            if group is not None:
+                LOG.info("Group %s is prepared ahead of its dependencies",
+                         group.name)
+                _start_group(dgm, group)
+                self._submit(group, Stage.PREPARED, True)
+                return True
+        return False
+
+    def _complete(self, future):
+        """Applies the result of a completed prepare or deploy function"""
+        group, stage, _ = self._in_progress.pop(future)
+        self.dgm.record_stage_end(group.name, stage)
+        # Exceptions raised by the function are raised here, failing the
+        # step as they would when groups are processed in turn.
+        qtr = future.result()
+        if stage == Stage.PREPARED:
+            deploy_nodes = _complete_prepare(self.dgm, group, qtr)
+            if deploy_nodes is not None:
+                self._prepared.append((group, deploy_nodes))
         else:
-            # TODO(bryan-strassner) Update this message if Drydock provides
-            #     a way to cancel a task, and that method is employed by
-            #     Shipyard upon timeout.
-            LOG.info("There were no nodes successfully prepared. "
-                     "Deployment will not be attempted for group %s. "
-                     "Success criteria will be immediately checked. "
-                     "If a timeout in the prepare step has occured, it is "
-                     "possible that Drydock is still attempting the prepare "
-                     "task.",
-                     group.name)
+            _complete_deployment(self.dgm, group, qtr)
+
+    def _submit(self, group, stage, is_ahead, *args):
+        func = self.prepare_func if stage == Stage.PREPARED else \
+            self.deploy_func
+        self.dgm.record_stage_start(group.name, stage)
+        future = self._executor.submit(func, group, *args)
+        self._in_progress[future] = (group, stage, is_ahead)
+
+    def _next_group(self, groups):
+        """Returns the first of the groups that is not in progress"""
+        active = [group.name for group, _, _ in self._in_progress.values()]
+        return next((group for group in groups if group.name not in active),
+                    None)
+
+    def _task_count(self):
+        """The number of functions in progress, not prepared ahead"""
+        return len([entry for entry in self._in_progress.values()
+                    if not entry[2]])
+
+    def _ahead_count(self):
+        """The number of groups being or having been prepared ahead of their
+        dependencies"""
+        preparing = len([entry for entry in self._in_progress.values()
+                         if entry[2]])
+        waiting = len([group for group, _ in self._prepared
+                       if not self.dgm.dependencies_deployed(group.name)])
+        return preparing + waiting
+
+
+def _start_group(dgm, group):
+    """Starts the processing of a group
+
+    :param dgm: the DeploymentGroupManager
+    :param group: the DeploymentGroup to start
+    Returns True if the group has actionable nodes to be prepared. Otherwise
+    the group is checked against its success criteria, and is complete.
+    """
+    LOG.info("*** Deployment Group: %s is being processed ***", group.name)
+    if not group.actionable_nodes:
+        LOG.info("There were no actionable nodes for group %s. It is "
+                 "possible that all nodes: [%s] have previously been "
+                 "deployed. Group will be immediately checked "
+                 "against its success criteria", group.name,
+                 ", ".join(group.full_nodes))
+
+        # In the case of a group having no actionable nodes, since groups
+        # prepare -> deploy in direct sequence, we can check against
+        # deployment, since all nodes would need to be deployed or have
+        # been attempted. Need to follow the state-transition, so
+        # PREPARED -> DEPLOYED
+        dgm.evaluate_group_succ_criteria(group.name, Stage.PREPARED)
         dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
+        return False
+
+    LOG.info("%s has actionable nodes: [%s]", group.name,
+             ", ".join(group.actionable_nodes))
+    if len(group.actionable_nodes) < len(group.full_nodes):
+        LOG.info("Some nodes are not actionable because they were "
+                 "included in a prior group, but will be considered in "
+                 "the success critera calculation for this group")
+    return True
+
+
+def _complete_prepare(dgm, group, prep_qtr):
+    """Applies the result of preparing the nodes of a group
+
+    :param dgm: the DeploymentGroupManager
+    :param group: the prepared DeploymentGroup
+    :param prep_qtr: the QueryTaskResult of the prepare function
+    Returns the nodes to deploy, or None if the group has failed
+    """
+    # Mark successes as prepared
+    for node_name in prep_qtr.successes:
+        dgm.mark_node_prepared(node_name)
+
+    dgm.fail_unsuccessful_nodes(group, prep_qtr.successes)
+    if group.stage == Stage.FAILED:
+        # Prepared ahead of a group it depends on, which has since failed
+        LOG.info("Group %s has failed because a group it depends on has "
+                 "failed, and will not be deployed", group.name)
+        return None
+    if not dgm.evaluate_group_succ_criteria(group.name, Stage.PREPARED):
+        return None
+    return prep_qtr.successes
+
+
+def _complete_deployment(dgm, group, dep_qtr):
+    """Applies the result of deploying the nodes of a group
+
+    :param dgm: the DeploymentGroupManager
+    :param group: the deployed DeploymentGroup
+    :param dep_qtr: the QueryTaskResult of the deploy function, or None if
+        there were no prepared nodes to deploy
+    """
+    if dep_qtr is not None:
+        # Mark successes as deployed
+        for node_name in dep_qtr.successes:
+            dgm.mark_node_deployed(node_name)
+        dgm.fail_unsuccessful_nodes(group, dep_qtr.successes)
+    else:
+        # TODO(bryan-strassner) Update this message if Drydock provides
+        #     a way to cancel a task, and that method is employed by
+        #     Shipyard upon timeout.
+        LOG.info("There were no nodes successfully prepared. "
+                 "Deployment will not be attempted for group %s. "
+                 "Success criteria will be immediately checked. "
+                 "If a timeout in the prepare step has occured, it is "
+                 "possible that Drydock is still attempting the prepare "
+                 "task.",
+                 group.name)
+    dgm.evaluate_group_succ_criteria(group.name, Stage.DEPLOYED)
 
 
 class QueryTaskResult:
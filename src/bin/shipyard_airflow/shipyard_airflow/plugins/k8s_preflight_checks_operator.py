@@ -18,60 +18,58 @@ from airflow.exceptions import AirflowException
 from airflow.models import BaseOperator
 from airflow.plugins_manager import AirflowPlugin
 from airflow.utils.decorators import apply_defaults
-from kubernetes import client, config
+
+try:
+    from check_k8s_pod_status import wait_for_pods_ready
+except ImportError:
+    from shipyard_airflow.plugins.check_k8s_pod_status import \
+        wait_for_pods_ready
 
 
 class K8sHealthCheckOperator(BaseOperator):
     """
     Performs basic Kubernetes Health Check
+
+    Checks that pods are either in 'Succeeded' or in 'Running' state,
+    waiting up to the time out for pods that are not yet. The k8s health
+    checks can be expanded in future if need be.
+
+    :param required_pods: Optional, the pod name prefixes of the pods to
+        check. By default, all pods are checked.
+    :param namespace: Optional, the namespace of the pods to check. By
+        default, the pods of all namespaces are checked.
+    :param label_selector: Optional, a label selector of the pods to check
+    :param time_out: The seconds allowed for the pods to be ready
     """
     @apply_defaults
     def __init__(self,
+                 required_pods=None,
+                 namespace=None,
+                 label_selector=None,
+                 time_out=300,
                  *args, **kwargs):
 
         super(K8sHealthCheckOperator, self).__init__(*args, **kwargs)
+        self.required_pods = required_pods
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.time_out = time_out
 
     def execute(self, context):
         logging.info("Running Basic Kubernetes Cluster Health Check:")
 
-        # Note that we are using 'in_cluster_config'
-        config.load_incluster_config()
-        v1 = client.CoreV1Api()
-        ret = v1.list_pod_for_all_namespaces(watch=False)
-
-        # Loop through items to get the status of all pods
-        # Note that the current health check only checks to
-        # ensure that all pods are either in 'Succeeded' or
-        # in 'Running' state. The k8s health checks can be
-        # expanded in future if need be.
-        for i in ret.items:
-            logging.info("%s is in %s state", i.metadata.name,
-                         i.status.phase)
-
-            if i.status.phase not in ['Succeeded', 'Running']:
-                # NOTE: Kubelet receives information about the pods
-                # and node from etcd after a restart. It seems that
-                # it is possible for kubelet to set the pod status to
-                # 'MatchNodeSelector' after a hard reboot of the node.
-                # This might happen if the labels in the initial node
-                # info is different from the node info in etcd, which
-                # will in turn cause the pod admission to fail.
-                #
-                # As the system does recover after a hard reboot with
-                # new pods created for various services, there is a need
-                # to ignore the failed pods with 'MatchNodeSelector' status
-                # to avoid false alarms. Hence the approach that we will
-                # be taking in such situation will be to log warning messages
-                # printing the current state of these pods as opposed to
-                # failing the health checks.
-                if (i.status.phase == 'Failed' and
-                        i.status.container_statuses is None and
-                        i.status.reason == 'MatchNodeSelector'):
-                    logging.warning("%s is in %s state with status",
-                                    i.metadata.name, i.status.phase)
-                    logging.warning(i.status)
-                else:
-                    raise AirflowException("Kubernetes Health Checks Failed!")
+        # The empty prefix matches all pods
+        readiness = wait_for_pods_ready(self.required_pods or [''],
+                                        self.time_out,
+                                        namespace=self.namespace,
+                                        label_selector=self.label_selector)
+        not_ready = ["{}* ({} of {} ready)".format(
+            prefix, status['ready_pods'], status['pods'])
+            for prefix, status in readiness.items() if not status['ready']]
+        if not_ready:
+            raise AirflowException(
+                "Kubernetes Health Checks Failed! Pods not ready: "
+                "{}".format(", ".join(not_ready)))
 
 
 class K8sHealthCheckPlugin(AirflowPlugin):
@@ -0,0 +1,118 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Listing and watching of Kubernetes resources
+
+The resources are listed once, and changes are then watched from the
+resource version of the list, so that a change is seen as soon as it happens
+rather than at the next of a series of full lists.
+"""
+import logging
+import math
+import time
+
+from kubernetes import watch
+
+LOG = logging.getLogger(__name__)
+
+
+class ResourceVersionExpired(Exception):
+    """The resource version of a watch is no longer available"""
+    pass
+
+
+class WatchError(Exception):
+    """An error event was received from a watch"""
+    pass
+
+
+def list_and_watch(get_list_func, handle_event, is_done, deadline, interval,
+                   list_args=(), on_list=None, **list_kwargs):
+    """Lists resources, then watches them for changes, until done
+
+    A watch that ends is resumed from the last resource version seen. If the
+    resource version has expired, the resources are listed again. Other
+    errors are retried after the interval.
+
+    :param get_list_func: A callable returning the list function of the
+        resources, e.g. CoreV1Api().list_node. Called again if it fails.
+    :param handle_event: A callable of (event_type, resource), called for
+        each resource listed, as ADDED, and for each change watched
+    :param is_done: A callable returning True when no more changes are
+        needed
+    :param deadline: The time.monotonic() value at which to stop
+    :param interval: The seconds to wait before retrying after an error
+    :param list_args: The positional arguments of the list function, e.g.
+        the namespace
+    :param on_list: Optional, a callable invoked before the resources of
+        each list are handled, e.g. to discard state from before a re-list
+    :param list_kwargs: The keyword arguments of the list function, e.g.
+        label_selector
+    :returns: the result of is_done()
+    """
+    interval = max(int(interval), 1)
+    list_func = None
+    resource_version = None
+    while not is_done() and time.monotonic() < deadline:
+        try:
+            if list_func is None:
+                list_func = get_list_func()
+            if resource_version is None:
+                ret = list_func(*list_args, **list_kwargs)
+                if on_list is not None:
+                    on_list()
+                for item in ret.items:
+                    handle_event('ADDED', item)
+                resource_version = ret.metadata.resource_version
+            else:
+                resource_version = _watch(list_func, handle_event, is_done,
+                                          deadline, resource_version,
+                                          list_args, list_kwargs)
+        except ResourceVersionExpired:
+            LOG.info("Watch expired, listing the resources again")
+            resource_version = None
+        except Exception:
+            LOG.warning("There was an error watching the cluster status. "
+                        "Retrying in %d seconds", interval, exc_info=True)
+            resource_version = None
+            time.sleep(max(min(interval, deadline - time.monotonic()), 0))
+    return is_done()
+
+
+def _watch(list_func, handle_event, is_done, deadline, resource_version,
+           list_args, list_kwargs):
+    """Watches for changes until done, the deadline passes, or the watch
+    ends
+
+    Returns the resource version to resume watching from
+    """
+    resource_watch = watch.Watch()
+    timeout_seconds = max(int(math.ceil(deadline - time.monotonic())), 1)
+    try:
+        for event in resource_watch.stream(list_func, *list_args,
+                                           resource_version=resource_version,
+                                           timeout_seconds=timeout_seconds,
+                                           **list_kwargs):
+            if event['type'] == 'ERROR':
+                raw_object = event.get('raw_object') or {}
+                if raw_object.get('code') == 410:
+                    raise ResourceVersionExpired()
+                raise WatchError(raw_object.get('message'))
+            resource = event['object']
+            resource_version = resource.metadata.resource_version
+            handle_event(event['type'], resource)
+            if is_done() or time.monotonic() >= deadline:
+                break
+    finally:
+        resource_watch.stop()
+    return resource_version
@@ -21,7 +21,6 @@ from airflow.exceptions import AirflowException
 from airflow.models import BaseOperator
 from airflow.plugins_manager import AirflowPlugin
 from airflow.utils.decorators import apply_defaults
-import sqlalchemy
 
 try:
     from deckhand_client_factory import DeckhandClientFactory
@@ -41,6 +40,7 @@ except ImportError:
 
 from shipyard_airflow.common.document_validators.document_validation_utils \
     import DocumentValidationUtils
+from shipyard_airflow.common.db_pool.pool_registry import ENGINE_POOLS
 from shipyard_airflow.common.notes.notes import NotesManager
 from shipyard_airflow.common.notes.notes_helper import NotesHelper
 from shipyard_airflow.common.notes.storage_impl_db import \
@@ -48,6 +48,7 @@ from shipyard_airflow.common.notes.storage_impl_db import \
 
 # Configuration sections
 BASE = 'base'
+DOCUMENT_INFO = 'document_info'
 K8S_LOGS = 'k8s_logs'
 REQUESTS_CONFIG = 'requests_config'
 
@@ -280,28 +281,21 @@ class UcpBaseOperator(BaseOperator):
         but since we have easy access to a configuration file, this does
         direct SQLAlchemy to get the engine. By using the config, the database
         connection is not exposed as environment variables -- which is one way
-        that Airflow registers database connections for use by the dbApiHook
+        that Airflow registers database connections for use by the dbApiHook.
+        The engine is obtained from the process wide registry, so that
+        operators executing in the same process share a connection pool.
         """
         if self._shipyard_db_engine is None:
-            connection_string = self.config.get(BASE, 'postgresql_db')
-            pool_size = self.config.getint(BASE, 'pool_size')
-            max_overflow = self.config.getint(BASE, 'pool_overflow')
-            pool_pre_ping = self.config.getboolean(BASE, 'pool_pre_ping')
-            pool_recycle = self.config.getint(BASE, 'connection_recycle')
-            pool_timeout = self.config.getint(BASE, 'pool_timeout')
-            self._shipyard_db_engine = sqlalchemy.create_engine(
-                connection_string, pool_size=pool_size,
-                max_overflow=max_overflow,
-                pool_pre_ping=pool_pre_ping,
-                pool_recycle=pool_recycle,
-                pool_timeout=pool_timeout
+            self._shipyard_db_engine = ENGINE_POOLS.get_engine(
+                self.config.get(BASE, 'postgresql_db'),
+                pool_size=self.config.getint(BASE, 'pool_size'),
+                max_overflow=self.config.getint(BASE, 'pool_overflow'),
+                pool_pre_ping=self.config.getboolean(BASE, 'pool_pre_ping'),
+                pool_recycle=self.config.getint(BASE, 'connection_recycle'),
+                pool_timeout=self.config.getint(BASE, 'pool_timeout'),
+                statement_timeout=self.config.getint(
+                    BASE, 'statement_timeout', fallback=0)
             )
-            LOG.info("Initialized Shipyard database connection with pool "
-                     "size: %d, max overflow: %d, pool pre ping: %s, pool "
-                     "recycle: %d, and pool timeout: %d",
-                     pool_size, max_overflow,
-                     pool_pre_ping, pool_recycle,
-                     pool_timeout)
 
         return self._shipyard_db_engine
 
@@ -325,8 +319,12 @@ class UcpBaseOperator(BaseOperator):
 
 def _get_document_util(shipyard_conf):
     """Retrieve an instance of the DocumentValidationUtils"""
-    dh_client = DeckhandClientFactory(shipyard_conf).get_client()
-    return DocumentValidationUtils(dh_client)
+    dh_factory = DeckhandClientFactory(shipyard_conf)
+    index_dir = dh_factory.config.get(DOCUMENT_INFO,
+                                      'rendered_document_index_dir',
+                                      fallback='')
+    return DocumentValidationUtils(dh_factory.get_client(),
+                                   index_dir=index_dir)
 
 
 class UcpBaseOperatorPlugin(AirflowPlugin):
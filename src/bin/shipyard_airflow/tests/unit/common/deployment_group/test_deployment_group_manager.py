@@ -354,3 +354,94 @@ class TestDeploymentGroupManager:
             ['node1', 'node2', 'node3', 'node4', 'node5', 'node6', 'node7',
              'node8', 'node9', 'node10', 'node11', 'node12']
         )
+
+    def test_get_eligible_groups(self):
+        dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
+
+        def eligible():
+            return sorted(group.name for group in dgm.get_eligible_groups())
+
+        assert eligible() == ['monitoring-nodes', 'ntp-node']
+        # prepared is not complete, dependents are not yet eligible
+        dgm.mark_group_prepared('ntp-node')
+        assert eligible() == ['monitoring-nodes']
+        dgm.mark_group_deployed('ntp-node')
+        assert eligible() == ['control-nodes', 'monitoring-nodes']
+        dgm.mark_group_prepared('control-nodes')
+        dgm.mark_group_deployed('control-nodes')
+        assert eligible() == ['compute-nodes-1', 'compute-nodes-2',
+                              'monitoring-nodes']
+        dgm.mark_group_failed('compute-nodes-1')
+        assert eligible() == ['compute-nodes-2', 'monitoring-nodes']
+
+    def test_get_eligible_groups_overlapping(self):
+        """Independent groups that share nodes are not processed together"""
+        groups = yaml.safe_load("""
+- name: rack2
+  critical: false
+  depends_on: []
+  selectors:
+    - rack_names:
+        - rack2
+- name: tag1
+  critical: false
+  depends_on: []
+  selectors:
+    - node_tags:
+        - tag1
+- name: rack4
+  critical: false
+  depends_on: []
+  selectors:
+    - rack_names:
+        - rack4
+""")
+        dgm = DeploymentGroupManager(groups, node_lookup)
+        # tag1 shares node5 with rack2, and node8 with neither
+        first, second = sorted(['rack2', 'tag1'],
+                               key=dgm._group_order.index)
+        eligible = [group.name for group in dgm.get_eligible_groups()]
+        assert first in eligible
+        assert second not in eligible
+        assert 'rack4' in eligible
+        dgm.mark_group_failed(first)
+        assert second in [group.name for group in dgm.get_eligible_groups()]
+
+    def test_get_look_ahead_groups(self):
+        dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
+
+        def look_ahead():
+            return sorted(group.name for group in dgm.get_look_ahead_groups())
+
+        # all-compute-nodes shares nodes with the compute groups before it
+        assert look_ahead() == ['compute-nodes-1', 'compute-nodes-2',
+                                'control-nodes', 'spare-compute-nodes']
+        assert not dgm.dependencies_deployed('control-nodes')
+        dgm.mark_group_prepared('ntp-node')
+        dgm.mark_group_deployed('ntp-node')
+        assert dgm.dependencies_deployed('control-nodes')
+        assert 'control-nodes' not in look_ahead()
+        dgm.mark_group_prepared('compute-nodes-1')
+        assert 'compute-nodes-1' not in look_ahead()
+        dgm.mark_group_failed('control-nodes')
+        assert look_ahead() == []
+
+    def test_stage_timing(self, caplog):
+        dgm = DeploymentGroupManager(yaml.safe_load(GROUPS_YAML), node_lookup)
+        assert dgm.get_stage_timing() == {}
+        dgm.record_stage_start('ntp-node', Stage.PREPARED)
+        dgm.record_stage_start('control-nodes', Stage.PREPARED)
+        dgm.record_stage_end('ntp-node', Stage.PREPARED)
+        dgm.record_stage_start('ntp-node', Stage.DEPLOYED)
+        timing = dgm.get_stage_timing()
+        assert timing['ntp-node'][Stage.PREPARED]['start'] == 0.0
+        assert timing['ntp-node'][Stage.PREPARED]['duration'] >= 0.0
+        assert timing['ntp-node'][Stage.DEPLOYED]['duration'] is None
+        assert timing['control-nodes'][Stage.PREPARED]['start'] >= 0.0
+        dgm.record_stage_end('ntp-node', Stage.DEPLOYED)
+        dgm.record_stage_end('control-nodes', Stage.PREPARED)
+        dgm.report_stage_timing()
+        assert "=====   Stage Timing   =====" in caplog.text
+        assert "Group control-nodes Stage.PREPARED started at" in caplog.text
+        with pytest.raises(UnknownDeploymentGroupError):
+            dgm.record_stage_start('Limburger Cheese', Stage.PREPARED)
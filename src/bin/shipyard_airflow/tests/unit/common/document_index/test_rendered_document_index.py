@@ -0,0 +1,170 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the local indexes of rendered documents"""
+import datetime
+import os
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.common.document_index import rendered_document_index
+from shipyard_airflow.common.document_index.rendered_document_index import (
+    DocumentIndexRegistry, RenderedDocumentIndex, index_path, write_index
+)
+from shipyard_airflow.common.document_validators.document_validation_utils \
+    import DocumentValidationUtils
+from shipyard_airflow.common.document_validators.errors import (
+    DocumentLookupError, DocumentNotFoundError
+)
+
+DOCUMENTS = [
+    ('shipyard/DeploymentConfiguration/v1', 'deployment-configuration',
+     {'physical_provisioner': {'deploy_interval': 10}}),
+    ('pegleg/DeploymentData/v1', 'deployment-version',
+     {'version': 'v1.0', 'date': datetime.date(2018, 9, 1)}),
+    ('shipyard/DeploymentStrategy/v1', 'deployment-strategy',
+     {'groups': []}),
+    ('shipyard/DeploymentStrategy/v1', 'duplicated', {'a': 1}),
+    ('shipyard/DeploymentStrategy/v1', 'duplicated', {'a': 2}),
+    ('nameless/Document/v1', None, {}),
+]
+
+
+def _documents():
+    return iter(DOCUMENTS)
+
+
+def _dh_client(documents):
+    dh_docs = []
+    for schema, name, data in documents:
+        doc = mock.MagicMock()
+        doc.schema = schema
+        doc.metadata = {'name': name}
+        doc.data = data
+        dh_docs.append(doc)
+    dhc = mock.MagicMock()
+    dhc.revisions.documents.return_value = dh_docs
+    return dhc
+
+
+def test_index_file(tmpdir):
+    path = str(tmpdir.join('index'))
+    with open(path, 'wb') as stream:
+        assert write_index(stream, DOCUMENTS) == 5
+
+    index = RenderedDocumentIndex(path)
+    assert len(index) == 4
+    assert index.get('shipyard/DeploymentConfiguration/v1',
+                     'deployment-configuration') == {
+        'physical_provisioner': {'deploy_interval': 10}}
+    # values that are not JSON types are stored as strings
+    assert index.get('pegleg/DeploymentData/v1', 'deployment-version') == {
+        'version': 'v1.0', 'date': '2018-09-01'}
+    assert ('shipyard/DeploymentStrategy/v1', 'deployment-strategy') in index
+    # not unique, so not found
+    assert ('shipyard/DeploymentStrategy/v1', 'duplicated') not in index
+    assert index.get('shipyard/DeploymentStrategy/v1', 'duplicated') is None
+    assert index.get('shipyard/DeploymentStrategy/v1', 'missing', {}) == {}
+    index.close()
+
+
+def test_not_an_index_file(tmpdir):
+    path = tmpdir.join('index')
+    path.write_binary(b'not an index file')
+    with pytest.raises(ValueError):
+        RenderedDocumentIndex(str(path))
+
+
+class TestDocumentIndexRegistry:
+    def test_built_once(self, tmpdir):
+        directory = str(tmpdir)
+        fetch = mock.MagicMock(side_effect=_documents)
+        registry = DocumentIndexRegistry()
+        index = registry.get_index(directory, 5, fetch)
+        assert registry.get_index(directory, '5', fetch) is index
+        assert os.path.exists(index_path(directory, 5))
+
+        # another process, sharing the directory, uses the existing file
+        other = DocumentIndexRegistry().get_index(directory, 5, fetch)
+        assert other is not index
+        assert len(other) == 4
+        assert fetch.call_count == 1
+
+    def test_fetch_failure(self, tmpdir):
+        directory = str(tmpdir)
+        registry = DocumentIndexRegistry()
+        with pytest.raises(RuntimeError):
+            registry.get_index(directory, 5,
+                               mock.MagicMock(side_effect=RuntimeError))
+        # no partial files are left behind
+        assert not [name for name in os.listdir(directory)
+                    if not name.endswith('.lock')]
+        assert len(registry.get_index(directory, 5, _documents)) == 4
+
+    def test_limit(self, tmpdir):
+        directory = str(tmpdir)
+        registry = DocumentIndexRegistry()
+        for revision_id in range(1, 5):
+            registry.get_index(directory, revision_id, _documents, limit=2)
+            # make the modification times distinct
+            os.utime(index_path(directory, revision_id),
+                     (revision_id, revision_id))
+        # the lock of the directory is shared by all the revisions, and is
+        # never removed
+        assert sorted(os.listdir(directory)) == [
+            '.lock',
+            os.path.basename(index_path(directory, 3)),
+            os.path.basename(index_path(directory, 4)),
+        ]
+        assert len(registry._indexes) == 2
+
+    def test_existing_opened_without_lock(self, tmpdir):
+        directory = str(tmpdir)
+        DocumentIndexRegistry().get_index(directory, 5, _documents)
+        with mock.patch.object(rendered_document_index.fcntl,
+                               'flock') as flock:
+            index = DocumentIndexRegistry().get_index(
+                directory, 5, mock.MagicMock(side_effect=AssertionError))
+        assert len(index) == 4
+        flock.assert_not_called()
+
+
+class TestDocumentValidationUtilsIndexed:
+    def test_get_unique_doc(self, tmpdir):
+        dhc = _dh_client(DOCUMENTS)
+        utils = DocumentValidationUtils(dhc, index_dir=str(tmpdir))
+        assert utils.get_unique_doc(
+            revision_id=7, name='deployment-configuration',
+            schema='shipyard/DeploymentConfiguration/v1') == {
+                'physical_provisioner': {'deploy_interval': 10}}
+        assert utils.get_unique_doc(
+            revision_id=7, name='deployment-strategy',
+            schema='shipyard/DeploymentStrategy/v1') == {'groups': []}
+        dhc.revisions.documents.assert_called_once_with(7, rendered=True)
+
+        for name in ['duplicated', 'missing']:
+            with pytest.raises(DocumentNotFoundError):
+                utils.get_unique_doc(revision_id=7, name=name,
+                                     schema='shipyard/DeploymentStrategy/v1')
+        # empty data is found
+        assert utils.get_unique_doc(revision_id=7, name=None,
+                                    schema='nameless/Document/v1') == {}
+
+    def test_get_unique_doc_lookup_error(self, tmpdir):
+        dhc = mock.MagicMock()
+        dhc.revisions.documents.side_effect = RuntimeError('unavailable')
+        utils = DocumentValidationUtils(dhc, index_dir=str(tmpdir))
+        with pytest.raises(DocumentLookupError):
+            utils.get_unique_doc(revision_id=8, name='deployment-strategy',
+                                 schema='shipyard/DeploymentStrategy/v1')
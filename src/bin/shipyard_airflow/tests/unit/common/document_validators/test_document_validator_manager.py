@@ -269,6 +269,30 @@ class TestValidatorManager:
             assert r['level'] == "Error"
             assert r['error']
 
+    def test_chained_success_indexed(self, tmpdir):
+        placeholders = ['document-placeholder{}'.format(suffix)
+                        for suffix in ['03', '-A', '-B', '-C', '-D', '-E',
+                                       '-F', '-G', '-H', '-I', '-J', '-K',
+                                       '-L', '-M']]
+        docs = []
+        for name in placeholders:
+            doc = MagicMock()
+            doc.schema = "schema/Schema/v1"
+            doc.metadata = {"name": name}
+            doc.data = {"nothing": "here"}
+            docs.append(doc)
+        dhc = MagicMock()
+        dhc.revisions.documents.return_value = docs
+
+        validations = [(ValidatorC, 'document-placeholder03')]
+        dvm = DocumentValidationManager(dhc, 1, validations,
+                                        index_dir=str(tmpdir))
+        dvm.validate()
+        assert not dvm.errored
+        assert dvm.validations_run == 26
+        # the rendered documents are retrieved once for all validations
+        dhc.revisions.documents.assert_called_once_with(1, rendered=True)
+
     def test_missing_dh_client(self):
         with pytest.raises(DeckhandClientRequiredError):
             ValidatorB(deckhand_client=None, revision=1, doc_name="no")
@@ -200,6 +200,85 @@ class TestNotesManager:
         n_list = nm.retrieve(Query("test1/11111/aaa", exact_match=True))
         assert len(n_list) == 1
 
+    def _store_many(self, nm):
+        for assoc_id, verbosity in [("action/11111", 1),
+                                    ("action/22222", 2),
+                                    ("step/11111/aaa", 1),
+                                    ("step/11111/bbb", 1),
+                                    ("step/22222/aaa", 1)]:
+            nm.store(Note(
+                assoc_id=assoc_id,
+                subject="store_retrieve_many",
+                sub_type="test",
+                note_val="this is my note for {}".format(assoc_id),
+                verbosity=verbosity,
+                link_url="http://test.test/" if verbosity == 2 else None
+            ))
+
+    def test_store_retrieve_many(self):
+        nm = NotesManager(MemoryNotesStorage(), get_token)
+        self._store_many(nm)
+        n_dict = nm.retrieve_many([
+            Query("action/11111", exact_match=True),
+            Query("action/22222", max_verbosity=1, exact_match=True),
+            Query("step/11111/"),
+            Query("step/33333/"),
+        ])
+        assert len(n_dict["action/11111"]) == 1
+        assert n_dict["action/22222"] == []
+        assert ([n.assoc_id for n in n_dict["step/11111/"]] ==
+                ["step/11111/aaa", "step/11111/bbb"])
+        assert n_dict["step/33333/"] == []
+        assert nm.retrieve_many([]) == {}
+
+    def test_store_retrieve_many_url_refs(self):
+        nm = NotesManager(MemoryNotesStorage(), get_token)
+        self._store_many(nm)
+        n_dict = nm.retrieve_many([Query("action/")])
+        assert len(n_dict["action/"]) == 2
+        for n in n_dict["action/"]:
+            if n.link_url:
+                assert n.resolved_url_value == (
+                    "Details at notedetails/" + n.note_id)
+            else:
+                assert n.resolved_url_value is None
+
+    def test_retrieve_many_default(self):
+        """Tests the retrieve_many of a storage that doesn't override it"""
+        class RetrieveOnlyStorage(NotesStorage):
+            def __init__(self):
+                self.mem = MemoryNotesStorage()
+                self.queries = []
+
+            def store(self, note):
+                return self.mem.store(note)
+
+            def retrieve(self, query):
+                self.queries.append(query.assoc_id_pattern)
+                return self.mem.retrieve(query)
+
+            def retrieve_by_id(self, note_id):
+                return self.mem.retrieve_by_id(note_id)
+
+        storage = RetrieveOnlyStorage()
+        nm = NotesManager(storage, get_token)
+        self._store_many(nm)
+        n_dict = nm.retrieve_many([Query("step/11111/"), Query("step/2")])
+        assert storage.queries == ["step/11111/", "step/2"]
+        assert len(n_dict["step/11111/"]) == 2
+        assert len(n_dict["step/2"]) == 1
+
+    def test_retrieve_many_exception_handling(self):
+        nm = NotesManager(NotesStorageErrorImpl(), get_token)
+        with pytest.raises(NotesRetrievalError) as nre:
+            nm.retrieve_many([Query("test")])
+        assert "Unhandled" in str(nre.value)
+
+        nm = NotesManager(NotesStorageExpectedErrorImpl(), get_token)
+        with pytest.raises(NotesRetrievalError) as nre:
+            nm.retrieve_many([Query("test")])
+        assert "Expected" in str(nre.value)
+
     def test_store_retrieve_url_refs(self):
         """Tests that notes retrieved as a list have notedetails refs"""
         nm = NotesManager(MemoryNotesStorage(), get_token)
@@ -13,6 +13,8 @@
 # limitations under the License.
 from unittest.mock import patch
 
+import falcon
+from falcon import testing
 import pytest
 
 from shipyard_airflow.control.helpers.workflow_helper import (
@@ -24,12 +26,14 @@ from tests.unit.control import common
 
 
 class TestWorkflowResource():
-    @patch.object(WorkflowResource, 'get_all_workflows', common.str_responder)
+    @patch.object(WorkflowResource, 'iter_all_workflows',
+                  lambda *args, **kwargs: iter([{'dag_id': 'deploy_site'}]))
     def test_on_get(self, api_client):
         """Validate the on_get method returns 200 on success"""
         result = api_client.simulate_get(
             "/api/v1.0/workflows", headers=common.AUTH_HEADERS)
         assert result.status_code == 200
+        assert result.json == [{'dag_id': 'deploy_site'}]
 
     def test_get_all_workflows(self):
         """
@@ -39,7 +43,51 @@ class TestWorkflowResource():
         with patch.object(WorkflowHelper, 'get_workflow_list') as mock_method:
             helper = WorkflowHelper('')
             wr.get_all_workflows(helper, None)
-        mock_method.assert_called_once_with(since_iso8601=None)
+        mock_method.assert_called_once_with(since_iso8601=None, cursor=None,
+                                            limit=None)
+
+    def test_iter_all_workflows(self):
+        """
+        test that iter_all_workflows invokes the helper properly
+        """
+        wr = WorkflowResource()
+        with patch.object(WorkflowHelper, 'iter_workflows') as mock_method:
+            helper = WorkflowHelper('')
+            wr.iter_all_workflows(helper, None)
+        mock_method.assert_called_once_with(since_iso8601=None, cursor=None,
+                                            limit=None)
+
+    def test_get_workflow_filters(self):
+        """
+        test that the query parameters are parsed for filtering and paging
+        """
+        wr = WorkflowResource()
+        req = falcon.Request(testing.create_environ(
+            path='/', query_string=(
+                'since=2017-09-13T11:12:00Z&limit=5&'
+                'cursor=deploy_site__2017-09-13T11:13:03.057000')))
+        assert wr.get_workflow_filters(req) == {
+            'since_date': '2017-09-13T11:12:00Z',
+            'cursor': 'deploy_site__2017-09-13T11:13:03.057000',
+            'limit': 5
+        }
+
+    @pytest.mark.parametrize('query_string', [
+        'limit=0',
+        'limit=ten',
+        'cursor=deploy_site',
+        'cursor=deploy_site__turnip',
+    ])
+    def test_get_workflow_filters_invalid(self, query_string):
+        """
+        test that invalid filtering and paging parameters are rejected
+        """
+        wr = WorkflowResource()
+        req = falcon.Request(testing.create_environ(
+            path='/', query_string=query_string))
+        with pytest.raises(ApiError) as expected_exc:
+            wr.get_workflow_filters(req)
+        assert '400' in str(expected_exc.value.status)
 
 
 class TestWorkflowIdResource():
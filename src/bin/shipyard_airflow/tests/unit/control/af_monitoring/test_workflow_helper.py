@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from datetime import datetime
+from unittest import mock
 
 import arrow
 
@@ -112,21 +113,57 @@ def test_get_workflow_list():
     Tests the get_workflow_list method
     """
     helper = WorkflowHelper('')
-    helper._get_all_dag_runs_db = lambda: [DAG_RUN_1, DAG_RUN_1, DAG_RUN_1]
+    helper._iter_workflow_dag_runs_db = mock.MagicMock(
+        return_value=iter([dict(DAG_RUN_1), dict(DAG_RUN_1)]))
 
-    # Time includes items
     dag_list = helper.get_workflow_list(
         since_iso8601='2017-09-13T11:12:00.000000'
     )
-    assert DAG_RUN_1 in dag_list
-    assert len(dag_list) == 3
-
-    # Time excludes items
-    dag_list = helper.get_workflow_list(
-        since_iso8601='2017-10-01T11:12:00.000000'
+    assert len(dag_list) == 2
+    assert (dag_list[0]['workflow_id'] ==
+            'did2__2017-09-13T11:13:03.057000')
+    # the date criteria are applied by the database
+    helper._iter_workflow_dag_runs_db.assert_called_once_with(
+        since=datetime(2017, 9, 13, 11, 12),
+        cursor_dag_id=None,
+        cursor_execution_date=None,
+        limit=None)
+
+
+def test_iter_workflows_paged():
+    """
+    Tests the iter_workflows method with a cursor and limit
+    """
+    helper = WorkflowHelper('')
+    helper._iter_workflow_dag_runs_db = mock.MagicMock(
+        return_value=iter([dict(DAG_RUN_1)]))
+
+    dag_list = list(helper.iter_workflows(
+        since_iso8601='2017-09-13T11:12:00.000000',
+        cursor='deploy_site__2017-09-13T11:12:30.000000',
+        limit=1
+    ))
+    assert [dag['dag_id'] for dag in dag_list] == ['did2']
+    helper._iter_workflow_dag_runs_db.assert_called_once_with(
+        since=datetime(2017, 9, 13, 11, 12),
+        cursor_dag_id='deploy_site',
+        cursor_execution_date=datetime(2017, 9, 13, 11, 12, 30),
+        limit=1)
+
+
+def test_validate_workflow_cursor():
+    """
+    static method validate_workflow_cursor
+    """
+    assert WorkflowHelper.validate_workflow_cursor(
+        'aar__dvark__1924-04-12T05:34:01.222220'
+    )
+    assert not WorkflowHelper.validate_workflow_cursor(
+        'aardvark_1924-04-12T05:34:01.222220'
+    )
+    assert not WorkflowHelper.validate_workflow_cursor(
+        'aardvark__turnip'
     )
-    assert DAG_RUN_1 not in dag_list
-    assert len(dag_list) == 0
 
 
 TASK_LIST = [
@@ -16,9 +16,42 @@ import os
 from falcon import testing
 import pytest
 
+from shipyard_airflow.control.helpers.document_hash_cache import (
+    DOCUMENT_HASHES)
+from shipyard_airflow.control.helpers.rendered_docs_cache import (
+    RENDERED_DOCS)
+from shipyard_airflow.control.helpers.revision_index_cache import (
+    REVISION_INDEX)
 from shipyard_airflow.control.start_shipyard import start_shipyard
 
 
+@pytest.fixture(autouse=True)
+def clear_revision_index():
+    """Prevents the revision index cached by one test being used by another"""
+    REVISION_INDEX.invalidate()
+    yield
+    REVISION_INDEX.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def clear_document_hashes():
+    """Prevents the document hashes cached by one test being used by another
+    """
+    DOCUMENT_HASHES.clear()
+    yield
+    DOCUMENT_HASHES.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_rendered_docs():
+    """Prevents the rendered documents cached by one test being used by
+    another
+    """
+    RENDERED_DOCS.clear()
+    yield
+    RENDERED_DOCS.clear()
+
+
 @pytest.fixture()
 def api_client():
     """Testing client for the Shipyard API"""
@@ -164,6 +164,15 @@ def test_determine_lifecycle():
                action_helper.determine_lifecycle(status_pair['input']))
 
 
+def test_determine_dag_states():
+    assert (sorted(action_helper.determine_dag_states('Pending')) ==
+            ['none', 'queued', 'scheduled'])
+    assert (sorted(action_helper.determine_dag_states('processing')) ==
+            ['running', 'up_for_retry'])
+    assert action_helper.determine_dag_states('Paused') == ['paused']
+    assert action_helper.determine_dag_states('bogusBroken') == []
+
+
 def test_get_step():
     # Set up actions helper
     action_id = '01CPV581B0CM8C9CA0CFRNVPPY'  # id in db
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from datetime import datetime
+from datetime import timedelta
 import json
 import logging
 import os
@@ -101,7 +102,7 @@ def create_resp():
     return resp
 
 
-def actions_db():
+def actions_db(**kwargs):
     """
     replaces the actual db call
     """
@@ -131,7 +132,7 @@ def actions_db():
     ]
 
 
-def dag_runs_db():
+def dag_runs_db(**kwargs):
     """
     replaces the actual db call
     """
@@ -157,7 +158,7 @@ def dag_runs_db():
     ]
 
 
-def tasks_db():
+def tasks_db(**kwargs):
     """
     replaces the actual db call
     """
@@ -272,10 +273,10 @@ def test_actions_all_in_list():
 @mock.patch.object(ShipyardPolicy, 'authorize', return_value=True)
 @mock.patch.object(
     ActionsResource,
-    'get_all_actions',
-    return_value={'id': 'test_id',
-                  'name': 'test_name'})
-def test_on_get(mock_get_all_actions, mock_authorize):
+    'iter_all_actions',
+    return_value=iter([{'id': 'test_id',
+                        'name': 'test_name'}]))
+def test_on_get(mock_iter_all_actions, mock_authorize):
     act_resource = ActionsResource()
     context.policy_engine = ShipyardPolicy()
     req = create_req(context, None)
@@ -283,8 +284,9 @@ def test_on_get(mock_get_all_actions, mock_authorize):
     act_resource.on_get(req, resp)
     mock_authorize.assert_called_once_with(
         'workflow_orchestrator:list_actions', context)
-    assert mock_get_all_actions.call_count == 1
-    assert resp.body is not None
+    assert mock_iter_all_actions.call_count == 1
+    assert json.loads(b''.join(resp.stream).decode('utf-8')) == [
+        {'id': 'test_id', 'name': 'test_name'}]
     assert resp.status == '200 OK'
 
 
@@ -324,15 +326,15 @@ def test_on_post(mock_info, mock_create_action, mock_authorize, *args):
 
 @mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
             new=nh)
-def test_get_all_actions(*args):
+def test_iter_all_actions_correlated(*args):
     """
     Tests the main response from get all actions
     """
     action_resource = ActionsResource()
-    action_resource.get_all_actions_db = actions_db
-    action_resource.get_all_dag_runs_db = dag_runs_db
-    action_resource.get_all_tasks_db = tasks_db
-    result = action_resource.get_all_actions(verbosity=1)
+    action_resource.get_actions_db = actions_db
+    action_resource.get_dag_runs_db = dag_runs_db
+    action_resource.get_tasks_db = tasks_db
+    result = list(action_resource.iter_all_actions(verbosity=1))
     assert len(result) == len(actions_db())
     for action in result:
         if action['name'] == 'dag_it':
@@ -345,20 +347,20 @@ def test_get_all_actions(*args):
 
 @mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
             new=nh)
-def test_get_all_actions_notes(*args):
+def test_iter_all_actions_notes(*args):
     """
     Tests the main response from get all actions
     """
     action_resource = ActionsResource()
-    action_resource.get_all_actions_db = actions_db
-    action_resource.get_all_dag_runs_db = dag_runs_db
-    action_resource.get_all_tasks_db = tasks_db
+    action_resource.get_actions_db = actions_db
+    action_resource.get_dag_runs_db = dag_runs_db
+    action_resource.get_tasks_db = tasks_db
     # inject some notes
     nh.make_action_note('aaaaaa', "hello from aaaaaa1")
     nh.make_action_note('aaaaaa', "hello from aaaaaa2")
     nh.make_action_note('bbbbbb', "hello from bbbbbb")
 
-    result = action_resource.get_all_actions(verbosity=1)
+    result = list(action_resource.iter_all_actions(verbosity=1))
     assert len(result) == len(actions_db())
     for action in result:
         if action['id'] == 'aaaaaa':
@@ -368,12 +370,262 @@ def test_get_all_actions_notes(*args):
             assert action['notes'][0]['note_val'] == 'hello from bbbbbb'
 
 
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper')
+def test_iter_all_actions_notes_for_page(mock_notes_helper):
+    """
+    Tests that notes are retrieved for only the actions being returned
+    """
+    mock_notes_helper.get_notes_for_actions.return_value = {}
+    action_resource = ActionsResource()
+    action_resource.get_actions_db = mock.MagicMock(
+        return_value=actions_db()[1:])
+    action_resource.get_dag_runs_db = dag_runs_db
+    action_resource.get_tasks_db = tasks_db
+    list(action_resource.iter_all_actions(verbosity=2, limit=1))
+    mock_notes_helper.get_notes_for_actions.assert_called_once_with(
+        action_ids=['bbbbbb'], verbosity=2)
+
+
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+def test_iter_all_actions_filtered(*args):
+    """
+    Tests that filters are passed through to the database wrappers, and the
+    airflow data is limited to the dag runs of the actions returned
+    """
+    action_resource = ActionsResource()
+    action_resource.get_actions_db = mock.MagicMock(
+        side_effect=[actions_db(), []])
+    action_resource.get_action_ids_by_lifecycle_db = mock.MagicMock(
+        return_value=['bbbbbb'])
+    action_resource.get_dag_runs_db = mock.MagicMock(
+        return_value=dag_runs_db())
+    action_resource.get_tasks_db = mock.MagicMock(return_value=tasks_db())
+    result = list(action_resource.iter_all_actions(
+        verbosity=1, cursor='000000', limit=2, since=DATE_ONE, name='dag2',
+        lifecycle='Complete'))
+    action_resource.get_action_ids_by_lifecycle_db.assert_called_once_with(
+        lifecycle='Complete', action_ids=['aaaaaa', 'bbbbbb'],
+        dag_ids=['did1', 'did2'])
+    # one action of the first page matched, so the next page is limited to
+    # the one action remaining
+    assert action_resource.get_actions_db.call_args_list == [
+        mock.call(cursor='000000', limit=2, since=DATE_ONE, name='dag2'),
+        mock.call(cursor='bbbbbb', limit=1, since=DATE_ONE, name='dag2')
+    ]
+    exec_date = datetime(2017, 9, 13, 11, 13, 3)
+    action_resource.get_dag_runs_db.assert_called_with(
+        start_date=exec_date, end_date=exec_date + timedelta(seconds=1))
+    action_resource.get_tasks_db.assert_called_with(
+        dag_runs=[('did2', DATE_ONE_STR)])
+    assert len(result) == 1
+    assert result[0]['id'] == 'bbbbbb'
+    assert result[0]['action_lifecycle'] == 'Complete'
+    assert len(result[0]['steps']) == 3
+
+
+def test_get_task_map(*args):
+    """
+    Tests that tasks are grouped by dag run, including subdag tasks with
+    the tasks of their parent
+    """
+    action_resource = ActionsResource()
+    subdag_task = {
+        'task_id': '3a',
+        'dag_id': 'did2.subdag',
+        'execution_date': DATE_ONE,
+        'state': 'SUCCESS'
+    }
+    action_resource.get_tasks_db = mock.MagicMock(
+        return_value=tasks_db() + [subdag_task])
+    task_map = action_resource.get_task_map(
+        dag_runs=[('did1', DATE_ONE_STR), ('did2', DATE_ONE_STR)])
+    assert sorted(task_map.keys()) == [('did1', DATE_ONE_STR),
+                                       ('did2', DATE_ONE_STR)]
+    assert [t['task_id'] for t in task_map[('did1', DATE_ONE_STR)]] == ['2a']
+    assert ([t['task_id'] for t in task_map[('did2', DATE_ONE_STR)]] ==
+            ['1a', '1b', '1c', '3a'])
+
+
+def test_iter_all_actions_no_lifecycle_match(*args):
+    """
+    Tests that no further lookups happen if no dag runs match the lifecycle
+    """
+    action_resource = ActionsResource()
+    action_resource.get_action_ids_by_lifecycle_db = mock.MagicMock(
+        return_value=[])
+    action_resource.get_actions_db = mock.MagicMock(
+        return_value=actions_db())
+    action_resource.get_dag_runs_db = mock.MagicMock()
+    action_resource.get_tasks_db = mock.MagicMock()
+    assert list(action_resource.iter_all_actions(
+        verbosity=1, lifecycle='Paused')) == []
+    assert not action_resource.get_dag_runs_db.called
+    assert not action_resource.get_tasks_db.called
+
+
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+def test_iter_all_actions_pending_lifecycle(*args):
+    """
+    Tests that the actions having no dag run are included in the Pending
+    lifecycle, by excluding the actions having a dag run in another state
+    """
+    action_resource = ActionsResource()
+    action_resource.get_action_ids_by_lifecycle_db = mock.MagicMock()
+    action_resource.get_action_ids_not_in_lifecycle_db = mock.MagicMock(
+        return_value=['bbbbbb'])
+    action_resource.get_actions_db = mock.MagicMock(
+        return_value=actions_db())
+    action_resource.get_dag_runs_db = mock.MagicMock(return_value=[])
+    action_resource.get_tasks_db = mock.MagicMock(return_value=[])
+    result = list(action_resource.iter_all_actions(verbosity=1,
+                                                   lifecycle='Pending'))
+    assert not action_resource.get_action_ids_by_lifecycle_db.called
+    action_resource.get_action_ids_not_in_lifecycle_db.assert_called_with(
+        lifecycle='Pending', action_ids=['aaaaaa', 'bbbbbb'],
+        dag_ids=['did1', 'did2'])
+    assert [action['id'] for action in result] == ['aaaaaa']
+    assert result[0]['action_lifecycle'] == 'Pending'
+
+
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+@mock.patch.object(actions_api, 'ACTIONS_BATCH_SIZE', 2)
+def test_iter_all_actions(*args):
+    """
+    Tests that the actions are retrieved in batches, following the cursor,
+    until the limit or the end of the actions is reached
+    """
+    history = [{
+        'id': '{:026d}'.format(idx),
+        'name': 'deploy_site',
+        'dag_id': 'deploy_site',
+        'dag_execution_date': DATE_ONE_STR,
+    } for idx in range(5)]
+
+    def paged_actions_db(cursor=None, limit=None, **kwargs):
+        return [dict(action) for action in history
+                if cursor is None or action['id'] > cursor][:limit]
+
+    action_resource = ActionsResource()
+    action_resource.get_actions_db = mock.MagicMock(
+        side_effect=paged_actions_db)
+    action_resource.get_dag_runs_db = mock.MagicMock(return_value=[])
+    action_resource.get_tasks_db = mock.MagicMock(return_value=[])
+
+    actions = list(action_resource.iter_all_actions(verbosity=1))
+    assert [a['id'] for a in actions] == [a['id'] for a in history]
+    assert ([c[1]['limit'] for c in
+             action_resource.get_actions_db.call_args_list] == [2, 2, 2])
+
+    action_resource.get_actions_db.reset_mock()
+    actions = list(action_resource.iter_all_actions(
+        verbosity=1, cursor=history[0]['id'], limit=3))
+    assert [a['id'] for a in actions] == [a['id'] for a in history[1:4]]
+    assert ([(c[1]['cursor'], c[1]['limit']) for c in
+             action_resource.get_actions_db.call_args_list] ==
+            [(history[0]['id'], 2), (history[2]['id'], 1)])
+
+
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+@mock.patch.object(actions_api, 'ACTIONS_BATCH_SIZE', 2)
+def test_iter_all_actions_lifecycle_bounded_by_page(*args):
+    """
+    Tests that the dag run states are looked up for only the actions of each
+    page, rather than for the whole history
+    """
+    history = [{
+        'id': '{:026d}'.format(idx),
+        'name': 'deploy_site',
+        'dag_id': 'deploy_site',
+        'dag_execution_date': DATE_ONE_STR,
+    } for idx in range(5)]
+
+    def paged_actions_db(cursor=None, limit=None, **kwargs):
+        return [dict(action) for action in history
+                if cursor is None or action['id'] > cursor][:limit]
+
+    action_resource = ActionsResource()
+    action_resource.get_actions_db = mock.MagicMock(
+        side_effect=paged_actions_db)
+    # every other action is complete
+    action_resource.get_action_ids_by_lifecycle_db = mock.MagicMock(
+        side_effect=lambda action_ids, **kwargs: action_ids[::2])
+    action_resource.get_dag_runs_db = mock.MagicMock(return_value=[])
+    action_resource.get_tasks_db = mock.MagicMock(return_value=[])
+
+    actions = list(action_resource.iter_all_actions(verbosity=1,
+                                                    lifecycle='Complete'))
+    assert [a['id'] for a in actions] == [
+        history[0]['id'], history[2]['id'], history[4]['id']]
+    assert [c[1]['action_ids'] for c in
+            action_resource.get_action_ids_by_lifecycle_db.call_args_list
+            ] == [[a['id'] for a in history[idx:idx + 2]]
+                  for idx in range(0, 5, 2)]
+
+
+def test_iter_all_actions_no_actions(*args):
+    """
+    Tests that airflow is not queried when there are no actions
+    """
+    action_resource = ActionsResource()
+    action_resource.get_actions_db = mock.MagicMock(return_value=[])
+    action_resource.get_dag_runs_db = mock.MagicMock()
+    action_resource.get_tasks_db = mock.MagicMock()
+    assert list(action_resource.iter_all_actions(verbosity=1)) == []
+    assert not action_resource.get_dag_runs_db.called
+    assert not action_resource.get_tasks_db.called
+
+
+def _filter_req(query_string):
+    env = testing.create_environ(path='/', query_string=query_string)
+    return falcon.Request(env)
+
+
+def test_get_action_filters():
+    action_resource = ActionsResource()
+    filters = action_resource.get_action_filters(_filter_req(''))
+    assert filters == {
+        'cursor': None,
+        'limit': None,
+        'since': None,
+        'name': None,
+        'lifecycle': None
+    }
+    filters = action_resource.get_action_filters(_filter_req(
+        'cursor=01BTP9T2WCE1PAJR2DWYXG805V&limit=10&name=deploy_site&'
+        'lifecycle=failed&since=2017-09-13T11:13:03%2B02:00'))
+    assert filters == {
+        'cursor': '01BTP9T2WCE1PAJR2DWYXG805V',
+        'limit': 10,
+        'since': datetime(2017, 9, 13, 9, 13, 3),
+        'name': 'deploy_site',
+        'lifecycle': 'failed'
+    }
+
+
+@pytest.mark.parametrize('query_string', [
+    'cursor=abc',
+    'limit=0',
+    'limit=ten',
+    'since=notadate',
+    'lifecycle=Tacos',
+])
+def test_get_action_filters_invalid(query_string):
+    action_resource = ActionsResource()
+    with pytest.raises(ApiError) as api_err:
+        action_resource.get_action_filters(_filter_req(query_string))
+    assert api_err.value.status == falcon.HTTP_400
+
+
 def _gen_action_resource_stubbed():
     # TODO(bryan-strassner): mabye subclass this instead?
     action_resource = ActionsResource()
-    action_resource.get_all_actions_db = actions_db
-    action_resource.get_all_dag_runs_db = dag_runs_db
-    action_resource.get_all_tasks_db = tasks_db
+    action_resource.get_actions_db = actions_db
+    action_resource.get_dag_runs_db = dag_runs_db
+    action_resource.get_tasks_db = tasks_db
     action_resource.invoke_airflow_dag = airflow_stub
     action_resource.insert_action = insert_action_stub
     action_resource.audit_control_command_db = audit_control_command_db
@@ -639,25 +891,50 @@ def test_auth_alignment(auth, *args):
 
 
 @patch('shipyard_airflow.db.shipyard_db.ShipyardDbAccess.'
-       'get_all_submitted_actions')
-def test_get_all_actions_db(mock_get_all_submitted_actions):
+       'get_submitted_actions')
+def test_get_actions_db(mock_get_submitted_actions):
+    act_resource = ActionsResource()
+    act_resource.get_actions_db(limit=5, name='deploy_site')
+    mock_get_submitted_actions.assert_called_with(
+        cursor=None, limit=5, since=None, name='deploy_site')
+
+
+@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.get_run_ids_by_state')
+def test_get_action_ids_by_lifecycle_db(mock_get_run_ids_by_state):
+    act_resource = ActionsResource()
+    act_resource.get_action_ids_by_lifecycle_db(
+        lifecycle='Complete', action_ids=['aaaaaa'], dag_ids=['did1'])
+    mock_get_run_ids_by_state.assert_called_with(
+        states=['success'], run_ids=['aaaaaa'], dag_ids=['did1'])
+
+
+@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.'
+       'get_run_ids_not_in_state')
+def test_get_action_ids_not_in_lifecycle_db(mock_get_run_ids_not_in_state):
     act_resource = ActionsResource()
-    act_resource.get_all_actions_db()
-    assert mock_get_all_submitted_actions.called
+    act_resource.get_action_ids_not_in_lifecycle_db(
+        lifecycle='Pending', action_ids=['aaaaaa'], dag_ids=['did1'])
+    mock_get_run_ids_not_in_state.assert_called_with(
+        states=['queued', 'scheduled', 'none'], run_ids=['aaaaaa'],
+        dag_ids=['did1'])
 
 
-@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.get_all_dag_runs')
-def test_get_all_dag_runs_db(mock_get_all_dag_runs):
+@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.'
+       'get_dag_runs_by_execution_range')
+def test_get_dag_runs_db(mock_get_dag_runs_by_execution_range):
     act_resource = ActionsResource()
-    act_resource.get_all_dag_runs_db()
-    assert mock_get_all_dag_runs.called
+    act_resource.get_dag_runs_db(start_date=DATE_ONE, end_date=DATE_TWO)
+    mock_get_dag_runs_by_execution_range.assert_called_with(
+        start_date=DATE_ONE, end_date=DATE_TWO)
 
 
-@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.get_all_tasks')
-def test_get_all_tasks_db(mock_get_all_tasks):
+@patch('shipyard_airflow.db.airflow_db.AirflowDbAccess.'
+       'get_tasks_by_dag_runs')
+def test_get_tasks_db(mock_get_tasks_by_dag_runs):
     act_resource = ActionsResource()
-    act_resource.get_all_tasks_db()
-    assert mock_get_all_tasks.called
+    act_resource.get_tasks_db(dag_runs=[('did2', DATE_ONE_STR)])
+    mock_get_tasks_by_dag_runs.assert_called_with(
+        dag_runs=[('did2', DATE_ONE_STR)])
 
 
 @patch('shipyard_airflow.db.shipyard_db.ShipyardDbAccess.insert_action')
@@ -0,0 +1,135 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Microbenchmark for the correlation of actions to their steps
+
+Times ActionsResource.iter_all_actions for increasing numbers of task rows,
+verifying that the cost of correlating steps to actions grows linearly with
+the size of the history rather than with actions x tasks.
+
+The benchmark depends on wall clock timings, so it is opt-in: it is skipped
+unless the SHIPYARD_RUN_BENCHMARKS environment variable is set.
+"""
+from datetime import datetime
+from datetime import timedelta
+import logging
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.common.notes.notes import NotesManager
+from shipyard_airflow.common.notes.notes_helper import NotesHelper
+from shipyard_airflow.common.notes.storage_impl_mem import (
+    MemoryNotesStorage
+)
+from shipyard_airflow.control.action.actions_api import ActionsResource
+
+LOG = logging.getLogger(__name__)
+
+RUN_BENCHMARKS_ENV = 'SHIPYARD_RUN_BENCHMARKS'
+
+# Each action has TASKS_PER_DAG tasks in its dag, and as many again in a
+# subdag
+TASKS_PER_DAG = 10
+START_DATE = datetime(2018, 1, 1)
+
+nh = NotesHelper(NotesManager(MemoryNotesStorage(), lambda: "token"))
+
+
+def _gen_history(task_rows):
+    """Generate actions, dag runs and tasks totalling task_rows tasks"""
+    actions = []
+    dag_runs = []
+    tasks = []
+    for idx in range(task_rows // (TASKS_PER_DAG * 2)):
+        exec_date = START_DATE + timedelta(seconds=idx)
+        actions.append({
+            'id': '{:026d}'.format(idx),
+            'name': 'deploy_site',
+            'parameters': {},
+            'dag_id': 'deploy_site',
+            'dag_execution_date': exec_date.strftime('%Y-%m-%dT%H:%M:%S'),
+            'user': 'robot1',
+            'timestamp': exec_date,
+            'context_marker': '8-4-4-4-12a'
+        })
+        dag_runs.append({
+            'dag_id': 'deploy_site',
+            'execution_date': exec_date,
+            'state': 'success'
+        })
+        for dag_id in ('deploy_site', 'deploy_site.drydock_build'):
+            for task_idx in range(TASKS_PER_DAG):
+                tasks.append({
+                    'task_id': 'step_{}'.format(task_idx),
+                    'dag_id': dag_id,
+                    'execution_date': exec_date,
+                    'state': 'success'
+                })
+    return actions, dag_runs, tasks
+
+
+def _time_iter_all_actions(task_rows):
+    actions, dag_runs, tasks = _gen_history(task_rows)
+    # the fake queries return only the rows of the page requested, as the
+    # database queries do
+    tasks_by_run = {}
+    for task in tasks:
+        tasks_by_run.setdefault(
+            (task['dag_id'].split('.', 1)[0],
+             task['execution_date'].strftime('%Y-%m-%dT%H:%M:%S')),
+            []).append(task)
+
+    def get_actions_db(cursor=None, limit=None, **kwargs):
+        return [action for action in actions
+                if cursor is None or action['id'] > cursor][:limit]
+
+    def get_dag_runs_db(start_date, end_date):
+        return [run for run in dag_runs
+                if start_date <= run['execution_date'] < end_date]
+
+    def get_tasks_db(dag_runs):
+        return [task for dag_run in dag_runs
+                for task in tasks_by_run.get(dag_run, [])]
+
+    action_resource = ActionsResource()
+    action_resource.get_actions_db = get_actions_db
+    action_resource.get_dag_runs_db = get_dag_runs_db
+    action_resource.get_tasks_db = get_tasks_db
+
+    start = time.perf_counter()
+    result = list(action_resource.iter_all_actions(verbosity=0))
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == len(actions)
+    for action in result:
+        assert len(action['steps']) == TASKS_PER_DAG * 2
+    LOG.info("iter_all_actions with %d task rows and %d actions: %.4fs",
+             task_rows, len(actions), elapsed)
+    return elapsed
+
+
+@pytest.mark.skipif(not os.environ.get(RUN_BENCHMARKS_ENV),
+                    reason='{} is not set'.format(RUN_BENCHMARKS_ENV))
+@mock.patch('shipyard_airflow.control.action.actions_api.notes_helper',
+            new=nh)
+def test_iter_all_actions_task_correlation_scaling(*args):
+    timings = {
+        task_rows: _time_iter_all_actions(task_rows)
+        for task_rows in (1000, 10000, 100000)
+    }
+    # 10x the rows is expected to take roughly 10x the time. A quadratic
+    # correlation would take roughly 100x the time.
+    assert timings[100000] < timings[10000] * 40
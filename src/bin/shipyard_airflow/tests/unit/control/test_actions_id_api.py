@@ -57,7 +57,9 @@ def actions_db(action_id):
         'dag_execution_date': DATE_ONE_STR,
         'user': 'robot1',
         'timestamp': DATE_ONE,
-        'context_marker': '8-4-4-4-12a'
+        'context_marker': '8-4-4-4-12a',
+        'validations': get_validations(action_id),
+        'command_audit': get_ac_audit(action_id)
     }
 
 
@@ -76,6 +78,14 @@ def dag_runs_db(dag_id, execution_date):
     }]
 
 
+def dag_run_with_tasks_db(dag_id, execution_date):
+    """
+    replaces the actual db call
+    """
+    return (dag_runs_db(dag_id, execution_date)[0],
+            tasks_db(dag_id, execution_date))
+
+
 def tasks_db(dag_id, execution_date):
     """
     replaces the actual db call
@@ -180,10 +190,7 @@ def test_get_action_success(*args):
     action_resource = ActionsIdResource()
     # stubs for db
     action_resource.get_action_db = actions_db
-    action_resource.get_dag_run_db = dag_runs_db
-    action_resource.get_tasks_db = tasks_db
-    action_resource.get_validations_db = get_validations
-    action_resource.get_action_command_audit_db = get_ac_audit
+    action_resource.get_dag_run_with_tasks_db = dag_run_with_tasks_db
 
     action = action_resource.get_action(
         action_id='12345678901234567890123456',
@@ -192,9 +199,67 @@ def test_get_action_success(*args):
     if action['name'] == 'dag_it':
         assert len(action['steps']) == 3
         assert action['dag_status'] == 'FAILED'
+        assert len(action['validations']) == 1
         assert len(action['command_audit']) == 2
 
 
+@mock.patch('shipyard_airflow.control.helpers.action_helper.notes_helper',
+            new=nh)
+@mock.patch('shipyard_airflow.control.action.actions_id_api.notes_helper',
+            new=nh)
+def test_get_action_no_dag_run(*args):
+    """
+    Tests that an action without a dag run is returned without steps
+    """
+    action_resource = ActionsIdResource()
+    action_resource.get_action_db = actions_db
+    action_resource.get_dag_run_with_tasks_db = mock.MagicMock(
+        return_value=(None, []))
+
+    action = action_resource.get_action(
+        action_id='12345678901234567890123456',
+        verbosity=1
+    )
+    action_resource.get_dag_run_with_tasks_db.assert_called_once_with(
+        'did2', DATE_ONE_STR)
+    assert 'steps' not in action
+    assert 'dag_status' not in action
+    assert len(action['command_audit']) == 2
+
+
+def test_get_action_notes_single_retrieval():
+    """
+    Tests that the notes of an action and its steps are retrieved together
+    """
+    notes_helper = NotesHelper(NotesManager(MemoryNotesStorage(), get_token))
+    action_id = '12345678901234567890123456'
+    notes_helper.make_action_note(action_id, 'action note')
+    notes_helper.make_action_note(action_id, 'detailed note', verbosity=3)
+    notes_helper.make_step_note(action_id, '1a', 'step note')
+    notes_helper.make_step_note(action_id, '1b', 'detailed step note',
+                                verbosity=2)
+    action_resource = ActionsIdResource()
+    action_resource.get_action_db = actions_db
+    action_resource.get_dag_run_with_tasks_db = dag_run_with_tasks_db
+
+    with mock.patch(
+        'shipyard_airflow.control.helpers.action_helper.notes_helper',
+        new=notes_helper), mock.patch(
+            'shipyard_airflow.control.action.actions_id_api.notes_helper',
+            new=notes_helper), mock.patch.object(
+                notes_helper.nm, 'retrieve_many',
+                wraps=notes_helper.nm.retrieve_many) as retrieve_many:
+        action = action_resource.get_action(action_id=action_id,
+                                            verbosity=3)
+    retrieve_many.assert_called_once_with(mock.ANY)
+    assert [note['note_val'] for note in action['notes']] == [
+        'action note', 'detailed note']
+    # step notes are limited to the summary level
+    assert {step['id']: [note['note_val'] for note in step['notes']]
+            for step in action['steps']} == {
+        '1a': ['step note'], '1b': [], '1c': []}
+
+
 @mock.patch.object(ActionsIdResource, 'get_action_db', return_value=None)
 def test_get_action_errors(mock_get_action):
     '''verify when get_action_db returns None, ApiError is raised'''
@@ -207,40 +272,8 @@ def test_get_action_errors(mock_get_action):
     assert 'Action not found' in str(expected_exc)
 
 
-@mock.patch.object(ActionsIdResource, 'get_dag_run_db', return_value=None)
-def test_get_dag_run_by_id_empty(mock_get_dag_run_db):
-    '''test that an empty dag_run_list will return None'''
-    action_resource = ActionsIdResource()
-    context.policy_engine = ShipyardPolicy()
-    dag_id = 'test_dag_id'
-    execution_date = 'test_execution_date'
-    result = action_resource.get_dag_run_by_id(dag_id, execution_date)
-    mock_get_dag_run_db.assert_called_once_with(dag_id, execution_date)
-    assert result is None
-
-
-def test_get_dag_run_by_id_notempty():
-    '''test that a nonempty dag_run_list will return the 1st dag in the list'''
-    action_resource = ActionsIdResource()
-    action_resource.get_dag_run_db = dag_runs_db
-    dag_id = 'test_dag_id'
-    execution_date = 'test_execution_date'
-    result = action_resource.get_dag_run_by_id(dag_id, execution_date)
-    assert result == {
-        'dag_id': 'did2',
-        'execution_date': DATE_ONE,
-        'state': 'FAILED',
-        'run_id': '99',
-        'external_trigger': 'something',
-        'start_date': DATE_ONE,
-        'end_date': DATE_ONE
-    }
-
-
-@mock.patch.object(
-    SHIPYARD_DB,
-    'get_action_by_id', )
-def test_get_action_db(mock_get_action_by_id):
+@mock.patch.object(SHIPYARD_DB, 'get_action_detail_by_id')
+def test_get_action_db(mock_get_action_detail_by_id):
     expected = {
         'id': '12345678901234567890123456',
         'name': 'dag_it',
@@ -249,92 +282,28 @@ def test_get_action_db(mock_get_action_by_id):
         'dag_execution_date': DATE_ONE_STR,
         'user': 'robot1',
         'timestamp': DATE_ONE,
-        'context_marker': '8-4-4-4-12a'
+        'context_marker': '8-4-4-4-12a',
+        'validations': [],
+        'command_audit': []
     }
-    mock_get_action_by_id.return_value = expected
+    mock_get_action_detail_by_id.return_value = expected
     action_resource = ActionsIdResource()
     action_id = 'test_action_id'
 
     result = action_resource.get_action_db(action_id)
-    mock_get_action_by_id.assert_called_once_with(action_id=action_id)
+    mock_get_action_detail_by_id.assert_called_once_with(action_id=action_id)
     assert result == expected
 
 
-@mock.patch.object(SHIPYARD_DB, 'get_validation_by_action_id')
-def test_get_validations_db(mock_get_validation_by_action_id):
-    expected = {
-        'id': '43',
-        'action_id': '12345678901234567890123456',
-        'validation_name': 'It has shiny goodness',
-        'details': 'This was not very shiny.'
-    }
-    mock_get_validation_by_action_id.return_value = expected
-    action_resource = ActionsIdResource()
-    action_id = 'test_action_id'
-
-    result = action_resource.get_validations_db(action_id)
-    mock_get_validation_by_action_id.assert_called_once_with(
-        action_id=action_id)
-    assert result == expected
-
-
-@mock.patch.object(AIRFLOW_DB, 'get_tasks_by_id')
-def test_get_tasks_db(mock_get_tasks_by_id):
-    expected = {
-        'id': '43',
-        'action_id': '12345678901234567890123456',
-        'validation_name': 'It has shiny goodness',
-        'details': 'This was not very shiny.'
-    }
-    mock_get_tasks_by_id.return_value = expected
-    action_resource = ActionsIdResource()
-    dag_id = 'test_dag_id'
-    execution_date = 'test_execution_date'
-
-    result = action_resource.get_tasks_db(dag_id, execution_date)
-    mock_get_tasks_by_id.assert_called_once_with(
-        dag_id=dag_id, execution_date=execution_date)
-    assert result == expected
-
-
-@mock.patch.object(AIRFLOW_DB, 'get_dag_runs_by_id')
-def test_get_dag_run_db(mock_get_dag_runs_by_id):
-    expected = {
-        'dag_id': 'did2',
-        'execution_date': DATE_ONE,
-        'state': 'FAILED',
-        'run_id': '99',
-        'external_trigger': 'something',
-        'start_date': DATE_ONE,
-        'end_date': DATE_ONE
-    }
-    mock_get_dag_runs_by_id.return_value = expected
+@mock.patch.object(AIRFLOW_DB, 'get_dag_run_with_tasks')
+def test_get_dag_run_with_tasks_db(mock_get_dag_run_with_tasks):
+    expected = dag_run_with_tasks_db('did2', DATE_ONE_STR)
+    mock_get_dag_run_with_tasks.return_value = expected
     action_resource = ActionsIdResource()
     dag_id = 'test_dag_id'
     execution_date = 'test_execution_date'
 
-    result = action_resource.get_dag_run_db(dag_id, execution_date)
-    mock_get_dag_runs_by_id.assert_called_once_with(
+    result = action_resource.get_dag_run_with_tasks_db(dag_id, execution_date)
+    mock_get_dag_run_with_tasks.assert_called_once_with(
         dag_id=dag_id, execution_date=execution_date)
     assert result == expected
-
-
-@mock.patch.object(SHIPYARD_DB, 'get_command_audit_by_action_id')
-def test_get_action_command_audit_db(mock_get_command_audit_by_action_id):
-    expected = {
-        'id': '12345678901234567890123456',
-        'name': 'dag_it',
-        'parameters': None,
-        'dag_id': 'did2',
-        'dag_execution_date': DATE_ONE_STR,
-        'user': 'robot1',
-        'timestamp': DATE_ONE,
-        'context_marker': '8-4-4-4-12a'
-    }
-    mock_get_command_audit_by_action_id.return_value = expected
-    action_resource = ActionsIdResource()
-    action_id = 'test_action_id'
-
-    result = action_resource.get_action_command_audit_db(action_id)
-    mock_get_command_audit_by_action_id.assert_called_once_with(action_id)
-    assert result == expected
@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+
 from shipyard_airflow.control.base import ShipyardRequestContext
 from shipyard_airflow.control.api import VersionsResource
 from tests.unit.control.common import create_req, create_resp
@@ -24,6 +26,6 @@ class TestVersionsResource():
         req = create_req(context, None)
         resp = create_resp()
         version_resource.on_get(req, resp)
-        assert sorted(resp.body) == sorted(
-            '{"v1.0": {"status": "stable", "path": "/api/v1.0"}}')
+        assert json.loads(resp.body) == {
+            "v1.0": {"status": "stable", "path": "/api/v1.0"}}
         assert resp.status == '200 OK'
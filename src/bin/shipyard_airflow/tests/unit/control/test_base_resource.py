@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from datetime import datetime
 import json
+from unittest import mock
+
 import pytest
 
 from shipyard_airflow.control.base import BaseResource, ShipyardRequestContext
@@ -88,4 +91,35 @@ def test_to_json():
         'name': 'test_name'
     }
     results = baseResource.to_json(body_dict)
-    assert results == json.dumps(body_dict)
+    assert json.loads(results) == body_dict
+
+
+def test_to_json_stream():
+    '''test to_json_stream produces the same json as to_json'''
+    baseResource = BaseResource()
+    records = [
+        {'id': idx, 'name': 'test_name', 'timestamp': datetime(2018, 1, 1)}
+        for idx in range(5)
+    ]
+    for expected in ([], records[:1], records):
+        results = b''.join(baseResource.to_json_stream(iter(expected)))
+        assert results.decode('utf-8') == baseResource.to_json(expected)
+
+
+@mock.patch('shipyard_airflow.control.base.STREAM_CHUNK_SIZE', 10)
+def test_to_json_stream_chunks():
+    '''test to_json_stream encodes records as they are produced'''
+    baseResource = BaseResource()
+    produced = []
+
+    def records():
+        for idx in range(3):
+            produced.append(idx)
+            yield {'id': 'record_{}'.format(idx)}
+
+    stream = baseResource.to_json_stream(records())
+    # the first record is retrieved before the stream is read
+    assert produced == [0]
+    assert next(stream) == b'[{"id": "record_0"}, {"id": "record_1"}'
+    assert produced == [0, 1]
+    assert b''.join(stream) == b', {"id": "record_2"}]'
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """ Tests for the configdocs_api"""
+import io
 import json
 from unittest import mock
 from unittest.mock import ANY, patch
@@ -22,12 +23,14 @@ import pytest
 from shipyard_airflow.control.base import ShipyardRequestContext
 from shipyard_airflow.control.configdocs.configdocs_api import (
     CommitConfigDocsResource,
+    ConfigDocsBatchResource,
     ConfigDocsResource,
     DEPLOYMENT_DATA_DOC
 )
 from shipyard_airflow.control.helpers import configdocs_helper
 from shipyard_airflow.control.helpers.configdocs_helper import \
     ConfigdocsHelper
+from shipyard_airflow.control.helpers.document_stream import ingest_documents
 from shipyard_airflow.control.api_lock import ApiLock
 from shipyard_airflow.errors import ApiError
 from tests.unit.control import common
@@ -49,6 +52,41 @@ class TestConfigDocsStatusResource():
             'content-type'] == 'application/json; charset=UTF-8'
 
 
+class TestConfigDocsDiffResource():
+    @patch.object(ConfigdocsHelper, 'get_collection_diff')
+    def test_on_get(self, mock_method, api_client):
+        """Validate the on_get method returns 200 on success"""
+        mock_method.return_value = {'documents': []}
+        result = api_client.simulate_get(
+            "/api/v1.0/configdocs/coll1/diff", headers=common.AUTH_HEADERS,
+            query_string="versions=committed,last_site_action")
+        assert result.status_code == 200
+        assert result.json == {'documents': []}
+        mock_method.assert_called_once_with(
+            'coll1', ['committed', 'last_site_action'])
+
+
+class TestConfigDocsHashResource():
+    @patch.object(ConfigdocsHelper, 'get_collection_hash')
+    def test_on_get(self, mock_method, api_client):
+        """Validate the on_get method returns 200 on success"""
+        mock_method.return_value = {'hash': 'abc'}
+        result = api_client.simulate_get(
+            "/api/v1.0/configdocs/coll1/hash", headers=common.AUTH_HEADERS,
+            query_string="version=committed")
+        assert result.status_code == 200
+        assert result.json == {'hash': 'abc'}
+        mock_method.assert_called_once_with('coll1', 'committed')
+
+    @patch.object(ConfigdocsHelper, 'get_collection_hash')
+    def test_on_get_invalid_version(self, mock_method, api_client):
+        result = api_client.simulate_get(
+            "/api/v1.0/configdocs/coll1/hash", headers=common.AUTH_HEADERS,
+            query_string="version=nope")
+        assert result.status_code == 400
+        mock_method.assert_not_called()
+
+
 class TestConfigDocsResource():
     @patch.object(ConfigDocsResource, 'post_collection', common.str_responder)
     @mock.patch.object(ApiLock, 'release')
@@ -69,6 +107,46 @@ class TestConfigDocsResource():
             "/api/v1.0/configdocs/coll1", headers=headers, body='A')
         assert result.status_code == 201
 
+    @patch.object(ConfigDocsResource, 'post_collection')
+    @mock.patch.object(ApiLock, 'release')
+    @mock.patch.object(ApiLock, 'acquire')
+    def test_on_post_ingested(self, mock_acquire, mock_release,
+                              mock_post_collection, api_client):
+        body = ('---\nschema: a/Doc/v1\nmetadata:\n  name: one\n'
+                'data: 1\n')
+        received = {}
+
+        def post_collection(helper, collection_id, document_data,
+                            buffer_mode_param, empty_collection):
+            received['names'] = document_data.names_and_schemas
+            received['body'] = document_data.read()
+            return {'status': 'Success'}
+
+        mock_post_collection.side_effect = post_collection
+        headers = {'Content-Length': str(len(body))}
+        headers.update(common.AUTH_HEADERS)
+        result = api_client.simulate_post(
+            "/api/v1.0/configdocs/coll1", headers=headers, body=body)
+        assert result.status_code == 201
+        assert received == {'names': [('one', 'a/Doc/v1')],
+                            'body': body.encode('utf-8')}
+
+    @patch.object(ConfigDocsResource, 'post_collection')
+    @mock.patch.object(ApiLock, 'release')
+    @mock.patch.object(ApiLock, 'acquire')
+    def test_on_post_duplicates(self, mock_acquire, mock_release,
+                                mock_post_collection, api_client):
+        body = ('---\nschema: a/Doc/v1\nmetadata:\n  name: one\n'
+                'data: 1\n') * 2
+        headers = {'Content-Length': str(len(body))}
+        headers.update(common.AUTH_HEADERS)
+        result = api_client.simulate_post(
+            "/api/v1.0/configdocs/coll1", headers=headers, body=body)
+        assert result.status_code == 400
+        assert ('Document with schema: a/Doc/v1 and name: one occurs more '
+                'than once') in result.text
+        mock_post_collection.assert_not_called()
+
     @patch.object(ConfigDocsResource, 'get_collection', common.str_responder)
     def test_configdocs_on_get(self, api_client):
         """Validate the on_get method returns 200 on success"""
@@ -297,11 +375,275 @@ class TestConfigDocsResource():
         mock_method1.assert_not_called
 
 
+def _ingested(*names):
+    """Returns ingested documents, one with each name"""
+    return ingest_documents(io.BytesIO(''.join(
+        '---\nschema: a/Doc/v1\nmetadata:\n  name: {}\ndata: 1\n'.format(name)
+        for name in names).encode('utf-8')), 1024)
+
+
+def _batch_helper(revisions=(5, 6)):
+    helper = ConfigdocsHelper(CTX)
+    helper.get_revision_id = mock.Mock(return_value=4)
+    helper.is_buffer_valid_for_bucket = mock.Mock(return_value=True)
+    helper.add_collection = mock.Mock(side_effect=list(revisions))
+    helper.get_deckhand_validation_status = mock.Mock(
+        return_value=configdocs_helper._format_validations_to_status([], 0))
+    helper.deckhand = mock.Mock()
+    helper.deckhand.get_latest_rev_id.return_value = 4
+    return helper
+
+
+class TestConfigDocsBatchResource():
+    @patch.object(ConfigDocsBatchResource, 'post_collections')
+    @mock.patch.object(ApiLock, 'release')
+    @mock.patch.object(ApiLock, 'acquire')
+    def test_on_post(self, mock_acquire, mock_release, mock_post_collections,
+                     api_client):
+        design = '---\nschema: a/Doc/v1\nmetadata:\n  name: one\ndata: 1\n'
+        secrets = '---\nschema: b/Doc/v1\nmetadata:\n  name: one\ndata: 2\n'
+        received = {}
+
+        def post_collections(helper, collections, buffer_mode_param):
+            for collection_id, document_data in collections:
+                received[collection_id] = (document_data.names_and_schemas,
+                                           document_data.read())
+            received['buffer_mode'] = buffer_mode_param
+            return {'status': 'Success'}
+
+        mock_post_collections.side_effect = post_collections
+        headers = {'Content-Length': str(len(design + secrets))}
+        headers.update(common.AUTH_HEADERS)
+        result = api_client.simulate_post(
+            "/api/v1.0/batchconfigdocs", headers=headers, body=design + secrets,
+            query_string='buffermode=append&collections=design:{},'
+                         'secrets:{}'.format(len(design), len(secrets)))
+        assert result.status_code == 201
+        assert result.json == {'status': 'Success', 'code': '201 Created'}
+        assert received == {
+            'design': ([('one', 'a/Doc/v1')], design.encode('utf-8')),
+            'secrets': ([('one', 'b/Doc/v1')], secrets.encode('utf-8')),
+            'buffer_mode': 'append'
+        }
+        assert mock_acquire.call_count == 1
+
+    @patch.object(ConfigDocsBatchResource, 'post_collections')
+    @mock.patch.object(ApiLock, 'release')
+    @mock.patch.object(ApiLock, 'acquire')
+    def test_on_post_invalid(self, mock_acquire, mock_release,
+                             mock_post_collections, api_client):
+        doc = '---\nschema: a/Doc/v1\nmetadata:\n  name: one\ndata: 1\n'
+        for collections, body, message in [
+                ('', doc, 'At least one collection must be specified'),
+                ('design', doc, 'a length greater than 0: design'),
+                ('design:0', doc, 'a length greater than 0: design:0'),
+                ('design:{0},design:{0}'.format(len(doc)), doc * 2,
+                 'Collection design is specified more than once'),
+                ('design:{}'.format(len(doc) + 1), doc,
+                 'Content-Length must be the total'),
+                ('design:{}'.format(len(doc) * 2), doc * 2,
+                 'Document with schema: a/Doc/v1 and name: one occurs more '
+                 'than once in collection design')]:
+            headers = {'Content-Length': str(len(body))}
+            headers.update(common.AUTH_HEADERS)
+            result = api_client.simulate_post(
+                "/api/v1.0/batchconfigdocs", headers=headers, body=body,
+                query_string='collections={}'.format(collections))
+            assert result.status_code == 400
+            assert message in result.text
+        mock_post_collections.assert_not_called()
+
+    def test_post_collections(self):
+        CONF.set_override('deployment_version_create', 'Info', 'validations')
+        # The secrets created no new revision
+        helper = _batch_helper(revisions=(5, 5))
+        collections = [('design', _ingested('one', 'two')),
+                       ('secrets', _ingested('three'))]
+        status = ConfigDocsBatchResource().post_collections(
+            helper=helper, collections=collections, buffer_mode_param='append')
+
+        assert helper.is_buffer_valid_for_bucket.call_args_list == [
+            mock.call('design', configdocs_helper.BufferMode.APPEND),
+            mock.call('secrets', configdocs_helper.BufferMode.APPEND)]
+        assert helper.add_collection.call_args_list == [
+            mock.call('design', collections[0][1]),
+            mock.call('secrets', collections[1][1])]
+        # validated once, for the last revision of the batch
+        helper.get_deckhand_validation_status.assert_called_once_with(5)
+        helper.deckhand.rollback.assert_not_called()
+        messages = [msg['message']
+                    for msg in status['details']['messageList']]
+        assert 'Collection secrets is unchanged' in messages
+        assert any(msg.startswith('Deployment version document missing')
+                   for msg in messages)
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_deployment_version(self):
+        CONF.set_override('deployment_version_create', 'Error', 'validations')
+        helper = _batch_helper()
+        collections = [('design', _ingested('one')),
+                       ('secrets', _ingested('two'))]
+        with pytest.raises(ApiError) as apie:
+            ConfigDocsBatchResource().post_collections(
+                helper=helper, collections=collections)
+        assert apie.value.status == '400 Bad Request'
+        helper.add_collection.assert_not_called()
+
+        # Present in one of the collections
+        helper = _batch_helper()
+        collections[1] = ('secrets', ingest_documents(io.BytesIO(
+            '---\nschema: {schema}\nmetadata:\n  name: {name}\ndata: 1\n'
+            .format(**DEPLOYMENT_DATA_DOC).encode('utf-8')), 1024))
+        status = ConfigDocsBatchResource().post_collections(
+            helper=helper, collections=collections)
+        assert status['details']['messageList'] == []
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_replace(self):
+        CONF.set_override('deployment_version_create', 'Skip', 'validations')
+        helper = _batch_helper()
+        ConfigDocsBatchResource().post_collections(
+            helper=helper,
+            collections=[('design', _ingested('one')),
+                         ('secrets', _ingested('two'))],
+            buffer_mode_param='replace')
+        # The buffer is rolled back once, for the batch
+        helper.is_buffer_valid_for_bucket.assert_called_once_with(
+            'design', configdocs_helper.BufferMode.REPLACE)
+        assert helper.add_collection.call_count == 2
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_not_valid_for_buffer(self):
+        CONF.set_override('deployment_version_create', 'Skip', 'validations')
+        helper = _batch_helper()
+        helper.is_buffer_valid_for_bucket.side_effect = [True, False]
+        with pytest.raises(ApiError) as apie:
+            ConfigDocsBatchResource().post_collections(
+                helper=helper,
+                collections=[('design', _ingested('one')),
+                             ('secrets', _ingested('two'))],
+                buffer_mode_param='append')
+        assert apie.value.status == '409 Conflict'
+        helper.add_collection.assert_not_called()
+
+        with pytest.raises(ApiError) as apie:
+            ConfigDocsBatchResource().post_collections(
+                helper=helper,
+                collections=[('design', _ingested('one'))],
+                buffer_mode_param='sideways')
+        assert apie.value.status == '400 Bad Request'
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_rolled_back(self):
+        CONF.set_override('deployment_version_create', 'Skip', 'validations')
+        helper = _batch_helper(
+            revisions=[5, ApiError(title='Documents may not exist in more '
+                                         'than one collection',
+                                   description='nope',
+                                   status='409 Conflict')])
+        with pytest.raises(ApiError) as apie:
+            ConfigDocsBatchResource().post_collections(
+                helper=helper,
+                collections=[('design', _ingested('one')),
+                             ('secrets', _ingested('two'))],
+                buffer_mode_param='append')
+        assert apie.value.status == '409 Conflict'
+        # Rolled back to the latest revision before the batch
+        helper.deckhand.get_latest_rev_id.assert_called_once_with()
+        helper.deckhand.rollback.assert_called_once_with(4)
+
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_not_rolled_back_if_unchanged(self):
+        """Nothing is rolled back unless the batch created a revision"""
+        CONF.set_override('deployment_version_create', 'Skip', 'validations')
+        # Nothing changed, the buffer is empty or has the same revision
+        for revisions in [(None, None), (4, 4)]:
+            helper = _batch_helper(revisions=revisions)
+            with pytest.raises(ApiError) as apie:
+                ConfigDocsBatchResource().post_collections(
+                    helper=helper,
+                    collections=[('design', _ingested('one')),
+                                 ('secrets', _ingested('two'))],
+                    buffer_mode_param='append')
+            assert (apie.value.title ==
+                    'Collections not added to Shipyard buffer')
+            helper.deckhand.rollback.assert_not_called()
+
+        # Failed before any revision was created
+        helper = _batch_helper(
+            revisions=[4, ApiError(title='Documents may not exist in more '
+                                         'than one collection',
+                                   description='nope',
+                                   status='409 Conflict')])
+        with pytest.raises(ApiError) as apie:
+            ConfigDocsBatchResource().post_collections(
+                helper=helper,
+                collections=[('design', _ingested('one')),
+                             ('secrets', _ingested('two'))],
+                buffer_mode_param='append')
+        assert apie.value.status == '409 Conflict'
+        helper.deckhand.rollback.assert_not_called()
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_replace_unchanged(self):
+        """Collections matching the replaced buffer are unchanged"""
+        CONF.set_override('deployment_version_create', 'Skip', 'validations')
+        helper = _batch_helper(revisions=(5, 6))
+        # Replacing the buffer created revision 5
+        helper.deckhand.get_latest_rev_id.side_effect = [4, 5]
+        status = ConfigDocsBatchResource().post_collections(
+            helper=helper,
+            collections=[('design', _ingested('one')),
+                         ('secrets', _ingested('two'))],
+            buffer_mode_param='replace')
+        messages = [msg['message']
+                    for msg in status['details']['messageList']]
+        assert messages == ['Collection design is unchanged']
+        helper.get_deckhand_validation_status.assert_called_once_with(6)
+        CONF.clear_override('deployment_version_create', 'validations')
+
+    def test_post_collections_rolled_back_stale_cache(self):
+        """The rollback target is the latest revision in Deckhand, even if
+        the cached revision index is out of date
+        """
+        CONF.set_override('deployment_version_create', 'Skip', 'validations')
+        stale = [{'id': 1, 'tags': ['committed']}, {'id': 4, 'tags': []}]
+        cached_helper = ConfigdocsHelper(CTX)
+        cached_helper.deckhand.get_revision_list = lambda: stale
+        assert cached_helper.get_revision_id(configdocs_helper.LATEST) == 4
+
+        # Another process has since written revision 7 to the buffer, after
+        # a gap in the revision ids that the check of the cached index
+        # against Deckhand does not detect
+        helper = ConfigdocsHelper(CTX)
+        helper.deckhand.get_revision_list = lambda: stale + [
+            {'id': 7, 'tags': []}]
+        helper.deckhand.get_revision = lambda revision_id: {
+            1: stale[0], 4: stale[1]}.get(revision_id)
+        assert helper.get_revision_id(configdocs_helper.LATEST) == 4
+        helper.deckhand.rollback = mock.Mock()
+        helper.is_buffer_valid_for_bucket = mock.Mock(return_value=True)
+        helper.add_collection = mock.Mock(side_effect=[8, ApiError(
+            title='Documents may not exist in more than one collection',
+            description='nope',
+            status='409 Conflict')])
+        with pytest.raises(ApiError):
+            ConfigDocsBatchResource().post_collections(
+                helper=helper,
+                collections=[('design', _ingested('one')),
+                             ('secrets', _ingested('two'))],
+                buffer_mode_param='append')
+        helper.deckhand.rollback.assert_called_once_with(7)
+        CONF.clear_override('deployment_version_create', 'validations')
+
+
 class TestCommitConfigDocsResource():
     @mock.patch.object(ApiLock, 'release')
     @mock.patch.object(ApiLock, 'acquire')
     def test_on_post(self, mock_acquire, mock_release, api_client):
-        queries = ["", "force=true", "dryrun=true"]
+        queries = ["", "force=true", "dryrun=true",
+                   "dryrun=true&refresh-validations=true"]
         with patch.object(
             CommitConfigDocsResource, 'commit_configdocs', return_value={}
         ) as mock_method:
@@ -311,9 +653,10 @@ class TestCommitConfigDocsResource():
                     headers=common.AUTH_HEADERS)
                 assert result.status_code == 200
         mock_method.assert_has_calls([
-            mock.call(ANY, False, False),
-            mock.call(ANY, True, False),
-            mock.call(ANY, False, True)
+            mock.call(ANY, False, False, False),
+            mock.call(ANY, True, False, False),
+            mock.call(ANY, False, True, False),
+            mock.call(ANY, False, True, True)
         ])
 
     def test_commit_configdocs(self):
@@ -325,7 +668,7 @@ class TestCommitConfigDocsResource():
         with patch.object(ConfigdocsHelper, 'tag_buffer') as mock_method:
             helper = ConfigdocsHelper(CTX)
             helper.is_buffer_empty = lambda: False
-            helper.get_validations_for_revision = lambda x: {
+            helper.get_validations_for_revision = lambda x, refresh: {
                 'status': 'Success'
             }
             helper.get_revision_id = lambda x: 1
@@ -339,7 +682,7 @@ class TestCommitConfigDocsResource():
             helper = ConfigdocsHelper(CTX)
             helper.is_buffer_empty = lambda: False
             helper.get_validations_for_revision = (
-                lambda x: {
+                lambda x, refresh: {
                     'status': 'Failure',
                     'code': '400 Bad Request',
                     'message': 'this is a mock response'
@@ -360,7 +703,7 @@ class TestCommitConfigDocsResource():
         with patch.object(ConfigdocsHelper, 'tag_buffer') as mock_method:
             helper = ConfigdocsHelper(CTX)
             helper.is_buffer_empty = lambda: False
-            helper.get_validations_for_revision = lambda x: {
+            helper.get_validations_for_revision = lambda x, refresh: {
                 'status': 'Failure'
             }
             helper.get_revision_id = lambda x: 1
@@ -380,7 +723,7 @@ class TestCommitConfigDocsResource():
         with pytest.raises(ApiError):
             helper = ConfigdocsHelper(CTX)
             helper.is_buffer_empty = lambda: True
-            helper.get_validations_for_revision = lambda x: {
+            helper.get_validations_for_revision = lambda x, refresh: {
                 'status': 'Success'
             }
             ccdr.commit_configdocs(helper, False, False)
@@ -394,7 +737,7 @@ class TestCommitConfigDocsResource():
         with patch.object(ConfigdocsHelper, 'tag_buffer') as mock_method:
             helper = ConfigdocsHelper(CTX)
             helper.is_buffer_empty = lambda: False
-            helper.get_validations_for_revision = lambda x: {
+            helper.get_validations_for_revision = lambda x, refresh: {
                 'status': 'Success'
             }
             helper.get_revision_id = lambda x: 1
@@ -403,3 +746,18 @@ class TestCommitConfigDocsResource():
         assert '200' in commit_resp['code']
         assert commit_resp['message'] == 'DRYRUN'
         assert commit_resp['status'] == 'Success'
+
+    def test_commit_configdocs_refresh(self):
+        """
+        Tests that the refresh of validations is passed to the helper
+        """
+        ccdr = CommitConfigDocsResource()
+        with patch.object(ConfigdocsHelper, 'tag_buffer'):
+            helper = ConfigdocsHelper(CTX)
+            helper.is_buffer_empty = lambda: False
+            helper.get_validations_for_revision = mock.MagicMock(
+                return_value={'status': 'Success'})
+            helper.get_revision_id = lambda x: 1
+            ccdr.commit_configdocs(helper, False, True, True)
+        helper.get_validations_for_revision.assert_called_once_with(
+            1, refresh=True)
@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import copy
+import io
 import json
+import threading
+import time
 from unittest import mock
 from unittest.mock import patch
 
@@ -29,6 +32,12 @@ from shipyard_airflow.control.helpers.configdocs_helper import (
 from shipyard_airflow.control.helpers.deckhand_client import (
     DeckhandClient, DeckhandResponseError,
     NoRevisionsExistError)
+from shipyard_airflow.control.helpers.document_hash_cache import (
+    collection_hash, document_hashes)
+from shipyard_airflow.control.helpers.document_stream import (
+    ingest_documents)
+from shipyard_airflow.control.helpers.revision_index_cache import (
+    REVISION_INDEX)
 from shipyard_airflow.errors import ApiError, AppError
 
 CTX = ShipyardRequestContext()
@@ -360,6 +369,190 @@ def test_get_configdocs_status():
     assert expected == sorted(result, key=lambda x: x['collection_name'])
 
 
+COLL_V1 = """---
+schema: a/Doc/v1
+metadata:
+  name: one
+data: 1
+---
+schema: a/Doc/v1
+metadata:
+  name: two
+data: 2
+...
+"""
+
+COLL_V2 = """---
+schema: a/Doc/v1
+metadata:
+  name: one
+data: 1
+status:
+  revision: 5
+---
+schema: a/Doc/v1
+metadata:
+  name: three
+data: 3
+---
+schema: b/Doc/v1
+metadata:
+  name: one
+data: 11
+"""
+
+COLL_V3 = """---
+schema: a/Doc/v1
+metadata:
+  name: one
+data: 100
+---
+schema: a/Doc/v1
+metadata:
+  name: three
+data: 3
+"""
+
+
+def test_get_collection_diff():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_ordered_versions = lambda versions: ORDERED_VER
+    helper._get_versions_name_id = lambda ordered_versions: REV_NAME_ID
+    docs = {3: COLL_V1, 5: COLL_V2}
+    helper.deckhand.get_docs_from_revision = mock.Mock(
+        side_effect=lambda revision_id, bucket_id: docs[revision_id])
+
+    result = helper.get_collection_diff('mop')
+
+    assert result == {
+        'collection_name': 'mop',
+        'base_version': 'committed',
+        'base_revision': 3,
+        'new_version': 'buffer',
+        'new_revision': 5,
+        'documents': [{
+            'schema': 'a/Doc/v1',
+            'name': 'three',
+            'status': 'created',
+            'document': {'schema': 'a/Doc/v1',
+                         'metadata': {'name': 'three'},
+                         'data': 3}
+        }, {
+            'schema': 'a/Doc/v1',
+            'name': 'two',
+            'status': 'deleted'
+        }, {
+            'schema': 'b/Doc/v1',
+            'name': 'one',
+            'status': 'created',
+            'document': {'schema': 'b/Doc/v1',
+                         'metadata': {'name': 'one'},
+                         'data': 11}
+        }]
+    }
+    helper.deckhand.get_docs_from_revision.assert_has_calls([
+        mock.call(revision_id=3, bucket_id='mop'),
+        mock.call(revision_id=5, bucket_id='mop')
+    ])
+
+    # A new buffer is compared without retrieving the committed documents
+    helper._get_versions_name_id = (
+        lambda ordered_versions: ('committed', 'buffer', 3, 6))
+    docs[6] = COLL_V3
+    helper.deckhand.get_docs_from_revision.reset_mock()
+    result = helper.get_collection_diff('mop')
+    assert [(d['name'], d['status']) for d in result['documents']] == [
+        ('one', 'modified'), ('three', 'created'), ('two', 'deleted')]
+    assert result['documents'][0]['document']['data'] == 100
+    helper.deckhand.get_docs_from_revision.assert_called_once_with(
+        revision_id=6, bucket_id='mop')
+
+
+def test_get_collection_diff_no_changes():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_ordered_versions = lambda versions: ORDERED_VER
+    helper._get_versions_name_id = lambda ordered_versions: REV_NAME_ID
+    helper.deckhand.get_docs_from_revision = mock.Mock(
+        return_value=COLL_V1)
+    assert helper.get_collection_diff('mop')['documents'] == []
+    assert helper.deckhand.get_docs_from_revision.call_count == 2
+
+    # Both revisions are cached, and unchanged documents are not needed
+    assert helper.get_collection_diff('mop')['documents'] == []
+    assert helper.deckhand.get_docs_from_revision.call_count == 2
+
+
+def test_get_collection_diff_no_committed():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_ordered_versions = lambda versions: ORDERED_VER
+    helper._get_versions_name_id = (
+        lambda ordered_versions: ('committed', 'buffer', 0, 5))
+    helper.deckhand.get_docs_from_revision = mock.Mock(
+        return_value=COLL_V1)
+    result = helper.get_collection_diff('mop')
+    assert [(d['name'], d['status']) for d in result['documents']] == [
+        ('one', 'created'), ('two', 'created')]
+    helper.deckhand.get_docs_from_revision.assert_called_once_with(
+        revision_id=5, bucket_id='mop')
+
+
+def test_get_collection_diff_deckhand_error():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_ordered_versions = lambda versions: ORDERED_VER
+    helper._get_versions_name_id = lambda ordered_versions: REV_NAME_ID
+    helper.deckhand.get_docs_from_revision = mock.Mock(
+        side_effect=DeckhandResponseError(status_code=500,
+                                          response_message='broken'))
+    with pytest.raises(AppError) as apperror:
+        helper.get_collection_diff('mop')
+    assert 'broken' in apperror.value.description
+
+
+def test_get_collection_hash():
+    helper = ConfigdocsHelper(CTX)
+    revisions = {'buffer': 5, 'committed': 3}
+    helper.get_revision_id = lambda version: revisions.get(version)
+    docs = {3: COLL_V1, 5: COLL_V2}
+    helper.deckhand.get_docs_from_revision = mock.Mock(
+        side_effect=lambda revision_id, bucket_id: docs[revision_id])
+
+    result = helper.get_collection_hash('mop')
+    assert result == {
+        'collection_name': 'mop',
+        'version': 'buffer',
+        'revision_id': 5,
+        'document_count': 3,
+        'hash': collection_hash(
+            document_hashes(yaml.safe_load_all(COLL_V2)))
+    }
+    # The hashes of the revision are cached
+    assert helper.get_collection_hash('mop') == result
+    assert helper.deckhand.get_docs_from_revision.call_count == 1
+
+    committed = helper.get_collection_hash('mop', 'committed')
+    assert committed['revision_id'] == 3
+    assert committed['hash'] != result['hash']
+
+    # With no buffer, the buffer is the committed version
+    del revisions['buffer']
+    assert helper.get_collection_hash('mop')['hash'] == committed['hash']
+
+
+def test_get_collection_hash_no_revisions():
+    helper = ConfigdocsHelper(CTX)
+    helper.get_revision_id = lambda version: None
+    helper.deckhand.get_docs_from_revision = mock.Mock()
+    result = helper.get_collection_hash('mop')
+    assert result['revision_id'] == 0
+    assert result['document_count'] == 0
+    assert result['hash'] == collection_hash({})
+    helper.deckhand.get_docs_from_revision.assert_not_called()
+
+    with pytest.raises(ApiError) as apierror:
+        helper.get_collection_hash('mop', 'last_site_action')
+    assert apierror.value.status == falcon.HTTP_404
+
+
 def test__get_revision_dict_no_commit():
     """
     Tests the processing of revision dict response from deckhand
@@ -547,6 +740,76 @@ def test_get_collection_docs():
     assert len(yaml_str) == 16
 
 
+def test_get_rendered_configdocs_cached():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_revision_dict = lambda: REV_BUFFER_DICT
+    helper.deckhand.get_rendered_docs_from_revision = mock.Mock(
+        return_value='a: b\n')
+
+    assert helper.get_rendered_configdocs('committed') == 'a: b\n'
+    assert helper.get_rendered_configdocs('committed') == 'a: b\n'
+    assert list(helper.get_rendered_configdocs(
+        'committed', stream=True)) == [b'a: b\n']
+    helper.deckhand.get_rendered_docs_from_revision.assert_called_once_with(
+        cleartext_secrets=False, revision_id=3, stream=False)
+
+
+def test_get_rendered_configdocs_stream_cached():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_revision_dict = lambda: REV_BUFFER_DICT
+    helper.deckhand.get_rendered_docs_from_revision = mock.Mock(
+        return_value=iter([b'a: b\n', b'c: d\n']))
+
+    # cached once the stream is consumed
+    assert list(helper.get_rendered_configdocs(
+        'buffer', stream=True)) == [b'a: b\n', b'c: d\n']
+    assert helper.get_rendered_configdocs('buffer') == 'a: b\nc: d\n'
+    assert helper.deckhand.get_rendered_docs_from_revision.call_count == 1
+
+
+def test_get_rendered_configdocs_cleartext_not_cached():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_revision_dict = lambda: REV_BUFFER_DICT
+    helper.deckhand.get_rendered_docs_from_revision = mock.Mock(
+        return_value='secret: cleartext\n')
+
+    for _ in range(2):
+        assert helper.get_rendered_configdocs(
+            'committed', cleartext_secrets=True) == 'secret: cleartext\n'
+    assert helper.deckhand.get_rendered_docs_from_revision.call_count == 2
+    assert configdocs_helper.RENDERED_DOCS.size == 0
+
+
+def test_get_rendered_configdocs_cache_disabled():
+    configdocs_helper.CONF.set_override('rendered_docs_cache_size', 0,
+                                        'deckhand')
+    try:
+        helper = ConfigdocsHelper(CTX)
+        helper._get_revision_dict = lambda: REV_BUFFER_DICT
+        helper.deckhand.get_rendered_docs_from_revision = mock.Mock(
+            return_value='a: b\n')
+        helper.get_rendered_configdocs('committed')
+        helper.get_rendered_configdocs('committed')
+        assert helper.deckhand.get_rendered_docs_from_revision.call_count == 2
+    finally:
+        configdocs_helper.CONF.clear_override('rendered_docs_cache_size',
+                                              'deckhand')
+
+
+def test_get_rendered_configdocs_etag():
+    helper = ConfigdocsHelper(CTX)
+    helper._get_revision_dict = lambda: REV_BUFFER_DICT
+    assert helper.get_rendered_configdocs_etag('committed') == '"3-redacted"'
+    assert helper.get_rendered_configdocs_etag(
+        'buffer', cleartext_secrets=True) == '"5-cleartext"'
+    with pytest.raises(ApiError) as apie:
+        helper.get_rendered_configdocs_etag('last_site_action')
+    assert apie.value.status == falcon.HTTP_404
+    with pytest.raises(ApiError) as apie:
+        helper.get_rendered_configdocs_etag('latest')
+    assert apie.value.status == falcon.HTTP_400
+
+
 val_ep = '{}/validatedesign'
 
 
@@ -562,12 +825,12 @@ val_endpoints = [
 ]
 
 
-def _fake_get_validations_for_component(url, design_reference, response,
-                                        exception, context_marker, **kwargs):
+def _fake_get_validations_for_component(url, design_reference,
+                                        context_marker, **kwargs):
     """
     Responds with a status response
     """
-    response['response'] = json.loads(("""
+    return json.loads(("""
 {
   "kind": "Status",
   "apiVersion": "v1.0",
@@ -622,6 +885,8 @@ def test_get_validations_for_revision_dh_render(dh_client):
                    return_value=[])
 @mock.patch.object(ConfigdocsHelper, '_get_shipyard_validations',
                    return_value=[])
+@mock.patch.object(ConfigdocsHelper, '_get_validation_results_db',
+                   return_value=[])
 def test_get_validations_for_revision(*args):
     """
     Tests the functionality of the get_validations_for_revision method
@@ -634,6 +899,187 @@ def test_get_validations_for_revision(*args):
     assert val_status['details']['errorCount'] == 4
 
 
+RELEASE_VALIDATIONS = threading.Event()
+
+
+def _blocking_get_validations_for_component(url, design_reference,
+                                            context_marker, **kwargs):
+    """
+    Responds only once the validations are released
+    """
+    RELEASE_VALIDATIONS.wait(5)
+    return _fake_get_validations_for_component(url, design_reference,
+                                               context_marker)
+
+
+@mock.patch.object(DeckhandClient, 'get_render_errors',
+                   return_value=[])
+@mock.patch.object(DeckhandClient, 'get_path',
+                   return_value='path{}')
+@mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+            '._get_validation_endpoints',
+            return_value=val_endpoints)
+@mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+            '._get_validations_for_component',
+            new=_blocking_get_validations_for_component)
+@mock.patch.object(ConfigdocsHelper, '_get_deckhand_validation_errors',
+                   return_value=[{'error': True, 'message': 'dh broken'}])
+@mock.patch.object(ConfigdocsHelper, '_get_shipyard_validations',
+                   return_value=[])
+@mock.patch.object(ConfigdocsHelper, '_get_validation_results_db',
+                   return_value=[])
+def test_get_validations_for_revision_deckhand_errors(*args):
+    """
+    Tests that the component validations are not waited for or reported
+    if Deckhand reports validation errors
+    """
+    RELEASE_VALIDATIONS.clear()
+    helper = ConfigdocsHelper(CTX)
+    start = time.monotonic()
+    val_status = helper.get_validations_for_revision(3)
+    RELEASE_VALIDATIONS.set()
+    assert time.monotonic() - start < 2
+    assert val_status['details']['errorCount'] == 1
+    assert val_status['details']['messageList'] == [
+        {'error': True, 'message': 'dh broken'}]
+
+
+@mock.patch.object(DeckhandClient, 'get_render_errors',
+                   return_value=[])
+@mock.patch.object(DeckhandClient, 'get_path',
+                   return_value='path{}')
+@mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+            '._get_validation_endpoints',
+            return_value=val_endpoints)
+@mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+            '._get_validations_for_component',
+            new=_blocking_get_validations_for_component)
+@mock.patch.object(ConfigdocsHelper, '_get_deckhand_validation_errors',
+                   return_value=[])
+@mock.patch.object(ConfigdocsHelper, '_get_shipyard_validations',
+                   return_value=[])
+@mock.patch.object(ConfigdocsHelper, '_get_validation_results_db',
+                   return_value=[])
+def test_get_validations_for_revision_deadline(*args):
+    """
+    Tests that a component validation not completed within the deadline is
+    reported as an error
+    """
+    RELEASE_VALIDATIONS.clear()
+    configdocs_helper.CONF.set_override('validation_deadline', 1,
+                                        'validations')
+    try:
+        helper = ConfigdocsHelper(CTX)
+        val_status = helper.get_validations_for_revision(3)
+    finally:
+        RELEASE_VALIDATIONS.set()
+        configdocs_helper.CONF.clear_override('validation_deadline',
+                                              'validations')
+    assert val_status['details']['errorCount'] == 2
+    msgs = val_status['details']['messageList']
+    assert [msg['source'] for msg in msgs] == ['Drydock', 'Armada']
+    assert all(msg['name'] == 'ValidationTimeout' for msg in msgs)
+
+
+STORED_DRYDOCK_RESULT = {
+    'validator': 'Drydock',
+    'endpoint': 'drydock/validatedesign',
+    'result': {
+        'kind': 'Status',
+        'status': 'Failure',
+        'details': {
+            'messageList': [{'message': 'stored error', 'error': True}]
+        }
+    }
+}
+
+
+@mock.patch.object(DeckhandClient, 'get_render_errors',
+                   return_value=[])
+@mock.patch.object(DeckhandClient, 'get_path',
+                   return_value='path{}')
+@mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+            '._get_validation_endpoints',
+            return_value=val_endpoints)
+@mock.patch.object(ConfigdocsHelper, '_get_deckhand_validation_errors',
+                   return_value=[])
+@mock.patch.object(ConfigdocsHelper, '_get_shipyard_validations',
+                   return_value=[])
+@mock.patch.object(ConfigdocsHelper, '_get_validation_results_db',
+                   return_value=[STORED_DRYDOCK_RESULT])
+def test_get_validations_for_revision_stored_results(*args):
+    """
+    Tests that a stored validation result is used rather than invoking the
+    component again
+    """
+    helper = ConfigdocsHelper(CTX)
+    with mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+                    '._get_validations_for_component',
+                    side_effect=_fake_get_validations_for_component) as comp:
+        val_status = helper.get_validations_for_revision(3)
+    # only Armada is invoked
+    comp.assert_called_once_with(
+        url='armada/validatedesign', design_reference=mock.ANY,
+        context_marker=mock.ANY, thread_name='Armada',
+        on_response=mock.ANY, log_extra=mock.ANY)
+    msgs = val_status['details']['messageList']
+    assert msgs[0]['message'] == 'stored error'
+    assert msgs[0]['source'] == 'Drydock'
+    assert val_status['details']['errorCount'] == 3
+    helper._get_validation_results_db.assert_called_once_with(3)
+
+    # with a refresh, the stored results are not used
+    helper = ConfigdocsHelper(CTX)
+    with mock.patch('shipyard_airflow.control.helpers.configdocs_helper'
+                    '._get_validations_for_component',
+                    side_effect=_fake_get_validations_for_component) as comp:
+        val_status = helper.get_validations_for_revision(3, refresh=True)
+    assert comp.call_count == 2
+    assert val_status['details']['errorCount'] == 4
+
+
+def test_store_validation_result():
+    """
+    Tests that the response of a component is stored, and that failures to
+    store or retrieve results are not fatal
+    """
+    helper = ConfigdocsHelper(CTX)
+    helper._insert_validation_result_db = mock.MagicMock()
+    helper._store_validation_result(3, 'Drydock', 'drydock/validatedesign',
+                                    {'status': 'Success'})
+    helper._insert_validation_result_db.assert_called_once_with(
+        3, 'Drydock', 'drydock/validatedesign', {'status': 'Success'})
+
+    helper._insert_validation_result_db.side_effect = Exception('db down')
+    helper._store_validation_result(3, 'Drydock', 'drydock/validatedesign',
+                                    {'status': 'Success'})
+
+    helper._get_validation_results_db = mock.MagicMock(
+        side_effect=Exception('db down'))
+    assert helper._get_stored_validation_results(3) == {}
+
+
+@responses.activate
+@mock.patch("shipyard_airflow.control.helpers.configdocs_helper.get_token",
+            return_value="1")
+def test_get_validations_for_component_on_response(*args):
+    """Tests that only a response from the component is passed on"""
+    url = 'http://shiptest/validate_on_response'
+    on_response = mock.MagicMock()
+    responses.add(responses.POST, url, body='{"status": "Success"}',
+                  status=200)
+    configdocs_helper._get_validations_for_component(
+        url, {}, "testing", "unittest", on_response=on_response)
+    on_response.assert_called_once_with({"status": "Success"})
+
+    on_response.reset_mock()
+    url = 'http://shiptest/validate_on_response_500'
+    responses.add(responses.POST, url, body='oops', status=500)
+    configdocs_helper._get_validations_for_component(
+        url, {}, "testing", "unittest", on_response=on_response)
+    on_response.assert_not_called()
+
+
 def test_generate_validation_message():
     """Test for static method to generate a ValidationMessage
 
@@ -918,8 +1364,6 @@ def test_get_validations_for_component_200_null_body(*args):
     """
     url = 'http://shiptest/validate_empty'
     design_reference = {}
-    response = {}
-    exception = {}
     context_marker = "testing"
     thread_name = "unittest"
 
@@ -927,14 +1371,13 @@ def test_get_validations_for_component_200_null_body(*args):
                   url,
                   body=None,
                   status=200)
-    configdocs_helper._get_validations_for_component(
-        url, design_reference, response, exception, context_marker,
-        thread_name)
+    response = configdocs_helper._get_validations_for_component(
+        url, design_reference, context_marker, thread_name)
 
     ex_unable = ('unittest unable to validate configdocs or an invalid '
                  'response has been returned')
 
-    assert response['response'] == {
+    assert response == {
         'details': {
             'messageList': [{
                 'message': ex_unable,
@@ -946,15 +1389,12 @@ def test_get_validations_for_component_200_null_body(*args):
             }]
         }
     }
-    assert exception['exception'].__class__.__name__ == "JSONDecodeError"
 
 
 def _exercise_get_validations_for_component_valid(resp_code, *args):
     """Tests the function used to call the remote validators"""
     url = 'http://shiptest/validate_{}'.format(resp_code)
     design_reference = {}
-    response = {}
-    exception = {}
     context_marker = "testing"
     thread_name = "unittest"
 
@@ -963,12 +1403,10 @@ def _exercise_get_validations_for_component_valid(resp_code, *args):
                   url,
                   body=valid_response,
                   status=resp_code)
-    configdocs_helper._get_validations_for_component(
-        url, design_reference, response, exception, context_marker,
-        thread_name)
+    response = configdocs_helper._get_validations_for_component(
+        url, design_reference, context_marker, thread_name)
 
-    assert response['response'] == {'response': 'something'}
-    assert exception == {}
+    assert response == {'response': 'something'}
 
 
 @responses.activate
@@ -990,8 +1428,6 @@ def test_get_validations_for_component_bad_status_404(*args):
     """
     url = 'http://shiptest/validate_404'
     design_reference = {}
-    response = {}
-    exception = {}
     context_marker = "testing"
     thread_name = "unittest"
 
@@ -999,14 +1435,13 @@ def test_get_validations_for_component_bad_status_404(*args):
                   url,
                   body="Some string",
                   status=404)
-    configdocs_helper._get_validations_for_component(
-        url, design_reference, response, exception, context_marker,
-        thread_name)
+    response = configdocs_helper._get_validations_for_component(
+        url, design_reference, context_marker, thread_name)
 
     ex_unable = ('unittest unable to validate configdocs or an invalid '
                  'response has been returned')
 
-    assert response['response'] == {
+    assert response == {
         'details': {
             'messageList': [{
                 'message': ex_unable,
@@ -1019,7 +1454,6 @@ def test_get_validations_for_component_bad_status_404(*args):
             }]
         }
     }
-    assert exception['exception'].__class__.__name__ == "HTTPError"
 
 
 def test_check_intermediate_commit():
@@ -1055,10 +1489,164 @@ def test_check_intermediate_commit():
     helper_with_intermidiate_commits.deckhand.get_revision_list = \
         lambda: revs_interm
 
+    # each helper is backed by different revisions; don't share the index
     assert not helper_no_revs.check_intermediate_commit()
+    REVISION_INDEX.invalidate()
     assert not helper_no_intermidiate_commits.check_intermediate_commit()
+    REVISION_INDEX.invalidate()
     assert helper_with_intermidiate_commits.check_intermediate_commit()
 
+
+def test_check_intermediate_commit_single_revision_list():
+    """The intermediate commit check and the revision dict are derived from
+    a single retrieval of the revision list, shared between helpers
+    """
+    revs = yaml.safe_load("""
+---
+  - id: 1
+    tags: [committed]
+  - id: 2
+    tags: [committed, site-action-success]
+  - id: 3
+    tags: []
+...
+""")
+    calls = []
+
+    def _get_revision_list():
+        calls.append(1)
+        return revs
+
+    helper = ConfigdocsHelper(CTX)
+    helper.deckhand.get_revision_list = _get_revision_list
+    assert helper.check_intermediate_commit()
+    assert helper.get_revision_id(configdocs_helper.BUFFER) == 3
+    assert helper.get_revision_id(configdocs_helper.COMMITTED) == 2
+
+    other_helper = ConfigdocsHelper(CTX)
+    other_helper.deckhand.get_revision_list = _get_revision_list
+    other_helper.deckhand.get_revision = _fake_get_revision(revs)
+    assert other_helper.check_intermediate_commit()
+    assert len(calls) == 1
+
+
+def _fake_get_revision(revisions):
+    """Returns a replacement for DeckhandClient.get_revision, retrieving
+    revisions from the list supplied"""
+    def _get_revision(revision_id):
+        for revision in revisions:
+            if revision['id'] == revision_id:
+                return revision
+        return None
+    return _get_revision
+
+
+def _cache_revision_index(revisions):
+    """Loads a revision index for the revisions into the revision index
+    cache, as though by another request"""
+    cached_helper = ConfigdocsHelper(CTX)
+    cached_helper.deckhand.get_revision_list = lambda: revisions
+    cached_helper.get_revision_id(configdocs_helper.BUFFER)
+
+
+def test_get_rendered_configdocs_etag_stale_cache():
+    """The entity tag of rendered documents is of the revision in Deckhand,
+    even if the cached revision index is out of date
+    """
+    stale = [{'id': 1, 'tags': ['committed']}, {'id': 2, 'tags': []}]
+    _cache_revision_index(stale)
+
+    # another process has since added revision 3 to the buffer
+    current = stale + [{'id': 3, 'tags': []}]
+    helper = ConfigdocsHelper(CTX)
+    helper.deckhand.get_revision_list = lambda: current
+    helper.deckhand.get_revision = _fake_get_revision(current)
+    assert helper.get_rendered_configdocs_etag(
+        version=configdocs_helper.BUFFER) == '"3-redacted"'
+    assert helper.get_revision_id(configdocs_helper.BUFFER) == 3
+
+
+def test_revision_index_reloaded_after_new_revision():
+    """A cached revision index is reloaded if another process has added a
+    revision since it was loaded
+    """
+    stale = [{'id': 1, 'tags': ['committed']}, {'id': 2, 'tags': []}]
+    _cache_revision_index(stale)
+
+    current = stale + [{'id': 3, 'tags': []}]
+    helper = ConfigdocsHelper(CTX)
+    helper.deckhand.get_revision_list = lambda: current
+    helper.deckhand.get_revision = _fake_get_revision(current)
+    assert helper.get_revision_id(configdocs_helper.BUFFER) == 3
+    assert helper.get_revision_id(configdocs_helper.LATEST) == 3
+
+
+def test_revision_index_reloaded_after_tag():
+    """A cached revision index is reloaded if another process has tagged
+    the latest or committed revision since it was loaded
+    """
+    stale = [{'id': 1, 'tags': ['committed']}, {'id': 2, 'tags': []}]
+    _cache_revision_index(stale)
+
+    # the buffer has since been committed
+    current = [{'id': 1, 'tags': ['committed']},
+               {'id': 2, 'tags': ['committed']}]
+    helper = ConfigdocsHelper(CTX)
+    helper.deckhand.get_revision_list = lambda: current
+    helper.deckhand.get_revision = _fake_get_revision(current)
+    assert helper.get_revision_id(configdocs_helper.COMMITTED) == 2
+    assert helper.get_revision_id(configdocs_helper.BUFFER) is None
+
+
+def test_revision_index_reloaded_on_check_error():
+    """A cached revision index is reloaded if it cannot be checked"""
+    stale = [{'id': 1, 'tags': ['committed']}, {'id': 2, 'tags': []}]
+    _cache_revision_index(stale)
+
+    helper = ConfigdocsHelper(CTX)
+    helper.deckhand.get_revision_list = lambda: stale + [
+        {'id': 3, 'tags': []}]
+    helper.deckhand.get_revision = mock.Mock(
+        side_effect=DeckhandResponseError(status_code=500))
+    assert helper.get_revision_id(configdocs_helper.BUFFER) == 3
+
+
+def test_revision_index_reused_when_current():
+    """A cached revision index is used without downloading the revision
+    list if it matches the revisions in Deckhand
+    """
+    revisions = [{'id': 1, 'tags': ['committed']}, {'id': 2, 'tags': []}]
+    _cache_revision_index(revisions)
+
+    helper = ConfigdocsHelper(CTX)
+    helper.deckhand.get_revision_list = mock.Mock()
+    helper.deckhand.get_revision = mock.Mock(
+        side_effect=_fake_get_revision(revisions))
+    assert helper.get_revision_id(configdocs_helper.BUFFER) == 2
+    assert not helper.deckhand.get_revision_list.called
+    assert sorted(c[0][0] for c in
+                  helper.deckhand.get_revision.call_args_list) == [1, 2, 3]
+
+
+def test_revision_dict_not_shared_when_ttl_disabled():
+    """With a ttl of 0, each helper retrieves the revision list"""
+    calls = []
+
+    def _get_revision_list():
+        calls.append(1)
+        return []
+
+    configdocs_helper.CONF.set_override('revision_cache_ttl', 0, 'deckhand')
+    try:
+        for _ in range(2):
+            helper = ConfigdocsHelper(CTX)
+            helper.deckhand.get_revision_list = _get_revision_list
+            assert not helper.check_intermediate_commit()
+    finally:
+        configdocs_helper.CONF.clear_override('revision_cache_ttl', 'deckhand')
+    assert len(calls) == 2
+
+
 def test_parse_received_doc_data():
     helper = ConfigdocsHelper(CTX)
     yaml = """
@@ -1125,6 +1713,16 @@ data:
     assert names_and_schemas[2][0] == 'average-document'
     assert names_and_schemas[2][1] == 'notascool/Document/v1'
 
+def test_get_doc_names_and_schemas_ingested():
+    helper = ConfigdocsHelper(CTX)
+    documents = ingest_documents(io.BytesIO(
+        b'---\nschema: a/Doc/v1\nmetadata:\n  name: one\ndata: 1\n'),
+        1024)
+    assert helper.get_doc_names_and_schemas(documents) == [
+        ('one', 'a/Doc/v1')]
+    assert helper.check_for_document(documents, 'one', 'a/Doc/v1')
+
+
 def test_check_for_document():
     helper = ConfigdocsHelper(CTX)
     yaml = """
@@ -0,0 +1,92 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the document hash cache"""
+from shipyard_airflow.control.helpers.document_hash_cache import (
+    DocumentHashCache, collection_hash, document_hash, document_hashes,
+    document_key)
+
+DOC = {
+    'schema': 'drydock/BaremetalNode/v1',
+    'metadata': {'name': 'node-1', 'layeringDefinition': {'layer': 'site'}},
+    'data': {'oob': {'account': 'admin'}, 'host_profile': 'cp'}
+}
+
+HASH_OF_DOC_AND_OTHER = (
+    '8e229286c90112b9aa1b6167ddab1f912bb7fb356997b7ecbcdc03c0476f1943')
+
+
+def test_document_key():
+    assert document_key(DOC) == ('drydock/BaremetalNode/v1', 'node-1')
+    assert document_key({}) == ('', '')
+
+
+def test_document_hash_content_only():
+    reordered = {
+        'data': {'host_profile': 'cp', 'oob': {'account': 'admin'}},
+        'metadata': {'layeringDefinition': {'layer': 'site'},
+                     'name': 'node-1'},
+        'schema': 'drydock/BaremetalNode/v1',
+        # differs between revisions for the same content
+        'id': 12,
+        'status': {'bucket': 'site', 'revision': 4}
+    }
+    assert document_hash(reordered) == document_hash(DOC)
+
+    changed = dict(DOC, data={'oob': {'account': 'root'},
+                              'host_profile': 'cp'})
+    assert document_hash(changed) != document_hash(DOC)
+
+
+def test_document_hashes():
+    hashes = document_hashes([DOC, None])
+    assert hashes == {
+        ('drydock/BaremetalNode/v1', 'node-1'): document_hash(DOC)}
+
+
+def test_collection_hash():
+    other = {'schema': 'a/Doc/v1', 'metadata': {'name': 'other'}, 'data': 1}
+    hashes = document_hashes([DOC, other])
+    assert collection_hash(hashes) == collection_hash(
+        document_hashes([other, DOC]))
+    assert collection_hash(hashes) != collection_hash(
+        document_hashes([DOC]))
+    # The same digest is computed by the Shipyard client
+    assert collection_hash(hashes) == HASH_OF_DOC_AND_OTHER
+    assert collection_hash({}) == (
+        '4f53cda18c2baa0c0354bb5f9a3ecbe5ed12ab4d8e11ba873c2f11161202b945')
+
+
+def test_cache_least_recently_used_evicted():
+    cache = DocumentHashCache()
+    cache.put(1, 'site', {'a': 1}, max_entries=2)
+    cache.put(2, 'site', {'b': 2}, max_entries=2)
+    assert cache.get(1, 'site') == {'a': 1}
+    cache.put(3, 'site', {'c': 3}, max_entries=2)
+    assert cache.get(2, 'site') is None
+    assert cache.get(1, 'site') == {'a': 1}
+    assert cache.get(3, 'site') == {'c': 3}
+    assert cache.get(3, 'other') is None
+
+
+def test_cache_disabled():
+    cache = DocumentHashCache()
+    cache.put(1, 'site', {'a': 1}, max_entries=0)
+    assert cache.get(1, 'site') is None
+
+
+def test_cache_clear():
+    cache = DocumentHashCache()
+    cache.put(1, 'site', {'a': 1}, max_entries=2)
+    cache.clear()
+    assert cache.get(1, 'site') is None
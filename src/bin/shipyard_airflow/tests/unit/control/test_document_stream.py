@@ -0,0 +1,135 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the streaming ingestion of documents"""
+import io
+
+import requests
+
+from shipyard_airflow.control.helpers.document_stream import (
+    ingest_documents)
+
+DOCS = b"""---
+schema: deckhand/LayeringPolicy/v1
+metadata:
+  schema: metadata/Control/v1
+  name: layering-policy
+data:
+  layerOrder:
+    - global
+    - site
+---
+# a nested name or schema is not that of the document
+data:
+  schema: not/This/v1
+  metadata:
+    name: not-this
+  ? [complex, key]
+  : value
+  ? {schema: not/This/v1}
+  : value
+metadata: &meta
+  labels:
+    name: not-this
+  name: cool-doc
+  storagePolicy: cleartext
+schema: mycool/Document/v1
+---
+schema: nameless/Document/v1
+metadata: {}
+data: {}
+---
+schema: mycool/Document/v1
+metadata: *meta
+data: 2
+---
+schema: mycool/Document/v1
+metadata:
+  name: cool-doc
+data: 3
+...
+"""
+
+
+def test_names_and_schemas():
+    with ingest_documents(io.BytesIO(DOCS), 1024 * 1024) as docs:
+        assert docs.names_and_schemas == [
+            ('layering-policy', 'deckhand/LayeringPolicy/v1'),
+            ('cool-doc', 'mycool/Document/v1'),
+            ('', 'nameless/Document/v1'),
+            # An alias is not expanded
+            ('', 'mycool/Document/v1'),
+            ('cool-doc', 'mycool/Document/v1'),
+        ]
+        assert docs.duplicates == [('cool-doc', 'mycool/Document/v1')]
+        assert docs.has_document('layering-policy',
+                                 'deckhand/LayeringPolicy/v1')
+        assert not docs.has_document('not-this', 'mycool/Document/v1')
+        assert docs.yaml_error is None
+
+
+def test_payload():
+    with ingest_documents(io.BytesIO(DOCS), 1024 * 1024) as docs:
+        assert len(docs) == len(DOCS)
+        assert b''.join(docs) == DOCS
+        docs.seek(0)
+        assert docs.read() == DOCS
+
+        # sent with a Content-Length, reading the spooled documents
+        docs.seek(0)
+        request = requests.Request(
+            'PUT', 'http://deckhand/buckets/coll1/documents',
+            data=docs).prepare()
+        assert request.headers['Content-Length'] == str(len(DOCS))
+        assert request.body is docs
+
+
+def test_spooled_to_disk():
+    large = DOCS + b''.join(
+        b'---\nschema: many/Document/v1\nmetadata:\n  name: doc-%d\n'
+        b'data: %s\n' % (i, b'x' * 1000) for i in range(200))
+    with ingest_documents(io.BytesIO(large), 64 * 1024) as docs:
+        assert docs._spool._rolled
+        assert len(docs.names_and_schemas) == 205
+        assert len(docs) == len(large)
+        assert docs.read() == large
+
+    with ingest_documents(io.BytesIO(DOCS), 64 * 1024) as docs:
+        assert not docs._spool._rolled
+
+
+def test_invalid_yaml():
+    invalid = b'---\nschema: a/Doc/v1\nmetadata:\n  name: [unclosed\n' * 10
+    with ingest_documents(io.BytesIO(invalid), 1024) as docs:
+        assert docs.names_and_schemas == []
+        assert docs.duplicates == []
+        assert docs.yaml_error is not None
+        # the whole payload is still read, to be forwarded
+        assert docs.read() == invalid
+
+
+def test_empty_documents():
+    with ingest_documents(io.BytesIO(b'---\n---\n'), 1024) as docs:
+        assert docs.names_and_schemas == [('', ''), ('', '')]
+        assert docs.duplicates == []
+
+
+def test_length():
+    stream = io.BytesIO(DOCS + b'---\nschema: next/Doc/v1\n')
+    with ingest_documents(stream, 1024, length=len(DOCS)) as docs:
+        assert len(docs.names_and_schemas) == 5
+        assert docs.read() == DOCS
+    with ingest_documents(stream, 1024, length=1024) as docs:
+        # the stream ended first
+        assert len(docs) == len(b'---\nschema: next/Doc/v1\n')
+        assert docs.names_and_schemas == [('', 'next/Doc/v1')]
@@ -0,0 +1,196 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the HTTP session registry"""
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import threading
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.control.helpers import deckhand_client
+from shipyard_airflow.control.helpers import http_session
+from shipyard_airflow.control.helpers.deckhand_client import DeckhandClient
+from shipyard_airflow.control.helpers.http_session import (
+    HttpSessionRegistry)
+from .fake_response import FakeResponse
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # the statuses to respond with, in order; 200 once exhausted
+    statuses = []
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if length:
+            self.rfile.read(length)
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    # kept alive connections are each handled by a thread
+    daemon_threads = True
+
+
+@pytest.fixture()
+def server():
+    KeepAliveHandler.statuses = []
+    httpd = ThreadingServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{}/'.format(httpd.server_port)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_get_session_shared_by_name():
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand')
+    assert registry.get_session('deckhand') is session
+    assert registry.get_session('armada') is not session
+
+
+def test_get_session_adapter():
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand', pool_maxsize=4, max_retries=2)
+    adapter = session.get_adapter('https://deckhand/api/v1.0')
+    assert adapter._pool_maxsize == 4
+    retry = adapter.max_retries
+    assert retry.total == 2
+    assert retry.connect == 2
+    # a request that may have been received is not repeated
+    assert retry.read == 0
+    assert retry.is_retry('GET', 503)
+    assert not retry.is_retry('PUT', 502)
+    assert not retry.is_retry('DELETE', 504)
+    assert not retry.is_retry('POST', 503)
+    assert not retry.is_retry('GET', 500)
+
+
+def test_get_session_not_retrying_unavailable():
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand-render', max_retries=2,
+                                   retry_unavailable=False)
+    retry = session.get_adapter('https://deckhand/api/v1.0').max_retries
+    assert retry.connect == 2
+    assert retry.read == 0
+    assert retry.status == 0
+
+
+def test_get_session_after_fork():
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand')
+    with mock.patch.object(http_session.os, 'getpid', return_value=-1):
+        assert registry.get_session('deckhand') is not session
+
+
+def test_get_metrics_connection_reuse(server):
+    registry = HttpSessionRegistry()
+    assert registry.get_metrics('deckhand') is None
+    session = registry.get_session('deckhand')
+    for _ in range(5):
+        assert session.get(server).status_code == 200
+    assert registry.get_metrics('deckhand') == {
+        'connections': 1,
+        'requests': 5,
+        'reused': 4
+    }
+    assert list(registry.get_metrics()) == ['deckhand']
+
+
+def test_metrics_logged_after_interval(server, caplog):
+    registry = HttpSessionRegistry(metrics_log_interval=0)
+    session = registry.get_session('deckhand')
+    assert session.get(server).status_code == 200
+    with caplog.at_level('INFO', logger=http_session.__name__):
+        registry.get_session('deckhand')
+    assert "HTTP session metrics: {'deckhand': " in caplog.text
+
+    caplog.clear()
+    registry.metrics_log_interval = 3600
+    with caplog.at_level('INFO', logger=http_session.__name__):
+        registry.get_session('deckhand')
+    assert 'HTTP session metrics' not in caplog.text
+
+
+def test_idempotent_request_retried(server):
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand', backoff_factor=0)
+    KeepAliveHandler.statuses = [503, 503]
+    assert session.get(server).status_code == 200
+    assert registry.get_metrics('deckhand')['requests'] == 3
+
+
+def test_unavailable_not_retried_if_disabled(server):
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand-render', backoff_factor=0,
+                                   retry_unavailable=False)
+    KeepAliveHandler.statuses = [503]
+    assert session.get(server).status_code == 503
+    assert registry.get_metrics('deckhand-render')['requests'] == 1
+
+
+def test_non_idempotent_request_not_retried(server):
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand', backoff_factor=0)
+    KeepAliveHandler.statuses = [503]
+    assert session.post(server, data='x').status_code == 503
+    assert registry.get_metrics('deckhand')['requests'] == 1
+
+
+def test_close_all():
+    registry = HttpSessionRegistry()
+    session = registry.get_session('deckhand')
+    registry.close_all()
+    assert registry.get_metrics() == {}
+    assert registry.get_session('deckhand') is not session
+
+
+@mock.patch.object(DeckhandClient, '_get_headers', return_value={})
+@mock.patch.object(DeckhandClient, 'get_path', return_value='http://dh')
+def test_deckhand_client_uses_shared_session(get_path, get_headers):
+    session = mock.MagicMock()
+    session.get.return_value = FakeResponse(200, 'results: []')
+    with mock.patch.object(deckhand_client.HTTP_SESSIONS, 'get_session',
+                           return_value=session) as get_session:
+        DeckhandClient('context-marker').get_revision_list()
+        DeckhandClient('context-marker').get_revision_list()
+    assert session.get.call_count == 2
+    get_session.assert_called_with(
+        'deckhand', pool_maxsize=10, max_retries=3)
+
+
+@mock.patch.object(DeckhandClient, '_get_headers', return_value={})
+@mock.patch.object(DeckhandClient, 'get_path', return_value='http://dh/{}')
+def test_deckhand_client_render_session(get_path, get_headers):
+    session = mock.MagicMock()
+    session.get.return_value = FakeResponse(200, 'a: b')
+    with mock.patch.object(deckhand_client.HTTP_SESSIONS, 'get_session',
+                           return_value=session) as get_session:
+        DeckhandClient('context-marker').get_rendered_docs_from_revision(1)
+    get_session.assert_called_once_with(
+        'deckhand-render', pool_maxsize=10, max_retries=3,
+        retry_unavailable=False)
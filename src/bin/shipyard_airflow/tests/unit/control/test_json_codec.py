@@ -0,0 +1,147 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import datetime, timezone
+import json
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.conf import config  # noqa: F401 (registers options)
+from shipyard_airflow.control import json_codec
+
+BODY = {
+    'id': '01BTP9T2WCE1PAJR2DWYXG805V',
+    'parameters': {'servers': ['node1', 'node2'], 'count': 2},
+    'timestamp': datetime(2017, 9, 13, 11, 13, 3, 57000),
+    'notes': [],
+    'dag_status': None,
+    1: 'one'
+}
+
+EXPECTED = {
+    'id': '01BTP9T2WCE1PAJR2DWYXG805V',
+    'parameters': {'servers': ['node1', 'node2'], 'count': 2},
+    'timestamp': '2017-09-13 11:13:03.057000',
+    'notes': [],
+    'dag_status': None,
+    '1': 'one'
+}
+
+
+@pytest.fixture(params=sorted(json_codec.CODECS))
+def codec(request):
+    return json_codec.CODECS[request.param]
+
+
+# An action as listed by the actions API
+ACTION = {
+    'id': '01BTP9T2WCE1PAJR2DWYXG805V',
+    'name': 'deploy_site',
+    'parameters': {},
+    'dag_id': 'deploy_site',
+    'dag_execution_date': '2017-09-13T11:13:03',
+    'user': 'shipyard',
+    'timestamp': datetime(2017, 9, 13, 11, 13, 3, 57000),
+    'context_marker': '8-4-4-4-12a',
+    'dag_status': 'success',
+    'action_lifecycle': 'Complete',
+    'steps': [{'url': '/actions/01BTP9T2WCE1PAJR2DWYXG805V/steps/step1',
+               'state': 'success', 'id': 'step1', 'index': 1,
+               'notes': []}],
+    'notes': [{'assoc_id': 'action/01BTP9T2WCE1PAJR2DWYXG805V',
+               'subject': '01BTP9T2WCE1PAJR2DWYXG805V',
+               'sub_type': 'action metadata',
+               'note_val': 'Configdoc revision 1',
+               'verbosity': 1,
+               'note_id': '01CPWQN0NA6KG1BHXX7AA8MRHW',
+               'note_timestamp': '2018-09-07 23:18:04.123456',
+               'resolved_url_value': None}],
+    'committed_rev_id': 1,
+    'allow_intermediate_commits': False,
+}
+
+# A workflow as listed by the workflows API
+WORKFLOW = {
+    'id': 1,
+    'dag_id': 'deploy_site',
+    'execution_date': datetime(2018, 9, 7, 23, 18, 4),
+    'state': 'running',
+    'run_id': 'manual__2018-09-07T23:18:04',
+    'external_trigger': True,
+    'conf': None,
+    'end_date': None,
+    'start_date': datetime(2018, 9, 7, 23, 18, 4, 985000,
+                           tzinfo=timezone.utc),
+    'workflow_id': 'deploy_site__2018-09-07T23:18:04.000000',
+}
+
+
+def test_default_codec():
+    assert json_codec.get_codec().name == 'json'
+
+
+@pytest.mark.skipif(json_codec.orjson is None,
+                    reason='orjson is not installed')
+def test_configured_codec():
+    json_codec.CONF.set_override('json_codec', 'orjson', 'base')
+    try:
+        assert json_codec.get_codec().name == 'orjson'
+    finally:
+        json_codec.CONF.clear_override('json_codec', 'base')
+
+
+def test_configured_codec_unavailable():
+    json_codec.CONF.set_override('json_codec', 'orjson', 'base')
+    try:
+        with mock.patch.dict(json_codec.CODECS, clear=True,
+                             json=json_codec.StdlibJsonCodec()):
+            assert json_codec.get_codec().name == 'json'
+    finally:
+        json_codec.CONF.clear_override('json_codec', 'base')
+
+
+def test_dumps(codec):
+    assert json.loads(codec.dumps(BODY)) == EXPECTED
+    assert json.loads(codec.dumpb(BODY).decode('utf-8')) == EXPECTED
+
+
+def test_dumps_list_separator(codec):
+    items = [codec.dumpb(item) for item in ({'a': 1}, [2], 'b')]
+    assert (b'[' + codec.item_separator.join(items) + b']' ==
+            codec.dumpb([{'a': 1}, [2], 'b']))
+
+
+def test_loads(codec):
+    assert codec.loads(json.dumps(EXPECTED)) == EXPECTED
+    assert codec.loads(json.dumps(EXPECTED).encode('utf-8')) == EXPECTED
+
+
+def test_loads_invalid(codec):
+    with pytest.raises(json_codec.JSONDecodeError):
+        codec.loads('{"id": ')
+
+
+@pytest.mark.skipif(json_codec.orjson is None,
+                    reason='orjson is not installed')
+@pytest.mark.parametrize('payload', [
+    ACTION, [ACTION, ACTION], WORKFLOW, [WORKFLOW, WORKFLOW]])
+def test_codecs_equivalent(payload):
+    """The codecs encode the same values, differing only in whitespace"""
+    stdlib_codec = json_codec.CODECS['json']
+    orjson_codec = json_codec.CODECS['orjson']
+    assert (json.loads(orjson_codec.dumps(payload)) ==
+            json.loads(stdlib_codec.dumps(payload)))
+    assert (orjson_codec.dumpb(payload) ==
+            json.dumps(payload, default=str,
+                       separators=(',', ':')).encode('utf-8'))
@@ -0,0 +1,44 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from shipyard_airflow.control import json_schemas
+from shipyard_airflow.errors import AppError, InvalidFormatError
+
+INVALID_SCHEMA = '''
+    {
+        "title": "Invalid schema",
+        "type" : "turnip"
+    }
+'''
+
+
+def test_validate_json():
+    json_schemas.validate_json({'name': 'deploy_site'}, json_schemas.ACTION)
+
+    with pytest.raises(InvalidFormatError) as expected_exc:
+        json_schemas.validate_json({'name': 1}, json_schemas.ACTION)
+    assert 'JSON validation failed' in str(expected_exc)
+
+
+def test_validate_json_invalid_schema():
+    with pytest.raises(AppError) as expected_exc:
+        json_schemas.validate_json({'name': 'deploy_site'}, INVALID_SCHEMA)
+    assert 'Invalid schema' in str(expected_exc.value.description)
+
+
+def test_validator_cached():
+    validator = json_schemas._get_validator(json_schemas.ACTION)
+    json_schemas.validate_json({'name': 'deploy_site'}, json_schemas.ACTION)
+    assert json_schemas._get_validator(json_schemas.ACTION) is validator
@@ -16,11 +16,15 @@ from unittest.mock import patch
 import pytest
 
 from shipyard_airflow.control.base import ShipyardRequestContext
-from shipyard_airflow.control.configdocs.rendered_configdocs_api import \
-    RenderedConfigDocsResource
+from shipyard_airflow.control.configdocs.rendered_configdocs_api import (
+    RenderedConfigDocsResource, _etag_matches)
 from shipyard_airflow.control.helpers.configdocs_helper import \
     ConfigdocsHelper
+from shipyard_airflow.control.helpers.deckhand_client import DeckhandClient
+from shipyard_airflow.control.helpers.revision_index_cache import (
+    REVISION_INDEX)
 from shipyard_airflow.errors import ApiError
+from tests.unit.control import common
 
 CTX = ShipyardRequestContext()
 
@@ -52,7 +56,8 @@ def test_get_rendered_configdocs():
         helper = ConfigdocsHelper(CTX)
         rcdr.get_rendered_configdocs(helper, version='buffer')
 
-    mock_method.assert_called_once_with('buffer', False)
+    mock_method.assert_called_once_with('buffer', False,
+                                        stream=False)
 
 
 def test_get_rendered_last_site_action_configdocs():
@@ -68,7 +73,8 @@ def test_get_rendered_last_site_action_configdocs():
         helper = ConfigdocsHelper(CTX)
         rcdr.get_rendered_configdocs(helper, version='last_site_action')
 
-    mock_method.assert_called_once_with('last_site_action', False)
+    mock_method.assert_called_once_with('last_site_action', False,
+                                        stream=False)
 
 
 def test_get_rendered_successful_site_action_configdocs():
@@ -84,4 +90,79 @@ def test_get_rendered_successful_site_action_configdocs():
         helper = ConfigdocsHelper(CTX)
         rcdr.get_rendered_configdocs(helper, version='successful_site_action')
 
-    mock_method.assert_called_once_with('successful_site_action', False)
+    mock_method.assert_called_once_with('successful_site_action', False,
+                                        stream=False)
+
+
+@patch.object(ConfigdocsHelper, 'get_rendered_configdocs',
+              return_value=iter([b'---\n', b'a: b\n']))
+@patch.object(ConfigdocsHelper, 'get_rendered_configdocs_etag',
+              return_value='"5-redacted"')
+def test_on_get_etag(mock_etag, mock_rendered, api_client):
+    """
+    Tests the rendered documents are returned with an entity tag
+    """
+    result = api_client.simulate_get(
+        "/api/v1.0/renderedconfigdocs", headers=common.AUTH_HEADERS,
+        query_string="version=committed")
+    assert result.status_code == 200
+    assert result.text == '---\na: b\n'
+    assert result.headers['etag'] == '"5-redacted"'
+    mock_etag.assert_called_once_with(version='committed',
+                                      cleartext_secrets=False)
+
+
+@patch.object(ConfigdocsHelper, 'get_rendered_configdocs')
+@patch.object(ConfigdocsHelper, 'get_rendered_configdocs_etag',
+              return_value='"5-redacted"')
+def test_on_get_not_modified(mock_etag, mock_rendered, api_client):
+    """
+    Tests the rendered documents are not retrieved or returned if the
+    client already has them
+    """
+    headers = {'If-None-Match': '"4-redacted", "5-redacted"'}
+    headers.update(common.AUTH_HEADERS)
+    result = api_client.simulate_get(
+        "/api/v1.0/renderedconfigdocs", headers=headers)
+    assert result.status_code == 304
+    assert result.text == ''
+    assert result.headers['etag'] == '"5-redacted"'
+    mock_rendered.assert_not_called()
+
+
+@patch.object(ConfigdocsHelper, 'get_rendered_configdocs',
+              return_value=iter([b'---\n', b'a: c\n']))
+@patch.object(DeckhandClient, 'get_revision_list',
+              return_value=[{'id': 4, 'tags': ['committed']},
+                            {'id': 5, 'tags': []}])
+@patch.object(DeckhandClient, 'get_revision',
+              side_effect=lambda revision_id: {
+                  4: {'id': 4, 'tags': ['committed']},
+                  5: {'id': 5, 'tags': []}}.get(revision_id))
+def test_on_get_stale_revision_cache(mock_revision, mock_revisions,
+                                     mock_rendered, api_client):
+    """
+    Tests a client holding the documents of the previous buffer revision
+    receives the current ones, even if the revision index cache still
+    holds the previous buffer revision
+    """
+    REVISION_INDEX.get_or_load(
+        lambda: {'buffer': {'id': 4, 'tags': []},
+                 'committed': None,
+                 'latest': {'id': 4, 'tags': []}}, ttl=60)
+    headers = {'If-None-Match': '"4-redacted"'}
+    headers.update(common.AUTH_HEADERS)
+    result = api_client.simulate_get(
+        "/api/v1.0/renderedconfigdocs", headers=headers,
+        query_string="version=buffer")
+    assert result.status_code == 200
+    assert result.text == '---\na: c\n'
+    assert result.headers['etag'] == '"5-redacted"'
+
+
+def test_etag_matches():
+    assert _etag_matches('"5-redacted"', '"5-redacted"')
+    assert _etag_matches('"4-redacted" , W/"5-redacted"', '"5-redacted"')
+    assert _etag_matches('*', '"5-redacted"')
+    assert not _etag_matches(None, '"5-redacted"')
+    assert not _etag_matches('"5-cleartext"', '"5-redacted"')
@@ -0,0 +1,99 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the rendered documents cache"""
+from unittest import mock
+
+from shipyard_airflow.control.helpers.deckhand_client import DeckhandClient
+from shipyard_airflow.control.helpers.rendered_docs_cache import (
+    RenderedDocsCache)
+
+
+def test_least_recently_used_evicted_by_size():
+    cache = RenderedDocsCache()
+    cache.put(1, b'aaaa', max_bytes=10)
+    cache.put(2, b'bbbb', max_bytes=10)
+    assert cache.get(1) == b'aaaa'
+    cache.put(3, b'cccc', max_bytes=10)
+    assert cache.get(2) is None
+    assert cache.get(1) == b'aaaa'
+    assert cache.get(3) == b'cccc'
+    assert cache.size == 8
+
+
+def test_replaced_entry_size():
+    cache = RenderedDocsCache()
+    cache.put(1, b'aaaa', max_bytes=10)
+    cache.put(1, b'aa', max_bytes=10)
+    assert cache.size == 2
+
+
+def test_too_large_not_cached():
+    cache = RenderedDocsCache()
+    cache.put(1, b'aaaa', max_bytes=3)
+    assert cache.get(1) is None
+    cache.put(1, b'', max_bytes=0)
+    assert cache.get(1) is None
+
+
+def test_caching_iter():
+    cache = RenderedDocsCache()
+    chunks = cache.caching_iter(1, iter([b'ab', b'cd']), max_bytes=10)
+    assert next(chunks) == b'ab'
+    # not cached until all chunks are yielded
+    assert cache.get(1) is None
+    assert list(chunks) == [b'cd']
+    assert cache.get(1) == b'abcd'
+
+
+def test_caching_iter_closed_early():
+    cache = RenderedDocsCache()
+    chunks = cache.caching_iter(1, iter([b'ab', b'cd']), max_bytes=10)
+    next(chunks)
+    chunks.close()
+    assert cache.get(1) is None
+
+
+def test_caching_iter_closes_chunks():
+    source = mock.MagicMock()
+    source.__iter__.return_value = iter([b'ab', b'cd'])
+    chunks = RenderedDocsCache().caching_iter(1, source, max_bytes=10)
+    next(chunks)
+    source.close.assert_not_called()
+    chunks.close()
+    source.close.assert_called_once_with()
+
+
+@mock.patch.object(DeckhandClient, 'get_path',
+                   return_value='http://deckhand/{}')
+def test_rendered_docs_stream_closes_response(get_path):
+    """A partly read stream of rendered documents releases the response"""
+    response = mock.MagicMock(status_code=200)
+    response.iter_content.return_value = iter([b'a: b\n', b'c: d\n'])
+    client = DeckhandClient('context-marker')
+    with mock.patch.object(DeckhandClient, '_get_request',
+                           return_value=response):
+        chunks = RenderedDocsCache().caching_iter(
+            1, client.get_rendered_docs_from_revision(1, stream=True),
+            max_bytes=10)
+        assert next(chunks) == b'a: b\n'
+        response.close.assert_not_called()
+        chunks.close()
+    response.close.assert_called_once_with()
+
+
+def test_caching_iter_too_large():
+    cache = RenderedDocsCache()
+    chunks = cache.caching_iter(1, iter([b'ab', b'cd']), max_bytes=3)
+    assert list(chunks) == [b'ab', b'cd']
+    assert cache.get(1) is None
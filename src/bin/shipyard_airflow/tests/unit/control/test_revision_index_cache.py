@@ -0,0 +1,113 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the revision index cache"""
+from unittest import mock
+
+import pytest
+
+from shipyard_airflow.control.helpers import revision_index_cache
+from shipyard_airflow.control.helpers.deckhand_client import DeckhandClient
+from shipyard_airflow.control.helpers.revision_index_cache import (
+    REVISION_INDEX, RevisionIndexCache)
+from .fake_response import FakeResponse
+
+
+class CountingLoader():
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'count': self.calls}
+
+
+def test_get_or_load_caches():
+    cache = RevisionIndexCache()
+    loader = CountingLoader()
+    assert cache.get_or_load(loader, ttl=10) == {'count': 1}
+    assert cache.get_or_load(loader, ttl=10) == {'count': 1}
+    assert loader.calls == 1
+
+
+def test_get_or_load_ttl_disabled():
+    cache = RevisionIndexCache()
+    loader = CountingLoader()
+    assert cache.get_or_load(loader, ttl=0) == {'count': 1}
+    assert cache.get_or_load(loader, ttl=0) == {'count': 2}
+
+
+@mock.patch.object(revision_index_cache.time, 'monotonic')
+def test_get_or_load_expires(monotonic):
+    cache = RevisionIndexCache()
+    loader = CountingLoader()
+    monotonic.return_value = 100
+    cache.get_or_load(loader, ttl=10)
+    monotonic.return_value = 109
+    assert cache.get_or_load(loader, ttl=10) == {'count': 1}
+    monotonic.return_value = 110
+    assert cache.get_or_load(loader, ttl=10) == {'count': 2}
+
+
+def test_invalidate():
+    cache = RevisionIndexCache()
+    loader = CountingLoader()
+    cache.get_or_load(loader, ttl=10)
+    cache.invalidate()
+    assert cache.get_or_load(loader, ttl=10) == {'count': 2}
+    assert cache.get_or_load(loader, ttl=10) == {'count': 2}
+
+
+def test_invalidate_during_load():
+    """An index loaded while the cache is invalidated is not cached"""
+    cache = RevisionIndexCache()
+    loader = CountingLoader()
+
+    def _invalidating_loader():
+        cache.invalidate()
+        return loader()
+
+    assert cache.get_or_load(_invalidating_loader, ttl=10) == {'count': 1}
+    assert cache.get_or_load(loader, ttl=10) == {'count': 2}
+
+
+def test_failed_load_not_cached():
+    cache = RevisionIndexCache()
+    loader = CountingLoader()
+
+    def _failing_loader():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get_or_load(_failing_loader, ttl=10)
+    assert cache.get_or_load(loader, ttl=10) == {'count': 1}
+
+
+@pytest.mark.parametrize('method, request_method, args', [
+    ('put_bucket', '_put_request', ('mop', 'documents')),
+    ('tag_revision', '_post_request', (1, 'committed')),
+    ('rollback', '_post_request', (1,)),
+    ('reset_to_empty', '_delete_request', ()),
+])
+@mock.patch.object(DeckhandClient, 'get_path',
+                   return_value='http://deckhand')
+def test_deckhand_client_invalidates(get_path, method, request_method,
+                                     args):
+    """The revision changing DeckhandClient methods invalidate the cache"""
+    loader = CountingLoader()
+    REVISION_INDEX.get_or_load(loader, ttl=10)
+    client = DeckhandClient('context-marker')
+    with mock.patch.object(DeckhandClient, request_method,
+                           return_value=FakeResponse(200, '{}')):
+        getattr(client, method)(*args)
+    assert REVISION_INDEX.get_or_load(loader, ttl=10) == {'count': 2}
@@ -0,0 +1,111 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the validation fanout"""
+import threading
+import time
+
+from shipyard_airflow.control.helpers.validation_fanout import (
+    ValidationFanout, ValidationLatencies)
+
+
+def _sleep_and_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def _raise_value_error():
+    raise ValueError('broken')
+
+
+def test_results_yielded_as_completed():
+    latencies = ValidationLatencies()
+    fanout = ValidationFanout(deadline=10, max_workers=4,
+                              latencies=latencies)
+    fanout.add('slow', _sleep_and_return, 0.3, 'slow value')
+    fanout.add('fast', _sleep_and_return, 0.0, value='fast value')
+    start = time.monotonic()
+    results = list(fanout.iter_results())
+    elapsed = time.monotonic() - start
+    assert [r.name for r in results] == ['fast', 'slow']
+    assert [r.value for r in results] == ['fast value', 'slow value']
+    assert not any(r.timed_out or r.exception for r in results)
+    # concurrent: bounded by the slowest, not the sum
+    assert elapsed < 0.6
+    assert results[1].latency >= 0.3
+    metrics = latencies.as_dict()
+    assert metrics['slow']['count'] == 1
+    assert metrics['slow']['max'] >= 0.3
+    assert metrics['fast']['timeouts'] == 0
+
+
+def test_exception_captured():
+    fanout = ValidationFanout(deadline=10, max_workers=2,
+                              latencies=ValidationLatencies())
+    fanout.add('broken', _raise_value_error)
+    result, = list(fanout.iter_results())
+    assert result.value is None
+    assert isinstance(result.exception, ValueError)
+
+
+def test_deadline_per_validation():
+    latencies = ValidationLatencies()
+    fanout = ValidationFanout(deadline=10, max_workers=3,
+                              latencies=latencies)
+    release = threading.Event()
+    fanout.add('stuck', release.wait, 5, deadline=0.2)
+    fanout.add('fast', _sleep_and_return, 0.0, 'ok')
+    start = time.monotonic()
+    results = {r.name: r for r in fanout.iter_results()}
+    release.set()
+    assert time.monotonic() - start < 2
+    assert results['fast'].value == 'ok'
+    assert results['stuck'].timed_out
+    assert results['stuck'].value is None
+    assert results['stuck'].latency >= 0.2
+    assert latencies.as_dict()['stuck']['timeouts'] == 1
+
+
+def test_deadline_counted_from_run_start():
+    fanout = ValidationFanout(deadline=0.3, max_workers=1,
+                              latencies=ValidationLatencies())
+    fanout.add('first', _sleep_and_return, 0.2, 'first')
+    fanout.add('second', _sleep_and_return, 0.2, 'second')
+    results = list(fanout.iter_results())
+    # the second validation waits for the worker longer than the deadline
+    # remaining after it is submitted, but completes within its deadline
+    assert [r.name for r in results] == ['first', 'second']
+    assert not any(r.timed_out for r in results)
+    assert [r.value for r in results] == ['first', 'second']
+
+
+def test_iteration_ended_early():
+    fanout = ValidationFanout(deadline=10, max_workers=1,
+                              latencies=ValidationLatencies())
+    ran = []
+    release = threading.Event()
+    fanout.add('first', _sleep_and_return, 0.0, 'first')
+    fanout.add('second', release.wait, 5)
+    fanout.add('third', ran.append, 'third')
+    result_iter = fanout.iter_results()
+    assert next(result_iter).name == 'first'
+    result_iter.close()
+    release.set()
+    # the validations not yet started are cancelled
+    time.sleep(0.1)
+    assert ran == []
+
+
+def test_no_validations():
+    fanout = ValidationFanout(deadline=10, max_workers=1)
+    assert list(fanout.iter_results()) == []
@@ -0,0 +1,109 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import datetime
+from unittest import mock
+
+from shipyard_airflow.db.airflow_db import AirflowDbAccess
+
+
+class TestAirflowDb():
+    def test_get_tasks_by_dag_runs(self):
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock(return_value=[])
+        airflow_db.get_tasks_by_dag_runs(
+            dag_runs=[('deploy_site', '2018-09-07T23:18:04'),
+                      ('update_site', '2018-09-08T01:02:03')])
+        airflow_db.get_as_dict_array.assert_called_once_with(
+            AirflowDbAccess.SELECT_TASKS_BY_DAG_RUNS,
+            dag_ids=['deploy_site', 'update_site'],
+            execution_dates=['2018-09-07T23:18:04', '2018-09-08T01:02:03'])
+
+    def test_get_tasks_by_dag_runs_none(self):
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock()
+        assert airflow_db.get_tasks_by_dag_runs(dag_runs=[]) == []
+        assert not airflow_db.get_as_dict_array.called
+
+    def test_get_dag_run_with_tasks(self):
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock(return_value=[
+            {'dag_run_id': 1, 'dag_run_state': 'running',
+             'task_id': 'step_1', 'state': 'success'},
+            {'dag_run_id': 1, 'dag_run_state': 'running',
+             'task_id': 'step_2', 'state': 'running'},
+        ])
+        dag_run, tasks = airflow_db.get_dag_run_with_tasks(
+            dag_id='deploy_site', execution_date='2018-09-07T23:18:04')
+        airflow_db.get_as_dict_array.assert_called_once_with(
+            AirflowDbAccess.SELECT_DAG_RUN_WITH_TASKS,
+            dag_id='deploy_site',
+            execution_date='2018-09-07T23:18:04')
+        assert dag_run == {'id': 1, 'state': 'running'}
+        assert tasks == [{'task_id': 'step_1', 'state': 'success'},
+                         {'task_id': 'step_2', 'state': 'running'}]
+
+    def test_get_dag_run_with_tasks_no_tasks(self):
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock(return_value=[
+            {'dag_run_id': 1, 'dag_run_state': 'running',
+             'task_id': None, 'state': None},
+        ])
+        assert airflow_db.get_dag_run_with_tasks(
+            dag_id='deploy_site', execution_date='2018-09-07T23:18:04'
+        ) == ({'id': 1, 'state': 'running'}, [])
+
+    def test_get_dag_run_with_tasks_not_found(self):
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock(return_value=[])
+        assert airflow_db.get_dag_run_with_tasks(
+            dag_id='deploy_site', execution_date='2018-09-07T23:18:04'
+        ) == (None, [])
+
+    def test_iter_workflow_dag_runs(self):
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock(return_value=[])
+        since = datetime(2018, 9, 7, 23, 18, 4)
+        assert list(airflow_db.iter_workflow_dag_runs(
+            since=since, limit=10)) == []
+        airflow_db.get_as_dict_array.assert_called_once_with(
+            AirflowDbAccess.SELECT_WORKFLOW_DAG_RUNS,
+            since=since,
+            cursor_dag_id=None,
+            cursor_execution_date=None,
+            limit=10)
+
+    @mock.patch('shipyard_airflow.db.airflow_db.WORKFLOW_BATCH_SIZE', 2)
+    def test_iter_workflow_dag_runs_batched(self):
+        # Each batch is read by its own query, continuing from the last dag
+        # run of the prior batch, so no connection is held between batches
+        dag_runs = [
+            {'dag_id': 'deploy_site', 'execution_date': datetime(2018, 9, 7)},
+            {'dag_id': 'update_site', 'execution_date': datetime(2018, 9, 7)},
+            {'dag_id': 'deploy_site', 'execution_date': datetime(2018, 9, 8)},
+        ]
+        airflow_db = AirflowDbAccess()
+        airflow_db.get_as_dict_array = mock.MagicMock(
+            side_effect=[dag_runs[:2], dag_runs[2:]])
+        since = datetime(2018, 9, 1)
+        runs = airflow_db.iter_workflow_dag_runs(since=since, limit=5)
+        assert next(runs) == dag_runs[0]
+        assert airflow_db.get_as_dict_array.call_count == 1
+        assert list(runs) == dag_runs[1:]
+        airflow_db.get_as_dict_array.assert_called_with(
+            AirflowDbAccess.SELECT_WORKFLOW_DAG_RUNS,
+            since=since,
+            cursor_dag_id='update_site',
+            cursor_execution_date=datetime(2018, 9, 7),
+            limit=2)
+        assert airflow_db.get_as_dict_array.call_count == 2
@@ -11,8 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from unittest import mock
+
 import sqlalchemy
 
+from shipyard_airflow.conf import config  # noqa: F401 (registers options)
 from shipyard_airflow.db import common_db
 
 
@@ -64,3 +67,22 @@ class TestCommonDb():
         assert M2_RES == common_db._query_single_line(M2_QUERY)
         assert S_QUERY == common_db._query_single_line(S_QUERY)
         assert SQL_A_RES == common_db._query_single_line(SQL_ALCHEMY_QUERY)
+
+    @mock.patch.object(common_db, 'ENGINE_POOLS')
+    def test_get_engine_shared(self, mock_engine_pools):
+        class TestDbAccess(common_db.DbAccess):
+            def get_connection_string(self):
+                return 'postgresql+psycopg2://u:p@host/db'
+
+        db_access = TestDbAccess()
+        engine = db_access.get_engine()
+        assert engine is mock_engine_pools.get_engine.return_value
+        assert db_access.get_engine() is engine
+        mock_engine_pools.get_engine.assert_called_once_with(
+            'postgresql+psycopg2://u:p@host/db',
+            pool_size=db_access.pool_size,
+            max_overflow=db_access.max_overflow,
+            pool_pre_ping=db_access.pool_pre_ping,
+            pool_recycle=db_access.pool_recycle,
+            pool_timeout=db_access.pool_timeout,
+            statement_timeout=db_access.statement_timeout)
@@ -0,0 +1,73 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import datetime, timezone
+from unittest import mock
+
+from shipyard_airflow.db.shipyard_db import ShipyardDbAccess
+
+
+class TestShipyardDb():
+    def test_get_action_detail_by_id(self):
+        shipyard_db = ShipyardDbAccess()
+        shipyard_db.get_as_dict_array = mock.MagicMock(return_value=[{
+            'id': '01CPV581B0CM8C9CA0CFRNVPPY',
+            'validations': [],
+            'command_audit': [{
+                'id': '01CPV5AQ5BT6HPWJ0YGRRVNHBV',
+                'command': 'pause',
+                'datetime': '2018-09-07T23:18:04.123456+00:00'
+            }]
+        }])
+        action = shipyard_db.get_action_detail_by_id(
+            '01CPV581B0CM8C9CA0CFRNVPPY')
+        shipyard_db.get_as_dict_array.assert_called_once_with(
+            ShipyardDbAccess.SELECT_ACTION_DETAIL_BY_ID,
+            action_id='01CPV581B0CM8C9CA0CFRNVPPY')
+        assert action['command_audit'][0]['datetime'] == datetime(
+            2018, 9, 7, 23, 18, 4, 123456, tzinfo=timezone.utc)
+
+    def test_get_action_detail_by_id_not_found(self):
+        shipyard_db = ShipyardDbAccess()
+        shipyard_db.get_as_dict_array = mock.MagicMock(return_value=[])
+        assert shipyard_db.get_action_detail_by_id(
+            '01CPV581B0CM8C9CA0CFRNVPPY') is None
+
+    def test_get_validation_results(self):
+        shipyard_db = ShipyardDbAccess()
+        shipyard_db.get_as_dict_array = mock.MagicMock(return_value=[{
+            'validator': 'Drydock',
+            'endpoint': 'http://drydock/api/v1.0/validatedesign',
+            'result': '{"status": "Success"}'
+        }])
+        assert shipyard_db.get_validation_results(5) == [{
+            'validator': 'Drydock',
+            'endpoint': 'http://drydock/api/v1.0/validatedesign',
+            'result': {'status': 'Success'}
+        }]
+        shipyard_db.get_as_dict_array.assert_called_once_with(
+            ShipyardDbAccess.SELECT_VALIDATION_RESULTS_BY_REVISION,
+            revision_id=5)
+
+    def test_insert_validation_result(self):
+        shipyard_db = ShipyardDbAccess()
+        shipyard_db.perform_insert = mock.MagicMock()
+        shipyard_db.insert_validation_result(
+            5, 'Drydock', 'http://drydock/api/v1.0/validatedesign',
+            {'status': 'Success'})
+        shipyard_db.perform_insert.assert_called_once_with(
+            ShipyardDbAccess.UPSERT_VALIDATION_RESULT,
+            revision_id=5,
+            validator='Drydock',
+            endpoint='http://drydock/api/v1.0/validatedesign',
+            result='{"status": "Success"}')
@@ -0,0 +1,108 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Query plan regression tests for the Shipyard database indexes
+
+These tests migrate and query a PostgreSQL database specified by the
+SHIPYARD_TEST_DB_URL environment variable, e.g.:
+postgresql+psycopg2://postgres@localhost:5432/shipyard_test
+The database should be dedicated to testing. The tests are skipped if the
+variable is not set or the database cannot be reached.
+
+Sequential scans are disabled for the plans produced, so that the result does
+not depend on the (small) amount of data in the tables: if an index is
+usable for the query, the planner will choose it.
+"""
+import os
+
+import pytest
+import sqlalchemy
+from oslo_config import cfg
+
+from shipyard_airflow.conf import config  # noqa: F401 (registers options)
+from shipyard_airflow.db.shipyard_db import ShipyardDbAccess
+
+CONF = cfg.CONF
+TEST_DB_URL_ENV = 'SHIPYARD_TEST_DB_URL'
+ALEMBIC_INI_PATH = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+# Mirrors the query generated by the notes storage for a prefix lookup
+SELECT_NOTES_BY_ASSOC_ID_PREFIX = sqlalchemy.sql.text('''
+SELECT
+    note_id
+FROM
+    notes
+WHERE
+    assoc_id LIKE :assoc_id_pattern
+AND
+    verbosity <= :max_verbosity
+ORDER BY
+    note_timestamp
+''')
+
+
+@pytest.fixture(scope='module')
+def shipyard_db():
+    url = os.environ.get(TEST_DB_URL_ENV)
+    if not url:
+        pytest.skip('{} is not set'.format(TEST_DB_URL_ENV))
+    try:
+        sqlalchemy.create_engine(url).connect().close()
+    except sqlalchemy.exc.OperationalError as ex:
+        pytest.skip('Database is not available: {}'.format(ex))
+
+    CONF.set_override('postgresql_db', url, 'base')
+    CONF.set_override('alembic_ini_path', ALEMBIC_INI_PATH, 'base')
+    db = ShipyardDbAccess()
+    db.update_db()
+    yield db
+    db.get_engine().dispose()
+    CONF.clear_override('postgresql_db', 'base')
+    CONF.clear_override('alembic_ini_path', 'base')
+
+
+def _explain(db, query, **kwargs):
+    """Returns the plan for the query as a single string"""
+    with db.get_engine().connect() as connection:
+        connection.execute('SET enable_seqscan = off')
+        result = connection.execute(
+            sqlalchemy.sql.text('EXPLAIN ' + str(query)), **kwargs)
+        return '\n'.join(row[0] for row in result)
+
+
+@pytest.mark.parametrize('query, params, index', [
+    (ShipyardDbAccess.SELECT_VALIDATION_BY_ACTION_ID,
+     {'action_id': '01CPV581B0CM8C9CA0CFRNVPPY'},
+     'ix_preflight_validation_failures_action_id'),
+    (ShipyardDbAccess.SELECT_CMD_AUDIT_BY_ACTION_ID,
+     {'action_id': '01CPV581B0CM8C9CA0CFRNVPPY'},
+     'ix_action_command_audit_action_id'),
+    (ShipyardDbAccess.SELECT_LATEST_LOCK_BY_TYPE,
+     {'lock_type': 'configdocs_update'},
+     'ix_api_locks_lock_type_datetime'),
+    (ShipyardDbAccess.SELECT_VALIDATION_RESULTS_BY_REVISION,
+     {'revision_id': 5},
+     'validation_results_pkey'),
+    (SELECT_NOTES_BY_ASSOC_ID_PREFIX,
+     {'assoc_id_pattern': 'action/01CPV581B0CM8C9CA0CFRNVPPY%',
+      'max_verbosity': 5},
+     'ix_notes_assoc_id_verbosity'),
+])
+def test_query_uses_index(shipyard_db, query, params, index):
+    # With sequential scans disabled, a full scan of an unrelated index
+    # (e.g. the primary key) filtering every row is still an index scan, so
+    # the index expected to satisfy the lookup is checked by name
+    plan = _explain(shipyard_db, query, **params)
+    assert index in plan, plan
+    assert 'Seq Scan' not in plan, plan
@@ -15,7 +15,7 @@
 from unittest import mock
 
 from shipyard_airflow.plugins.check_k8s_node_status import (
-    check_node_status
+    check_node_status, NodeReadinessTracker, wait_for_node_status
 )
 
 
@@ -245,3 +245,126 @@ class TestCheckK8sNodeStatus:
 
         not_found_nodes = check_node_status(1, 5, set(['a1', 'b1', 'z1']))
         assert not_found_nodes == ['z1']
+
+
+def _node(name, ready, resource_version='1'):
+    """A fake V1Node with a Ready condition following another condition"""
+    node = mock.MagicMock()
+    node.metadata.name = name
+    node.metadata.resource_version = resource_version
+    pressure = mock.MagicMock(type='MemoryPressure', status='False',
+                              message='sufficient memory')
+    ready_condition = mock.MagicMock(type='Ready', status=ready,
+                                     message='kubelet status')
+    node.status.conditions = [ready_condition, pressure]
+    return node
+
+
+def _node_list(nodes, resource_version='10'):
+    ret = mock.MagicMock()
+    ret.items = nodes
+    ret.metadata.resource_version = resource_version
+    return ret
+
+
+def _event(event_type, node):
+    return {'type': event_type, 'object': node, 'raw_object': {}}
+
+
+class TestNodeReadinessTracker:
+    def test_tracker(self):
+        tracker = NodeReadinessTracker(['a1', 'b1', 'a1', 'c1'])
+        assert tracker.not_ready_nodes() == ['a1', 'b1', 'c1']
+        tracker.update(_node('b1', 'True'))
+        tracker.update(_node('c1', 'False'))
+        tracker.update(_node('z1', 'True'))
+        tracker.update(MalformedNodeStatus())
+        assert tracker.not_ready_nodes() == ['a1', 'c1']
+        tracker.update(_node('a1', 'True'))
+        tracker.update(_node('c1', 'True'))
+        assert tracker.all_ready
+        # once ready, a node remains ready
+        tracker.update(_node('c1', 'False'))
+        assert tracker.all_ready
+
+    def test_tracker_malformed(self):
+        tracker = NodeReadinessTracker(['a1'])
+        tracker.update(MalformedNodeStatus('a1'))
+        assert tracker.not_ready_nodes() == ['a1']
+
+
+@mock.patch("shipyard_airflow.plugins.check_k8s_node_status.config")
+@mock.patch("shipyard_airflow.plugins.check_k8s_node_status.client")
+@mock.patch("shipyard_airflow.plugins.k8s_watch.watch")
+class TestWaitForNodeStatus:
+    def test_ready_from_watch(self, watch, client, config):
+        """Nodes not ready when listed become ready while watched"""
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_node.return_value = _node_list([
+            _node('a1', 'True'), _node('b1', 'False')])
+        watch.Watch.return_value.stream.return_value = iter([
+            _event('MODIFIED', _node('b1', 'False', '11')),
+            _event('MODIFIED', _node('c1', 'True', '12')),
+            _event('ADDED', _node('c1', 'True', '13')),
+            _event('MODIFIED', _node('b1', 'True', '14')),
+            _event('MODIFIED', _node('b1', 'True', '15')),
+        ])
+
+        assert wait_for_node_status(60, 1, ['a1', 'b1', 'c1']) == []
+        label_selector = 'kubernetes.io/hostname in (a1,b1,c1)'
+        core_v1.list_node.assert_called_once_with(
+            label_selector=label_selector)
+        stream_kwargs = watch.Watch.return_value.stream.call_args[1]
+        assert stream_kwargs['resource_version'] == '10'
+        assert stream_kwargs['label_selector'] == label_selector
+        # the wait ends when the last node is ready
+        assert next(watch.Watch.return_value.stream.return_value, None)
+        assert watch.Watch.return_value.stop.called
+
+    def test_all_ready_when_listed(self, watch, client, config):
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_node.return_value = _node_list([_node('a1', 'True')])
+
+        assert wait_for_node_status(60, 1, {'a1'}) == []
+        core_v1.list_node.assert_called_once_with(
+            field_selector='metadata.name=a1')
+        assert not watch.Watch.called
+
+    def test_expired_resource_version(self, watch, client, config):
+        """The nodes are listed again when the watch has expired"""
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_node.side_effect = [
+            _node_list([_node('a1', 'False')], '10'),
+            _node_list([_node('a1', 'True')], '20'),
+        ]
+        watch.Watch.return_value.stream.return_value = iter([
+            {'type': 'ERROR', 'object': None,
+             'raw_object': {'code': 410, 'message': 'too old'}},
+        ])
+
+        assert wait_for_node_status(60, 1, ['a1']) == []
+        assert core_v1.list_node.call_count == 2
+
+    @mock.patch("shipyard_airflow.plugins.k8s_watch.time")
+    @mock.patch("shipyard_airflow.plugins.check_k8s_node_status.time")
+    def test_timeout(self, time, watch_time, watch, client, config):
+        watch_time.monotonic = time.monotonic
+        time.monotonic.side_effect = [0, 0, 0, 1, 1, 100]
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_node.return_value = _node_list([_node('a1', 'False')])
+        watch.Watch.return_value.stream.return_value = iter([
+            _event('MODIFIED', _node('b1', 'True', '11')),
+        ])
+
+        assert wait_for_node_status(60, 1, ['a1', 'b1']) == ['a1']
+
+    @mock.patch("shipyard_airflow.plugins.k8s_watch.time")
+    @mock.patch("shipyard_airflow.plugins.check_k8s_node_status.time")
+    def test_not_connected_to_k8s(self, time, watch_time, watch, client,
+                                  config):
+        watch_time.monotonic = time.monotonic
+        time.monotonic.side_effect = [0, 0, 1, 1, 1.5, 2]
+        config.load_incluster_config.side_effect = Exception('no cluster')
+
+        assert wait_for_node_status(2, 1, ['a1', 'b1']) == ['a1', 'b1']
+        assert watch_time.sleep.call_count == 2
@@ -0,0 +1,142 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for check_k8s_pod_status functions"""
+from unittest import mock
+
+from airflow.exceptions import AirflowException
+import pytest
+
+from shipyard_airflow.plugins.check_k8s_pod_status import (
+    check_pods_status, PodReadinessTracker, wait_for_pods_ready
+)
+
+
+def _pod(name, phase, resource_version='1', namespace='ucp', reason=None):
+    """A fake V1Pod"""
+    pod = mock.MagicMock()
+    pod.metadata.name = name
+    pod.metadata.namespace = namespace
+    pod.metadata.resource_version = resource_version
+    pod.status.phase = phase
+    pod.status.reason = reason
+    pod.status.container_statuses = None if reason else []
+    return pod
+
+
+def _pod_list(pods, resource_version='10'):
+    ret = mock.MagicMock()
+    ret.items = pods
+    ret.metadata.resource_version = resource_version
+    return ret
+
+
+def _event(event_type, pod):
+    return {'type': event_type, 'object': pod, 'raw_object': {}}
+
+
+class TestPodReadinessTracker:
+    def test_readiness(self):
+        tracker = PodReadinessTracker(['ceph-', 'calico-', 'ceph-mon-'])
+        tracker.handle_event('ADDED', _pod('ceph-mon-a', 'Running'))
+        tracker.handle_event('ADDED', _pod('ceph-osd-a', 'Pending'))
+        tracker.handle_event('ADDED', _pod('shipyard-api', 'Pending'))
+        assert not tracker.all_ready
+        assert tracker.readiness() == {
+            'ceph-': {'ready': False, 'pods': 2, 'ready_pods': 1},
+            'calico-': {'ready': False, 'pods': 0, 'ready_pods': 0},
+            'ceph-mon-': {'ready': True, 'pods': 1, 'ready_pods': 1},
+        }
+
+        tracker.handle_event('ADDED', _pod('calico-node-a', 'Running'))
+        tracker.handle_event('MODIFIED', _pod('ceph-osd-a', 'Succeeded'))
+        assert tracker.all_ready
+        tracker.handle_event('ADDED', _pod('ceph-osd-b', 'Pending'))
+        assert not tracker.all_ready
+        tracker.handle_event('DELETED', _pod('ceph-osd-b', 'Pending'))
+        assert tracker.all_ready
+
+        tracker.clear()
+        assert not tracker.all_ready
+
+    def test_match_node_selector_ignored(self):
+        tracker = PodReadinessTracker(['calico-'])
+        tracker.handle_event('ADDED', _pod('calico-node-a', 'Running'))
+        tracker.handle_event('ADDED', _pod('calico-node-b', 'Failed',
+                                           reason='MatchNodeSelector'))
+        assert tracker.all_ready
+
+    def test_all_pods(self):
+        tracker = PodReadinessTracker([''])
+        tracker.handle_event('ADDED', _pod('a', 'Running'))
+        tracker.handle_event('ADDED', _pod('b', 'Pending', namespace='kube'))
+        assert tracker.readiness() == {
+            '': {'ready': False, 'pods': 2, 'ready_pods': 1}}
+
+
+@mock.patch("shipyard_airflow.plugins.check_k8s_pod_status.config")
+@mock.patch("shipyard_airflow.plugins.check_k8s_pod_status.client")
+@mock.patch("shipyard_airflow.plugins.k8s_watch.watch")
+class TestWaitForPodsReady:
+    def test_ready_from_watch(self, watch, client, config):
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_namespaced_pod.return_value = _pod_list([
+            _pod('ceph-mon-a', 'Running'), _pod('calico-node-a', 'Pending')])
+        watch.Watch.return_value.stream.return_value = iter([
+            _event('MODIFIED', _pod('calico-node-a', 'Running', '11')),
+            _event('ADDED', _pod('calico-node-b', 'Pending', '12')),
+        ])
+
+        readiness = wait_for_pods_ready(['ceph-', 'calico-'], 60,
+                                        namespace='ucp',
+                                        label_selector='app=infra')
+        assert readiness == {
+            'ceph-': {'ready': True, 'pods': 1, 'ready_pods': 1},
+            'calico-': {'ready': True, 'pods': 1, 'ready_pods': 1},
+        }
+        core_v1.list_namespaced_pod.assert_called_once_with(
+            'ucp', label_selector='app=infra')
+        assert not core_v1.list_pod_for_all_namespaces.called
+        stream_args = watch.Watch.return_value.stream.call_args
+        assert stream_args[0] == (core_v1.list_namespaced_pod, 'ucp')
+        assert stream_args[1]['resource_version'] == '10'
+        # the wait ends when the pods are ready
+        assert next(watch.Watch.return_value.stream.return_value, None)
+
+    def test_check_pods_status(self, watch, client, config):
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_pod_for_all_namespaces.return_value = _pod_list([
+            _pod('ceph-mon-a', 'Running'), _pod('calico-node-a', 'Running')])
+
+        assert check_pods_status(['ceph-', 'calico-'])
+        assert not watch.Watch.called
+
+    @mock.patch("shipyard_airflow.plugins.k8s_watch.time")
+    @mock.patch("shipyard_airflow.plugins.check_k8s_pod_status.time")
+    def test_check_pods_status_timeout(self, time, watch_time, watch, client,
+                                       config):
+        watch_time.monotonic = time.monotonic
+        time.monotonic.side_effect = [0, 0, 0, 1, 1, 100]
+        core_v1 = client.CoreV1Api.return_value
+        core_v1.list_pod_for_all_namespaces.return_value = _pod_list([
+            _pod('ceph-mon-a', 'Pending')])
+        watch.Watch.return_value.stream.return_value = iter([
+            _event('MODIFIED', _pod('ceph-mon-a', 'Pending', '11')),
+        ])
+        assert not check_pods_status(['ceph-'])
+
+        # no more changes are watched
+        time.monotonic.side_effect = [0, 0, 0, 1, 100]
+        with pytest.raises(AirflowException) as exc:
+            check_pods_status(['ceph-', 'calico-'])
+        assert 'calico-' in str(exc.value)
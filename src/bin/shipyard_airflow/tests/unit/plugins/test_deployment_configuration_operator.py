@@ -175,6 +175,44 @@ def test_get_doc_mock_deckhand_invalid(*args):
     assert 'valid deployment-configuration' in str(airflow_ex)
 
 
+def get_m_index_client(data):
+    doc_obj = mock.MagicMock()
+    doc_obj.schema = 'shipyard/DeploymentConfiguration/v1'
+    doc_obj.metadata = {'name': 'deployment-configuration'}
+    doc_obj.data = data
+    mock_client = mock.MagicMock()
+    mock_client.revisions.documents.return_value = [doc_obj]
+    return mock_client
+
+
+@mock.patch.object(DeckhandClientFactory, 'get_client',
+                   return_value=get_m_index_client({'a': 'b'}))
+def test_get_doc_indexed(get_client, tmpdir):
+    """Get doc should look up the document in the rendered document index"""
+    dco = DeploymentConfigurationOperator(main_dag_name="main",
+                                          shipyard_conf="shipyard.conf",
+                                          task_id="t1")
+    dco.config = make_fake_config()
+    dco.config.set(DOCUMENT_INFO, 'rendered_document_index_dir', str(tmpdir))
+    assert dco.get_doc(99) == {'a': 'b'}
+    get_client.return_value.revisions.documents.assert_called_once_with(
+        99, rendered=True)
+
+
+@mock.patch.object(DeckhandClientFactory, 'get_client',
+                   return_value=get_m_index_client(None))
+def test_get_doc_indexed_invalid(get_client, tmpdir):
+    """Get doc should fail if the indexed document has no data"""
+    dco = DeploymentConfigurationOperator(main_dag_name="main",
+                                          shipyard_conf="shipyard.conf",
+                                          task_id="t1")
+    dco.config = make_fake_config()
+    dco.config.set(DOCUMENT_INFO, 'rendered_document_index_dir', str(tmpdir))
+    with pytest.raises(AirflowException) as airflow_ex:
+        dco.get_doc(99)
+    assert 'valid deployment-configuration' in str(airflow_ex)
+
+
 sample_deployment_config = """
   physical_provisioner:
     deployment_strategy: all-at-once
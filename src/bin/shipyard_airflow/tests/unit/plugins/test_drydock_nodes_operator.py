@@ -14,6 +14,8 @@
 """Tests for drydock_nodes operator functions"""
 import copy
 import os
+import threading
+import time
 from unittest import mock
 
 import pytest
@@ -351,7 +353,7 @@ class TestDrydockNodesOperator:
         assert op._execute_task.call_count == 1
 
     @mock.patch("shipyard_airflow.plugins.check_k8s_node_status."
-                "check_node_status", return_value=[])
+                "wait_for_node_status", return_value=[])
     def test_execute_deployment(self, cns):
         op = DrydockNodesOperator(main_dag_name="main",
                                   shipyard_conf=CONF_FILE,
@@ -368,9 +370,12 @@ class TestDrydockNodesOperator:
         op._execute_deployment(group, succ_prep_nodes)
         assert op._execute_task.call_count == 1
         assert cns.call_count == 1
+        # the join wait is part of the time allowed for the nodes to be ready
+        assert cns.call_args[0][:2] == (op.node_st_timeout,
+                                        op.node_st_interval)
 
     @mock.patch("shipyard_airflow.plugins.check_k8s_node_status."
-                "check_node_status", return_value=['node2', 'node4'])
+                "wait_for_node_status", return_value=['node2', 'node4'])
     def test_execute_deployment_k8s_fail(self, cns, caplog):
         op = DrydockNodesOperator(main_dag_name="main",
                                   shipyard_conf=CONF_FILE,
@@ -484,4 +489,168 @@ class TestDrydockNodesOperator:
         op.do_execute()
         assert "critical groups have met their success criteria" in caplog.text
 
-    # TODO (bryan-strassner) test for _execute_task
+    def test_process_deployment_groups_concurrent(self):
+        """Independent groups are processed concurrently"""
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        started = []
+        prepare = _gen_pe_func('all-success', stand_alone=True)
+
+        def _prepare(group):
+            with lock:
+                started.append(group.name)
+                running.append(group.name)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(group.name)
+            return prepare(group)
+
+        _process_deployment_groups(
+            dgm,
+            _prepare,
+            _gen_pe_func('all-success', stand_alone=True),
+            max_concurrent_tasks=2)
+        assert not dgm.critical_groups_failed()
+        for group in dgm.group_list():
+            assert group.stage == Stage.DEPLOYED
+        # the independent monitoring-nodes and ntp-node run together,
+        # and the compute nodes after control-nodes, never more than 2
+        assert max(max_running) == 2
+        assert set(started[:2]) == {'monitoring-nodes', 'ntp-node'}
+        assert started.index('control-nodes') < started.index(
+            'compute-nodes-1')
+        # all-compute-nodes has no actionable nodes, so is not prepared
+        assert len(started) == 6
+
+    def test_process_deployment_groups_concurrent_dep_fail(self):
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+        _process_deployment_groups(
+            dgm,
+            _gen_pe_func('all-success', stand_alone=True),
+            _gen_pe_func('all-fail', stand_alone=True),
+            max_concurrent_tasks=4)
+        assert dgm.critical_groups_failed()
+        for group in dgm.group_list():
+            assert group.stage == Stage.FAILED
+
+    def test_process_deployment_groups_concurrent_exception(self):
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+
+        def _prepare(group):
+            raise AirflowException("Drydock is unreachable")
+
+        with pytest.raises(AirflowException):
+            _process_deployment_groups(
+                dgm,
+                _prepare,
+                _gen_pe_func('all-success', stand_alone=True),
+                max_concurrent_tasks=4)
+
+    def test_process_deployment_groups_look_ahead(self):
+        """The next group is prepared while the previous one deploys"""
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+        lock = threading.Lock()
+        events = []
+        prepare = _gen_pe_func('all-success', stand_alone=True)
+        deploy = _gen_pe_func('all-success', stand_alone=True)
+
+        def _record(stage, func):
+            def _func(group, *args):
+                with lock:
+                    events.append((stage, 'start', group.name))
+                time.sleep(0.02)
+                with lock:
+                    events.append((stage, 'end', group.name))
+                return func(group, *args)
+            return _func
+
+        _process_deployment_groups(
+            dgm,
+            _record('prepare', prepare),
+            _record('deploy', deploy),
+            max_concurrent_tasks=1,
+            prepare_look_ahead=1)
+        assert not dgm.critical_groups_failed()
+        for group in dgm.group_list():
+            assert group.stage == Stage.DEPLOYED
+
+        # control-nodes is prepared ahead of its dependency ntp-node
+        # being deployed, but is deployed after it
+        assert (events.index(('prepare', 'start', 'control-nodes')) <
+                events.index(('deploy', 'end', 'ntp-node')))
+        assert (events.index(('deploy', 'end', 'ntp-node')) <
+                events.index(('deploy', 'start', 'control-nodes')))
+        for group in ['compute-nodes-1', 'compute-nodes-2']:
+            assert (events.index(('deploy', 'end', 'control-nodes')) <
+                    events.index(('deploy', 'start', group)))
+        timing = dgm.get_stage_timing()
+        assert timing['control-nodes'][Stage.PREPARED]['duration'] > 0
+        assert timing['control-nodes'][Stage.DEPLOYED]['duration'] > 0
+
+    def test_process_deployment_groups_look_ahead_dep_fail(self):
+        """A group prepared ahead of a failed dependency is not deployed"""
+        dgm = DeploymentGroupManager(
+            yaml.safe_load(tdgm.GROUPS_YAML),
+            node_lookup
+        )
+        deployed = []
+        deploy = _gen_pe_func('all-success', stand_alone=True)
+        fail = _gen_pe_func('all-fail', stand_alone=True)
+
+        def _deploy(group, *args):
+            deployed.append(group.name)
+            if group.name == 'ntp-node':
+                return fail(group, *args)
+            return deploy(group, *args)
+
+        _process_deployment_groups(
+            dgm,
+            _gen_pe_func('all-success', stand_alone=True),
+            _deploy,
+            max_concurrent_tasks=1,
+            prepare_look_ahead=2)
+        assert dgm.critical_groups_failed()
+        assert sorted(deployed) == ['monitoring-nodes', 'ntp-node']
+        for group in dgm.group_list():
+            if group.name == 'monitoring-nodes':
+                assert group.stage == Stage.DEPLOYED
+            else:
+                assert group.stage == Stage.FAILED
+
+    def test_execute_task(self):
+        op = DrydockNodesOperator(main_dag_name="main",
+                                  shipyard_conf=CONF_FILE,
+                                  task_id="t1")
+        op.design_ref = {}
+        op.drydock_client = mock.MagicMock()
+        op.drydock_client.create_task.return_value = {'task_id': '0'}
+        op.query_task = mock.MagicMock()
+        op.get_task_dict = _fake_get_task_dict
+        op._create_drydock_results_notes = mock.MagicMock()
+        node_filter = gen_node_name_filter(['node1', 'node2'])
+
+        result = op._execute_task('prepare_nodes', 1, 10, node_filter)
+        assert result.task_id == '0'
+        assert result.successes == {'node1', 'node2', 'node3'}
+        op.drydock_client.create_task.assert_called_once_with(
+            design_ref={}, task_action='prepare_nodes',
+            node_filter=node_filter)
+        op.query_task.assert_called_once_with(1, 10)
+        # the task state is held by a copy of the operator
+        assert op.drydock_task_id is None
+        assert op.node_filter is None
@@ -17,11 +17,15 @@ from unittest import mock
 
 import pytest
 
+from shipyard_airflow.plugins.drydock_base_operator import (
+    poll_delays, TASK_POLL_METRICS
+)
 from shipyard_airflow.plugins.drydock_verify_site import (
     DrydockVerifySiteOperator
 )
 from shipyard_airflow.plugins.drydock_errors import (
     DrydockTaskFailedException,
+    DrydockTaskTimeoutException,
 )
 
 CONF_FILE = os.path.join(os.path.dirname(__file__), 'test.conf')
@@ -49,6 +53,8 @@ def test_logs_fetched_if_exception_in_create_task(get_pod_logs):
 @mock.patch('shipyard_airflow.plugins.ucp_base_operator.get_pod_logs')
 def test_logs_fetched_if_exception_in_query_task(get_pod_logs):
     client = mock.MagicMock()
+    client.get_task.return_value = {'status': 'terminated',
+                                    'result': {'status': 'failure'}}
     dvs = DrydockVerifySiteOperator(
         task_id="t1",
         shipyard_conf=CONF_FILE,
@@ -60,3 +66,65 @@ def test_logs_fetched_if_exception_in_query_task(get_pod_logs):
         dvs.execute(mock.MagicMock())
     assert get_pod_logs.called
     assert client.get_tasks.called
+
+
+def _task_state(status, result='incomplete'):
+    return {'status': status, 'result': {'status': result}}
+
+
+def _verify_site_operator(client):
+    dvs = DrydockVerifySiteOperator(
+        task_id="t1",
+        shipyard_conf=CONF_FILE,
+        drydock_client=client)
+    dvs.drydock_task_id = 'task-1'
+    dvs.drydock_task_action = 'verify_site'
+    return dvs
+
+
+def test_poll_delays():
+    delays = poll_delays(30)
+    first = [next(delays) for _ in range(8)]
+    assert 0.9 <= first[0] <= 1.1
+    assert 1.8 <= first[1] <= 2.2
+    assert 3.6 <= first[2] <= 4.4
+    # capped at the interval
+    assert all(27 <= delay <= 30 for delay in first[5:])
+
+    delays = poll_delays(1)
+    assert all(next(delays) <= 1 for _ in range(5))
+
+
+@mock.patch('time.sleep')
+def test_query_task_adaptive(sleep):
+    client = mock.MagicMock()
+    client.get_task.side_effect = [
+        _task_state('running'),
+        ValueError('Intermittent failure'),
+        _task_state('running'),
+        _task_state('complete', 'success'),
+    ]
+    dvs = _verify_site_operator(client)
+    dvs.query_task(interval=60, time_out=3600)
+    assert client.get_task.call_count == 4
+    # short delays first, growing despite the failed query
+    delays = [call[0][0] for call in sleep.call_args_list]
+    assert len(delays) == 3
+    assert 0.9 <= delays[0] <= 1.1
+    assert 3.6 <= delays[2] <= 4.4
+    metrics = TASK_POLL_METRICS.as_dict()['verify_site']
+    assert metrics['count'] >= 1
+    assert metrics['max_detection_lag'] >= delays[2]
+
+
+@mock.patch('shipyard_airflow.plugins.drydock_base_operator.time')
+def test_query_task_timeout(time):
+    # the deadline is by wall clock time, regardless of the queries made
+    time.monotonic.side_effect = [0, 5, 11, 11]
+    client = mock.MagicMock()
+    client.get_task.return_value = _task_state('running')
+    dvs = _verify_site_operator(client)
+    with pytest.raises(DrydockTaskTimeoutException):
+        dvs.query_task(interval=1, time_out=10)
+    assert client.get_task.call_count == 2
+    assert time.sleep.call_count == 1
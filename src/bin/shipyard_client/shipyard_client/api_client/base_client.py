@@ -111,15 +111,16 @@ class BaseClient(metaclass=abc.ABCMeta):
             self.error(str(e))
             raise ClientError(str(e))
 
-    def get_resp(self, url, query_params=None):
+    def get_resp(self, url, query_params=None, headers=None):
         """ Thin wrapper of requests get """
         if not query_params:
             query_params = {}
         try:
-            headers = {
+            headers = dict(headers or {})
+            headers.update({
                 'X-Context-Marker': self.context.context_marker,
                 'X-Auth-Token': self.get_token()
-            }
+            })
             query_params['verbosity'] = self.context.verbosity
             self.debug('url: ' + url)
             self.debug('Query Params: ' + str(query_params))
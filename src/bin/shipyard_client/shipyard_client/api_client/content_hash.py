@@ -0,0 +1,77 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Content hashes of collections of documents
+
+The hash of a collection is the same as that provided by Shipyard for a
+collection (GET configdocs/{collection_id}/hash), so that a collection can be
+compared to Shipyard's copy without being uploaded. The hash depends only on
+the schema, metadata and data of the documents, and not on their order or
+formatting.
+"""
+import hashlib
+import json
+
+import yaml
+
+# The parts of a document that make up its content
+HASHED_FIELDS = ('schema', 'metadata', 'data')
+
+
+def document_hash(document):
+    """Returns the sha256 hex digest of the content of a document"""
+    content = {field: document.get(field) for field in HASHED_FIELDS}
+    serialized = json.dumps(content, sort_keys=True, separators=(',', ':'),
+                            default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def collection_hash(document_data):
+    """Returns the sha256 hex digest of a collection of documents
+
+    :param document_data: the YAML documents as a string, bytes, or an
+        iterable of chunks of bytes. The documents are loaded one at a time.
+    :raises yaml.YAMLError: if the documents are not valid YAML
+    """
+    if not isinstance(document_data, (str, bytes)):
+        document_data = _ChunkReader(iter(document_data))
+    entries = []
+    for document in yaml.safe_load_all(document_data):
+        if not document:
+            continue
+        metadata = document.get('metadata') or {}
+        entries.append([document.get('schema', ''),
+                        metadata.get('name', ''),
+                        document_hash(document)])
+    serialized = json.dumps(sorted(entries), separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class _ChunkReader:
+    """A file-like reader of an iterator of chunks of bytes"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._pending = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        if size < 0:
+            data, self._pending = self._pending, b''
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
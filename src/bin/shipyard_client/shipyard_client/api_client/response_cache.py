@@ -0,0 +1,72 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local copies of API responses, for making conditional requests
+
+Each response body is stored in a file, along with its entity tag (ETag), so
+that a later request for the same resource can send If-None-Match and reuse
+the local copy when the API responds 304 Not Modified.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Response bodies and their entity tags stored in a directory
+
+    Files are readable only by the user. Responses that include cleartext
+    secrets must not be stored.
+
+    :param str directory: the directory the responses are stored in, created
+        if it does not exist
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def get(self, key):
+        """Returns the (etag, content) stored for the key, or None"""
+        try:
+            with open(self._path(key), 'rb') as cached:
+                etag = cached.readline().decode('utf-8').rstrip('\n')
+                return etag, cached.read()
+        except FileNotFoundError:
+            return None
+        except OSError as ex:
+            LOG.warning('Unable to read cached response: %s', ex)
+            return None
+
+    def put(self, key, etag, content):
+        """Stores the content (bytes) and entity tag for the key"""
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # Write and rename, so a reader never sees a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            try:
+                with os.fdopen(fd, 'wb') as cached:
+                    cached.write(etag.encode('utf-8') + b'\n')
+                    cached.write(content)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as ex:
+            LOG.warning('Unable to store cached response: %s', ex)
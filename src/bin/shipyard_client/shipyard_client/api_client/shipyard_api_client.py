@@ -13,8 +13,13 @@
 # limitations under the License.
 import enum
 import json
+import os
+
+import yaml
 
 from .base_client import BaseClient
+from .content_hash import collection_hash
+from .response_cache import ResponseCache
 
 
 class ApiPaths(enum.Enum):
@@ -26,7 +31,9 @@ class ApiPaths(enum.Enum):
     _BASE_URL = '{}/'
     GET_CONFIGDOCS = _BASE_URL + 'configdocs'
     POST_GET_CONFIG = _BASE_URL + 'configdocs/{}'
+    GET_CONFIGDOCS_HASH = _BASE_URL + 'configdocs/{}/hash'
     GET_RENDERED = _BASE_URL + 'renderedconfigdocs'
+    POST_BATCH_CONFIG = _BASE_URL + 'batchconfigdocs'
     COMMIT_CONFIG = _BASE_URL + 'commitconfigdocs'
     POST_GET_ACTIONS = _BASE_URL + 'actions'
     GET_ACTION_DETAIL = _BASE_URL + 'actions/{}'
@@ -53,7 +60,8 @@ class ShipyardClient(BaseClient):
                         collection_id=None,
                         buffer_mode='rejectoncontents',
                         empty_collection=False,
-                        document_data=None):
+                        document_data=None,
+                        skip_unchanged=False):
         """
         Ingests a collection of documents
         :param str collection_id: identifies a collection of docs.Bucket_id
@@ -61,9 +69,24 @@ class ShipyardClient(BaseClient):
         :param empty_collection: True if the collection is empty. Document
             data will be ignored if this flag is set to True. Default: False
         :param str document_data: data in a format understood by Deckhand(YAML)
-        :returns: diff from last committed revision to new revision
+        :param skip_unchanged: True to upload the documents only if they
+            differ from the collection in the Shipyard buffer, compared by
+            content hash. Not applied to an empty collection or the replace
+            buffer mode. Default: False
+        :returns: diff from last committed revision to new revision, or the
+            hash of the collection (a 200 response) if it is unchanged
         :rtype: Response object
         """
+        if (skip_unchanged and not empty_collection and
+                str(buffer_mode).lower() != 'replace'):
+            response = self.get_configdocs_hash(collection_id)
+            if (response.status_code == 200 and
+                    response.json().get('hash') ==
+                    self._collection_hash(document_data)):
+                self.debug('Collection {} is unchanged, and is not '
+                           'uploaded'.format(collection_id))
+                return response
+
         query_params = {"buffermode": buffer_mode}
         if empty_collection:
             query_params['empty-collection'] = True
@@ -73,6 +96,76 @@ class ShipyardClient(BaseClient):
         )
         return self.post_resp(url, query_params, document_data)
 
+    def post_configdocs_batch(self,
+                              collections,
+                              buffer_mode='rejectoncontents',
+                              skip_unchanged=False):
+        """
+        Ingests several collections of documents in a single request
+        :param collections: a list of (collection_id, document_data) of the
+            collections, where document_data is a non-empty YAML string, or an
+            iterable of chunks of bytes with a length
+        :param str buffermode: append|replace|rejectOnContents, applied to the
+            batch as a whole
+        :param skip_unchanged: True to upload only the collections that
+            differ from the collections in the Shipyard buffer. Not applied
+            to the replace buffer mode. Default: False
+        :returns: the validations of the buffer with the collections added,
+            or the hash of the last collection (a 200 response) if all are
+            unchanged
+        :rtype: Response object
+        """
+        collections = [
+            (collection_id, document_data.encode('utf-8')
+             if isinstance(document_data, str) else document_data)
+            for collection_id, document_data in collections]
+        if skip_unchanged and str(buffer_mode).lower() != 'replace':
+            changed = []
+            for collection_id, document_data in collections:
+                response = self.get_configdocs_hash(collection_id)
+                if (response.status_code == 200 and
+                        response.json().get('hash') ==
+                        self._collection_hash(document_data)):
+                    self.debug('Collection {} is unchanged, and is not '
+                               'uploaded'.format(collection_id))
+                else:
+                    changed.append((collection_id, document_data))
+            if not changed:
+                return response
+            collections = changed
+
+        query_params = {
+            "buffermode": buffer_mode,
+            "collections": ','.join(
+                '{}:{}'.format(collection_id, len(document_data))
+                for collection_id, document_data in collections)
+        }
+        url = ApiPaths.POST_BATCH_CONFIG.value.format(self.get_endpoint())
+        return self.post_resp(url, query_params, _BatchBody(
+            [document_data for _, document_data in collections]))
+
+    def _collection_hash(self, document_data):
+        try:
+            return collection_hash(document_data or '')
+        except yaml.YAMLError as ex:
+            # Uploaded regardless, for Shipyard to report the error
+            self.debug('Unable to hash the collection: {}'.format(ex))
+            return None
+
+    def get_configdocs_hash(self, collection_id=None, version='buffer'):
+        """
+        Get the content hash of a collection of documents
+        :param collection_id: String, bucket_id in deckhand
+        :param version: String, buffer|committed|last_site_action|
+                                successful_site_action
+        :rtype: Response object
+        """
+        query_params = {"version": version}
+        url = ApiPaths.GET_CONFIGDOCS_HASH.value.format(
+            self.get_endpoint(),
+            collection_id)
+        return self.get_resp(url, query_params)
+
     def get_configdocs(self, collection_id=None, version='buffer',
                        cleartext_secrets=False):
         """
@@ -107,6 +200,10 @@ class ShipyardClient(BaseClient):
                             successful_site_action
         :returns: full set of configdocs in their rendered form.
         :rtype: Response object
+
+        If the context specifies a cache_dir, a local copy of the rendered
+        documents (only with redacted secrets) is kept, and is returned as a
+        200 response when Shipyard indicates it is unchanged.
         """
         query_params = {"version": version}
         if cleartext_secrets is True:
@@ -114,29 +211,73 @@ class ShipyardClient(BaseClient):
         url = ApiPaths.GET_RENDERED.value.format(
             self.get_endpoint()
         )
-        return self.get_resp(url, query_params)
+        cache = self._get_response_cache()
+        if cache is None or cleartext_secrets is True:
+            return self.get_resp(url, query_params)
+
+        key = '{}?version={}'.format(url, version)
+        cached = cache.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        response = self.get_resp(url, query_params, headers=headers)
+        if response.status_code == 304 and cached:
+            self.debug('Using the local copy of the rendered documents')
+            response.status_code = 200
+            response._content = cached[1]
+        elif response.status_code == 200 and response.headers.get('ETag'):
+            cache.put(key, response.headers['ETag'], response.content)
+        return response
 
-    def commit_configdocs(self, force=False, dryrun=False):
+    def _get_response_cache(self):
+        cache_dir = self.context.cache_dir
+        if not cache_dir:
+            return None
+        return ResponseCache(
+            os.path.join(os.path.expanduser(cache_dir), 'rendereddocs'))
+
+    def commit_configdocs(self, force=False, dryrun=False,
+                          refresh_validations=False):
         """
         :param force: boolean, True|False
         :param dryrun: boolean, True|False
+        :param refresh_validations: boolean, True|False. True to invoke the
+            validations of the Airship components even if their results for
+            the revision are stored
         :returns: dictionary, validations from Airship components
         :rtype: Response object
         """
         query_params = {"force": force, "dryrun": dryrun}
+        if refresh_validations:
+            query_params["refresh-validations"] = refresh_validations
         url = ApiPaths.COMMIT_CONFIG.value.format(self.get_endpoint())
         return self.post_resp(url, query_params)
 
-    def get_actions(self):
+    def get_actions(self, cursor=None, limit=None, since=None, name=None,
+                    lifecycle=None):
         """
         A list of actions that have been executed through shipyard's action API
-        :returns: lists all actions
+        :param str cursor: optional, the id of the last action of a prior page
+            of results. Only actions following this action are returned.
+        :param int limit: optional, the maximum number of actions to return
+        :param str since: optional, iso8601 date. Only actions invoked at or
+            after this time are returned.
+        :param str name: optional, the name of the actions to return
+        :param str lifecycle: optional, the lifecycle of the actions to return
+            e.g. Pending|Processing|Complete|Failed|Paused
+        :returns: lists all actions matching the filters, ordered by id
         :rtype: Response object
         """
+        query_params = {
+            k: v for k, v in (('cursor', cursor),
+                              ('limit', limit),
+                              ('since', since),
+                              ('name', name),
+                              ('lifecycle', lifecycle))
+            if v is not None
+        }
         url = ApiPaths.POST_GET_ACTIONS.value.format(
             self.get_endpoint()
         )
-        return self.get_resp(url)
+        return self.get_resp(url, query_params)
 
     def post_actions(self, name=None, parameters=None,
                      allow_intermediate_commits=False):
@@ -245,15 +386,24 @@ class ShipyardClient(BaseClient):
             self.get_endpoint(), note_id)
         return self.get_resp(url)
 
-    def get_workflows(self, since=None):
+    def get_workflows(self, since=None, cursor=None, limit=None):
         """
         Queries airflow for DAGs that are running or have run
         (successfully or unsuccessfully)
         :param str since: iso8601 date optional
-        :returns: DAGS running or that have run
+        :param str cursor: optional, the workflow id of the last workflow of a
+            prior page of results. Only workflows following this workflow are
+            returned.
+        :param int limit: optional, the maximum number of workflows to return
+        :returns: DAGS running or that have run, ordered by execution date
         :rtype: Response object
         """
-        query_params = {'since': since}
+        query_params = {
+            k: v for k, v in (('since', since),
+                              ('cursor', cursor),
+                              ('limit', limit))
+            if v is not None
+        }
         url = ApiPaths.GET_WORKFLOWS.value.format(self.get_endpoint())
         return self.get_resp(url, query_params)
 
@@ -282,3 +432,22 @@ class ShipyardClient(BaseClient):
         url = ApiPaths.GET_SITE_STATUSES.value.format(
             self.get_endpoint())
         return self.get_resp(url, query_params)
+
+
+class _BatchBody:
+    """The documents of several collections, one after the other, as a
+    request body of known length
+    """
+
+    def __init__(self, parts):
+        self._parts = parts
+
+    def __len__(self):
+        return sum(len(part) for part in self._parts)
+
+    def __iter__(self):
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+            else:
+                yield from part
@@ -25,10 +25,13 @@ class ShipyardClientContext:
     :param bool debug: defaults False, enable debugging
     :param int verbosity: 0-5, default=1, the level of verbosity to set
         for the API
+    :param str cache_dir: the directory in which local copies of responses
+        are kept for conditional requests. None (default) disables the
+        local copies.
     """
 
     def __init__(self, keystone_auth, context_marker,
-                 debug=False, verbosity=1):
+                 debug=False, verbosity=1, cache_dir=None):
         self.debug = debug
         if self.debug:
             LOG.setLevel(logging.DEBUG)
@@ -36,3 +39,4 @@ class ShipyardClientContext:
         self.keystone_auth = keystone_auth
         self.context_marker = context_marker
         self.verbosity = verbosity
+        self.cache_dir = cache_dir
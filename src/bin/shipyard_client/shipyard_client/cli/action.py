@@ -112,7 +112,8 @@ class CliAction(AbstractCliAction):
 
         self.client_context = ShipyardClientContext(
             self.auth_vars, self.context_marker, self.debug,
-            self.api_parameters.get('verbosity'))
+            self.api_parameters.get('verbosity'),
+            self.api_parameters.get('cache_dir'))
 
     def get_api_client(self):
         """Returns the api client for this action"""
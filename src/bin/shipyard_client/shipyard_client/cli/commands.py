@@ -73,10 +73,18 @@ from shipyard_client.cli.input_checks import check_control_action, check_id
     required=False,
     type=click.IntRange(0, 5),
     default=1)
+@click.option(
+    '--cache-dir',
+    'cache_dir',
+    envvar='SHIPYARD_CACHE_DIR',
+    help='A directory in which local copies of rendered documents (with '
+    'secrets redacted) are kept, so that unchanged documents are not '
+    'retrieved again. (optional)',
+    required=False)
 @click.pass_context
 def shipyard(ctx, context_marker, debug, os_auth_token, os_project_domain_name,
              os_user_domain_name, os_domain_name, os_project_name, os_username,
-             os_password, os_auth_url, output_format, verbosity):
+             os_password, os_auth_url, output_format, verbosity, cache_dir):
     """
     COMMAND: shipyard \n
     DESCRIPTION: The base shipyard command supports options that determine
@@ -84,7 +92,7 @@ def shipyard(ctx, context_marker, debug, os_auth_token, os_project_domain_name,
     the shipyard command. \n
     FORMAT: shipyard [--context-marker=<uuid>] [--os_{various}=<value>]
     [--debug/--no-debug] [--output-format=<json,yaml,raw] [--verbosity=<0-5>]
-    <subcommands> \n
+    [--cache-dir=<directory>] <subcommands> \n
     """
     if not ctx.obj:
         ctx.obj = {}
@@ -127,6 +135,7 @@ def shipyard(ctx, context_marker, debug, os_auth_token, os_project_domain_name,
         'context_marker': str(context_marker) if context_marker else None,
         'debug': debug,
         'verbosity': verbosity,
+        'cache_dir': cache_dir,
     }
 
     ctx.obj['FORMAT'] = output_format
@@ -19,19 +19,23 @@ from shipyard_client.cli import format_utils
 class CommitConfigdocs(CliAction):
     """Actions to Commit Configdocs"""
 
-    def __init__(self, ctx, force, dryrun):
+    def __init__(self, ctx, force, dryrun, refresh_validations=False):
         """Sets parameters."""
         super().__init__(ctx)
         self.force = force
         self.dryrun = dryrun
-        self.logger.debug("CommitConfigdocs action initialized with force=%s "
-                          "and dryrun=%s.", force, dryrun)
+        self.refresh_validations = refresh_validations
+        self.logger.debug("CommitConfigdocs action initialized with force=%s, "
+                          "dryrun=%s and refresh_validations=%s.", force,
+                          dryrun, refresh_validations)
 
     def invoke(self):
         """Calls API Client and formats response from API Client"""
         self.logger.debug("Calling API Client commit_configdocs.")
-        return self.get_api_client().commit_configdocs(force=self.force,
-                                                       dryrun=self.dryrun)
+        return self.get_api_client().commit_configdocs(
+            force=self.force,
+            dryrun=self.dryrun,
+            refresh_validations=self.refresh_validations)
 
     # Handle 400, 409 with default error handler for cli.
     cli_handled_err_resp_codes = [400, 409]
@@ -34,7 +34,8 @@ DESC_CONFIGDOCS = """
 COMMAND: configdocs \n
 DESCRIPTION: Attempts to commit the Shipyard Buffer documents, first
 invoking validation by downstream components. \n
-FORMAT: shipyard commit configdocs [--force | --dryrun] \n
+FORMAT: shipyard commit configdocs [--force | --dryrun]
+[--refresh-validations] \n
 EXAMPLE: shipyard commit configdocs
 """
 
@@ -54,8 +55,14 @@ SHORT_DESC_CONFIGDOCS = ("Attempts to commit the Shipyard Buffer documents, "
     is_flag=True,
     help='Retrieve validation status for the contents of the buffer without '
     'committing.')
+@click.option(
+    '--refresh-validations',
+    is_flag=True,
+    help='Invoke the validations by the Airship components, even if their '
+    'results for the documents are already stored.')
 @click.pass_context
-def commit_configdocs(ctx, force, dryrun):
+def commit_configdocs(ctx, force, dryrun, refresh_validations):
     if (force and dryrun):
         ctx.fail('Either force or dryrun may be selected but not both.')
-    click.echo(CommitConfigdocs(ctx, force, dryrun).invoke_and_return_resp())
+    click.echo(CommitConfigdocs(ctx, force, dryrun,
+                                refresh_validations).invoke_and_return_resp())
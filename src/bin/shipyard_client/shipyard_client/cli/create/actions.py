@@ -58,20 +58,21 @@ class CreateConfigdocs(CliAction):
     """Action to Create Configdocs"""
 
     def __init__(self, ctx, collection, buffer_mode, empty_collection, data,
-                 filenames):
+                 filenames, skip_unchanged=False):
         """Sets parameters."""
         super().__init__(ctx)
         self.logger.debug(
             "CreateConfigdocs action initialized with collection: %s, "
-            "buffer mode: %s, empty collection: %s, data length: %s. "
-            "Processed Files:", collection, buffer_mode, empty_collection,
-            len(data))
+            "buffer mode: %s, empty collection: %s, skip unchanged: %s, "
+            "data length: %s. Processed Files:", collection, buffer_mode,
+            empty_collection, skip_unchanged, len(data))
         for file in filenames:
             self.logger.debug(file)
         self.collection = collection
         self.buffer_mode = buffer_mode
         self.empty_collection = empty_collection
         self.data = data
+        self.skip_unchanged = skip_unchanged
 
     def invoke(self):
         """Calls API Client and formats response from API Client"""
@@ -84,21 +85,73 @@ class CreateConfigdocs(CliAction):
             collection_id=self.collection,
             buffer_mode=self.buffer_mode,
             empty_collection=self.empty_collection,
-            document_data=data_to_send)
+            document_data=data_to_send,
+            skip_unchanged=self.skip_unchanged)
 
     # Handle 409 with default error handler for cli.
     cli_handled_err_resp_codes = [409]
 
-    # Handle 201 responses using the cli_format_response_handler
-    cli_handled_succ_resp_codes = [201]
+    # Handle 201 responses using the cli_format_response_handler, and 200
+    # responses, for an unchanged collection that is not uploaded
+    cli_handled_succ_resp_codes = [200, 201]
 
     def cli_format_response_handler(self, response):
         """CLI output handler
 
         :param response: a requests response object
         :returns: a string representing a formatted response
-            Handles 201 responses
+            Handles 200 and 201 responses
+        """
+        if response.status_code == 200:
+            return ("Configuration documents unchanged. Collection {} was not "
+                    "uploaded.".format(self.collection))
+        outfmt_string = "Configuration documents added.\n{}"
+        return outfmt_string.format(
+            format_utils.cli_format_status_handler(response))
+
+
+class CreateConfigdocsBatch(CliAction):
+    """Action to Create several collections of Configdocs"""
+
+    def __init__(self, ctx, collections, buffer_mode, skip_unchanged=False):
+        """Sets parameters."""
+        super().__init__(ctx)
+        self.logger.debug(
+            "CreateConfigdocsBatch action initialized with collections: %s, "
+            "buffer mode: %s, skip unchanged: %s",
+            ', '.join('{} ({} bytes)'.format(name, len(data))
+                      for name, data in collections),
+            buffer_mode, skip_unchanged)
+        self.collections = collections
+        self.buffer_mode = buffer_mode
+        self.skip_unchanged = skip_unchanged
+
+    def invoke(self):
+        """Calls API Client and formats response from API Client"""
+        self.logger.debug("Calling API Client post_configdocs_batch.")
+        return self.get_api_client().post_configdocs_batch(
+            collections=self.collections,
+            buffer_mode=self.buffer_mode,
+            skip_unchanged=self.skip_unchanged)
+
+    # Handle 409 with default error handler for cli.
+    cli_handled_err_resp_codes = [409]
+
+    # Handle 201 responses using the cli_format_response_handler, and 200
+    # responses, for unchanged collections that are not uploaded
+    cli_handled_succ_resp_codes = [200, 201]
+
+    def cli_format_response_handler(self, response):
+        """CLI output handler
+
+        :param response: a requests response object
+        :returns: a string representing a formatted response
+            Handles 200 and 201 responses
         """
+        if response.status_code == 200:
+            return ("Configuration documents unchanged. Collections {} were "
+                    "not uploaded.".format(
+                        ', '.join(name for name, _ in self.collections)))
         outfmt_string = "Configuration documents added.\n{}"
         return outfmt_string.format(
             format_utils.cli_format_status_handler(response))
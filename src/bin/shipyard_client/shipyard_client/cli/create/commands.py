@@ -18,7 +18,9 @@ import click
 import os
 import yaml
 
-from shipyard_client.cli.create.actions import CreateAction, CreateConfigdocs
+from shipyard_client.cli.create.actions import CreateAction, \
+    CreateConfigdocs, CreateConfigdocsBatch
+from shipyard_client.cli.create.document_files import DocumentFiles
 from shipyard_client.cli.input_checks import check_action_command, \
     check_reformat_parameter
 
@@ -84,9 +86,13 @@ DESCRIPTION: Load documents into the Shipyard Buffer. \n
 FORMAT: shipyard create configdocs <collection> [--append | --replace]
 [--empty-collection]
 [--filename=<filename> (repeatable) | --directory=<directory>] (repeatable)
- --recurse\n
+ --recurse [--skip-unchanged]\n
+FORMAT: shipyard create configdocs --batch [--append | --replace]
+--directory=<directory> (repeatable) --recurse [--skip-unchanged]\n
 EXAMPLE: shipyard create configdocs design --append
---filename=site_design.yaml
+--filename=site_design.yaml \n
+EXAMPLE: shipyard create configdocs --batch --append
+--directory=site/design --directory=site/secrets
 """
 
 SHORT_DESC_CONFIGDOCS = "Load documents into the Shipyard Buffer."
@@ -94,7 +100,7 @@ SHORT_DESC_CONFIGDOCS = "Load documents into the Shipyard Buffer."
 
 @create.command(
     name='configdocs', help=DESC_CONFIGDOCS, short_help=SHORT_DESC_CONFIGDOCS)
-@click.argument('collection')
+@click.argument('collection', required=False)
 @click.option(
     '--append',
     is_flag=True,
@@ -133,12 +139,30 @@ SHORT_DESC_CONFIGDOCS = "Load documents into the Shipyard Buffer."
     'deleted. Any file and directory parameters will be ignored if this '
     'option is used.'
 )
+@click.option(
+    '--skip-unchanged',
+    is_flag=True,
+    help='Upload the collection only if it differs from the collection in '
+    'the Shipyard Buffer (or committed documents if the buffer is empty). '
+    'May not be used with --replace.'
+)
+@click.option(
+    '--batch',
+    is_flag=True,
+    help='Load each directory as a collection named after the directory, all '
+    'in a single request. The collection argument is omitted when this '
+    'option is used.'
+)
 @click.pass_context
 def create_configdocs(ctx, collection, filenames, directory, append, replace,
-                      recurse, empty_collection):
+                      recurse, empty_collection, skip_unchanged, batch):
     if (append and replace):
         ctx.fail('Either append or replace may be selected but not both')
 
+    if (skip_unchanged and replace):
+        ctx.fail('--skip-unchanged may not be used with --replace, which '
+                 'discards the Shipyard Buffer')
+
     if append:
         buffer_mode = 'append'
     elif replace:
@@ -146,6 +170,23 @@ def create_configdocs(ctx, collection, filenames, directory, append, replace,
     else:
         buffer_mode = None
 
+    if batch:
+        if collection or filenames or empty_collection or not directory:
+            ctx.fail('Please specify one or more directories using '
+                     '--directory="<directory>", and no collection, '
+                     'filenames or --empty-collection with --batch')
+        click.echo(
+            CreateConfigdocsBatch(
+                ctx=ctx,
+                collections=_load_directory_collections(ctx, directory,
+                                                        recurse),
+                buffer_mode=buffer_mode,
+                skip_unchanged=skip_unchanged).invoke_and_return_resp())
+        return
+
+    if not collection:
+        ctx.fail('Missing argument "collection".')
+
     if empty_collection:
         # Use an empty string as the document payload, and indicate no files.
         data = ""
@@ -158,18 +199,7 @@ def create_configdocs(ctx, collection, filenames, directory, append, replace,
                      'using --directory="<directory>"')
         # Scan and parse the input directories and files
         if directory:
-            for _dir in directory:
-                if recurse:
-                    for path, dirs, files in os.walk(_dir):
-                        filenames += tuple([
-                            os.path.join(path, name) for name in files
-                            if is_yaml(name)
-                        ])
-                else:
-                    filenames += tuple([
-                        os.path.join(_dir, each) for each in os.listdir(_dir)
-                        if is_yaml(each)
-                    ])
+            filenames += _find_yaml_files(directory, recurse)
 
             if not filenames:
                 # None or empty list should raise this error
@@ -177,20 +207,7 @@ def create_configdocs(ctx, collection, filenames, directory, append, replace,
                          'Please enter one or more YAML files or a '
                          'directory that contains one or more YAML files.')
 
-        docs = []
-        for _file in filenames:
-            with open(_file, 'r') as stream:
-                if is_yaml(_file):
-                    try:
-                        docs += list(yaml.safe_load_all(stream))
-                    except yaml.YAMLError as exc:
-                        ctx.fail('YAML file {} is invalid because {}'.format(
-                            _file, exc))
-                else:
-                    ctx.fail('The file {} is not a YAML file.  Please enter '
-                             'only YAML files.'.format(_file))
-
-        data = yaml.safe_dump_all(docs)
+        data = _load_document_files(ctx, filenames)
 
     click.echo(
         CreateConfigdocs(
@@ -199,9 +216,66 @@ def create_configdocs(ctx, collection, filenames, directory, append, replace,
             buffer_mode=buffer_mode,
             empty_collection=empty_collection,
             data=data,
-            filenames=filenames).invoke_and_return_resp())
+            filenames=filenames,
+            skip_unchanged=skip_unchanged).invoke_and_return_resp())
 
 
 def is_yaml(filename):
     """Test if the filename should be regarded as a yaml file"""
     return filename.endswith(".yaml") or filename.endswith(".yml")
+
+
+def _find_yaml_files(directories, recurse):
+    """Returns the YAML files in the directories"""
+    filenames = ()
+    for _dir in directories:
+        if recurse:
+            for path, dirs, files in os.walk(_dir):
+                filenames += tuple([
+                    os.path.join(path, name) for name in files
+                    if is_yaml(name)
+                ])
+        else:
+            filenames += tuple([
+                os.path.join(_dir, each) for each in os.listdir(_dir)
+                if is_yaml(each)
+            ])
+    return filenames
+
+
+def _load_document_files(ctx, filenames):
+    """Returns the documents of the files, as DocumentFiles
+
+    The files are validated here, and read as the documents are sent.
+    """
+    data = DocumentFiles()
+    for _file in filenames:
+        if is_yaml(_file):
+            try:
+                data.add(_file)
+            except yaml.YAMLError as exc:
+                ctx.fail('YAML file {} is invalid because {}'.format(
+                    _file, exc))
+        else:
+            ctx.fail('The file {} is not a YAML file.  Please enter '
+                     'only YAML files.'.format(_file))
+    return data
+
+
+def _load_directory_collections(ctx, directories, recurse):
+    """Returns the (collection, DocumentFiles) of each directory, where the
+    collection is named after the directory
+    """
+    collections = []
+    for _dir in directories:
+        collection = os.path.basename(os.path.normpath(_dir))
+        if collection in [name for name, _ in collections]:
+            ctx.fail('More than one directory is named {}. Each directory '
+                     'is loaded as a collection named after the '
+                     'directory.'.format(collection))
+        data = _load_document_files(ctx, _find_yaml_files([_dir], recurse))
+        if not len(data):
+            ctx.fail('The directory {} does not contain any YAML '
+                     'documents.'.format(_dir))
+        collections.append((collection, data))
+    return collections
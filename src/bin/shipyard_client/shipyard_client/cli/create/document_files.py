@@ -0,0 +1,108 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The YAML files of a collection, sent as a single stream of documents
+
+Each file is validated by parsing it into YAML events, without constructing
+the documents, and is later read from disk as the request body is sent. The
+files are joined as they are, so the documents are neither loaded into memory
+together nor reformatted.
+"""
+import os
+
+import yaml
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_DOCUMENT_START = b'---\n'
+
+
+class DocumentFiles:
+    """A multi-document YAML stream of the contents of a list of files
+
+    Usable as a request body of known length: the files are read in turn, in
+    chunks, when the body is read or iterated.
+    """
+
+    def __init__(self):
+        # The (prefix, filename, size, suffix) of each file
+        self._segments = []
+        self._length = 0
+        self._reader = None
+        self._pending = b''
+
+    def add(self, filename):
+        """Validates a YAML file and adds it to the stream
+
+        Files with no documents (e.g. only comments) are not added.
+
+        :param filename: the path of the file
+        :returns: True if the file was added
+        :raises yaml.YAMLError: if the file is not valid YAML
+        """
+        explicit_start = None
+        with open(filename, 'rb') as stream:
+            for event in yaml.parse(stream, Loader=_LOADER):
+                if (explicit_start is None and
+                        isinstance(event, yaml.DocumentStartEvent)):
+                    explicit_start = event.explicit
+        if explicit_start is None:
+            return False
+
+        size = os.path.getsize(filename)
+        # The first document of a file is separated from the documents of
+        # the file before it, and each file ends with a line break.
+        prefix = b'' if explicit_start else _DOCUMENT_START
+        suffix = b''
+        if size:
+            with open(filename, 'rb') as stream:
+                stream.seek(-1, os.SEEK_END)
+                if stream.read(1) != b'\n':
+                    suffix = b'\n'
+        self._segments.append((prefix, filename, size, suffix))
+        self._length += len(prefix) + size + len(suffix)
+        return True
+
+    def _iter_chunks(self):
+        for prefix, filename, _, suffix in self._segments:
+            if prefix:
+                yield prefix
+            with open(filename, 'rb') as stream:
+                for chunk in iter(lambda: stream.read(READ_CHUNK_SIZE), b''):
+                    yield chunk
+            if suffix:
+                yield suffix
+
+    def __iter__(self):
+        return self._iter_chunks()
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        """Reads up to size bytes of the stream, or all remaining if size is
+        negative"""
+        if self._reader is None:
+            self._reader = self._iter_chunks()
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._reader, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        if size < 0:
+            data, self._pending = self._pending, b''
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
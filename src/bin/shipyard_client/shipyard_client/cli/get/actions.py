@@ -18,15 +18,25 @@ from shipyard_client.cli import format_utils
 class GetActions(CliAction):
     """Action to Get Actions"""
 
-    def __init__(self, ctx):
+    def __init__(self, ctx, cursor=None, limit=None, since=None, name=None,
+                 lifecycle=None):
         """Sets parameters."""
         super().__init__(ctx)
         self.logger.debug("GetActions action initialized.")
+        self.cursor = cursor
+        self.limit = limit
+        self.since = since
+        self.name = name
+        self.lifecycle = lifecycle
 
     def invoke(self):
         """Calls API Client and formats response from API Client"""
         self.logger.debug("Calling API Client get_actions.")
-        return self.get_api_client().get_actions()
+        return self.get_api_client().get_actions(cursor=self.cursor,
+                                                 limit=self.limit,
+                                                 since=self.since,
+                                                 name=self.name,
+                                                 lifecycle=self.lifecycle)
 
     # Handle 404 with default error handler for cli.
     cli_handled_err_resp_codes = []
@@ -152,16 +162,20 @@ class GetRenderedConfigdocs(CliAction):
 class GetWorkflows(CliAction):
     """Action to get workflows"""
 
-    def __init__(self, ctx, since=None):
+    def __init__(self, ctx, since=None, cursor=None, limit=None):
         """Sets parameters."""
         super().__init__(ctx)
         self.logger.debug("GetWorkflows action initialized.")
         self.since = since
+        self.cursor = cursor
+        self.limit = limit
 
     def invoke(self):
         """Calls API Client and formats response from API Client"""
         self.logger.debug("Calling API Client get_actions.")
-        return self.get_api_client().get_workflows(self.since)
+        return self.get_api_client().get_workflows(since=self.since,
+                                                   cursor=self.cursor,
+                                                   limit=self.limit)
 
     # Handle 404 with default error handler for cli.
     cli_handled_err_resp_codes = [404]
@@ -39,18 +39,43 @@ def get(ctx):
 DESC_ACTIONS = """
 COMMAND: actions \n
 DESCRIPTION: Lists the actions that have been invoked. \n
-FORMAT: shipyard get actions \n
-EXAMPLE: shipyard get actions
+FORMAT: shipyard get actions [--since=<date>] [--name=<action name>]
+[--lifecycle=<lifecycle>] [--limit=<limit>] [--cursor=<action id>] \n
+EXAMPLE: \n
+    shipyard get actions \n
+    shipyard get actions --since=2017-11-09T15:02:18Z --lifecycle=Failed \n
+    shipyard get actions --limit=20 --cursor=01BTP9T2WCE1PAJR2DWYXG805V
 """
 
 SHORT_DESC_ACTIONS = "Lists the actions that have been invoked."
 
 
 @get.command(name='actions', help=DESC_ACTIONS, short_help=SHORT_DESC_ACTIONS)
+@click.option(
+    '--since',
+    help='Only list actions invoked at or after this iso8601 date.')
+@click.option(
+    '--name',
+    help='Only list actions with this name, e.g. deploy_site')
+@click.option(
+    '--lifecycle',
+    type=click.Choice(['Pending', 'Processing', 'Complete', 'Failed',
+                       'Paused']),
+    help='Only list actions in this lifecycle state.')
+@click.option(
+    '--limit',
+    type=click.IntRange(min=1),
+    help='The maximum number of actions to list.')
+@click.option(
+    '--cursor',
+    help=('List the actions following this action id. Use the id of the last '
+          'action listed by a prior command to retrieve the next page.'))
 @click.pass_context
-def get_actions(ctx):
+def get_actions(ctx, since, name, lifecycle, limit, cursor):
 
-    click.echo(GetActions(ctx).invoke_and_return_resp())
+    click.echo(
+        GetActions(ctx, cursor=cursor, limit=limit, since=since, name=name,
+                   lifecycle=lifecycle).invoke_and_return_resp())
 
 
 DESC_CONFIGDOCS = """
@@ -187,10 +212,13 @@ def get_renderedconfigdocs(ctx, buffer, committed, last_site_action,
 DESC_WORKFLOWS = """
 COMMAND: workflows \n
 DESCRIPTION: Lists the workflows from airflow. \n
-FORMAT: shipyard get workflows [since]\n
+FORMAT: shipyard get workflows [--since=<date>] [--limit=<limit>]
+[--cursor=<workflow id>] \n
 EXAMPLE: \n
     shipyard get workflows \n
-    shipyard get workflows --since=2017-11-09T15:02:18Z
+    shipyard get workflows --since=2017-11-09T15:02:18Z \n
+    shipyard get workflows --limit=20
+    --cursor=deploy_site__2017-11-09T15:02:18.000000
 """
 
 SHORT_DESC_WORKFLOWS = "Lists the workflows from airflow."
@@ -202,10 +230,21 @@ SHORT_DESC_WORKFLOWS = "Lists the workflows from airflow."
     '--since',
     help=('A boundary in the past within which to retrieve results.'
           'Default is 30 days in the past.'))
+@click.option(
+    '--limit',
+    type=click.IntRange(min=1),
+    help='The maximum number of workflows to list.')
+@click.option(
+    '--cursor',
+    help=('List the workflows following this workflow id. Use the id of the '
+          'last workflow listed by a prior command to retrieve the next '
+          'page.'))
 @click.pass_context
-def get_workflows(ctx, since):
+def get_workflows(ctx, since, limit, cursor):
 
-    click.echo(GetWorkflows(ctx, since).invoke_and_return_resp())
+    click.echo(
+        GetWorkflows(ctx, since=since, cursor=cursor,
+                     limit=limit).invoke_and_return_resp())
 
 
 def get_version(ctx, buffer, committed, last_site_action,
@@ -0,0 +1,63 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import yaml
+
+from shipyard_client.api_client.content_hash import collection_hash
+
+DOCS = """---
+schema: drydock/BaremetalNode/v1
+metadata:
+  name: node-1
+  layeringDefinition:
+    layer: site
+data:
+  oob:
+    account: admin
+  host_profile: cp
+---
+schema: a/Doc/v1
+metadata:
+  name: other
+data: 1
+...
+"""
+
+
+def test_collection_hash():
+    # The digest computed by Shipyard for the same documents
+    assert collection_hash(DOCS) == (
+        '8e229286c90112b9aa1b6167ddab1f912bb7fb356997b7ecbcdc03c0476f1943')
+    assert collection_hash('') == collection_hash('---\n...\n') == (
+        '4f53cda18c2baa0c0354bb5f9a3ecbe5ed12ab4d8e11ba873c2f11161202b945')
+
+
+def test_collection_hash_content_only():
+    docs = list(yaml.safe_load_all(DOCS))
+    reordered = yaml.safe_dump_all(reversed(docs), default_flow_style=True)
+    assert collection_hash(reordered) == collection_hash(DOCS)
+
+    docs[1]['data'] = 2
+    assert collection_hash(yaml.safe_dump_all(docs)) != collection_hash(DOCS)
+
+
+def test_collection_hash_chunks():
+    data = DOCS.encode('utf-8')
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+    assert collection_hash(chunks) == collection_hash(DOCS)
+
+
+def test_collection_hash_invalid():
+    with pytest.raises(yaml.YAMLError):
+        collection_hash('a: [b\n')
@@ -14,7 +14,11 @@
 import json
 from unittest import mock
 
+import responses
+
 from shipyard_client.api_client.base_client import BaseClient
+from shipyard_client.api_client.content_hash import collection_hash
+from shipyard_client.api_client.response_cache import ResponseCache
 from shipyard_client.api_client.shipyard_api_client import ShipyardClient
 from shipyard_client.api_client.shipyardclient_context import \
     ShipyardClientContext
@@ -33,7 +37,7 @@ def replace_post_rep(self, url, query_params={}, data={}, content_type=''):
     return {'url': url, 'params': query_params, 'data': data}
 
 
-def replace_get_resp(self, url, query_params={}, json=False):
+def replace_get_resp(self, url, query_params={}, json=False, headers=None):
     """Replaces call to shipyard client.
 
     :returns: dict with url and parameters
@@ -41,7 +45,7 @@ def replace_get_resp(self, url, query_params={}, json=False):
     return {'url': url, 'params': query_params}
 
 
-def get_api_client():
+def get_api_client(cache_dir=None):
     """
     get a instance of shipyard client
     :returns: shipyard client with no context object
@@ -58,7 +62,8 @@ def get_api_client():
     context = ShipyardClientContext(
         debug=True,
         keystone_auth=keystone_auth,
-        context_marker='88888888-4444-4444-4444-121212121212')
+        context_marker='88888888-4444-4444-4444-121212121212',
+        cache_dir=cache_dir)
     return ShipyardClient(context)
 
 
@@ -75,6 +80,131 @@ def test_post_config_docs(*args):
     assert params['buffermode'] == buffermode
 
 
+@mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
+@mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+def test_get_config_docs_hash(*args):
+    shipyard_client = get_api_client()
+    result = shipyard_client.get_configdocs_hash('ABC', version='committed')
+    assert result['url'] == '{}/configdocs/ABC/hash'.format(
+        shipyard_client.get_endpoint())
+    assert result['params']['version'] == 'committed'
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_post_config_docs_skip_unchanged(*args):
+    hash_url = 'http://shipyard/api/v1.0/configdocs/ABC/hash'
+    post_url = 'http://shipyard/api/v1.0/configdocs/ABC'
+    docs = 'schema: a/Doc/v1\nmetadata: {name: one}\ndata: 1\n'
+    # reordered and reformatted, but the same content
+    reformatted = '---\ndata: 1\nmetadata:\n  name: one\nschema: a/Doc/v1\n'
+    responses.add(responses.GET, hash_url,
+                  json={'hash': collection_hash(docs)}, status=200)
+    responses.add(responses.POST, post_url, json={}, status=201)
+    shipyard_client = get_api_client()
+
+    result = shipyard_client.post_configdocs(
+        'ABC', buffer_mode='append', document_data=reformatted,
+        skip_unchanged=True)
+    assert result.status_code == 200
+    assert [call.request.method for call in responses.calls] == ['GET']
+
+    # Changed documents are uploaded
+    result = shipyard_client.post_configdocs(
+        'ABC', buffer_mode='append', document_data=docs + '---\n{a: b}\n',
+        skip_unchanged=True)
+    assert result.status_code == 201
+    assert [call.request.method for call in responses.calls] == [
+        'GET', 'GET', 'POST']
+
+    # The replace buffer mode always uploads
+    result = shipyard_client.post_configdocs(
+        'ABC', buffer_mode='replace', document_data=docs,
+        skip_unchanged=True)
+    assert result.status_code == 201
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_post_config_docs_skip_unchanged_no_hash(*args):
+    # A Shipyard without the hash API, and invalid YAML, are uploaded
+    responses.add(responses.GET,
+                  'http://shipyard/api/v1.0/configdocs/ABC/hash',
+                  body='Not Found', status=404)
+    responses.add(responses.POST, 'http://shipyard/api/v1.0/configdocs/ABC',
+                  json={}, status=201)
+    shipyard_client = get_api_client()
+    for docs in ['a: b\n', 'a: [b\n']:
+        result = shipyard_client.post_configdocs(
+            'ABC', buffer_mode='append', document_data=docs,
+            skip_unchanged=True)
+        assert result.status_code == 201
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_post_config_docs_batch(*args):
+    url = 'http://shipyard/api/v1.0/batchconfigdocs'
+    responses.add(responses.POST, url, json={}, status=201)
+    shipyard_client = get_api_client()
+    design = 'schema: a/Doc/v1\nmetadata: {name: caf\u00e9}\ndata: 1\n'
+    secrets = [b'schema: b/Doc/v1\n', b'metadata: {name: two}\n']
+
+    class Chunks(list):
+        def __len__(self):
+            return sum(len(chunk) for chunk in self)
+
+    result = shipyard_client.post_configdocs_batch(
+        [('design', design), ('secrets', Chunks(secrets))],
+        buffer_mode='append')
+    assert result.status_code == 201
+    request = responses.calls[0].request
+    assert request.url.startswith(url)
+    design = design.encode('utf-8')
+    assert 'collections=design%3A{}%2Csecrets%3A{}'.format(
+        len(design), len(b''.join(secrets))) in request.url
+    assert 'buffermode=append' in request.url
+    assert b''.join(request.body) == design + b''.join(secrets)
+    assert request.headers['Content-Length'] == str(
+        len(design + b''.join(secrets)))
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_post_config_docs_batch_skip_unchanged(*args):
+    url = 'http://shipyard/api/v1.0/batchconfigdocs'
+    design = 'schema: a/Doc/v1\nmetadata: {name: one}\ndata: 1\n'
+    secrets = 'schema: b/Doc/v1\nmetadata: {name: two}\ndata: 2\n'
+    responses.add(responses.GET,
+                  'http://shipyard/api/v1.0/configdocs/design/hash',
+                  json={'hash': collection_hash(design)}, status=200)
+    responses.add(responses.GET,
+                  'http://shipyard/api/v1.0/configdocs/secrets/hash',
+                  json={'hash': collection_hash('')}, status=200)
+    responses.add(responses.POST, url, json={}, status=201)
+    shipyard_client = get_api_client()
+
+    result = shipyard_client.post_configdocs_batch(
+        [('design', design), ('secrets', secrets)], buffer_mode='append',
+        skip_unchanged=True)
+    assert result.status_code == 201
+    request = responses.calls[2].request
+    assert 'collections=secrets%3A{}'.format(len(secrets)) in request.url
+    assert b''.join(request.body) == secrets.encode('utf-8')
+
+    # Nothing is uploaded if all the collections are unchanged
+    result = shipyard_client.post_configdocs_batch(
+        [('design', design)], buffer_mode='append', skip_unchanged=True)
+    assert result.status_code == 200
+    assert len(responses.calls) == 4
+
+
 @mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
 @mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
 @mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
@@ -111,6 +241,58 @@ def test_rendered_config_docs(*args):
     assert params['version'] == version
 
 
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_rendered_config_docs_local_copy(tmpdir):
+    url = 'http://shipyard/api/v1.0/renderedconfigdocs'
+    responses.add(responses.GET, url, body='a: b\n', status=200,
+                  headers={'ETag': '"5-redacted"'})
+    responses.add(responses.GET, url, status=304,
+                  headers={'ETag': '"5-redacted"'})
+    shipyard_client = get_api_client(cache_dir=str(tmpdir))
+
+    result = shipyard_client.get_rendereddocs(version='committed')
+    assert result.status_code == 200
+    assert result.text == 'a: b\n'
+    assert 'If-None-Match' not in responses.calls[0].request.headers
+
+    result = shipyard_client.get_rendereddocs(version='committed')
+    assert result.status_code == 200
+    assert result.text == 'a: b\n'
+    assert (responses.calls[1].request.headers['If-None-Match'] ==
+            '"5-redacted"')
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_rendered_config_docs_cleartext_not_kept(tmpdir):
+    url = 'http://shipyard/api/v1.0/renderedconfigdocs'
+    responses.add(responses.GET, url, body='secret: s\n', status=200,
+                  headers={'ETag': '"5-cleartext"'})
+    shipyard_client = get_api_client(cache_dir=str(tmpdir))
+
+    for _ in range(2):
+        result = shipyard_client.get_rendereddocs(version='committed',
+                                                  cleartext_secrets=True)
+        assert result.text == 'secret: s\n'
+    assert not any('If-None-Match' in call.request.headers
+                   for call in responses.calls)
+    assert not tmpdir.listdir()
+
+
+def test_response_cache(tmpdir):
+    cache = ResponseCache(str(tmpdir.join('rendereddocs')))
+    assert cache.get('key') is None
+    cache.put('key', '"1-redacted"', b'a: b\n')
+    assert cache.get('key') == ('"1-redacted"', b'a: b\n')
+    assert cache.get('other') is None
+    cache.put('key', '"2-redacted"', b'c: d\n')
+    assert cache.get('key') == ('"2-redacted"', b'c: d\n')
+    assert len(tmpdir.join('rendereddocs').listdir()) == 1
+
+
 @mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
 @mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
 @mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
@@ -124,6 +306,17 @@ def test_commit_configs(*args):
         shipyard_client.get_endpoint())
     assert params['force'] == force_mode
     assert params['dryrun'] == dryrun_mode
+    assert 'refresh-validations' not in params
+
+
+@mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
+@mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+def test_commit_configs_refresh_validations(*args):
+    shipyard_client = get_api_client()
+    result = shipyard_client.commit_configdocs(refresh_validations=True)
+    params = result['params']
+    assert params['refresh-validations'] is True
 
 
 @mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
@@ -133,6 +326,24 @@ def test_get_actions(*args):
     shipyard_client = get_api_client()
     result = shipyard_client.get_actions()
     assert result['url'] == '{}/actions'.format(shipyard_client.get_endpoint())
+    assert result['params'] == {}
+
+
+@mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
+@mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+def test_get_actions_filtered(*args):
+    shipyard_client = get_api_client()
+    result = shipyard_client.get_actions(
+        cursor='01BTP9T2WCE1PAJR2DWYXG805V', limit=10,
+        since='2017-11-09T15:02:18Z', lifecycle='Failed')
+    assert result['url'] == '{}/actions'.format(shipyard_client.get_endpoint())
+    assert result['params'] == {
+        'cursor': '01BTP9T2WCE1PAJR2DWYXG805V',
+        'limit': 10,
+        'since': '2017-11-09T15:02:18Z',
+        'lifecycle': 'Failed'
+    }
 
 
 @mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
@@ -221,6 +432,21 @@ def test_get_workflows(*args):
     assert 'since' in params
 
 
+@mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
+@mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
+@mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
+def test_get_workflows_paged(*args):
+    shipyard_client = get_api_client()
+    result = shipyard_client.get_workflows(
+        cursor='deploy_site__2017-11-09T15:02:18.000000', limit=10)
+    assert result['url'] == '{}/workflows'.format(
+        shipyard_client.get_endpoint())
+    assert result['params'] == {
+        'cursor': 'deploy_site__2017-11-09T15:02:18.000000',
+        'limit': 10
+    }
+
+
 @mock.patch.object(BaseClient, 'post_resp', replace_post_rep)
 @mock.patch.object(BaseClient, 'get_resp', replace_get_resp)
 @mock.patch.object(BaseClient, 'get_endpoint', replace_get_endpoint)
@@ -32,20 +32,21 @@ def test_commit_configdocs(*args):
     runner = CliRunner()
     with patch.object(CommitConfigdocs, '__init__') as mock_method:
         results = runner.invoke(shipyard, [auth_vars, 'commit', 'configdocs'])
-    mock_method.assert_called_once_with(ANY, False, False)
+    mock_method.assert_called_once_with(ANY, False, False, False)
 
 
 def test_commit_configdocs_options(*args):
     """test commit configdocs command with options"""
     runner = CliRunner()
-    options = ['--force', '--dryrun']
+    options = ['--force', '--dryrun', '--refresh-validations']
     with patch.object(CommitConfigdocs, '__init__') as mock_method:
         for opt in options:
             results = runner.invoke(shipyard, [auth_vars, 'commit',
                                     'configdocs', opt])
     mock_method.assert_has_calls([
-        mock.call(ANY, True, False),
-        mock.call(ANY, False, True)
+        mock.call(ANY, True, False, False),
+        mock.call(ANY, False, True, False),
+        mock.call(ANY, False, False, True)
     ])
 
 
@@ -17,8 +17,10 @@ import responses
 import yaml
 
 from shipyard_client.api_client.base_client import BaseClient
+from shipyard_client.api_client.content_hash import collection_hash
 from shipyard_client.cli.create.actions import CreateAction
 from shipyard_client.cli.create.actions import CreateConfigdocs
+from shipyard_client.cli.create.actions import CreateConfigdocsBatch
 from tests.unit.cli import stubs
 
 resp_body = """
@@ -225,3 +227,97 @@ def test_create_configdocs_empty(*args):
 
     response = action.invoke_and_return_resp()
     assert response.startswith("Configuration documents added.")
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_create_configdocs_skip_unchanged(*args):
+    document_data = '---\nschema: a/Doc/v1\nmetadata:\n  name: one\ndata: 1\n'
+    responses.add(responses.GET,
+                  'http://shiptest/configdocs/design/hash',
+                  json={'hash': collection_hash(document_data)},
+                  status=200)
+
+    response = CreateConfigdocs(stubs.StubCliContext(),
+                                'design',
+                                'append',
+                                False,
+                                document_data,
+                                (),
+                                skip_unchanged=True).invoke_and_return_resp()
+    assert response == ('Configuration documents unchanged. Collection '
+                        'design was not uploaded.')
+    assert len(responses.calls) == 1
+    assert 'version=buffer' in responses.calls[0].request.url
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_create_configdocs_skip_unchanged_changed(*args):
+    document_data = '---\nschema: a/Doc/v1\nmetadata:\n  name: one\ndata: 1\n'
+    responses.add(responses.GET,
+                  'http://shiptest/configdocs/design/hash',
+                  json={'hash': collection_hash('')},
+                  status=200)
+    responses.add(responses.POST,
+                  'http://shiptest/configdocs/design',
+                  body=stubs.gen_err_resp(message='Validations succeeded',
+                                          sub_error_count=0,
+                                          sub_info_count=0,
+                                          reason='Validation',
+                                          code=200),
+                  status=201)
+
+    response = CreateConfigdocs(stubs.StubCliContext(),
+                                'design',
+                                'append',
+                                False,
+                                document_data,
+                                (),
+                                skip_unchanged=True).invoke_and_return_resp()
+    assert response.startswith('Configuration documents added.')
+    assert responses.calls[1].request.body == document_data
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_create_configdocs_batch(*args):
+    responses.add(responses.POST,
+                  'http://shiptest/batchconfigdocs',
+                  body=stubs.gen_err_resp(message='Validations succeeded',
+                                          sub_error_count=0,
+                                          sub_info_count=0,
+                                          reason='Validation',
+                                          code=200),
+                  status=201)
+    document_data = '---\nschema: a/Doc/v1\nmetadata:\n  name: one\n'
+    response = CreateConfigdocsBatch(
+        stubs.StubCliContext(),
+        collections=[('design', document_data), ('site', document_data)],
+        buffer_mode='append').invoke_and_return_resp()
+    assert response.startswith('Configuration documents added.')
+    assert 'Status: Validations succeeded' in response
+    assert 'collections=design%3A43%2Csite%3A43' in (
+        responses.calls[0].request.url)
+
+
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_create_configdocs_batch_unchanged(*args):
+    document_data = '---\nschema: a/Doc/v1\nmetadata:\n  name: one\n'
+    for collection in ['design', 'site']:
+        responses.add(responses.GET,
+                      'http://shiptest/configdocs/{}/hash'.format(collection),
+                      json={'hash': collection_hash(document_data)},
+                      status=200)
+    response = CreateConfigdocsBatch(
+        stubs.StubCliContext(),
+        collections=[('design', document_data), ('site', document_data)],
+        buffer_mode=None,
+        skip_unchanged=True).invoke_and_return_resp()
+    assert response == ('Configuration documents unchanged. Collections '
+                        'design, site were not uploaded.')
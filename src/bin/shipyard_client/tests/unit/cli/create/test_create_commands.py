@@ -15,7 +15,8 @@ from unittest.mock import patch, ANY
 
 from click.testing import CliRunner
 
-from shipyard_client.cli.create.actions import CreateAction, CreateConfigdocs
+from shipyard_client.cli.create.actions import CreateAction, \
+    CreateConfigdocs, CreateConfigdocsBatch
 from shipyard_client.cli.commands import shipyard
 
 auth_vars = ('--os-project-domain-name=OS_PROJECT_DOMAIN_NAME_test '
@@ -68,7 +69,71 @@ def test_create_configdocs():
         ])
     mock_method.assert_called_once_with(ctx=ANY, collection=collection,
         buffer_mode='append', empty_collection=False, data=ANY,
-        filenames=file_list)
+        filenames=file_list, skip_unchanged=False)
+
+
+def test_create_configdocs_skip_unchanged():
+    """test create configdocs with the --skip-unchanged flag"""
+
+    collection = 'design'
+    filename = 'tests/unit/cli/create/sample_yaml/sample.yaml'
+    runner = CliRunner()
+    with patch.object(CreateConfigdocs, '__init__') as mock_method:
+        runner.invoke(shipyard, [
+            auth_vars, 'create', 'configdocs', collection, '--append',
+            '--filename=' + filename, '--skip-unchanged'
+        ])
+    mock_method.assert_called_once_with(ctx=ANY, collection=collection,
+        buffer_mode='append', empty_collection=False, data=ANY,
+        filenames=(filename,), skip_unchanged=True)
+
+    with patch.object(CreateConfigdocs, '__init__') as mock_method:
+        results = runner.invoke(shipyard, [
+            auth_vars, 'create', 'configdocs', collection, '--replace',
+            '--filename=' + filename, '--skip-unchanged'
+        ])
+    assert '--skip-unchanged may not be used with --replace' in results.output
+    mock_method.assert_not_called()
+
+
+def test_create_configdocs_batch():
+    """test create configdocs with the --batch flag"""
+
+    dir1 = 'tests/unit/cli/create/sample_yaml/'
+    dir2 = 'tests/unit/cli/create/sample_yaml0'
+    runner = CliRunner()
+    with patch.object(CreateConfigdocsBatch, '__init__') as mock_method:
+        runner.invoke(shipyard, [
+            auth_vars, 'create', 'configdocs', '--batch', '--append',
+            '--directory=' + dir1, '--directory=' + dir2, '--recurse'
+        ])
+    mock_method.assert_called_once_with(ctx=ANY, collections=ANY,
+        buffer_mode='append', skip_unchanged=False)
+    collections = mock_method.call_args[1]['collections']
+    assert [name for name, _ in collections] == ['sample_yaml', 'sample_yaml0']
+    assert all(len(data) > 0 for _, data in collections)
+
+
+def test_create_configdocs_batch_negative():
+    """test create configdocs with invalid uses of the --batch flag"""
+
+    dir1 = 'tests/unit/cli/create/sample_yaml'
+    filename = 'tests/unit/cli/create/sample_yaml/sample.yaml'
+    runner = CliRunner()
+    for args in [['design', '--batch', '--directory=' + dir1],
+                 ['--batch', '--filename=' + filename],
+                 ['--batch', '--empty-collection', '--directory=' + dir1],
+                 ['--batch', '--directory=' + dir1,
+                  '--directory=' + dir1 + '/']]:
+        with patch.object(CreateConfigdocsBatch, '__init__') as mock_method:
+            results = runner.invoke(shipyard, [
+                auth_vars, 'create', 'configdocs', *args])
+        assert 'Error' in results.output
+        mock_method.assert_not_called()
+
+    results = runner.invoke(shipyard, [
+        auth_vars, 'create', 'configdocs', '--directory=' + dir1])
+    assert 'Missing argument "collection"' in results.output
 
 
 def test_create_configdocs_empty():
@@ -152,7 +217,7 @@ def test_create_configdocs_empty():
             ])
 
         mock_method.assert_called_once_with(ctx=ANY, collection=collection,
-            **tc['kwargs'])
+            skip_unchanged=False, **tc['kwargs'])
 
 
 def test_create_configdocs_directory():
@@ -171,7 +236,7 @@ def test_create_configdocs_directory():
     #     happened.
     mock_method.assert_called_once_with(ctx=ANY, collection=collection,
         buffer_mode='append', empty_collection=False, data=ANY,
-        filenames=ANY)
+        filenames=ANY, skip_unchanged=False)
 
 
 def test_create_configdocs_directory_empty():
@@ -207,7 +272,7 @@ def test_create_configdocs_multi_directory():
     #     were actually traversed.
     mock_method.assert_called_once_with(ctx=ANY, collection=collection,
         buffer_mode='append', empty_collection=False, data=ANY,
-        filenames=ANY)
+        filenames=ANY, skip_unchanged=False)
 
 
 def test_create_configdocs_multi_directory_recurse():
@@ -227,7 +292,7 @@ def test_create_configdocs_multi_directory_recurse():
     #     were actually traversed and recursed.
     mock_method.assert_called_once_with(ctx=ANY, collection=collection,
         buffer_mode='append', empty_collection=False, data=ANY,
-        filenames=ANY)
+        filenames=ANY, skip_unchanged=False)
 
 
 def test_create_configdocs_negative():
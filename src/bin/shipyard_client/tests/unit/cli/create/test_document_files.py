@@ -0,0 +1,66 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+import requests
+import yaml
+
+from shipyard_client.cli.create.document_files import DocumentFiles
+
+
+def _write(tmpdir, name, content):
+    path = tmpdir.join(name)
+    path.write_binary(content)
+    return str(path)
+
+
+def test_document_files(tmpdir):
+    files = [
+        # implicit start and no trailing line break
+        _write(tmpdir, 'a.yaml', b'# comment\nschema: a/Doc/v1\ndata: 1'),
+        # only comments, not added
+        _write(tmpdir, 'b.yaml', b'# nothing here\n'),
+        _write(tmpdir, 'c.yaml',
+               b'---\nschema: b/Doc/v1\ndata: |\n  text\n'
+               b'---\nschema: c/Doc/v1\ndata: 3\n...\n'),
+        _write(tmpdir, 'd.yaml', b'schema: d/Doc/v1\n'),
+    ]
+    data = DocumentFiles()
+    assert [data.add(f) for f in files] == [True, False, True, True]
+
+    expected = (b'---\n# comment\nschema: a/Doc/v1\ndata: 1\n'
+                b'---\nschema: b/Doc/v1\ndata: |\n  text\n'
+                b'---\nschema: c/Doc/v1\ndata: 3\n...\n'
+                b'---\nschema: d/Doc/v1\n')
+    assert len(data) == len(expected)
+    assert b''.join(data) == expected
+    assert data.read(5) + data.read(100) + data.read() == expected
+    assert list(yaml.safe_load_all(expected)) == [
+        {'schema': 'a/Doc/v1', 'data': 1},
+        {'schema': 'b/Doc/v1', 'data': 'text\n'},
+        {'schema': 'c/Doc/v1', 'data': 3},
+        {'schema': 'd/Doc/v1'},
+    ]
+
+    # Sent with a Content-Length, rather than chunked
+    request = requests.Request('POST', 'http://shiptest/configdocs/design',
+                               data=data).prepare()
+    assert request.headers['Content-Length'] == str(len(expected))
+
+
+def test_document_files_invalid(tmpdir):
+    invalid = _write(tmpdir, 'invalid.yaml', b'schema: [unclosed\n')
+    data = DocumentFiles()
+    with pytest.raises(yaml.YAMLError):
+        data.add(invalid)
+    assert len(data) == 0
@@ -109,6 +109,21 @@ def test_get_actions(*args):
             "ABCDEFGHIJKLMNOPQRSTUVWXYA'") in response
 
 
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_get_actions_filtered(*args):
+    responses.add(
+        responses.GET,
+        'http://shiptest/actions?limit=1&lifecycle=Failed',
+        body=GET_ACTIONS_API_RESP,
+        status=200,
+        match_querystring=True)
+    response = GetActions(stubs.StubCliContext(), limit=1,
+                          lifecycle='Failed').invoke_and_return_resp()
+    assert 'action/01BTP9T2WCE1PAJR2DWYXG805V' in response
+
+
 GET_ACTIONS_API_RESP_UNPARSEABLE_NOTE = """
 [
   {
@@ -412,6 +427,24 @@ def test_get_workflows(*args):
     assert 'Workflow' in response
 
 
+@responses.activate
+@mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
+@mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
+def test_get_workflows_paged(*args):
+    responses.add(
+        responses.GET,
+        'http://shiptest/workflows?cursor=deploy_site__2017-10-09T21%3A18%3A'
+        '56.000000&limit=1',
+        body=GET_WORKFLOWS_API_RESP,
+        status=200,
+        match_querystring=True)
+    response = GetWorkflows(
+        stubs.StubCliContext(),
+        cursor='deploy_site__2017-10-09T21:18:56.000000',
+        limit=1).invoke_and_return_resp()
+    assert 'State' in response
+
+
 @responses.activate
 @mock.patch.object(BaseClient, 'get_endpoint', lambda x: 'http://shiptest')
 @mock.patch.object(BaseClient, 'get_token', lambda x: 'abc')
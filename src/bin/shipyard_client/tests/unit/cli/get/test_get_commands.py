@@ -34,7 +34,34 @@ def test_get_actions(*args):
     runner = CliRunner()
     with patch.object(GetActions, '__init__') as mock_method:
         runner.invoke(shipyard, [auth_vars, 'get', 'actions'])
-    mock_method.assert_called_once_with(ANY)
+    mock_method.assert_called_once_with(ANY, cursor=None, limit=None,
+                                        since=None, name=None,
+                                        lifecycle=None)
+
+
+def test_get_actions_filtered(*args):
+    """test get_actions with filtering and paging options"""
+
+    runner = CliRunner()
+    with patch.object(GetActions, '__init__') as mock_method:
+        runner.invoke(shipyard, [auth_vars, 'get', 'actions',
+                                 '--since=2017-11-09T15:02:18Z',
+                                 '--name=deploy_site',
+                                 '--lifecycle=Failed',
+                                 '--limit=10',
+                                 '--cursor=01BTP9T2WCE1PAJR2DWYXG805V'])
+    mock_method.assert_called_once_with(
+        ANY, cursor='01BTP9T2WCE1PAJR2DWYXG805V', limit=10,
+        since='2017-11-09T15:02:18Z', name='deploy_site', lifecycle='Failed')
+
+
+def test_get_actions_invalid_limit(*args):
+    """Verifies that a limit less than 1 results in an error"""
+
+    runner = CliRunner()
+    results = runner.invoke(shipyard,
+                            [auth_vars, 'get', 'actions', '--limit=0'])
+    assert 'Error' in results.output
 
 
 def test_get_actions_negative(*args):
@@ -110,13 +137,36 @@ def test_get_workflows(*args):
     runner = CliRunner()
     with patch.object(GetWorkflows, '__init__') as mock_method:
         runner.invoke(shipyard, [auth_vars, 'get', 'workflows'])
-    mock_method.assert_called_once_with(ANY, None)
+    mock_method.assert_called_once_with(ANY, since=None, cursor=None,
+                                        limit=None)
 
     since_val = '2017-01-01T12:34:56Z'
     since_arg = '--since={}'.format(since_val)
     with patch.object(GetWorkflows, '__init__') as mock_method:
         runner.invoke(shipyard, [auth_vars, 'get', 'workflows', since_arg])
-    mock_method.assert_called_once_with(ANY, since_val)
+    mock_method.assert_called_once_with(ANY, since=since_val, cursor=None,
+                                        limit=None)
+
+
+def test_get_workflows_paged(*args):
+    """test get_workflows with paging options"""
+
+    runner = CliRunner()
+    with patch.object(GetWorkflows, '__init__') as mock_method:
+        runner.invoke(shipyard, [auth_vars, 'get', 'workflows',
+                                 '--limit=10',
+                                 '--cursor=deploy_site__2017-01-01T12:34:56'])
+    mock_method.assert_called_once_with(
+        ANY, since=None, cursor='deploy_site__2017-01-01T12:34:56', limit=10)
+
+
+def test_get_workflows_invalid_limit(*args):
+    """Verifies that a limit less than 1 results in an error"""
+
+    runner = CliRunner()
+    results = runner.invoke(shipyard,
+                            [auth_vars, 'get', 'workflows', '--limit=0'])
+    assert 'Error' in results.output
 
 
 def test_get_workflows_negative(*args):
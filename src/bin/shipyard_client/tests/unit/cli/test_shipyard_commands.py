@@ -30,6 +30,7 @@ def test_shipyard():
     os_username = '--os-username=OS_USERNAME_test'
     os_password = '--os-password=OS_PASSWORD_test'
     os_auth_url = '--os-auth-url=OS_AUTH_URL_test'
+    cache_dir = '--cache-dir=/tmp/shipyard_cache'
 
     auth_vars = {
         'project_domain_name': 'OS_PROJECT_DOMAIN_NAME_test',
@@ -45,11 +46,12 @@ def test_shipyard():
         results = runner.invoke(shipyard, [
             context_marker, os_project_domain_name, os_user_domain_name,
             os_project_name, os_username, os_password, os_auth_url, debug,
-            'commit', 'configdocs'
+            cache_dir, 'commit', 'configdocs'
         ])
     mock_method.assert_called_once_with(
         auth_vars,
         '88888888-4444-4444-4444-121212121212',
         True,
-        1
+        1,
+        '/tmp/shipyard_cache'
     )